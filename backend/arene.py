@@ -0,0 +1,272 @@
+"""Arène : des serpents robots et le joueur sur un même plateau, sans pygame.
+
+Tous les corps sont posés sur une seule ``Grille``, qui sert d'index
+spatial : une case de corps, de nourriture ou libre se teste en O(1), et
+``proprietaires`` donne le serpent de chaque case de corps. ``avancer``
+résout un tick en une passe sur les serpents :
+
+1. chaque serpent vivant choisit sa direction et calcule sa case
+   d'arrivée, testée dans la grille telle qu'elle est au début du tick
+   (bords, corps de n'importe quel serpent, queues comprises comme pour le
+   serpent seul) ; deux têtes qui visent la même case meurent toutes les
+   deux (face-à-face) ;
+2. les survivants avancent et mangent la nourriture de leur case ;
+3. les morts libèrent leurs cases, les robots réapparaissent sur une case
+   libre et la nourriture mangée est reposée.
+
+Le coût d'un tick est proportionnel au nombre de serpents, pas à leur
+longueur ni à la taille du plateau.
+
+Exemple ::
+
+    python backend/arene.py --serpents 500 --colonnes 1000 --lignes 1000
+"""
+
+import argparse
+import random
+import sys
+import time
+from array import array
+from collections.abc import Callable
+
+from grille import CORPS, NOURRITURE, Grille
+from moteur import (
+    AUCUN_EVENEMENT,
+    BAS,
+    COLONNES,
+    DROITE,
+    FPS,
+    GAUCHE,
+    HAUT,
+    LIGNES,
+    NOURRITURE_MANGEE,
+    PARTIE_TERMINEE,
+    Serpent,
+)
+
+DIRECTIONS = (HAUT, BAS, GAUCHE, DROITE)
+# Probabilité qu'un robot change de direction sans y être forcé
+CHANCE_VIRAGE_ROBOT = 0.1
+CAUSES_MORT = ("bord", "corps", "face_a_face")
+
+# Fabrique(identifiant, grille, case de départ) -> serpent posé sur la grille
+FabriqueSerpent = Callable[[int, Grille, tuple[int, int]], Serpent]
+
+
+def _fabrique_defaut(identifiant: int, grille: Grille, depart: tuple[int, int]) -> Serpent:
+    return Serpent(grille.colonnes, grille.lignes, depart, grille)
+
+
+class Arene:
+    """Plateau partagé par ``nb_robots`` robots et, avec ``joueur``, le serpent du joueur.
+
+    Le joueur a l'identifiant 0 et la partie se termine à sa mort ; un robot
+    mort réapparaît aussitôt ailleurs. ``nb_nourritures`` cases de
+    nourriture (par défaut une par serpent) sont en jeu en permanence.
+    Expose les attributs d'``EtatPartie`` dont ``Jeu`` se sert (``serpent``,
+    ``score``, ``vitesse_actuelle``...).
+    """
+
+    # Pas d'effets de bonus dans l'arène
+    niveau = 1
+    multiplicateur_score = 1
+    invincible = False
+    temps_invincible = 0
+    bonus = None
+
+    def __init__(
+        self,
+        colonnes: int = COLONNES,
+        lignes: int = LIGNES,
+        nb_robots: int = 0,
+        graine: int | None = None,
+        joueur: bool = True,
+        nb_nourritures: int | None = None,
+        fabrique: FabriqueSerpent = _fabrique_defaut,
+        chance_virage: float = CHANCE_VIRAGE_ROBOT,
+    ):
+        nb_serpents = nb_robots + (1 if joueur else 0)
+        if nb_serpents <= 0:
+            raise ValueError("L'arène doit contenir au moins un serpent.")
+        self.colonnes = colonnes
+        self.lignes = lignes
+        self.grille = Grille(colonnes, lignes)
+        if nb_serpents > self.grille.nb_cellules // 2:
+            raise ValueError("Trop de serpents pour ce plateau.")
+        self.rng = random.Random(graine)
+        self.fabrique = fabrique
+        self.chance_virage = chance_virage
+        # Serpent qui occupe chaque case de corps (valide là où CORPS est posé)
+        self.proprietaires = array("l", bytes(self.grille.nb_cellules * array("l").itemsize))
+        self.nb_nourritures = nb_serpents if nb_nourritures is None else nb_nourritures
+        self.nourritures_en_jeu = 0
+        self.avec_joueur = joueur
+        self.serpents: list[Serpent] = [self._faire_apparaitre(identifiant) for identifiant in range(nb_serpents)]
+        self._reposer_nourriture()
+        self.vitesse_actuelle = FPS
+        self.score = 0
+        self.frame_count = 0
+        self.terminee = False
+        self.morts = dict.fromkeys(CAUSES_MORT, 0)
+
+    @property
+    def serpent(self) -> Serpent | None:
+        """Serpent du joueur (``None`` dans une arène de robots)."""
+        return self.serpents[0] if self.avec_joueur else None
+
+    def _faire_apparaitre(self, identifiant: int) -> Serpent:
+        grille = self.grille
+        cellule = grille.tirer_cellule_libre(self.rng)
+        if cellule is None:
+            raise RuntimeError("Plus aucune case libre dans l'arène.")
+        serpent = self.fabrique(identifiant, grille, grille.coordonnees(cellule))
+        serpent.direction = self.rng.choice(DIRECTIONS)
+        self.proprietaires[cellule] = identifiant
+        return serpent
+
+    def placer(self, identifiant: int, depart: tuple[int, int], direction: tuple[int, int]) -> Serpent:
+        """Remplace le serpent ``identifiant`` par un serpent neuf en ``depart`` (case libre)."""
+        grille = self.grille
+        cellule = grille.cellule(*depart)
+        if grille.occupation[cellule] & NOURRITURE:
+            grille.effacer(cellule, NOURRITURE)
+            self.nourritures_en_jeu -= 1
+        self.serpents[identifiant].corps.liberer()
+        serpent = self.serpents[identifiant] = self.fabrique(identifiant, grille, depart)
+        serpent.direction = direction
+        self.proprietaires[cellule] = identifiant
+        return serpent
+
+    def _reposer_nourriture(self) -> None:
+        grille = self.grille
+        while self.nourritures_en_jeu < self.nb_nourritures:
+            cellule = grille.tirer_cellule_libre(self.rng)
+            if cellule is None:
+                return
+            grille.marquer(cellule, NOURRITURE)
+            self.nourritures_en_jeu += 1
+
+    def _direction_robot(self, serpent: Serpent, x: int, y: int) -> tuple[int, int]:
+        """Tout droit tant que c'est libre, avec de temps en temps un virage au hasard."""
+        grille = self.grille
+        occupation = grille.occupation
+        colonnes = grille.colonnes
+        lignes = grille.lignes
+        direction = serpent.direction
+        rng = self.rng
+        if rng.random() >= self.chance_virage:
+            nx = x + direction[0]
+            ny = y + direction[1]
+            if 0 <= nx < colonnes and 0 <= ny < lignes and not occupation[ny * colonnes + nx] & CORPS:
+                return direction
+        candidats = [
+            (dx, dy)
+            for dx, dy in DIRECTIONS
+            if (dx, dy) != (-direction[0], -direction[1])
+            and 0 <= x + dx < colonnes
+            and 0 <= y + dy < lignes
+            and not occupation[(y + dy) * colonnes + x + dx] & CORPS
+        ]
+        return rng.choice(candidats) if candidats else direction
+
+    def avancer(self, action: tuple[int, int] | None = None) -> int:
+        """Joue un tick ; ``action`` est la direction du joueur. Retourne les
+        événements du joueur (masque de bits de ``moteur``)."""
+        if self.terminee:
+            return PARTIE_TERMINEE
+        self.frame_count += 1
+        grille = self.grille
+        occupation = grille.occupation
+        colonnes = grille.colonnes
+        lignes = grille.lignes
+        serpents = self.serpents
+        joueur = self.serpent
+        if action is not None and joueur is not None:
+            joueur.changer_direction(action)
+
+        # 1. Cases d'arrivée, contre la grille du début du tick
+        arrivees: dict[int, int] = {}
+        morts: list[tuple[int, str]] = []
+        for identifiant, serpent in enumerate(serpents):
+            y, x = divmod(serpent.corps.cellule_segment(0), colonnes)
+            if serpent is not joueur:
+                serpent.direction = self._direction_robot(serpent, x, y)
+            x += serpent.direction[0]
+            y += serpent.direction[1]
+            if not (0 <= x < colonnes and 0 <= y < lignes):
+                morts.append((identifiant, "bord"))
+                continue
+            cellule = y * colonnes + x
+            if occupation[cellule] & CORPS:
+                morts.append((identifiant, "corps"))
+                continue
+            autre = arrivees.get(cellule)
+            if autre is None:
+                arrivees[cellule] = identifiant
+                continue
+            morts.append((identifiant, "face_a_face"))
+            if autre >= 0:
+                morts.append((autre, "face_a_face"))
+                arrivees[cellule] = -1
+
+        # 2. Les survivants avancent
+        evenements = AUCUN_EVENEMENT
+        proprietaires = self.proprietaires
+        for cellule, identifiant in arrivees.items():
+            if identifiant < 0:
+                continue
+            serpent = serpents[identifiant]
+            serpent.bouger()
+            proprietaires[cellule] = identifiant
+            if occupation[cellule] & NOURRITURE:
+                grille.effacer(cellule, NOURRITURE)
+                self.nourritures_en_jeu -= 1
+                serpent.manger()
+                if serpent is joueur:
+                    self.score += 10
+                    evenements |= NOURRITURE_MANGEE
+
+        # 3. Morts, réapparitions et nourriture
+        for identifiant, cause in morts:
+            self.morts[cause] += 1
+            serpents[identifiant].corps.liberer()
+        for identifiant, _ in morts:
+            if serpents[identifiant] is joueur:
+                self.terminee = True
+                evenements |= PARTIE_TERMINEE
+            else:
+                serpents[identifiant] = self._faire_apparaitre(identifiant)
+        self._reposer_nourriture()
+        return evenements
+
+
+def mesurer(nb_serpents: int, colonnes: int, lignes: int, ticks: int, graine: int = 0) -> float:
+    """Durée moyenne d'un tick (secondes) pour une arène de robots."""
+    arene = Arene(colonnes, lignes, nb_robots=nb_serpents, graine=graine, joueur=False)
+    debut = time.perf_counter()
+    for _ in range(ticks):
+        arene.avancer()
+    return (time.perf_counter() - debut) / ticks
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Durée d'un tick d'arène selon le nombre de serpents.")
+    parser.add_argument("--serpents", type=int, nargs="+", default=[10, 100, 500, 1000])
+    parser.add_argument("--colonnes", type=int, default=1000)
+    parser.add_argument("--lignes", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--fps", type=int, default=FPS, help="cadence de simulation visée")
+    args = parser.parse_args(argv)
+
+    budget = 1 / args.fps
+    for nb_serpents in args.serpents:
+        duree = mesurer(nb_serpents, args.colonnes, args.lignes, args.ticks)
+        print(
+            f"{nb_serpents:>6} serpents : {duree * 1000:8.3f} ms/tick "
+            f"({duree / budget:6.1%} du budget à {args.fps} ticks/s)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Boucle de jeu à pas fixe, sans dépendance à pygame.
+
+La simulation avance par ticks de ``1 / cadence`` secondes, consommés dans
+un accumulateur de temps réel ; l'affichage tourne à sa propre fréquence et
+interpole entre les deux derniers ticks (``PasFixe.alpha``). ``Cadenceur``
+remplace ``Clock.tick`` (granularité d'une milliseconde, dérive cumulée) par
+une échéance absolue : ``sleep`` jusqu'à un peu avant, puis attente active.
+``StatistiquesBoucle`` mesure durée des frames et gigue des ticks.
+"""
+
+import time
+from collections import deque
+
+# Retard maximal rattrapé en une frame (évite la spirale de rattrapage
+# après une pause, un déplacement de fenêtre...)
+RETARD_MAX = 0.25
+# Marge avant l'échéance en dessous de laquelle on attend activement
+MARGE_ATTENTE_ACTIVE = 0.002
+TAILLE_HISTORIQUE = 600
+
+
+class PasFixe:
+    """Accumulateur de temps pour une simulation à pas fixe.
+
+    ``demarrer_frame`` ajoute le temps écoulé ; ``tick_du`` consomme un pas
+    tant qu'il en reste (la cadence peut changer d'un tick à l'autre) ;
+    ``alpha`` donne la fraction du tick suivant déjà écoulée.
+    """
+
+    def __init__(self, retard_max: float = RETARD_MAX):
+        self.retard_max = retard_max
+        self.accumulateur = 0.0
+        self._derniere_frame: float | None = None
+
+    def reinitialiser(self) -> None:
+        self.accumulateur = 0.0
+        self._derniere_frame = None
+
+    def demarrer_frame(self, maintenant: float) -> None:
+        if self._derniere_frame is not None:
+            self.accumulateur += min(maintenant - self._derniere_frame, self.retard_max)
+        self._derniere_frame = maintenant
+
+    def tick_du(self, cadence: float) -> bool:
+        pas = 1.0 / cadence
+        if self.accumulateur < pas:
+            return False
+        self.accumulateur -= pas
+        return True
+
+    def alpha(self, cadence: float) -> float:
+        return min(1.0, self.accumulateur * cadence)
+
+
+class Cadenceur:
+    """Rythme les frames sur des échéances absolues à ``frequence`` Hz."""
+
+    def __init__(self, frequence: float, marge: float = MARGE_ATTENTE_ACTIVE, horloge=time.perf_counter, dormir=time.sleep):
+        self.periode = 1.0 / frequence
+        self.marge = marge
+        self._horloge = horloge
+        self._dormir = dormir
+        self._echeance: float | None = None
+
+    def attendre(self) -> float:
+        """Attend l'échéance de la frame suivante et renvoie l'heure de réveil."""
+        maintenant = self._horloge()
+        if self._echeance is None:
+            self._echeance = maintenant
+        self._echeance += self.periode
+        if maintenant > self._echeance:
+            # Trop en retard : on repart de maintenant plutôt que d'enchaîner les frames
+            self._echeance = maintenant
+            return maintenant
+        restant = self._echeance - maintenant
+        if restant > self.marge:
+            self._dormir(restant - self.marge)
+        while (maintenant := self._horloge()) < self._echeance:
+            pass
+        return maintenant
+
+
+def percentile(valeurs, q: float) -> float:
+    """Percentile ``q`` (0-100) par rang le plus proche ; 0.0 si vide."""
+    if not valeurs:
+        return 0.0
+    tries = sorted(valeurs)
+    rang = min(len(tries) - 1, max(0, round(q / 100 * (len(tries) - 1))))
+    return tries[rang]
+
+
+class StatistiquesBoucle:
+    """Durée des frames et gigue des ticks sur les ``taille`` derniers échantillons.
+
+    La gigue d'un tick est l'écart entre l'intervalle réel depuis le tick
+    précédent et le pas théorique ``1 / cadence``.
+    """
+
+    def __init__(self, taille: int = TAILLE_HISTORIQUE):
+        self.durees_frames: deque[float] = deque(maxlen=taille)
+        self.gigues_ticks: deque[float] = deque(maxlen=taille)
+        self.frames = 0
+        self.ticks = 0
+        self._derniere_frame: float | None = None
+        self._dernier_tick: float | None = None
+
+    def frame(self, maintenant: float) -> None:
+        if self._derniere_frame is not None:
+            self.durees_frames.append(maintenant - self._derniere_frame)
+        self._derniere_frame = maintenant
+        self.frames += 1
+
+    def tick(self, maintenant: float, cadence: float) -> None:
+        if self._dernier_tick is not None:
+            self.gigues_ticks.append(abs(maintenant - self._dernier_tick - 1.0 / cadence))
+        self._dernier_tick = maintenant
+        self.ticks += 1
+
+    def interrompre_ticks(self) -> None:
+        """À appeler quand la simulation s'arrête (menu, game over)."""
+        self._dernier_tick = None
+
+    def resume(self) -> dict[str, float]:
+        durees = self.durees_frames
+        moyenne = sum(durees) / len(durees) if durees else 0.0
+        return {
+            "frames": self.frames,
+            "ticks": self.ticks,
+            "fps": 1.0 / moyenne if moyenne else 0.0,
+            "frame_ms_p50": percentile(durees, 50) * 1000,
+            "frame_ms_p95": percentile(durees, 95) * 1000,
+            "frame_ms_p99": percentile(durees, 99) * 1000,
+            "gigue_tick_ms_p50": percentile(self.gigues_ticks, 50) * 1000,
+            "gigue_tick_ms_p95": percentile(self.gigues_ticks, 95) * 1000,
+            "gigue_tick_ms_max": max(self.gigues_ticks, default=0.0) * 1000,
+        }
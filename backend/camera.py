@@ -0,0 +1,220 @@
+"""Caméra et mini-carte pour les plateaux plus grands que la fenêtre.
+
+La ``Camera`` suit la tête du serpent et borne son décalage au plateau ;
+``segments_visibles`` ne lit que les cellules sous la caméra, si bien que
+le coût du dessin dépend de ce qui est à l'écran, pas de la longueur du
+serpent ni de la taille du plateau. La ``MiniCarte`` garde une image
+réduite de l'occupation, mise à jour à partir des seules cellules entrées
+et sorties du corps depuis la frame précédente.
+
+Exemple ::
+
+    python backend/snake.py --colonnes 1000 --lignes 1000
+"""
+
+import math
+from collections.abc import Sequence
+
+import numpy as np
+import pygame
+
+from grille import CORPS, CorpsSerpent, Grille
+
+
+class Camera:
+    """Fenêtre de ``largeur x hauteur`` pixels sur un plateau de ``colonnes x lignes`` cellules.
+
+    ``x`` et ``y`` : coin haut gauche de la fenêtre, en pixels du plateau.
+    """
+
+    def __init__(self, colonnes: int, lignes: int, taille_cellule: int, largeur: int, hauteur: int):
+        self.colonnes = colonnes
+        self.lignes = lignes
+        self.taille_cellule = taille_cellule
+        self.largeur = largeur
+        self.hauteur = hauteur
+        self.x_max = max(0, colonnes * taille_cellule - largeur)
+        self.y_max = max(0, lignes * taille_cellule - hauteur)
+        self.x = 0
+        self.y = 0
+
+    def suivre(self, pixels: tuple[int, int]) -> None:
+        """Centre la fenêtre sur la cellule dessinée en ``pixels``, sans sortir du plateau."""
+        demi = self.taille_cellule // 2
+        self.x = min(max(pixels[0] + demi - self.largeur // 2, 0), self.x_max)
+        self.y = min(max(pixels[1] + demi - self.hauteur // 2, 0), self.y_max)
+
+    def cellules_visibles(self, marge: int = 1) -> tuple[int, int, int, int]:
+        """``(x0, y0, x1, y1)`` : cellules ``x0 <= x < x1``, ``y0 <= y < y1`` sous la fenêtre.
+
+        ``marge`` cellules de plus de chaque côté couvrent ombres et débordements.
+        """
+        taille = self.taille_cellule
+        return (
+            max(0, self.x // taille - marge),
+            max(0, self.y // taille - marge),
+            min(self.colonnes, (self.x + self.largeur - 1) // taille + 1 + marge),
+            min(self.lignes, (self.y + self.hauteur - 1) // taille + 1 + marge),
+        )
+
+    def visible(self, pixels: tuple[int, int]) -> bool:
+        """Un sprite d'une cellule dessiné en ``pixels`` (plateau) touche-t-il la fenêtre ?"""
+        taille = self.taille_cellule
+        return (
+            -2 * taille < pixels[0] - self.x < self.largeur + taille
+            and -2 * taille < pixels[1] - self.y < self.hauteur + taille
+        )
+
+    @property
+    def rect(self) -> pygame.Rect:
+        return pygame.Rect(self.x, self.y, self.largeur, self.hauteur)
+
+
+def cellules_marquees(grille: Grille, drapeau: int, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+    """Cellules du rectangle ``[x0, x1[ x [y0, y1[`` qui portent ``drapeau``."""
+    occupation = np.frombuffer(grille.occupation, dtype=np.uint8).reshape(grille.lignes, grille.colonnes)
+    ys, xs = np.nonzero(occupation[y0:y1, x0:x1] & drapeau)
+    return (ys + y0) * grille.colonnes + (xs + x0)
+
+
+def segments_visibles(corps: CorpsSerpent, x0: int, y0: int, x1: int, y1: int) -> tuple[np.ndarray, np.ndarray]:
+    """Rangs (croissants) et cellules des segments dans le rectangle ``[x0, x1[ x [y0, y1[``.
+
+    Seul le rectangle de la grille d'occupation est lu ; les rangs viennent
+    des slots de l'anneau (``Grille.slots``). Sur une grille partagée, une
+    cellule n'est à ce corps que si son slot pointe, dans son anneau et
+    dans sa longueur, vers elle-même.
+    """
+    cellules = cellules_marquees(corps.grille, CORPS, x0, y0, x1, y1)
+    slot_tete, longueur, capacite = corps.reperes
+    slots = np.frombuffer(corps.slots, dtype=np.dtype("l"))[cellules]
+    rangs = (slot_tete - slots) % capacite
+    a_lui = (slots < capacite) & (rangs < longueur)
+    a_lui[a_lui] = np.frombuffer(corps.anneau, dtype=np.dtype("l"))[slots[a_lui]] == cellules[a_lui]
+    rangs = rangs[a_lui]
+    cellules = cellules[a_lui]
+    ordre = np.argsort(rangs, kind="stable")
+    return rangs[ordre], cellules[ordre]
+
+
+class MiniCarte:
+    """Vue réduite du plateau : un pixel pour ``echelle x echelle`` cellules.
+
+    Le nombre de segments par pixel est tenu à jour avec les cellules
+    entrées et sorties de chaque corps suivi (``CorpsSerpent.changements_depuis``) ;
+    seuls les pixels qui passent de vide à occupé, ou l'inverse, sont
+    repeints. Un corps qui apparaît est compté en entier, un corps qui
+    disparaît (serpent mort, nouvelle partie) est décompté ; l'image n'est
+    reconstruite que si un anneau a été agrandi ou trop avancé depuis la
+    dernière mise à jour.
+    """
+
+    COULEUR_FOND = (16, 16, 22)
+    COULEUR_CORPS = (90, 220, 120)
+    COULEUR_BORD = (90, 90, 90)
+    COULEUR_CAMERA = (220, 220, 220)
+
+    def __init__(self, colonnes: int, lignes: int, taille_max: int = 120):
+        self.colonnes = colonnes
+        self.lignes = lignes
+        self.echelle = max(1, math.ceil(max(colonnes, lignes) / taille_max))
+        self.largeur = math.ceil(colonnes / self.echelle)
+        self.hauteur = math.ceil(lignes / self.echelle)
+        self.surface = pygame.Surface((self.largeur, self.hauteur))
+        self.surface.fill(self.COULEUR_FOND)
+        self._comptes = np.zeros(self.largeur * self.hauteur, dtype=np.int32)
+        # id(corps) -> (corps, repères à la dernière mise à jour)
+        self._suivis: dict[int, tuple[CorpsSerpent, tuple[int, int, int]]] = {}
+        self.reconstructions = 0
+        self.pixels_repeints = 0
+
+    def _pixels(self, cellules: np.ndarray) -> np.ndarray:
+        ys, xs = np.divmod(cellules, self.colonnes)
+        return (ys // self.echelle) * self.largeur + xs // self.echelle
+
+    def reconstruire(self, *corps: CorpsSerpent) -> None:
+        """Recompte tous les corps et repeint toute l'image."""
+        self.reconstructions += 1
+        cellules = [np.frombuffer(c.cellules(), dtype=np.dtype("l")) for c in corps]
+        pixels = self._pixels(np.concatenate(cellules)) if cellules else np.zeros(0, dtype=np.int64)
+        self._comptes = np.bincount(pixels, minlength=len(self._comptes)).astype(np.int32)
+        occupe = (self._comptes > 0).reshape(self.hauteur, self.largeur, 1)
+        image = np.where(occupe, self.COULEUR_CORPS, self.COULEUR_FOND).astype(np.uint8)
+        pygame.surfarray.blit_array(self.surface, image.transpose(1, 0, 2))
+        self._suivis = {id(c): (c, c.reperes) for c in corps}
+
+    def mettre_a_jour(self, *corps: CorpsSerpent) -> None:
+        """Met la carte à jour pour les corps ``corps`` (tous ceux du plateau)."""
+        anciens = self._suivis
+        suivis = {}
+        entrees: list[int] = []
+        sorties: list[int] = []
+        for c in corps:
+            suivi = anciens.pop(id(c), None)
+            if suivi is None:
+                entrees.extend(c.cellules())
+            else:
+                changements = c.changements_depuis(suivi[1])
+                if changements is None:
+                    self.reconstruire(*corps)
+                    return
+                entrees.extend(changements[0])
+                sorties.extend(changements[1])
+            suivis[id(c)] = (c, c.reperes)
+        for c, reperes in anciens.values():
+            # Décompte des cellules comptées à la dernière mise à jour :
+            # corps actuel, plus ce qu'il a quitté, moins ce qu'il a gagné depuis
+            changements = c.changements_depuis(reperes)
+            if changements is None:
+                self.reconstruire(*corps)
+                return
+            entrees.extend(changements[0])
+            sorties.extend(c.cellules())
+            sorties.extend(changements[1])
+        self._suivis = suivis
+        if entrees or sorties:
+            self._appliquer(entrees, sorties)
+
+    def _appliquer(self, entrees: list[int], sorties: list[int]) -> None:
+        comptes = self._comptes
+        colonnes = self.colonnes
+        echelle = self.echelle
+        largeur = self.largeur
+        # Pixel -> occupé avant cette mise à jour
+        avant: dict[int, bool] = {}
+        for cellules, pas in ((entrees, 1), (sorties, -1)):
+            for cellule in cellules:
+                y, x = divmod(cellule, colonnes)
+                pixel = (y // echelle) * largeur + x // echelle
+                if pixel not in avant:
+                    avant[pixel] = comptes[pixel] > 0
+                comptes[pixel] += pas
+        surface = self.surface
+        for pixel, occupe_avant in avant.items():
+            occupe = comptes[pixel] > 0
+            if occupe != occupe_avant:
+                y, x = divmod(pixel, largeur)
+                surface.set_at((x, y), self.COULEUR_CORPS if occupe else self.COULEUR_FOND)
+                self.pixels_repeints += 1
+
+    def dessiner(
+        self,
+        ecran: pygame.Surface,
+        position: tuple[int, int],
+        camera: Camera,
+        points: Sequence[tuple[tuple[int, int], tuple[int, int, int]]] = (),
+    ) -> pygame.Rect:
+        """Blitte la carte en ``position`` avec le cadre de la caméra et les ``points`` (cellule, couleur)."""
+        rect = ecran.blit(self.surface, position)
+        pygame.draw.rect(ecran, self.COULEUR_BORD, rect.inflate(2, 2), 1)
+        echelle = self.echelle * camera.taille_cellule
+        for (x, y), couleur in points:
+            ecran.fill(couleur, (rect.x + x // self.echelle, rect.y + y // self.echelle, 2, 2))
+        cadre = pygame.Rect(
+            rect.x + camera.x // echelle,
+            rect.y + camera.y // echelle,
+            max(2, math.ceil(camera.largeur / echelle)),
+            max(2, math.ceil(camera.hauteur / echelle)),
+        )
+        pygame.draw.rect(ecran, self.COULEUR_CAMERA, cadre.clip(rect), 1)
+        return rect.inflate(2, 2)
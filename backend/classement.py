@@ -0,0 +1,324 @@
+"""Journal des scores en ajout seul et index des meilleurs scores, sans pygame.
+
+Chaque fin de partie ajoute une ligne au journal de la génération courante
+(``scores.<generation>.log``) : pas de relecture ni de réécriture du fichier.
+En mémoire, un tas min de taille ``taille_top`` garde les meilleurs scores.
+La compaction, lancée dans un thread tous les ``seuil_compaction`` ajouts et
+à la fermeture, replie l'état dans ``scores.index.json`` (meilleurs scores et
+nombre de parties) puis supprime le journal replié ; au démarrage, on lit
+l'index et on ne rejoue que les journaux plus récents.
+
+L'ancien ``scores.json`` (liste complète, réécrite à chaque partie) est
+importé une seule fois s'il n'existe encore ni index ni journal.
+
+``IndexRangs`` donne le rang d'un score parmi tous ceux enregistrés, pour
+le service de classement (``main.py``).
+"""
+
+import heapq
+import json
+import os
+import re
+import threading
+from pathlib import Path
+
+TAILLE_TOP = 100
+CAPACITE_INDEX_RANGS = 1024
+SEUIL_COMPACTION = 1000
+VERSION_INDEX = 1
+NOM_INDEX = "scores.index.json"
+_MOTIF_JOURNAL = re.compile(r"scores\.(\d+)\.log")
+
+
+def ecrire_atomique(fichier: Path, contenu: str | bytes) -> None:
+    """Écrit ``contenu`` dans un fichier temporaire synchronisé puis le renomme :
+    un arrêt brutal laisse l'ancienne version ou la nouvelle, jamais un mélange."""
+    fichier.parent.mkdir(parents=True, exist_ok=True)
+    temporaire = fichier.with_name(fichier.name + ".tmp")
+    binaire = isinstance(contenu, bytes)
+    with temporaire.open("wb" if binaire else "w", encoding=None if binaire else "utf-8") as flux:
+        flux.write(contenu)
+        flux.flush()
+        os.fsync(flux.fileno())
+    os.replace(temporaire, fichier)
+
+
+def charger_scores(fichier: Path) -> list[int]:
+    """Charge une liste de scores au format JSON historique (tri décroissant)."""
+    if not fichier.exists():
+        return []
+
+    try:
+        with fichier.open("r", encoding="utf-8") as flux:
+            donnees = json.load(flux)
+    except (OSError, json.JSONDecodeError):
+        return []
+
+    if not isinstance(donnees, list):
+        return []
+
+    scores = []
+    for valeur in donnees:
+        try:
+            scores.append(int(valeur))
+        except (TypeError, ValueError):
+            continue
+
+    scores.sort(reverse=True)
+    return scores
+
+
+def sauvegarder_scores(scores: list[int], fichier: Path) -> None:
+    """Enregistre ``scores`` au format JSON historique (tri décroissant)."""
+    fichier.parent.mkdir(parents=True, exist_ok=True)
+    scores_triees = sorted((int(score) for score in scores), reverse=True)
+    with fichier.open("w", encoding="utf-8") as flux:
+        json.dump(scores_triees, flux, ensure_ascii=False, indent=2)
+
+
+class JournalScores:
+    """Scores persistés en ajout seul, meilleurs scores en O(log k) par partie."""
+
+    def __init__(
+        self,
+        dossier: Path,
+        taille_top: int = TAILLE_TOP,
+        seuil_compaction: int = SEUIL_COMPACTION,
+        fichier_historique: Path | None = None,
+    ):
+        if taille_top <= 0:
+            raise ValueError("Le nombre de meilleurs scores conservés doit être positif.")
+        self.dossier = Path(dossier)
+        self.taille_top = taille_top
+        self.seuil_compaction = seuil_compaction
+        self.parties = 0
+        self.generation = 0
+        self._tas: list[int] = []
+        self._top_trie: list[int] | None = None
+        self._depuis_compaction = 0
+        self._flux = None
+        self._verrou = threading.Lock()
+        self._compaction: threading.Thread | None = None
+        self._charger(fichier_historique)
+
+    def _journal(self, generation: int) -> Path:
+        return self.dossier / f"scores.{generation}.log"
+
+    def _generations_journaux(self) -> list[int]:
+        if not self.dossier.is_dir():
+            return []
+        generations = []
+        for chemin in self.dossier.iterdir():
+            correspondance = _MOTIF_JOURNAL.fullmatch(chemin.name)
+            if correspondance:
+                generations.append(int(correspondance.group(1)))
+        return sorted(generations)
+
+    def _lire_index(self) -> dict | None:
+        try:
+            with (self.dossier / NOM_INDEX).open("r", encoding="utf-8") as flux:
+                index = json.load(flux)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(index, dict) or index.get("version") != VERSION_INDEX:
+            return None
+        try:
+            generation = int(index["generation"])
+            parties = int(index["parties"])
+            top = [int(score) for score in index["top"]]
+        except (KeyError, TypeError, ValueError):
+            return None
+        return {"generation": generation, "parties": parties, "top": top}
+
+    def _charger(self, fichier_historique: Path | None) -> None:
+        index = self._lire_index()
+        generations = self._generations_journaux()
+        if index is not None:
+            self.generation = index["generation"]
+            self.parties = index["parties"]
+            for score in index["top"]:
+                self._integrer(score, compter=False)
+        elif not generations and fichier_historique is not None and fichier_historique.exists():
+            # Migration : l'ancien fichier est replié une fois dans l'index, puis laissé tel quel
+            scores = charger_scores(fichier_historique)
+            self.parties = len(scores)
+            for score in scores[:self.taille_top]:
+                self._integrer(score, compter=False)
+            self._ecrire_index(self._tas, self.parties, self.generation)
+
+        for generation in generations:
+            if generation < self.generation:
+                # Journal déjà replié dans l'index (compaction interrompue avant suppression)
+                self._journal(generation).unlink(missing_ok=True)
+                continue
+            for score in self._lire_journal(self._journal(generation)):
+                self._integrer(score)
+                self._depuis_compaction += 1
+            self.generation = generation
+
+    @staticmethod
+    def _lire_journal(chemin: Path) -> list[int]:
+        scores = []
+        with chemin.open("rb") as flux:
+            for ligne in flux:
+                # Une ligne tronquée (arrêt pendant l'écriture) est ignorée
+                if not ligne.endswith(b"\n"):
+                    break
+                try:
+                    scores.append(int(ligne))
+                except ValueError:
+                    continue
+        return scores
+
+    def _integrer(self, score: int, compter: bool = True) -> None:
+        if compter:
+            self.parties += 1
+        tas = self._tas
+        if len(tas) < self.taille_top:
+            heapq.heappush(tas, score)
+        elif score > tas[0]:
+            heapq.heapreplace(tas, score)
+        else:
+            return
+        self._top_trie = None
+
+    def meilleurs(self, nombre: int | None = None) -> list[int]:
+        """Meilleurs scores, du plus grand au plus petit (au plus ``taille_top``)."""
+        if self._top_trie is None:
+            with self._verrou:
+                self._top_trie = sorted(self._tas, reverse=True)
+        return self._top_trie[:nombre]
+
+    @property
+    def meilleur(self) -> int:
+        return max(self._tas, default=0)
+
+    def ajouter(self, score: int) -> None:
+        """Ajoute ``score`` au journal (une ligne, sans relire le fichier)."""
+        score = int(score)
+        with self._verrou:
+            if self._flux is None:
+                self._ouvrir_journal()
+            self._flux.write(b"%d\n" % score)
+            self._flux.flush()
+            self._integrer(score)
+            self._depuis_compaction += 1
+        if self._depuis_compaction >= self.seuil_compaction:
+            self.compacter()
+
+    def _ouvrir_journal(self) -> None:
+        self.dossier.mkdir(parents=True, exist_ok=True)
+        chemin = self._journal(self.generation)
+        self._flux = chemin.open("ab")
+        if self._flux.tell():
+            with chemin.open("rb") as flux:
+                flux.seek(-1, os.SEEK_END)
+                tronquee = flux.read(1) != b"\n"
+            if tronquee:
+                self._flux.write(b"\n")
+
+    def _ecrire_index(self, tas: list[int], parties: int, generation: int) -> None:
+        donnees = {
+            "version": VERSION_INDEX,
+            "generation": generation,
+            "parties": parties,
+            "top": sorted(tas, reverse=True),
+        }
+        ecrire_atomique(self.dossier / NOM_INDEX, json.dumps(donnees, separators=(",", ":")))
+
+    def compacter(self, attendre: bool = False) -> None:
+        """Replie le journal courant dans l'index et passe à la génération suivante.
+
+        Seuls la copie du tas et le changement de journal se font sous verrou ;
+        l'écriture de l'index et la suppression de l'ancien journal tournent
+        dans un thread, sauf si ``attendre``.
+        """
+        if self._compaction is not None and self._compaction.is_alive():
+            if not attendre:
+                return
+            self._compaction.join()
+        with self._verrou:
+            if not self._depuis_compaction:
+                return
+            tas = list(self._tas)
+            parties = self.parties
+            ancienne = self.generation
+            self.generation += 1
+            self._depuis_compaction = 0
+            if self._flux is not None:
+                self._flux.close()
+                self._flux = None
+
+        def replier():
+            self._ecrire_index(tas, parties, ancienne + 1)
+            for generation in self._generations_journaux():
+                if generation <= ancienne:
+                    self._journal(generation).unlink(missing_ok=True)
+
+        if attendre:
+            replier()
+        else:
+            self._compaction = threading.Thread(target=replier, name="compaction-scores", daemon=True)
+            self._compaction.start()
+
+    def attendre_compaction(self) -> None:
+        if self._compaction is not None:
+            self._compaction.join()
+
+    def fermer(self) -> None:
+        """Termine la compaction en cours et replie le journal restant."""
+        self.compacter(attendre=True)
+        self.attendre_compaction()
+        with self._verrou:
+            if self._flux is not None:
+                self._flux.close()
+                self._flux = None
+
+
+class IndexRangs:
+    """Rang d'un score parmi tous les scores ajoutés (entiers positifs ou nuls).
+
+    Arbre de Fenwick indexé par la valeur du score : ajout et rang en
+    O(log m), où m est le plus grand score vu arrondi à une puissance de 2.
+    Doubler la capacité garde les nœuds existants ; seul le nouveau nœud
+    racine (qui couvre tout l'intervalle) reçoit le total.
+    """
+
+    def __init__(self, capacite: int = CAPACITE_INDEX_RANGS):
+        self.capacite = 1 << max(0, capacite - 1).bit_length()
+        self._arbre = [0] * (self.capacite + 1)
+        self.total = 0
+
+    def __len__(self) -> int:
+        return self.total
+
+    def ajouter(self, score: int) -> None:
+        if score < 0:
+            raise ValueError("Un score ne peut pas être négatif.")
+        while score >= self.capacite:
+            self._arbre.extend([0] * self.capacite)
+            self.capacite *= 2
+            self._arbre[self.capacite] = self.total
+        arbre = self._arbre
+        capacite = self.capacite
+        position = score + 1
+        while position <= capacite:
+            arbre[position] += 1
+            position += position & -position
+        self.total += 1
+
+    def nombre_jusqu_a(self, score: int) -> int:
+        """Nombre de scores inférieurs ou égaux à ``score``."""
+        if score < 0:
+            return 0
+        arbre = self._arbre
+        position = min(score + 1, self.capacite)
+        nombre = 0
+        while position:
+            nombre += arbre[position]
+            position &= position - 1
+        return nombre
+
+    def rang(self, score: int) -> int:
+        """Rang qu'aurait ``score`` (1 = meilleur ; les ex æquo partagent le rang)."""
+        return self.total - self.nombre_jusqu_a(score) + 1
@@ -0,0 +1,163 @@
+"""Client non bloquant du service de classement (``main.py``).
+
+``soumettre`` met seulement la partie en file ; un thread l'envoie en HTTP
+sur une connexion persistante. Si le service ne répond pas, la partie reste
+en tête de file et l'envoi est retenté avec un délai qui double jusqu'à
+``DELAI_REESSAI_MAX``. À la fermeture, les parties non envoyées sont écrites
+dans ``fichier_attente`` et repartent au lancement suivant.
+"""
+
+import json
+import threading
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+from classement import ecrire_atomique
+
+if TYPE_CHECKING:
+    import http.client
+
+URL_DEFAUT = "http://127.0.0.1:8765"
+DELAI_REESSAI_MIN = 0.5
+DELAI_REESSAI_MAX = 30.0
+DELAI_RESEAU = 2.0
+# Au-delà, les parties les plus anciennes sont abandonnées
+TAILLE_FILE_MAX = 10_000
+
+
+def charger_file_attente(fichier: Path | None) -> list[dict]:
+    if fichier is None or not fichier.exists():
+        return []
+    try:
+        with fichier.open("r", encoding="utf-8") as flux:
+            donnees = json.load(flux)
+    except (OSError, json.JSONDecodeError):
+        return []
+    if not isinstance(donnees, list):
+        return []
+    return [partie for partie in donnees if isinstance(partie, dict)]
+
+
+class ClientClassement:
+    """Envoie les parties au service de classement depuis un thread."""
+
+    def __init__(
+        self,
+        url: str = URL_DEFAUT,
+        fichier_attente: Path | None = None,
+        delai_min: float = DELAI_REESSAI_MIN,
+        delai_max: float = DELAI_REESSAI_MAX,
+    ):
+        adresse = urlsplit(url)
+        self.hote = adresse.hostname or "127.0.0.1"
+        self.port = adresse.port or 80
+        self.fichier_attente = fichier_attente
+        self.delai_min = delai_min
+        self.delai_max = delai_max
+        self.envoyees = 0
+        self.rejetees = 0
+        self.echecs = 0
+        self.dernier_rang: int | None = None
+        self._file: deque[dict] = deque(charger_file_attente(fichier_attente)[-TAILLE_FILE_MAX:])
+        self._condition = threading.Condition()
+        self._arret = False
+        # http.client (et le paquet email) est importé par le thread, hors du démarrage du jeu
+        self._connexion: http.client.HTTPConnection | None = None
+        self._thread = threading.Thread(target=self._envoyer_en_boucle, name="client-classement", daemon=True)
+        self._thread.start()
+
+    @property
+    def en_attente(self) -> int:
+        return len(self._file)
+
+    def soumettre(self, partie: dict) -> None:
+        with self._condition:
+            if len(self._file) >= TAILLE_FILE_MAX:
+                self._file.popleft()
+            self._file.append(partie)
+            self._condition.notify_all()
+
+    def _envoyer(self, partie: dict) -> tuple[int, bytes]:
+        import http.client
+
+        if self._connexion is None:
+            self._connexion = http.client.HTTPConnection(self.hote, self.port, timeout=DELAI_RESEAU)
+        corps = json.dumps(partie).encode("utf-8")
+        self._connexion.request("POST", "/scores", corps, {"Content-Type": "application/json"})
+        reponse = self._connexion.getresponse()
+        return reponse.status, reponse.read()
+
+    def _fermer_connexion(self) -> None:
+        if self._connexion is not None:
+            self._connexion.close()
+            self._connexion = None
+
+    def _envoyer_en_boucle(self) -> None:
+        import http.client
+
+        condition = self._condition
+        delai = self.delai_min
+        while True:
+            with condition:
+                condition.wait_for(lambda: self._file or self._arret)
+                if self._arret:
+                    break
+                partie = self._file[0]
+
+            try:
+                statut, corps = self._envoyer(partie)
+            except (OSError, http.client.HTTPException):
+                statut, corps = None, b""
+            if statut is None or statut >= 500:
+                # Service absent ou en difficulté : on réessaie plus tard
+                self._fermer_connexion()
+                self.echecs += 1
+                with condition:
+                    condition.wait_for(lambda: self._arret, timeout=delai)
+                delai = min(delai * 2, self.delai_max)
+                continue
+
+            delai = self.delai_min
+            if statut < 300:
+                self.envoyees += 1
+                try:
+                    self.dernier_rang = json.loads(corps)["rang"]
+                except (ValueError, KeyError, TypeError):
+                    pass
+            else:
+                # Partie refusée (4xx) : la renvoyer n'y changerait rien
+                self.rejetees += 1
+            with condition:
+                # La tête a pu être abandonnée entre-temps si la file était pleine
+                if self._file and self._file[0] is partie:
+                    self._file.popleft()
+                condition.notify_all()
+        self._fermer_connexion()
+
+    def vider(self, delai: float | None = None) -> bool:
+        """Attend que la file soit vide (au plus ``delai`` secondes)."""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._file, timeout=delai)
+
+    def statistiques(self) -> dict[str, float]:
+        return {
+            "envoyees": self.envoyees,
+            "rejetees": self.rejetees,
+            "echecs": self.echecs,
+            "en_attente": self.en_attente,
+        }
+
+    def fermer(self, delai: float = DELAI_RESEAU) -> None:
+        """Laisse ``delai`` secondes pour vider la file, puis sauvegarde le reste."""
+        self.vider(delai)
+        with self._condition:
+            self._arret = True
+            self._condition.notify_all()
+        self._thread.join()
+        if self.fichier_attente is not None:
+            if self._file:
+                ecrire_atomique(self.fichier_attente, json.dumps(list(self._file), ensure_ascii=False))
+            else:
+                self.fichier_attente.unlink(missing_ok=True)
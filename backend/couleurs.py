@@ -0,0 +1,115 @@
+"""Tables de couleurs précalculées pour les skins du serpent.
+
+Chaque mode de couleur (arc-en-ciel, palette, pulsation) dépend d'une phase
+linéaire en (temps, index du segment). La table est calculée une seule fois
+par skin avec NumPy sur une phase quantifiée ; les couleurs d'une frame
+entière s'obtiennent ensuite en une opération vectorisée qui renvoie, pour
+chaque segment, un indice dans ``TableCouleurs.couleurs``.
+"""
+
+import math
+from typing import Any
+
+import numpy as np
+
+# Résolution des tables : 1536 teintes couvrent les 6 x 256 transitions RGB
+PAS_TEINTE = 1536
+PAS_PULSE = 1024
+
+# Valeurs par défaut des options de skin (voir ``Snake``)
+VITESSE_ANIMATION_DEFAUT = 0.25
+DELTA_COULEUR_DEFAUT = 0.10
+PULSE_VITESSE_DEFAUT = 1.5
+PULSE_AMPLITUDE_DEFAUT = 0.4
+PULSE_DECALE_DEFAUT = 0.25
+BASE_PULSE_DEFAUT = (100, 100, 100)
+
+
+def _teintes_rgb(nb_pas: int) -> np.ndarray:
+    """``hsv_to_rgb(h, 1, 1)`` vectorisé sur ``nb_pas`` teintes, tronqué comme ``int(c * 255)``."""
+    teinte = np.arange(nb_pas, dtype=np.float64) / nb_pas
+    secteur = np.floor(teinte * 6.0)
+    f = teinte * 6.0 - secteur
+    secteur = secteur.astype(np.int64) % 6
+    un = np.ones_like(teinte)
+    zero = np.zeros_like(teinte)
+    q = 1.0 - f
+    r = np.choose(secteur, [un, q, zero, zero, f, un])
+    g = np.choose(secteur, [f, un, un, q, zero, zero])
+    b = np.choose(secteur, [zero, zero, f, un, un, q])
+    return (np.stack([r, g, b], axis=1) * 255).astype(np.int64)
+
+
+class TableCouleurs:
+    """Table de couleurs compilée pour un skin.
+
+    ``indices_frame(n, t)`` renvoie l'indice de couleur des ``n`` segments au
+    temps ``t`` ; ``couleurs[indice]`` est le tuple RGB correspondant.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        palette: tuple[tuple[int, int, int], ...] = (),
+        options: dict[str, Any] | None = None,
+        vitesse_animation: float = VITESSE_ANIMATION_DEFAUT,
+        delta_couleur: float = DELTA_COULEUR_DEFAUT,
+    ):
+        options = options or {}
+        if mode == "palette" and not palette:
+            mode = "rainbow"
+        self.mode = mode
+        self._indices_segments = np.arange(0, dtype=np.float64)
+
+        if mode == "palette":
+            self._taille = len(palette)
+            self._defilement = float(options.get("PALETTE_DEFILEMENT", 0.0))
+            table = np.asarray(palette, dtype=np.int64)
+        elif mode == "pulse":
+            base = np.asarray(palette[0] if palette else BASE_PULSE_DEFAUT, dtype=np.float64)
+            amplitude = float(options.get("PULSE_AMPLITUDE", PULSE_AMPLITUDE_DEFAUT))
+            self._taille = PAS_PULSE
+            # phase = t * vitesse + i * decalage, ramenée sur [0, 2pi[ en PAS_PULSE pas
+            self._vitesse = float(options.get("PULSE_VITESSE", PULSE_VITESSE_DEFAUT)) / (2 * math.pi)
+            self._delta = float(options.get("PULSE_DECALE", PULSE_DECALE_DEFAUT)) / (2 * math.pi)
+            phase = (np.arange(PAS_PULSE, dtype=np.float64) + 0.5) / PAS_PULSE * 2 * math.pi
+            intensite = (np.sin(phase) + 1) / 2
+            table = base + (255 - base) * amplitude * intensite[:, None]
+            table = np.clip(table.astype(np.int64), 0, 255)
+        else:
+            self.mode = "rainbow"
+            self._taille = PAS_TEINTE
+            self._vitesse = float(vitesse_animation)
+            self._delta = float(delta_couleur)
+            table = _teintes_rgb(PAS_TEINTE)
+
+        self.couleurs: list[tuple[int, int, int]] = [tuple(c) for c in table.tolist()]
+
+    def _segments(self, nb_segments: int) -> np.ndarray:
+        if len(self._indices_segments) < nb_segments:
+            self._indices_segments = np.arange(max(nb_segments, 2 * len(self._indices_segments)), dtype=np.float64)
+        return self._indices_segments[:nb_segments]
+
+    def indices_frame(self, nb_segments: int, temps: float) -> np.ndarray:
+        """Indices de couleur des ``nb_segments`` premiers segments au temps ``temps``."""
+        return self.indices_rangs(self._segments(nb_segments), temps)
+
+    def indices_rangs(self, rangs: np.ndarray, temps: float) -> np.ndarray:
+        """Indices de couleur des segments de rangs ``rangs`` au temps ``temps``."""
+        if self.mode == "palette":
+            decalage = int(temps * self._defilement) % self._taille if self._defilement else 0
+            return (rangs.astype(np.int64) + decalage) % self._taille
+        phase = rangs * self._delta + temps * self._vitesse
+        return ((phase % 1.0) * self._taille).astype(np.int64) % self._taille
+
+    def couleurs_frame(self, nb_segments: int, temps: float) -> list[tuple[int, int, int]]:
+        couleurs = self.couleurs
+        return [couleurs[i] for i in self.indices_frame(nb_segments, temps).tolist()]
+
+    def couleur(self, index_segment: int, temps: float) -> tuple[int, int, int]:
+        if self.mode == "palette":
+            decalage = int(temps * self._defilement) % self._taille if self._defilement else 0
+            return self.couleurs[(index_segment + decalage) % self._taille]
+        phase = index_segment * self._delta + temps * self._vitesse
+        return self.couleurs[int((phase % 1.0) * self._taille) % self._taille]
+
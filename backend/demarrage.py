@@ -0,0 +1,109 @@
+"""Démarrage du jeu : import de pygame allégé et profil des premières phases.
+
+``pygame.init()`` initialise tous les sous-systèmes SDL, joystick et audio
+compris ; le jeu n'initialise que ce dont il se sert, au premier besoin
+(``ouvrir_fenetre``, ``police``, ``initialiser_son``).
+
+Exemple ::
+
+    python backend/snake.py --profil-demarrage
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+
+
+class ProfilDemarrage:
+    """Durées des phases successives du démarrage, en secondes.
+
+    ``marquer`` clôt la phase en cours (depuis la marque précédente) ;
+    ``ajouter`` note une phase menée à part (thread d'arrière-plan), qui ne
+    compte pas dans le total.
+    """
+
+    def __init__(self, debut: float | None = None):
+        self.debut = time.perf_counter() if debut is None else debut
+        self._precedente = self.debut
+        self.phases: list[tuple[str, float]] = []
+        self.a_part: list[tuple[str, float]] = []
+
+    def marquer(self, nom: str) -> None:
+        maintenant = time.perf_counter()
+        self.phases.append((nom, maintenant - self._precedente))
+        self._precedente = maintenant
+
+    def ajouter(self, nom: str, duree: float) -> None:
+        self.a_part.append((nom, duree))
+
+    @property
+    def total(self) -> float:
+        return self._precedente - self.debut
+
+    def rapport(self) -> str:
+        lignes = [f"{nom:<32} {duree * 1000:8.1f} ms" for nom, duree in self.phases]
+        lignes.append(f"{'total':<32} {self.total * 1000:8.1f} ms")
+        lignes += [f"{nom + ' (à part)':<32} {duree * 1000:8.1f} ms" for nom, duree in self.a_part]
+        return "\n".join(lignes)
+
+
+# Commencé dès l'import de ce module, avant pygame
+PROFIL_DEMARRAGE = ProfilDemarrage()
+
+
+@contextmanager
+def _sans_module(nom: str):
+    """Fait échouer ``import nom`` le temps du bloc (s'il n'est pas déjà chargé)."""
+    if nom in sys.modules:
+        yield
+        return
+    sys.modules[nom] = None
+    try:
+        yield
+    finally:
+        del sys.modules[nom]
+
+
+def importer_pygame():
+    """Importe pygame sans ``pkg_resources``.
+
+    ``pygame.pkgdata`` l'utilise s'il est là, et son import indexe toutes les
+    distributions installées (pandas, numpy, ...) : plus de la moitié du
+    temps d'import de pygame. Sans lui, pkgdata lit ses ressources (police
+    par défaut) directement dans le dossier du paquet.
+    """
+    with _sans_module("pkg_resources"):
+        import pygame
+    return pygame
+
+
+def ouvrir_fenetre(taille: tuple[int, int], titre: str):
+    """Initialise la vidéo seule et ouvre la fenêtre."""
+    pygame = importer_pygame()
+    if not pygame.display.get_init():
+        pygame.display.init()
+    # pygame.time.get_ticks renvoie 0 tant que le minuteur SDL n'est pas
+    # lancé : pygame.init() s'en charge, sinon une Clock le démarre
+    pygame.time.Clock()
+    ecran = pygame.display.set_mode(taille)
+    pygame.display.set_caption(titre)
+    return ecran
+
+
+def police(taille: int):
+    """Police par défaut de pygame ; initialise le module font au besoin."""
+    pygame = importer_pygame()
+    if not pygame.font.get_init():
+        pygame.font.init()
+    return pygame.font.Font(None, taille)
+
+
+def initialiser_son() -> bool:
+    """Initialise le mixer ; ``False`` s'il n'y a pas de sortie audio."""
+    pygame = importer_pygame()
+    try:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+    except pygame.error:
+        return False
+    return True
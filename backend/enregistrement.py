@@ -0,0 +1,234 @@
+"""Enregistrement déterministe des parties et rejeu sans affichage.
+
+Une partie est entièrement déterminée par sa graine (``EtatPartie.rng``
+sert à la nourriture, aux bonus, au tirage des 20 % et au type de bonus)
+et par les directions passées à ``moteur.avancer``. Un enregistrement ne
+garde donc que ça, plus le bilan attendu (ticks joués, score final).
+
+Format binaire (entiers en varint LEB128, non signés) ::
+
+    b"SNKR" | version (1 octet) | colonnes | lignes | graine | ticks | score
+    | nombre de virages | virages...
+
+Chaque virage tient dans un seul varint ``(ticks depuis le virage
+précédent) << 2 | code de direction`` : un octet tant que les virages sont
+espacés de moins de 32 ticks.
+
+Exemple ::
+
+    python backend/enregistrement.py rejouer backend/data/parties/*.snkr
+"""
+
+import argparse
+import random
+import sys
+import time
+from array import array
+from collections.abc import Callable
+from pathlib import Path
+
+import moteur
+from moteur import BAS, COLONNES, DROITE, GAUCHE, HAUT, LIGNES, EtatPartie
+
+MAGIQUE = b"SNKR"
+VERSION = 1
+EXTENSION = ".snkr"
+# Code de direction sur 2 bits : indice dans ce tuple
+DIRECTIONS = (HAUT, BAS, GAUCHE, DROITE)
+CODES_DIRECTIONS = {direction: code for code, direction in enumerate(DIRECTIONS)}
+MAX_TICKS_DEFAUT = 20_000
+
+
+class DivergenceRejeu(AssertionError):
+    """Le rejeu n'aboutit pas au bilan enregistré."""
+
+
+def _ecrire_varint(sortie: bytearray, valeur: int) -> None:
+    if valeur < 0:
+        raise ValueError("varint : valeur négative")
+    while valeur >= 0x80:
+        sortie.append(valeur & 0x7F | 0x80)
+        valeur >>= 7
+    sortie.append(valeur)
+
+
+def _lire_varint(donnees: bytes, position: int) -> tuple[int, int]:
+    valeur = decalage = 0
+    while True:
+        if position >= len(donnees):
+            raise ValueError("Enregistrement tronqué.")
+        octet = donnees[position]
+        position += 1
+        valeur |= (octet & 0x7F) << decalage
+        if not octet & 0x80:
+            return valeur, position
+        decalage += 7
+
+
+def nouvelle_graine() -> int:
+    """Graine 64 bits tirée de l'entropie du système."""
+    return random.SystemRandom().getrandbits(64)
+
+
+class Enregistrement:
+    """Graine, virages (tick, code) et bilan d'une partie."""
+
+    def __init__(self, graine: int, colonnes: int = COLONNES, lignes: int = LIGNES):
+        self.graine = graine
+        self.colonnes = colonnes
+        self.lignes = lignes
+        self.ticks_virages = array("q")
+        self.codes_virages = bytearray()
+        self.ticks = 0
+        self.score = 0
+
+    def __len__(self) -> int:
+        return len(self.codes_virages)
+
+    def nouvelle_partie(self, **options) -> EtatPartie:
+        """Partie de départ correspondant à l'enregistrement."""
+        return moteur.nouvelle_partie(self.colonnes, self.lignes, graine=self.graine, **options)
+
+    def noter(self, tick: int, direction: tuple[int, int]) -> None:
+        """Direction passée à ``avancer`` au tick ``tick`` (``etat.frame_count`` avant l'appel)."""
+        self.ticks_virages.append(tick)
+        self.codes_virages.append(CODES_DIRECTIONS[direction])
+
+    def terminer(self, etat: EtatPartie) -> None:
+        self.ticks = etat.frame_count
+        self.score = etat.score
+
+    def en_octets(self) -> bytes:
+        sortie = bytearray(MAGIQUE)
+        sortie.append(VERSION)
+        for valeur in (self.colonnes, self.lignes, self.graine, self.ticks, self.score, len(self)):
+            _ecrire_varint(sortie, valeur)
+        precedent = 0
+        for tick, code in zip(self.ticks_virages, self.codes_virages):
+            _ecrire_varint(sortie, (tick - precedent) << 2 | code)
+            precedent = tick
+        return bytes(sortie)
+
+    @classmethod
+    def depuis_octets(cls, donnees: bytes) -> "Enregistrement":
+        if donnees[:4] != MAGIQUE:
+            raise ValueError("Ce n'est pas un enregistrement de partie.")
+        if len(donnees) < 5 or donnees[4] != VERSION:
+            raise ValueError(f"Version d'enregistrement non prise en charge : {donnees[4:5]!r}")
+        position = 5
+        valeurs = []
+        for _ in range(6):
+            valeur, position = _lire_varint(donnees, position)
+            valeurs.append(valeur)
+        colonnes, lignes, graine, ticks, score, nombre = valeurs
+        enregistrement = cls(graine, colonnes, lignes)
+        enregistrement.ticks = ticks
+        enregistrement.score = score
+        tick = 0
+        for _ in range(nombre):
+            valeur, position = _lire_varint(donnees, position)
+            tick += valeur >> 2
+            enregistrement.ticks_virages.append(tick)
+            enregistrement.codes_virages.append(valeur & 3)
+        return enregistrement
+
+    def sauvegarder(self, chemin: Path) -> Path:
+        chemin.parent.mkdir(parents=True, exist_ok=True)
+        chemin.write_bytes(self.en_octets())
+        return chemin
+
+    @classmethod
+    def charger(cls, chemin: Path) -> "Enregistrement":
+        return cls.depuis_octets(Path(chemin).read_bytes())
+
+
+def rejouer(enregistrement: Enregistrement, verifier: bool = True) -> EtatPartie:
+    """Rejoue ``enregistrement.ticks`` ticks sans affichage.
+
+    Avec ``verifier``, lève ``DivergenceRejeu`` si le score final ou la fin
+    de partie diffèrent de l'enregistrement.
+    """
+    etat = enregistrement.nouvelle_partie()
+    avancer = moteur.avancer
+    ticks = enregistrement.ticks
+    virages = iter(zip(enregistrement.ticks_virages, enregistrement.codes_virages))
+    prochain, code = next(virages, (ticks, 0))
+    for tick in range(ticks):
+        if tick == prochain:
+            evenements = avancer(etat, DIRECTIONS[code])
+            prochain, code = next(virages, (ticks, 0))
+        else:
+            evenements = avancer(etat)
+        if evenements & moteur.PARTIE_TERMINEE:
+            break
+    if verifier:
+        if etat.score != enregistrement.score or etat.frame_count != ticks:
+            raise DivergenceRejeu(
+                f"score {etat.score} après {etat.frame_count} ticks, "
+                f"attendu {enregistrement.score} après {ticks} ticks (graine {enregistrement.graine})"
+            )
+    return etat
+
+
+def enregistrer_partie(
+    graine: int,
+    politique: Callable[[EtatPartie], tuple[int, int] | None],
+    colonnes: int = COLONNES,
+    lignes: int = LIGNES,
+    max_ticks: int = MAX_TICKS_DEFAUT,
+) -> Enregistrement:
+    """Joue une partie pilotée par ``politique`` en l'enregistrant."""
+    enregistrement = Enregistrement(graine, colonnes, lignes)
+    etat = enregistrement.nouvelle_partie()
+    while etat.frame_count < max_ticks:
+        direction = politique(etat)
+        if direction is not None:
+            enregistrement.noter(etat.frame_count, direction)
+        if moteur.avancer(etat, direction) & moteur.PARTIE_TERMINEE:
+            break
+    enregistrement.terminer(etat)
+    return enregistrement
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Rejeu sans affichage des parties enregistrées.")
+    commandes = parser.add_subparsers(dest="commande", required=True)
+    rejeu = commandes.add_parser("rejouer", help="rejoue et vérifie le score final")
+    rejeu.add_argument("fichiers", type=Path, nargs="+")
+    rejeu.add_argument("--repetitions", type=int, default=1, help="rejoue chaque partie N fois (mesure)")
+    info = commandes.add_parser("info", help="affiche l'en-tête d'un enregistrement")
+    info.add_argument("fichiers", type=Path, nargs="+")
+    args = parser.parse_args(argv)
+
+    divergences = 0
+    total_ticks = 0
+    total_duree = 0.0
+    for fichier in args.fichiers:
+        enregistrement = Enregistrement.charger(fichier)
+        if args.commande == "info":
+            print(
+                f"{fichier.name}: graine {enregistrement.graine}, {enregistrement.colonnes}x{enregistrement.lignes}, "
+                f"{enregistrement.ticks} ticks, score {enregistrement.score}, {len(enregistrement)} virages, "
+                f"{fichier.stat().st_size} octets"
+            )
+            continue
+        try:
+            debut = time.perf_counter()
+            for _ in range(args.repetitions):
+                rejouer(enregistrement)
+            duree = time.perf_counter() - debut
+        except DivergenceRejeu as erreur:
+            divergences += 1
+            print(f"{fichier.name}: DIVERGENCE : {erreur}")
+            continue
+        ticks = enregistrement.ticks * args.repetitions
+        total_ticks += ticks
+        total_duree += duree
+        print(f"{fichier.name}: score {enregistrement.score} OK, {ticks / duree:,.0f} ticks/s")
+    if args.commande == "rejouer" and total_duree:
+        print(f"\n{len(args.fichiers) - divergences} partie(s) conforme(s), {total_ticks / total_duree:,.0f} ticks/s")
+    return 1 if divergences else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+"""Environnement vectorisé : N parties de Snake avancées en un seul appel NumPy.
+
+Reprend les règles de ``moteur.avancer`` (déplacement, nourriture, niveaux,
+bonus et effets temporaires) mais stocke toutes les parties dans des
+tableaux : grille d'occupation ``(N, lignes * colonnes)``, tampon circulaire
+du corps, positions de la nourriture et du bonus, minuteries. L'interface
+suit celle de Gym : ``reset`` puis ``step(actions)`` qui renvoie
+``(observations, recompenses, terminees, infos)``, les parties terminées
+étant relancées automatiquement.
+
+Chaque environnement a sa propre graine : les tirages aléatoires sont
+dérivés de (graine, épisode, compteur) par un hachage splitmix64, donc une
+partie donne le même résultat quelle que soit la taille du lot.
+"""
+
+import numpy as np
+
+from moteur import (
+    CHANCE_BONUS,
+    COLONNES,
+    DUREE_INVINCIBLE,
+    DUREE_MULTIPLICATEUR,
+    DUREE_VIE_BONUS,
+    FPS,
+    LIGNES,
+    TYPES_BONUS,
+    VITESSE_MAX,
+    VITESSE_MIN,
+)
+
+# Actions : même ordre que HAUT, BAS, GAUCHE, DROITE ; -1 conserve la direction
+ACTION_HAUT, ACTION_BAS, ACTION_GAUCHE, ACTION_DROITE = range(4)
+_DX = np.array([0, 0, -1, 1], dtype=np.int64)
+_DY = np.array([-1, 1, 0, 0], dtype=np.int64)
+_OPPOSEE = np.array([ACTION_BAS, ACTION_HAUT, ACTION_DROITE, ACTION_GAUCHE], dtype=np.int8)
+
+# Contenu des cellules dans les observations
+CASE_VIDE, CASE_CORPS, CASE_TETE, CASE_NOURRITURE, CASE_BONUS = range(5)
+
+BONUS_VITESSE, BONUS_POINTS, BONUS_INVINCIBLE = range(len(TYPES_BONUS))
+AUCUN = -1
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    x = x + _GOLDEN
+    x = (x ^ (x >> np.uint64(30))) * _MIX1
+    x = (x ^ (x >> np.uint64(27))) * _MIX2
+    return x ^ (x >> np.uint64(31))
+
+
+class EnvironnementLot:
+    """``nb_envs`` parties de Snake avancées en parallèle."""
+
+    def __init__(self, nb_envs: int, colonnes: int = COLONNES, lignes: int = LIGNES, graine: int = 0):
+        if nb_envs <= 0:
+            raise ValueError("Il faut au moins un environnement.")
+        self.nb_envs = nb_envs
+        self.colonnes = colonnes
+        self.lignes = lignes
+        self.nb_cellules = colonnes * lignes
+        n, k = nb_envs, self.nb_cellules
+
+        self.grille = np.zeros((n, k), dtype=np.uint8)
+        self.anneau = np.zeros((n, k), dtype=np.int32)
+        self.slot_tete = np.zeros(n, dtype=np.int64)
+        self.longueur = np.ones(n, dtype=np.int64)
+        self.direction = np.full(n, ACTION_DROITE, dtype=np.int8)
+        self.grandir = np.zeros(n, dtype=bool)
+        self.nourriture = np.zeros(n, dtype=np.int64)
+        self.bonus_cellule = np.full(n, AUCUN, dtype=np.int64)
+        self.bonus_type = np.full(n, AUCUN, dtype=np.int8)
+        self.bonus_vie = np.zeros(n, dtype=np.int32)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.niveau = np.ones(n, dtype=np.int32)
+        self.multiplicateur = np.ones(n, dtype=np.int32)
+        self.vitesse = np.full(n, FPS, dtype=np.int32)
+        self.temps_invincible = np.zeros(n, dtype=np.int32)
+        self.temps_multiplicateur = np.zeros(n, dtype=np.int32)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.bonus_collectes = np.zeros((n, len(TYPES_BONUS)), dtype=np.int32)
+
+        self.graines = np.zeros(n, dtype=np.uint64)
+        self.episodes = np.zeros(n, dtype=np.uint64)
+        self._etat_rng = np.zeros(n, dtype=np.uint64)
+        self._compteur_rng = np.zeros(n, dtype=np.uint64)
+        self._tous = np.arange(n)
+        self._cellules = np.arange(k)
+        self.reset(graine)
+
+    # -- Gym ----------------------------------------------------------------
+
+    def reset(self, graines=None) -> np.ndarray:
+        """Relance toutes les parties. ``graines`` est un entier (graine de
+        base, ``graine + i`` pour l'environnement ``i``) ou une graine par
+        environnement."""
+        if graines is None:
+            graines = 0
+        graines = np.asarray(graines, dtype=np.uint64)
+        if graines.ndim == 0:
+            graines = graines + np.arange(self.nb_envs, dtype=np.uint64)
+        if graines.shape != (self.nb_envs,):
+            raise ValueError(f"{self.nb_envs} graines attendues, {graines.shape} reçues.")
+        self.graines[:] = graines
+        self.episodes[:] = 0
+        self._reinitialiser(self._tous)
+        return self.observations()
+
+    def step(self, actions):
+        """Avance toutes les parties d'un tick.
+
+        ``actions`` contient une direction par environnement (``ACTION_*``,
+        ou -1 pour continuer tout droit). Retourne ``(observations,
+        recompenses, terminees, infos)`` ; ``infos`` donne le score, le niveau,
+        la longueur et la durée finaux des parties terminées, relancées
+        automatiquement.
+        """
+        actions = np.asarray(actions, dtype=np.int8)
+        if actions.shape != (self.nb_envs,):
+            raise ValueError(f"{self.nb_envs} actions attendues, {actions.shape} reçues.")
+        tous = self._tous
+        k = self.nb_cellules
+        score_avant = self.score.copy()
+
+        # Changement de direction (demi-tour interdit)
+        valide = (actions >= 0) & (actions != _OPPOSEE[self.direction])
+        self.direction = np.where(valide, actions, self.direction).astype(np.int8)
+        self.ticks += 1
+
+        # Effets temporaires
+        actif = self.temps_invincible > 0
+        self.temps_invincible[actif] -= 1
+        actif = self.temps_multiplicateur > 0
+        self.temps_multiplicateur[actif] -= 1
+        self.multiplicateur[actif & (self.temps_multiplicateur == 0)] = 1
+        invincible = self.temps_invincible > 0
+
+        # Déplacement refusé (bord ou corps, queue comprise) : fatal, sauf en
+        # mode invincible où le serpent reste sur place, comme moteur.avancer
+        tete = self.anneau[tous, self.slot_tete].astype(np.int64)
+        x = tete % self.colonnes + _DX[self.direction]
+        y = tete // self.colonnes + _DY[self.direction]
+        dehors = (x < 0) | (x >= self.colonnes) | (y < 0) | (y >= self.lignes)
+        cellule = np.where(dehors, tete, y * self.colonnes + x)
+        refuse = dehors | (self.grille[tous, cellule] != 0)
+        cellule = np.where(refuse, tete, cellule)
+        morts = refuse & ~invincible
+        vivants = ~morts
+        deplace = ~refuse
+
+        # Libérer la queue (sauf croissance), puis poser la nouvelle tête ;
+        # une croissance en attente attend le prochain déplacement
+        avance = np.flatnonzero(deplace & ~self.grandir)
+        slot_queue = (self.slot_tete[avance] - self.longueur[avance] + 1) % k
+        self.grille[avance, self.anneau[avance, slot_queue]] = 0
+        self.longueur[deplace & self.grandir] += 1
+        self.grandir[deplace] = False
+        bouge = np.flatnonzero(deplace)
+        self.slot_tete[bouge] = (self.slot_tete[bouge] + 1) % k
+        self.anneau[bouge, self.slot_tete[bouge]] = cellule[bouge]
+        self.grille[bouge, cellule[bouge]] = 1
+
+        # Nourriture
+        mange = vivants & (cellule == self.nourriture)
+        plein = np.zeros(self.nb_envs, dtype=bool)
+        idx = np.flatnonzero(mange)
+        if idx.size:
+            self.grandir[idx] = True
+            self.score[idx] += 10 * self.multiplicateur[idx]
+            monte = idx[self.score[idx] % 50 == 0]
+            self.niveau[monte] += 1
+            self.vitesse[monte] = np.minimum(FPS + self.niveau[monte] * 2, VITESSE_MAX)
+
+            nouvelles = self._tirer_cellules_libres(idx, self.bonus_cellule[idx])
+            self.nourriture[idx] = nouvelles
+            plein[idx[nouvelles < 0]] = True
+
+            # Chance de générer un bonus
+            tirage = self._aleas(idx)
+            candidats = idx[(self._uniformes(tirage) < CHANCE_BONUS)
+                            & (self.bonus_cellule[idx] == AUCUN) & (nouvelles >= 0)]
+            if candidats.size:
+                types = (self._aleas(candidats) % np.uint64(len(TYPES_BONUS))).astype(np.int8)
+                positions = self._tirer_cellules_libres(candidats, self.nourriture[candidats])
+                place = positions >= 0
+                candidats, types, positions = candidats[place], types[place], positions[place]
+                self.bonus_cellule[candidats] = positions
+                self.bonus_type[candidats] = types
+                self.bonus_vie[candidats] = DUREE_VIE_BONUS
+
+        # Bonus : vieillissement puis ramassage
+        idx = np.flatnonzero(vivants & (self.bonus_cellule != AUCUN))
+        if idx.size:
+            self.bonus_vie[idx] -= 1
+            expire = idx[self.bonus_vie[idx] <= 0]
+            self.bonus_cellule[expire] = AUCUN
+            self.bonus_type[expire] = AUCUN
+            ramasse = idx[(self.bonus_vie[idx] > 0) & (cellule[idx] == self.bonus_cellule[idx])]
+            if ramasse.size:
+                types = self.bonus_type[ramasse]
+                vite = ramasse[types == BONUS_VITESSE]
+                self.vitesse[vite] = np.maximum(VITESSE_MIN, self.vitesse[vite] - 3)
+                points = ramasse[types == BONUS_POINTS]
+                self.multiplicateur[points] = 3
+                self.temps_multiplicateur[points] = DUREE_MULTIPLICATEUR
+                self.temps_invincible[ramasse[types == BONUS_INVINCIBLE]] = DUREE_INVINCIBLE
+                self.score[ramasse] += 5 * self.multiplicateur[ramasse]
+                np.add.at(self.bonus_collectes, (ramasse, types), 1)
+                self.bonus_cellule[ramasse] = AUCUN
+                self.bonus_type[ramasse] = AUCUN
+
+        recompenses = (self.score - score_avant).astype(np.float32)
+        terminees = morts | plein
+        infos = {}
+        finies = np.flatnonzero(terminees)
+        if finies.size:
+            infos = {
+                "envs": finies,
+                "score": self.score[finies].copy(),
+                "niveau": self.niveau[finies].copy(),
+                "longueur": self.longueur[finies].copy(),
+                "ticks": self.ticks[finies].copy(),
+                "bonus_collectes": self.bonus_collectes[finies].copy(),
+                "plateau_plein": plein[finies],
+            }
+            self.episodes[finies] += np.uint64(1)
+            self._reinitialiser(finies)
+        return self.observations(), recompenses, terminees, infos
+
+    def observations(self) -> np.ndarray:
+        """Grilles ``(N, lignes, colonnes)`` codées avec les constantes ``CASE_*``."""
+        tous = self._tous
+        obs = self.grille.astype(np.int8)
+        obs[tous, self.anneau[tous, self.slot_tete]] = CASE_TETE
+        obs[tous, self.nourriture] = CASE_NOURRITURE
+        avec_bonus = np.flatnonzero(self.bonus_cellule != AUCUN)
+        obs[avec_bonus, self.bonus_cellule[avec_bonus]] = CASE_BONUS
+        return obs.reshape(self.nb_envs, self.lignes, self.colonnes)
+
+    # -- Interne ------------------------------------------------------------
+
+    def _reinitialiser(self, idx: np.ndarray) -> None:
+        centre = (self.lignes // 2) * self.colonnes + self.colonnes // 2
+        self.grille[idx] = 0
+        self.anneau[idx, 0] = centre
+        self.grille[idx, centre] = 1
+        self.slot_tete[idx] = 0
+        self.longueur[idx] = 1
+        self.direction[idx] = ACTION_DROITE
+        self.grandir[idx] = False
+        self.bonus_cellule[idx] = AUCUN
+        self.bonus_type[idx] = AUCUN
+        self.bonus_vie[idx] = 0
+        self.score[idx] = 0
+        self.niveau[idx] = 1
+        self.multiplicateur[idx] = 1
+        self.vitesse[idx] = FPS
+        self.temps_invincible[idx] = 0
+        self.temps_multiplicateur[idx] = 0
+        self.ticks[idx] = 0
+        self.bonus_collectes[idx] = 0
+        self._etat_rng[idx] = _splitmix64(self.graines[idx] ^ _splitmix64(self.episodes[idx]))
+        self._compteur_rng[idx] = 0
+        self.nourriture[idx] = self._tirer_cellules_libres(idx, np.full(len(idx), AUCUN))
+
+    def _aleas(self, idx: np.ndarray) -> np.ndarray:
+        """Un entier pseudo-aléatoire de 64 bits par environnement de ``idx``."""
+        self._compteur_rng[idx] += np.uint64(1)
+        return _splitmix64(self._etat_rng[idx] + self._compteur_rng[idx] * _GOLDEN)
+
+    @staticmethod
+    def _uniformes(aleas: np.ndarray) -> np.ndarray:
+        return (aleas >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+    def _tirer_cellules_libres(self, idx: np.ndarray, exclues: np.ndarray) -> np.ndarray:
+        """Tire uniformément une cellule libre (hors ``exclues``) par
+        environnement ; -1 si le plateau est plein."""
+        libres = self.grille[idx] == 0
+        avec_exclue = np.flatnonzero(exclues >= 0)
+        libres[avec_exclue, exclues[avec_exclue]] = False
+        nb_libres = libres.sum(axis=1)
+        rang = self._aleas(idx) % np.maximum(nb_libres, 1).astype(np.uint64)
+        cumul = np.cumsum(libres, axis=1)
+        choix = (cumul > rang.astype(np.int64)[:, None]).argmax(axis=1)
+        return np.where(nb_libres > 0, choix, AUCUN)
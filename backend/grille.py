@@ -0,0 +1,371 @@
+"""Structures de données du plateau, sans dépendance à pygame.
+
+Les cellules sont numérotées ``y * colonnes + x``. Le corps du serpent est
+stocké dans un tampon circulaire d'indices de cellules et une grille
+d'occupation (``bytearray`` de drapeaux) permet de tester une collision en
+O(1). La grille tient aussi l'index des cellules libres, mis à jour à chaque
+changement d'occupation, pour faire apparaître nourriture et bonus en un
+seul tirage. Plusieurs serpents peuvent partager la même grille (arène).
+"""
+
+from array import array
+from collections.abc import Iterator, Sequence
+from functools import lru_cache
+
+# Drapeaux d'occupation d'une cellule
+CORPS = 1
+NOURRITURE = 2
+BONUS = 4
+
+# Anneau d'un corps : taille de départ, doublée au besoin, et slots gardés
+# libres derrière la queue pour relire les dernières cellules quittées
+CAPACITE_INITIALE = 64
+RESERVE_ANNEAU = 16
+
+
+@lru_cache(maxsize=1)
+def _identite(nb_cellules: int) -> array:
+    """Identité 0..n-1 de la taille de plateau courante.
+
+    Une seule taille gardée : l'identité pèse autant que le plateau (8 Mo à
+    1000x1000), et un processus ne joue en général que sur une taille.
+    """
+    return array("l", range(nb_cellules))
+
+
+class CellulesLibres:
+    """Ensemble de cellules : tableau compact (retrait par échange avec le
+    dernier élément) et index inverse cellule -> rang. Ajout, retrait et
+    tirage uniforme en O(1)."""
+
+    __slots__ = ("_cellules", "_rangs", "taille")
+
+    def __init__(self, nb_cellules: int):
+        # Copie (memcpy) d'une identité 0..n-1 mise en cache par taille
+        identite = _identite(nb_cellules)
+        self._cellules = identite[:]
+        self._rangs = identite[:]
+        self.taille = nb_cellules
+
+    def __len__(self) -> int:
+        return self.taille
+
+    def __contains__(self, cellule: int) -> bool:
+        return self._rangs[cellule] >= 0
+
+    def retirer(self, cellule: int) -> None:
+        rangs = self._rangs
+        rang = rangs[cellule]
+        self.taille -= 1
+        derniere = self._cellules[self.taille]
+        self._cellules[rang] = derniere
+        rangs[derniere] = rang
+        rangs[cellule] = -1
+
+    def ajouter(self, cellule: int) -> None:
+        self._cellules[self.taille] = cellule
+        self._rangs[cellule] = self.taille
+        self.taille += 1
+
+    def tirer(self, rng) -> int | None:
+        """Cellule libre tirée uniformément, ou ``None`` si aucune."""
+        if not self.taille:
+            return None
+        return self._cellules[rng.randrange(self.taille)]
+
+    def ordre(self) -> array:
+        """Copie des cellules, dans l'ordre du tableau dont dépend ``tirer``."""
+        return self._cellules[:self.taille]
+
+    def restaurer(self, ordre: Sequence[int]) -> None:
+        """Remplace l'ensemble par ``ordre``, rangs compris : une partie
+        reprise tire alors les mêmes cellules que l'originale."""
+        taille = len(ordre)
+        self._cellules[:taille] = array("l", ordre)
+        rangs = self._rangs = array("l", [-1]) * len(self._rangs)
+        for rang, cellule in enumerate(ordre):
+            rangs[cellule] = rang
+        self.taille = taille
+
+
+class Grille:
+    """Grille d'occupation ``colonnes x lignes`` (un octet de drapeaux par
+    cellule) et index des cellules libres.
+
+    ``slots`` donne, pour chaque cellule occupée par un corps, son slot dans
+    l'anneau de ce corps ; une cellule n'a qu'un occupant, le tableau est
+    donc partagé par tous les serpents de la grille.
+    """
+
+    def __init__(self, colonnes: int, lignes: int):
+        if colonnes <= 0 or lignes <= 0:
+            raise ValueError("La grille doit contenir au moins une cellule.")
+        self.colonnes = colonnes
+        self.lignes = lignes
+        self.nb_cellules = colonnes * lignes
+        self.occupation = bytearray(self.nb_cellules)
+        self.libres = CellulesLibres(self.nb_cellules)
+        self.slots = array("l", bytes(self.nb_cellules * array("l").itemsize))
+
+    def cellule(self, x: int, y: int) -> int:
+        return y * self.colonnes + x
+
+    def coordonnees(self, cellule: int) -> tuple[int, int]:
+        y, x = divmod(cellule, self.colonnes)
+        return (x, y)
+
+    def dans_les_bords(self, x: int, y: int) -> bool:
+        return 0 <= x < self.colonnes and 0 <= y < self.lignes
+
+    def est_occupee(self, x: int, y: int, drapeaux: int = CORPS) -> bool:
+        return self.dans_les_bords(x, y) and self.occupation[y * self.colonnes + x] & drapeaux != 0
+
+    def marquer(self, cellule: int, drapeau: int) -> None:
+        ancien = self.occupation[cellule]
+        self.occupation[cellule] = ancien | drapeau
+        if not ancien:
+            self.libres.retirer(cellule)
+
+    def effacer(self, cellule: int, drapeau: int) -> None:
+        ancien = self.occupation[cellule]
+        nouveau = ancien & ~drapeau
+        self.occupation[cellule] = nouveau
+        if ancien and not nouveau:
+            self.libres.ajouter(cellule)
+
+    def tirer_cellule_libre(self, rng) -> int | None:
+        return self.libres.tirer(rng)
+
+
+class VuePositions(Sequence):
+    """Vue en lecture seule des positions ``(x, y)`` du corps, tête en premier."""
+
+    __slots__ = ("_corps",)
+
+    def __init__(self, corps: "CorpsSerpent"):
+        self._corps = corps
+
+    def __len__(self) -> int:
+        return self._corps.longueur
+
+    def __getitem__(self, index):
+        corps = self._corps
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(corps.longueur))]
+        if index < 0:
+            index += corps.longueur
+        if not 0 <= index < corps.longueur:
+            raise IndexError("index de segment hors limites")
+        return corps.grille.coordonnees(corps.cellule_segment(index))
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        corps = self._corps
+        anneau = corps._anneau
+        capacite = corps.capacite
+        colonnes = corps.grille.colonnes
+        slot = corps._slot_tete
+        for _ in range(corps.longueur):
+            y, x = divmod(anneau[slot], colonnes)
+            yield (x, y)
+            slot = slot - 1 if slot else capacite - 1
+
+    def __contains__(self, position) -> bool:
+        try:
+            x, y = position
+        except (TypeError, ValueError):
+            return False
+        return self._corps.grille.est_occupee(x, y)
+
+    def __eq__(self, autre) -> bool:
+        if isinstance(autre, (list, tuple, VuePositions)):
+            return len(self) == len(autre) and all(a == b for a, b in zip(self, autre))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"VuePositions({list(self)!r})"
+
+
+class CorpsSerpent:
+    """Corps du serpent : tampon circulaire d'indices + grille d'occupation.
+
+    Déplacement, croissance, collision et traversée des bords coûtent O(1),
+    quelle que soit la longueur du serpent. L'anneau part de
+    ``CAPACITE_INITIALE`` slots et double quand il se remplit (O(1) amorti),
+    si bien qu'un serpent court ne coûte pas la taille du plateau. Le rang
+    d'un segment se retrouve à partir de sa cellule (``slots`` de la grille,
+    voir ``rang``). Pour un serpent de quelques segments, une liste de tuples
+    reste plus rapide (environ 5 fois pour 10 segments) : l'anneau ne
+    l'emporte qu'à partir de quelques dizaines de segments, et c'est la
+    grille qui rend la collision et le tirage des cellules libres en O(1).
+
+    ``grille`` : grille partagée avec d'autres serpents (sinon une grille
+    propre de ``colonnes x lignes``) ; la case de départ doit y être libre
+    de tout corps.
+    """
+
+    def __init__(self, colonnes: int, lignes: int, depart: tuple[int, int], grille: Grille | None = None):
+        if grille is None:
+            grille = Grille(colonnes, lignes)
+        elif (grille.colonnes, grille.lignes) != (colonnes, lignes):
+            raise ValueError("La grille partagée n'a pas les dimensions demandées.")
+        self.grille = grille
+        self.slots = grille.slots
+        self.capacite = min(CAPACITE_INITIALE, grille.nb_cellules + RESERVE_ANNEAU)
+        self._anneau = array("l", bytes(self.capacite * array("l").itemsize))
+        self._slot_tete = 0
+        self.longueur = 1
+        cellule = grille.cellule(*depart)
+        if grille.occupation[cellule] & CORPS:
+            raise ValueError(f"Case de départ déjà occupée : {depart}")
+        self._anneau[0] = cellule
+        self.slots[cellule] = 0
+        grille.marquer(cellule, CORPS)
+        self.positions = VuePositions(self)
+
+    @property
+    def tete(self) -> tuple[int, int]:
+        return self.grille.coordonnees(self._anneau[self._slot_tete])
+
+    @property
+    def queue(self) -> tuple[int, int]:
+        return self.grille.coordonnees(self.cellule_segment(self.longueur - 1))
+
+    def cellule_segment(self, index: int) -> int:
+        """Cellule du segment ``index`` (0 = tête)."""
+        return self._anneau[(self._slot_tete - index) % self.capacite]
+
+    @property
+    def anneau(self) -> array:
+        """Tampon circulaire (lecture seule) : cellule de chaque slot."""
+        return self._anneau
+
+    def rang(self, cellule: int) -> int:
+        """Rang (0 = tête) du segment qui occupe ``cellule``."""
+        return (self._slot_tete - self.slots[cellule]) % self.capacite
+
+    @property
+    def reperes(self) -> tuple[int, int, int]:
+        """Slot de la tête, longueur et capacité, à passer plus tard à ``changements_depuis``."""
+        return (self._slot_tete, self.longueur, self.capacite)
+
+    def changements_depuis(self, reperes: tuple[int, int, int]) -> tuple[list[int], list[int]] | None:
+        """Cellules entrées dans le corps et sorties du corps depuis ``reperes``.
+
+        ``reperes`` doit dater de moins de ``capacite`` déplacements (une
+        frame d'affichage en compte quelques-uns). Les cellules sorties sont
+        relues dans l'anneau, derrière la queue : ``None`` si la tête les a
+        déjà recouvertes ou si l'anneau a été agrandi depuis, il faut alors
+        tout relire.
+        """
+        ancien_slot, ancienne_longueur, ancienne_capacite = reperes
+        capacite = self.capacite
+        if capacite != ancienne_capacite:
+            return None
+        avance = (self._slot_tete - ancien_slot) % capacite
+        nb_sorties = avance - (self.longueur - ancienne_longueur)
+        if nb_sorties < 0 or ancienne_longueur + avance > capacite:
+            return None
+        anneau = self._anneau
+        entrees = [anneau[(ancien_slot + i) % capacite] for i in range(1, avance + 1)]
+        ancienne_queue = ancien_slot - ancienne_longueur + 1
+        sorties = [anneau[(ancienne_queue + i) % capacite] for i in range(nb_sorties)]
+        return entrees, sorties
+
+    def appliquer_changements(self, entrees: Sequence[int], nb_sorties: int) -> None:
+        """Retire ``nb_sorties`` cellules côté queue, puis ajoute ``entrees`` côté
+        tête, dans l'ordre : le corps passe d'un coup d'un instantané au suivant.
+
+        Les cellules ne sont pas vérifiées (voisinage, collision) : elles
+        viennent d'un corps valide, voir ``instantane``.
+        """
+        grille = self.grille
+        capacite = self.capacite
+        for _ in range(nb_sorties):
+            grille.effacer(self._anneau[(self._slot_tete - self.longueur + 1) % capacite], CORPS)
+            self.longueur -= 1
+        # Anneau agrandi d'avance, tant que le corps restant est court à recopier
+        while (
+            self.longueur + len(entrees) + RESERVE_ANNEAU > self.capacite
+            and self.capacite < grille.nb_cellules + RESERVE_ANNEAU
+        ):
+            self._agrandir()
+        anneau = self._anneau
+        capacite = self.capacite
+        slots = self.slots
+        marquer = grille.marquer
+        slot = self._slot_tete
+        for cellule in entrees:
+            slot += 1
+            if slot == capacite:
+                slot = 0
+            anneau[slot] = cellule
+            slots[cellule] = slot
+            marquer(cellule, CORPS)
+        self._slot_tete = slot
+        self.longueur += len(entrees)
+
+    def cellules(self) -> array:
+        """Copie des cellules du corps, de la tête à la queue (deux tranches de l'anneau)."""
+        debut = self._slot_tete - self.longueur + 1
+        if debut >= 0:
+            morceau = self._anneau[debut:self._slot_tete + 1]
+        else:
+            morceau = self._anneau[debut % self.capacite:] + self._anneau[:self._slot_tete + 1]
+        morceau.reverse()
+        return morceau
+
+    def bouger(self, direction: tuple[int, int], grandir: bool = False, traverser_bords: bool = False) -> bool:
+        """Avance d'une case dans ``direction``.
+
+        Retourne ``False`` sans rien modifier si la nouvelle tête sort du
+        plateau (sauf si ``traverser_bords``) ou touche le corps, queue comprise.
+        """
+        grille = self.grille
+        colonnes = grille.colonnes
+        y, x = divmod(self._anneau[self._slot_tete], colonnes)
+        x += direction[0]
+        y += direction[1]
+        if not (0 <= x < colonnes and 0 <= y < grille.lignes):
+            if not traverser_bords:
+                return False
+            x %= colonnes
+            y %= grille.lignes
+
+        cellule = y * colonnes + x
+        if grille.occupation[cellule] & CORPS:
+            return False
+
+        capacite = self.capacite
+        if grandir:
+            if self.longueur + 1 + RESERVE_ANNEAU > capacite:
+                self._agrandir()
+                capacite = self.capacite
+            self.longueur += 1
+        else:
+            grille.effacer(self._anneau[(self._slot_tete - self.longueur + 1) % capacite], CORPS)
+
+        slot = self._slot_tete = (self._slot_tete + 1) % capacite
+        self._anneau[slot] = cellule
+        self.slots[cellule] = slot
+        grille.marquer(cellule, CORPS)
+        return True
+
+    def _agrandir(self) -> None:
+        # Anneau doublé, déroulé de la queue (slot 0) à la tête
+        cellules = self.cellules()
+        cellules.reverse()
+        capacite = min(2 * self.capacite, self.grille.nb_cellules + RESERVE_ANNEAU)
+        anneau = array("l", bytes(capacite * array("l").itemsize))
+        anneau[: len(cellules)] = cellules
+        slots = self.slots
+        for slot, cellule in enumerate(cellules):
+            slots[cellule] = slot
+        self._anneau = anneau
+        self.capacite = capacite
+        self._slot_tete = len(cellules) - 1
+
+    def liberer(self) -> None:
+        """Retire le corps de la grille (serpent mort) ; l'anneau reste lisible."""
+        grille = self.grille
+        for cellule in self.cellules():
+            grille.effacer(cellule, CORPS)
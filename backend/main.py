@@ -1,5 +1,281 @@
+"""Service de classement local : HTTP/JSON sur asyncio, bibliothèque standard seule.
+
+Routes ::
+
+    POST /scores               {"score", "skin", "niveau", "duree"} -> 201 {"rang", "total"}
+    GET  /scores/top?n=10      {"parties": [...], "total"}
+    GET  /scores/rang?score=N  {"rang", "total"}
+    GET  /sante                {"ok", "total", "en_attente"}
+
+Tous les scores sont dans un ``IndexRangs`` (rang en O(log m)) et les
+meilleures parties dans une liste triée bornée. Les soumissions sont
+insérées dans SQLite par lots (``StockageSQLite``), validés au plus tard
+toutes les ``DELAI_LOT`` secondes. Toute écriture SQLite passe par un
+thread dédié : une validation qui attend le verrou de la base (jusqu'à
+``stockage.ATTENTE_VERROU``) ne bloque ni la boucle ni les autres connexions.
+Connexions persistantes (keep-alive).
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import signal
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from classement import IndexRangs
+from stockage import StockageSQLite
+
+HOTE = "127.0.0.1"
+PORT = 8765
+FICHIER_BASE = Path(__file__).resolve().parent / "data" / "classement.db"
+TAILLE_TOP = 256
+TAILLE_LOT = 512
+DELAI_LOT = 0.2
+# Borne la taille de l'index (indexé par valeur) face à un client farfelu
+SCORE_MAX = 10_000_000
+TAILLE_CORPS_MAX = 4096
+TAILLE_ENTETES_MAX = 8192
+
+
+class ErreurRequete(Exception):
+    def __init__(self, statut: int, message: str):
+        super().__init__(message)
+        self.statut = statut
+
+
+class ServiceClassement:
+    """Classement en mémoire adossé à une base SQLite."""
+
+    def __init__(self, stockage: StockageSQLite, taille_top: int = TAILLE_TOP):
+        self.stockage = stockage
+        self.taille_top = taille_top
+        self.index = IndexRangs()
+        for score in stockage.tous_les_scores():
+            self.index.ajouter(score)
+        # Clés (-score, numéro) : à score égal, la partie la plus ancienne d'abord
+        self._numero = 0
+        self._cles: list[tuple[int, int]] = []
+        self._meilleures: list[dict] = []
+        for partie in stockage.meilleures_parties(taille_top):
+            self._inserer_top(partie)
+        # Un seul thread : la connexion n'est jamais utilisée par deux écritures à la fois
+        self._ecritures = ThreadPoolExecutor(max_workers=1, thread_name_prefix="classement-sqlite")
+        self.erreurs_stockage = 0
+
+    def _inserer_top(self, partie: dict) -> None:
+        self._numero += 1
+        cle = (-partie["score"], self._numero)
+        if len(self._cles) >= self.taille_top and cle > self._cles[-1]:
+            return
+        position = bisect.bisect(self._cles, cle)
+        self._cles.insert(position, cle)
+        self._meilleures.insert(position, partie)
+        if len(self._cles) > self.taille_top:
+            self._cles.pop()
+            self._meilleures.pop()
+
+    def soumettre(self, donnees) -> dict:
+        partie = self._partie(donnees)
+        self._ecrire(partie)
+        return self._indexer(partie)
+
+    def _partie(self, donnees) -> dict:
+        """Partie soumise, validée et datée."""
+        if not isinstance(donnees, dict):
+            raise ErreurRequete(400, "objet JSON attendu")
+        score = donnees.get("score")
+        if not isinstance(score, int) or isinstance(score, bool) or not 0 <= score <= SCORE_MAX:
+            raise ErreurRequete(400, f"score entier entre 0 et {SCORE_MAX} attendu")
+        skin = donnees.get("skin")
+        niveau = donnees.get("niveau")
+        duree = donnees.get("duree")
+        if skin is not None and not isinstance(skin, str):
+            raise ErreurRequete(400, "skin : chaîne attendue")
+        if niveau is not None and (not isinstance(niveau, int) or isinstance(niveau, bool)):
+            raise ErreurRequete(400, "niveau : entier attendu")
+        if duree is not None and (not isinstance(duree, (int, float)) or isinstance(duree, bool)):
+            raise ErreurRequete(400, "duree : nombre attendu")
+
+        return {"score": score, "skin": skin, "niveau": niveau, "duree": duree, "date": time.time()}
+
+    def _ecrire(self, partie: dict) -> None:
+        """Écrit la partie, avant tout changement de l'index : en cas d'échec,
+        elle n'est classée nulle part et le client pourra la renvoyer."""
+        try:
+            self.stockage.ajouter_partie(
+                partie["score"], partie["skin"], partie["niveau"], partie["duree"], partie["date"]
+            )
+        except sqlite3.Error as erreur:
+            self.erreurs_stockage += 1
+            raise ErreurRequete(503, f"stockage indisponible : {erreur}") from None
+
+    def _indexer(self, partie: dict) -> dict:
+        self.index.ajouter(partie["score"])
+        self._inserer_top(partie)
+        return {"rang": self.index.rang(partie["score"]), "total": len(self.index)}
+
+    def top(self, nombre: int) -> dict:
+        return {"parties": self._meilleures[:max(0, nombre)], "total": len(self.index)}
+
+    def rang(self, score: int) -> dict:
+        return {"rang": self.index.rang(score), "total": len(self.index)}
+
+    def repondre(self, methode: str, cible: str, corps: bytes) -> tuple[int, dict]:
+        """Traite une requête déjà découpée ; renvoie (statut, réponse JSON)."""
+        url = urlsplit(cible)
+        parametres = parse_qs(url.query)
+        try:
+            if url.path == "/scores":
+                if methode != "POST":
+                    raise ErreurRequete(405, "POST attendu")
+                return 201, self.soumettre(_json(corps))
+            if methode != "GET":
+                raise ErreurRequete(405, "GET attendu")
+            if url.path == "/scores/top":
+                return 200, self.top(_entier(parametres, "n", 10))
+            if url.path == "/scores/rang":
+                return 200, self.rang(_entier(parametres, "score"))
+            if url.path == "/sante":
+                return 200, {
+                    "ok": True,
+                    "total": len(self.index),
+                    "en_attente": self.stockage.en_attente,
+                    "erreurs_stockage": self.erreurs_stockage,
+                }
+            raise ErreurRequete(404, f"route inconnue : {url.path}")
+        except ErreurRequete as erreur:
+            return erreur.statut, {"erreur": str(erreur)}
+
+    async def repondre_sans_bloquer(self, methode: str, cible: str, corps: bytes) -> tuple[int, dict]:
+        """Comme ``repondre``, mais l'écriture d'un ``POST /scores`` se fait dans
+        le thread SQLite ; l'index n'est mis à jour qu'ensuite, dans la boucle."""
+        if methode != "POST" or urlsplit(cible).path != "/scores":
+            return self.repondre(methode, cible, corps)
+        try:
+            partie = self._partie(_json(corps))
+            await asyncio.get_running_loop().run_in_executor(self._ecritures, self._ecrire, partie)
+        except ErreurRequete as erreur:
+            return erreur.statut, {"erreur": str(erreur)}
+        return 201, self._indexer(partie)
+
+    async def traiter_connexion(self, lecteur: asyncio.StreamReader, ecrivain: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    entete = await lecteur.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                try:
+                    ligne, *champs = entete[:-4].decode("latin-1").split("\r\n")
+                    methode, cible, version = ligne.split(" ", 2)
+                    en_tetes = {}
+                    for champ in champs:
+                        nom, _, valeur = champ.partition(":")
+                        en_tetes[nom.strip().lower()] = valeur.strip()
+                    longueur = int(en_tetes.get("content-length", 0))
+                except ValueError:
+                    ecrivain.write(_reponse(400, {"erreur": "requête mal formée"}, garder=False))
+                    return
+                if longueur > TAILLE_CORPS_MAX:
+                    ecrivain.write(_reponse(413, {"erreur": "corps trop long"}, garder=False))
+                    return
+                corps = await lecteur.readexactly(longueur) if longueur > 0 else b""
+                statut, reponse = await self.repondre_sans_bloquer(methode, cible, corps)
+                garder = version == "HTTP/1.1" and en_tetes.get("connection", "").lower() != "close"
+                ecrivain.write(_reponse(statut, reponse, garder))
+                await ecrivain.drain()
+                if not garder:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+        finally:
+            ecrivain.close()
+
+    async def valider_periodiquement(self, delai: float = DELAI_LOT) -> None:
+        boucle = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(delai)
+            try:
+                await boucle.run_in_executor(self._ecritures, self.stockage.valider)
+            except sqlite3.Error as erreur:
+                # Le lot reste en attente : nouvel essai au prochain délai
+                self.erreurs_stockage += 1
+                print(f"Validation du lot impossible : {erreur}", file=sys.stderr)
+
+    def fermer(self) -> None:
+        """Attend les écritures en cours, puis valide le dernier lot et ferme la base."""
+        self._ecritures.shutdown()
+        self.stockage.fermer()
+
+
+def _json(corps: bytes):
+    try:
+        return json.loads(corps)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        raise ErreurRequete(400, "JSON invalide") from None
+
+
+def _entier(parametres: dict[str, list[str]], nom: str, defaut: int | None = None) -> int:
+    valeurs = parametres.get(nom)
+    if not valeurs:
+        if defaut is None:
+            raise ErreurRequete(400, f"paramètre {nom} manquant")
+        return defaut
+    try:
+        return int(valeurs[0])
+    except ValueError:
+        raise ErreurRequete(400, f"paramètre {nom} : entier attendu") from None
+
+
+def _reponse(statut: int, donnees: dict, garder: bool) -> bytes:
+    corps = json.dumps(donnees, ensure_ascii=False).encode("utf-8")
+    entetes = (
+        f"HTTP/1.1 {statut} {HTTPStatus(statut).phrase}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(corps)}\r\n"
+        f"Connection: {'keep-alive' if garder else 'close'}\r\n\r\n"
+    )
+    return entetes.encode("latin-1") + corps
+
+
+async def servir(hote: str, port: int, base: Path) -> None:
+    """Sert jusqu'à SIGINT/SIGTERM, puis valide le dernier lot."""
+    stockage = StockageSQLite(base, taille_lot=TAILLE_LOT, delai_lot=DELAI_LOT)
+    service = ServiceClassement(stockage)
+    serveur = await asyncio.start_server(service.traiter_connexion, hote, port, limit=TAILLE_ENTETES_MAX)
+    adresse = serveur.sockets[0].getsockname()
+    print(f"Service de classement sur http://{adresse[0]}:{adresse[1]} ({len(service.index)} scores)", flush=True)
+
+    arret = asyncio.Event()
+    boucle = asyncio.get_running_loop()
+    for signal_arret in (signal.SIGINT, signal.SIGTERM):
+        try:
+            boucle.add_signal_handler(signal_arret, arret.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+    validation = asyncio.create_task(service.valider_periodiquement())
+    try:
+        async with serveur:
+            await arret.wait()
+    finally:
+        validation.cancel()
+        service.fermer()
+
+
 def main():
-    print("Hello from sand!")
+    parser = argparse.ArgumentParser(description="Service de classement du Snake")
+    parser.add_argument("--hote", default=HOTE)
+    parser.add_argument("--port", type=int, default=PORT, help="0 : port libre choisi par le système")
+    parser.add_argument("--base", type=Path, default=FICHIER_BASE, help="base SQLite des scores soumis")
+    arguments = parser.parse_args()
+    asyncio.run(servir(arguments.hote, arguments.port, arguments.base))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,258 @@
+"""Moteur de jeu sans pygame : règles du Snake, utilisables hors fenêtre.
+
+``EtatPartie`` regroupe tout l'état d'une partie (serpent, nourriture,
+bonus, minuteries, score, niveau) et ``avancer`` applique un tick de jeu.
+``Jeu`` (``snake.py``) n'est plus qu'un moteur de rendu au-dessus de ce
+module, qui peut aussi tourner seul pour les simulations, les tests ou un
+serveur.
+"""
+
+import random
+from dataclasses import dataclass, field
+
+from grille import BONUS, NOURRITURE, CorpsSerpent, Grille, VuePositions
+
+# Plateau par défaut (640x480 px en cellules de 20 px)
+COLONNES = 32
+LIGNES = 24
+FPS = 10
+VITESSE_MAX = 30
+VITESSE_MIN = 5
+
+# Directions
+HAUT = (0, -1)
+BAS = (0, 1)
+GAUCHE = (-1, 0)
+DROITE = (1, 0)
+
+# Bonus
+TYPES_BONUS = ('vitesse', 'points', 'invincible')
+DUREE_VIE_BONUS = 150
+CHANCE_BONUS = 0.2
+DUREE_MULTIPLICATEUR = 100
+DUREE_INVINCIBLE = 150
+
+# Événements renvoyés par ``avancer`` (combinables par OU binaire)
+AUCUN_EVENEMENT = 0
+NOURRITURE_MANGEE = 1
+BONUS_RAMASSE = 2
+PARTIE_TERMINEE = 4
+PLATEAU_REMPLI = 8
+
+
+class Serpent:
+    """Logique du serpent : corps, direction et croissance."""
+
+    def __init__(
+        self,
+        colonnes: int = COLONNES,
+        lignes: int = LIGNES,
+        depart: tuple[int, int] | None = None,
+        grille: Grille | None = None,
+    ):
+        if depart is None:
+            depart = (colonnes // 2, lignes // 2)
+        self.corps = CorpsSerpent(colonnes, lignes, depart, grille)
+        self.direction = DROITE
+        self.grandir = False
+
+    @property
+    def positions(self) -> VuePositions:
+        """Positions du corps (tête en premier), en lecture seule."""
+        return self.corps.positions
+
+    def bouger(self, traverser_bords: bool = False) -> bool:
+        if not self.corps.bouger(self.direction, self.grandir, traverser_bords):
+            return False
+        self.grandir = False
+        return True
+
+    def changer_direction(self, nouvelle_direction):
+        # Empêcher de faire demi-tour
+        if (self.direction[0] * -1, self.direction[1] * -1) != nouvelle_direction:
+            self.direction = nouvelle_direction
+
+    def manger(self):
+        self.grandir = True
+
+
+class Nourriture:
+    def __init__(self):
+        self.position: tuple[int, int] | None = None
+
+    def generer(self, grille: Grille, rng=random) -> bool:
+        """Place la nourriture sur une cellule libre tirée en O(1).
+        Retourne ``False`` (et ``position`` à ``None``) si le plateau est plein."""
+        if self.position is not None:
+            grille.effacer(grille.cellule(*self.position), NOURRITURE)
+        cellule = grille.tirer_cellule_libre(rng)
+        if cellule is None:
+            self.position = None
+            return False
+        grille.marquer(cellule, NOURRITURE)
+        self.position = grille.coordonnees(cellule)
+        return True
+
+
+class Bonus:
+    def __init__(self, type_bonus: str):
+        if type_bonus not in TYPES_BONUS:
+            raise ValueError(f"Type de bonus inconnu : {type_bonus!r}")
+        self.type = type_bonus  # 'vitesse', 'points', 'invincible'
+        self.position: tuple[int, int] | None = None
+        self.duree_vie = DUREE_VIE_BONUS  # Disparaît après 150 ticks
+
+    def generer(self, grille: Grille, rng=random) -> bool:
+        """Place le bonus sur une cellule libre ; ``False`` si aucune."""
+        cellule = grille.tirer_cellule_libre(rng)
+        if cellule is None:
+            return False
+        grille.marquer(cellule, BONUS)
+        self.position = grille.coordonnees(cellule)
+        return True
+
+    def retirer(self, grille: Grille) -> None:
+        if self.position is not None:
+            grille.effacer(grille.cellule(*self.position), BONUS)
+            self.position = None
+
+    def mise_a_jour(self) -> bool:
+        self.duree_vie -= 1
+        return self.duree_vie > 0
+
+
+@dataclass
+class EtatPartie:
+    """État complet d'une partie, sans aucune dépendance graphique."""
+
+    serpent: Serpent
+    nourriture: Nourriture
+    rng: random.Random
+    colonnes: int = COLONNES
+    lignes: int = LIGNES
+    classe_bonus: type[Bonus] = Bonus
+    bonus: Bonus | None = None
+    score: int = 0
+    niveau: int = 1
+    multiplicateur_score: int = 1
+    vitesse_actuelle: int = FPS
+    invincible: bool = False
+    temps_invincible: int = 0
+    temps_multiplicateur: int = 0
+    frame_count: int = 0
+    terminee: bool = False
+    plateau_rempli: bool = False
+    bonus_collectes: dict[str, int] = field(default_factory=lambda: dict.fromkeys(TYPES_BONUS, 0))
+
+    @property
+    def grille(self) -> Grille:
+        return self.serpent.corps.grille
+
+
+def nouvelle_partie(
+    colonnes: int = COLONNES,
+    lignes: int = LIGNES,
+    graine: int | None = None,
+    serpent: Serpent | None = None,
+    nourriture: Nourriture | None = None,
+    classe_bonus: type[Bonus] = Bonus,
+) -> EtatPartie:
+    """Crée une partie ; ``serpent``/``nourriture`` permettent d'injecter des
+    sous-classes graphiques, ``graine`` rend la partie reproductible."""
+    etat = EtatPartie(
+        serpent=serpent or Serpent(colonnes, lignes),
+        nourriture=nourriture or Nourriture(),
+        rng=random.Random(graine),
+        colonnes=colonnes,
+        lignes=lignes,
+        classe_bonus=classe_bonus,
+    )
+    etat.nourriture.generer(etat.grille, etat.rng)
+    return etat
+
+
+def avancer(etat: EtatPartie, action: tuple[int, int] | None = None) -> int:
+    """Joue un tick. ``action`` est une direction optionnelle appliquée avant
+    le déplacement. Retourne les événements survenus (masque de bits)."""
+    if etat.terminee:
+        return PARTIE_TERMINEE
+
+    serpent = etat.serpent
+    if action is not None:
+        serpent.changer_direction(action)
+
+    etat.frame_count += 1
+    evenements = AUCUN_EVENEMENT
+
+    # Gérer les effets temporaires
+    if etat.temps_invincible > 0:
+        etat.temps_invincible -= 1
+        if etat.temps_invincible == 0:
+            etat.invincible = False
+
+    if etat.temps_multiplicateur > 0:
+        etat.temps_multiplicateur -= 1
+        if etat.temps_multiplicateur == 0:
+            etat.multiplicateur_score = 1
+
+    # Mouvement du serpent : en mode invincible, un bord ou le corps
+    # l'arrête sur place au lieu de terminer la partie.
+    if not serpent.bouger() and not etat.invincible:
+        etat.terminee = True
+        return PARTIE_TERMINEE
+
+    tete = serpent.corps.tete
+
+    # Vérifier si le serpent mange la nourriture
+    if tete == etat.nourriture.position:
+        evenements |= NOURRITURE_MANGEE
+        serpent.manger()
+        etat.score += 10 * etat.multiplicateur_score
+
+        # Augmenter le niveau tous les 50 points
+        if etat.score % 50 == 0:
+            etat.niveau += 1
+            etat.vitesse_actuelle = min(FPS + etat.niveau * 2, VITESSE_MAX)
+
+        # Nouvelle nourriture : un plateau plein met fin à la partie
+        if not etat.nourriture.generer(etat.grille, etat.rng):
+            etat.terminee = True
+            etat.plateau_rempli = True
+            return evenements | PARTIE_TERMINEE | PLATEAU_REMPLI
+
+        # Chance de générer un bonus (20%)
+        if etat.rng.random() < CHANCE_BONUS and not etat.bonus:
+            type_bonus = etat.rng.choice(TYPES_BONUS)
+            bonus = etat.classe_bonus(type_bonus)
+            if bonus.generer(etat.grille, etat.rng):
+                etat.bonus = bonus
+
+    # Gérer les bonus
+    bonus = etat.bonus
+    if bonus:
+        if not bonus.mise_a_jour():
+            bonus.retirer(etat.grille)
+            etat.bonus = None
+        elif tete == bonus.position:
+            evenements |= BONUS_RAMASSE
+            # Appliquer l'effet du bonus
+            if bonus.type == 'vitesse':
+                etat.vitesse_actuelle = max(VITESSE_MIN, etat.vitesse_actuelle - 3)
+            elif bonus.type == 'points':
+                etat.multiplicateur_score = 3
+                etat.temps_multiplicateur = DUREE_MULTIPLICATEUR
+            elif bonus.type == 'invincible':
+                etat.invincible = True
+                etat.temps_invincible = DUREE_INVINCIBLE
+
+            etat.score += 5 * etat.multiplicateur_score
+            etat.bonus_collectes[bonus.type] += 1
+            bonus.retirer(etat.grille)
+            etat.bonus = None
+
+    return evenements
+
+
+# Noms anglais attendus par les outils de simulation
+GameState = EtatPartie
+step = avancer
@@ -0,0 +1,317 @@
+"""Pilote automatique : A* vers la nourriture et les bonus, sous budget de temps.
+
+``PiloteAutomatique`` est une politique au sens de ``simulation`` (état ->
+direction) : elle pilote aussi bien ``Jeu`` (``--pilote``) que les parties
+sans affichage (``simulation.py --politique pilote``).
+
+À chaque tick :
+
+1. le chemin du tick précédent est repris tel quel si la cible n'a pas
+   bougé, que la tête l'a suivi et que sa prochaine case est libre (sur
+   une grille à un seul serpent, un chemin libre le reste tant qu'on le
+   suit) ; sinon A* sur la grille d'occupation, vers la nourriture et vers
+   le bonus s'il est atteignable avant de disparaître ;
+2. le premier pas est validé par un remplissage (flood fill) depuis la
+   case visée : il faut au moins ``longueur`` cases accessibles pour ne
+   pas s'enfermer ;
+3. à défaut, le voisin libre qui laisse le plus de place.
+
+La recherche et le contrôle disposent de ``PART_RECHERCHE`` du budget
+``budget_us`` ; passé ce délai, le repli s'arrête lui aussi à la fin du
+budget et joue le meilleur coup évalué (au pire le voisin libre le plus
+proche de la cible).
+Les latences de décision sont gardées pour ``statistiques``.
+
+Exemple ::
+
+    python backend/pilote.py --parties 20 --budget-us 500
+"""
+
+import argparse
+import heapq
+import sys
+import time
+from collections import deque
+
+import moteur
+from boucle import percentile
+from grille import CORPS, Grille
+from moteur import BAS, COLONNES, DROITE, GAUCHE, HAUT, LIGNES, EtatPartie
+
+DIRECTIONS = (HAUT, BAS, GAUCHE, DROITE)
+BUDGET_DECISION_US = 500
+# Latences gardées pour les percentiles
+TAILLE_HISTORIQUE = 10_000
+# Part du budget laissée à la recherche ; le reste garantit le repli
+PART_RECHERCHE = 0.75
+# Itérations entre deux lectures de l'horloge
+PAS_HORLOGE = 16
+
+
+class BudgetDepasse(Exception):
+    """Échéance atteinte pendant une recherche."""
+
+
+class PiloteAutomatique:
+    """Politique planifiée : A* incrémental, contrôle d'enfermement et budget par décision."""
+
+    def __init__(self, graine: int | None = None, budget_us: int = BUDGET_DECISION_US):
+        # ``graine`` : signature commune des politiques, le pilote est déterministe
+        self.budget_ns = budget_us * 1000
+        self.latences_ns: deque[int] = deque(maxlen=TAILLE_HISTORIQUE)
+        self.decisions = 0
+        self.depassements = 0
+        self.replanifications = 0
+        self.chemins_reutilises = 0
+        self._chemin: deque[int] = deque()
+        self._cible: int | None = None
+        self._tete_prevue: int | None = None
+        self._echeance = 0
+
+    def reinitialiser(self) -> None:
+        """Oublie le chemin en cours (nouvelle partie) ; les statistiques sont gardées."""
+        self._chemin.clear()
+        self._cible = None
+        self._tete_prevue = None
+
+    def __call__(self, etat: EtatPartie) -> tuple[int, int] | None:
+        debut = time.perf_counter_ns()
+        self._echeance = debut + int(self.budget_ns * PART_RECHERCHE)
+        try:
+            direction = self._decider(etat, debut + self.budget_ns)
+            # Tout droit : None, comme un joueur qui ne touche à rien (enregistrements compacts)
+            return None if direction == etat.serpent.direction else direction
+        finally:
+            duree = time.perf_counter_ns() - debut
+            self.latences_ns.append(duree)
+            self.decisions += 1
+            if duree > self.budget_ns:
+                self.depassements += 1
+
+    def _verifier_echeance(self) -> None:
+        if time.perf_counter_ns() > self._echeance:
+            raise BudgetDepasse
+
+    def _decider(self, etat: EtatPartie, echeance_repli: int) -> tuple[int, int] | None:
+        corps = etat.serpent.corps
+        grille = corps.grille
+        colonnes = grille.colonnes
+        tete = corps.cellule_segment(0)
+        voisins = self._voisins_libres(grille, tete, etat.serpent.direction)
+        if not voisins:
+            self._chemin.clear()
+            return None
+
+        cibles = self._cibles(etat)
+        suivant = None
+        try:
+            if cibles:
+                suivant = self._prochaine_case(grille, tete, voisins, cibles)
+            if suivant is not None and self._place_suffisante(grille, suivant, corps.longueur):
+                self._tete_prevue = suivant
+                return _direction(tete, suivant, colonnes)
+        except BudgetDepasse:
+            pass
+
+        # Chemin refusé ou échéance : on replanifiera au prochain tick
+        self._chemin.clear()
+        self._tete_prevue = None
+        self._echeance = echeance_repli
+        return _direction(tete, self._meilleur_repli(grille, voisins, corps.longueur, cibles), colonnes)
+
+    def _cibles(self, etat: EtatPartie) -> list[int]:
+        grille = etat.grille
+        cibles = []
+        if etat.nourriture.position is not None:
+            cibles.append(grille.cellule(*etat.nourriture.position))
+        bonus = etat.bonus
+        if bonus is not None and bonus.position is not None:
+            x, y = etat.serpent.corps.tete
+            if abs(bonus.position[0] - x) + abs(bonus.position[1] - y) < bonus.duree_vie:
+                cibles.append(grille.cellule(*bonus.position))
+        return cibles
+
+    def _voisins_libres(self, grille: Grille, cellule: int, direction: tuple[int, int]) -> list[int]:
+        colonnes = grille.colonnes
+        lignes = grille.lignes
+        occupation = grille.occupation
+        y, x = divmod(cellule, colonnes)
+        voisins = []
+        for dx, dy in DIRECTIONS:
+            if (dx, dy) == (-direction[0], -direction[1]):
+                continue
+            nx = x + dx
+            ny = y + dy
+            if 0 <= nx < colonnes and 0 <= ny < lignes and not occupation[ny * colonnes + nx] & CORPS:
+                voisins.append(ny * colonnes + nx)
+        return voisins
+
+    def _prochaine_case(self, grille: Grille, tete: int, voisins: list[int], cibles: list[int]) -> int | None:
+        chemin = self._chemin
+        if (
+            chemin
+            and self._cible in cibles
+            and tete == self._tete_prevue
+            and not grille.occupation[chemin[0]] & CORPS
+        ):
+            self.chemins_reutilises += 1
+        else:
+            self.replanifications += 1
+            chemin.clear()
+            trouve = self._a_etoile(grille, tete, voisins, cibles)
+            if trouve is None:
+                return None
+            self._cible = trouve[-1]
+            chemin.extend(trouve)
+        return chemin.popleft()
+
+    def _a_etoile(self, grille: Grille, depart: int, premiers: list[int], cibles: list[int]) -> list[int] | None:
+        """Plus court chemin (hors ``depart``) vers la cible la plus proche, ou ``None``.
+
+        Le premier pas est pris parmi ``premiers`` : le demi-tour, que le
+        serpent refuse, n'en fait pas partie.
+        """
+        colonnes = grille.colonnes
+        lignes = grille.lignes
+        occupation = grille.occupation
+        coordonnees = [divmod(cible, colonnes) for cible in cibles]
+
+        def heuristique(cellule: int) -> int:
+            y, x = divmod(cellule, colonnes)
+            return min(abs(x - cx) + abs(y - cy) for cy, cx in coordonnees)
+
+        parents = {depart: -1}
+        couts = {depart: 0}
+        ouverts = []
+        for premier in premiers:
+            parents[premier] = depart
+            couts[premier] = 1
+            heapq.heappush(ouverts, (1 + heuristique(premier), 1, premier))
+        iterations = 0
+        while ouverts:
+            iterations += 1
+            if iterations % PAS_HORLOGE == 0:
+                self._verifier_echeance()
+            _, cout, cellule = heapq.heappop(ouverts)
+            if cout > couts[cellule]:
+                continue
+            if cellule in cibles:
+                chemin = []
+                while cellule != depart:
+                    chemin.append(cellule)
+                    cellule = parents[cellule]
+                chemin.reverse()
+                return chemin
+            y, x = divmod(cellule, colonnes)
+            cout += 1
+            for dx, dy in DIRECTIONS:
+                nx = x + dx
+                ny = y + dy
+                if not (0 <= nx < colonnes and 0 <= ny < lignes):
+                    continue
+                voisin = ny * colonnes + nx
+                if occupation[voisin] & CORPS or couts.get(voisin, cout + 1) <= cout:
+                    continue
+                couts[voisin] = cout
+                parents[voisin] = cellule
+                heapq.heappush(ouverts, (cout + heuristique(voisin), cout, voisin))
+        return None
+
+    def _place(self, grille: Grille, depart: int, besoin: int) -> int:
+        """Cases libres accessibles depuis ``depart`` (qui compte), arrêté à ``besoin``."""
+        colonnes = grille.colonnes
+        lignes = grille.lignes
+        occupation = grille.occupation
+        vus = {depart}
+        pile = [depart]
+        iterations = 0
+        while pile and len(vus) < besoin:
+            iterations += 1
+            if iterations % PAS_HORLOGE == 0:
+                self._verifier_echeance()
+            cellule = pile.pop()
+            y, x = divmod(cellule, colonnes)
+            for dx, dy in DIRECTIONS:
+                nx = x + dx
+                ny = y + dy
+                if 0 <= nx < colonnes and 0 <= ny < lignes:
+                    voisin = ny * colonnes + nx
+                    if voisin not in vus and not occupation[voisin] & CORPS:
+                        vus.add(voisin)
+                        pile.append(voisin)
+        return len(vus)
+
+    def _place_suffisante(self, grille: Grille, case: int, longueur: int) -> bool:
+        return self._place(grille, case, longueur) >= longueur
+
+    def _meilleur_repli(self, grille: Grille, voisins: list[int], longueur: int, cibles: list[int]) -> int:
+        """Voisin qui laisse le plus de place (puis le plus proche d'une cible) ;
+        à l'échéance, le meilleur des voisins déjà évalués."""
+        colonnes = grille.colonnes
+
+        def distance(cellule: int) -> int:
+            if not cibles:
+                return 0
+            y, x = divmod(cellule, colonnes)
+            return min(abs(x - cx) + abs(y - cy) for cy, cx in (divmod(c, colonnes) for c in cibles))
+
+        meilleur = min(voisins, key=distance)
+        meilleure_place = -1
+        try:
+            for voisin in sorted(voisins, key=distance):
+                place = self._place(grille, voisin, longueur)
+                if place > meilleure_place:
+                    meilleur, meilleure_place = voisin, place
+                if place >= longueur:
+                    break
+        except BudgetDepasse:
+            pass
+        return meilleur
+
+    def statistiques(self) -> dict[str, float]:
+        """Nombre de décisions, percentiles de latence (µs) et compteurs."""
+        latences = [duree / 1000 for duree in self.latences_ns]
+        return {
+            "decisions": self.decisions,
+            "decision_us_p50": percentile(latences, 50),
+            "decision_us_p95": percentile(latences, 95),
+            "decision_us_p99": percentile(latences, 99),
+            "decision_us_max": max(latences, default=0.0),
+            "depassements": self.depassements,
+            "replanifications": self.replanifications,
+            "chemins_reutilises": self.chemins_reutilises,
+        }
+
+
+def _direction(depart: int, arrivee: int, colonnes: int) -> tuple[int, int]:
+    y0, x0 = divmod(depart, colonnes)
+    y1, x1 = divmod(arrivee, colonnes)
+    return (x1 - x0, y1 - y0)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Parties sans affichage jouées par le pilote automatique.")
+    parser.add_argument("--parties", type=int, default=20)
+    parser.add_argument("--graine", type=int, default=0, help="graine de la première partie")
+    parser.add_argument("--budget-us", type=int, default=BUDGET_DECISION_US, help="budget d'une décision")
+    parser.add_argument("--colonnes", type=int, default=COLONNES)
+    parser.add_argument("--lignes", type=int, default=LIGNES)
+    parser.add_argument("--max-ticks", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    pilote = PiloteAutomatique(budget_us=args.budget_us)
+    scores = []
+    for graine in range(args.graine, args.graine + args.parties):
+        etat = moteur.nouvelle_partie(args.colonnes, args.lignes, graine=graine)
+        while etat.frame_count < args.max_ticks:
+            if moteur.avancer(etat, pilote(etat)) & moteur.PARTIE_TERMINEE:
+                break
+        scores.append(etat.score)
+    print(f"{len(scores)} parties, score moyen {sum(scores) / len(scores):.1f}, max {max(scores)}")
+    for cle, valeur in pilote.statistiques().items():
+        print(f"{cle}: {valeur:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""Plans de rendu des skins : options validées et résolues une fois pour toutes.
+
+Un ``SnakeSkin`` décrit ses options sous forme de dictionnaire
+(``options_snake``, noms en majuscules comme les constantes de ``Snake``).
+``compiler_plan`` les vérifie, complète les absentes par les valeurs par
+défaut et produit un ``PlanRendu`` immuable : paramètres numériques,
+indicateurs d'ombre, de reflet et de contour, et fonctions de couleur déjà
+liées à la table du skin. Le serpent lit ses attributs directement, sans
+dictionnaire ni ``getattr`` pendant le rendu.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from couleurs import TableCouleurs
+
+MODES_COULEUR = ("rainbow", "palette", "pulse")
+
+# Option de skin -> (attribut du plan, nature de la valeur)
+OPTIONS_PLAN: dict[str, tuple[str, str]] = {
+    "VITESSE_ANIMATION": ("vitesse_animation", "reel"),
+    "DELTA_COULEUR": ("delta_couleur", "reel"),
+    "AFFICHER_OMBRE": ("ombre", "booleen"),
+    "COULEUR_OMBRE": ("couleur_ombre", "couleur"),
+    "DECALAGE_OMBRE": ("decalage_ombre", "paire"),
+    "AFFICHER_REFLET": ("reflet", "booleen"),
+    "COULEUR_REFLET": ("couleur_reflet", "couleur"),
+    "AFFICHER_CONTOUR": ("contour", "booleen"),
+    "COULEUR_CONTOUR": ("couleur_contour", "couleur"),
+    "LARGEUR_CONTOUR": ("largeur_contour", "entier"),
+    "RAYON_ANGLE_CORPS": ("rayon_corps", "entier"),
+    "RAYON_ANGLE_TETE": ("rayon_tete", "entier"),
+    "ECLAT_TETE": ("eclat_tete", "reel"),
+    "ECLAT_MUSEAU": ("eclat_museau", "reel"),
+    "DECALAGE_MUSEAU": ("decalage_museau", "entier"),
+    "RAYON_MUSEAU": ("rayon_museau", "entier"),
+    "COULEUR_YEUX": ("couleur_yeux", "couleur"),
+    "COULEUR_PUPILLE": ("couleur_pupille", "couleur"),
+    "RAYON_YEUX": ("rayon_yeux", "entier"),
+    "RAYON_PUPILLE": ("rayon_pupille", "entier"),
+    "ECART_YEUX": ("ecart_yeux", "entier"),
+    "DISTANCE_DIRECTION_YEUX": ("distance_yeux", "entier"),
+    "DECALAGE_PUPILLE": ("decalage_pupille", "entier"),
+}
+# Options lues seulement par la table de couleurs
+OPTIONS_TABLE = {
+    "PALETTE_DEFILEMENT": "reel",
+    "PULSE_VITESSE": "reel",
+    "PULSE_AMPLITUDE": "reel",
+    "PULSE_DECALE": "reel",
+}
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class PlanRendu:
+    """Tout ce qu'il faut pour dessiner un serpent d'un skin donné."""
+
+    skin: Any
+    table: TableCouleurs
+    # Fonctions de la table, liées une fois pour toutes
+    couleurs: list[tuple[int, int, int]]
+    couleurs_frame: Callable[[int, float], list[tuple[int, int, int]]]
+    indices_frame: Callable[[int, float], Any]
+    indices_rangs: Callable[[Any, float], Any]
+    couleur: Callable[[int, float], tuple[int, int, int]]
+    # Préfixe des clés du cache de sprites : skin et options de rendu
+    cle_rendu: tuple
+    vitesse_animation: float
+    delta_couleur: float
+    ombre: bool
+    couleur_ombre: tuple[int, ...]
+    decalage_ombre: tuple[int, int]
+    reflet: bool
+    couleur_reflet: tuple[int, ...]
+    contour: bool
+    couleur_contour: tuple[int, ...]
+    largeur_contour: int
+    rayon_corps: int
+    rayon_tete: int
+    eclat_tete: float
+    eclat_museau: float
+    decalage_museau: int
+    rayon_museau: int
+    couleur_yeux: tuple[int, ...]
+    couleur_pupille: tuple[int, ...]
+    rayon_yeux: int
+    rayon_pupille: int
+    ecart_yeux: int
+    distance_yeux: int
+    decalage_pupille: int
+
+
+def _valider(skin, nom: str, nature: str, valeur):
+    def erreur(attendu: str) -> ValueError:
+        return ValueError(f"Skin {skin.identifiant!r} : {nom} doit être {attendu}, pas {valeur!r}")
+
+    if nature == "booleen":
+        if not isinstance(valeur, bool):
+            raise erreur("un booléen")
+        return valeur
+    if nature == "entier":
+        if not isinstance(valeur, int) or isinstance(valeur, bool) or valeur < 0:
+            raise erreur("un entier positif")
+        return valeur
+    if nature == "reel":
+        if not isinstance(valeur, (int, float)) or isinstance(valeur, bool):
+            raise erreur("un nombre")
+        return float(valeur)
+    if nature == "paire":
+        if not isinstance(valeur, tuple) or len(valeur) != 2 or not all(isinstance(v, int) for v in valeur):
+            raise erreur("un couple d'entiers")
+        return valeur
+    # Couleur RGB ou RGBA
+    if (
+        not isinstance(valeur, tuple)
+        or len(valeur) not in (3, 4)
+        or not all(isinstance(c, int) and 0 <= c <= 255 for c in valeur)
+    ):
+        raise erreur("une couleur RGB(A)")
+    return valeur
+
+
+def compiler_plan(skin, defauts) -> PlanRendu:
+    """Plan de ``skin`` ; les options absentes sont lues sur ``defauts`` (la classe ``Snake``).
+
+    Lève ``ValueError`` pour un mode de couleur, une palette ou une option invalides.
+    """
+    if skin.couleur_mode not in MODES_COULEUR:
+        raise ValueError(f"Skin {skin.identifiant!r} : mode de couleur inconnu {skin.couleur_mode!r}")
+    for couleur in skin.couleurs:
+        _valider(skin, "couleurs", "couleur", couleur)
+    options = skin.options_snake
+    for nom, valeur in options.items():
+        if nom in OPTIONS_PLAN:
+            _valider(skin, nom, OPTIONS_PLAN[nom][1], valeur)
+        elif nom in OPTIONS_TABLE:
+            _valider(skin, nom, OPTIONS_TABLE[nom], valeur)
+        else:
+            raise ValueError(f"Skin {skin.identifiant!r} : option inconnue {nom!r}")
+
+    valeurs = {
+        attribut: _valider(skin, nom, nature, options[nom] if nom in options else getattr(defauts, nom))
+        for nom, (attribut, nature) in OPTIONS_PLAN.items()
+    }
+    table = TableCouleurs(
+        skin.couleur_mode,
+        tuple(skin.couleurs),
+        options,
+        valeurs["vitesse_animation"],
+        valeurs["delta_couleur"],
+    )
+    cle_rendu = (
+        skin.identifiant,
+        valeurs["reflet"] and valeurs["couleur_reflet"],
+        valeurs["contour"] and (valeurs["couleur_contour"], valeurs["largeur_contour"]),
+    )
+    return PlanRendu(
+        skin=skin,
+        table=table,
+        couleurs=table.couleurs,
+        couleurs_frame=table.couleurs_frame,
+        indices_frame=table.indices_frame,
+        indices_rangs=table.indices_rangs,
+        couleur=table.couleur,
+        cle_rendu=cle_rendu,
+        **valeurs,
+    )
@@ -0,0 +1,158 @@
+"""Profilage par phase des frames du jeu, sans dépendance à pygame.
+
+Chaque frame commence par ``Profileur.debut_frame`` ; ``marquer(phase)``
+attribue à ``phase`` le temps écoulé depuis la marque précédente (mesuré
+avec ``perf_counter_ns``). Les durées vont dans des tampons circulaires de
+taille fixe : pas d'allocation en régime établi. Désactivé, le profileur
+n'existe pas (``Jeu.profileur is None``) et ne coûte rien.
+
+Les sessions s'exportent en JSON, en CSV ou au format « trace event » de
+Chrome (``chrome://tracing``, Perfetto).
+"""
+
+import csv
+import json
+import time
+from array import array
+from pathlib import Path
+
+import numpy as np
+
+# Phases d'une frame de ``Jeu.executer``, dans l'ordre où elles sont marquées
+PHASES_JEU = ("evenements", "simulation", "serpent", "decor", "hud", "overlay", "affichage", "attente")
+(
+    PHASE_EVENEMENTS,
+    PHASE_SIMULATION,
+    PHASE_SERPENT,
+    PHASE_DECOR,
+    PHASE_HUD,
+    PHASE_OVERLAY,
+    PHASE_AFFICHAGE,
+    PHASE_ATTENTE,
+) = range(len(PHASES_JEU))
+
+TAILLE_HISTORIQUE = 1024
+FORMATS_EXPORT = ("json", "csv", "chrome")
+
+
+class Profileur:
+    """Durées par phase des ``taille`` dernières frames."""
+
+    def __init__(self, phases: tuple[str, ...] = PHASES_JEU, taille: int = TAILLE_HISTORIQUE, horloge=time.perf_counter_ns):
+        if taille <= 0:
+            raise ValueError("La taille de l'historique doit être positive.")
+        self.phases = tuple(phases)
+        self.taille = taille
+        self.frames = 0
+        self._horloge = horloge
+        self._debuts = array("q", bytes(8 * taille))
+        self._durees = [array("q", bytes(8 * taille)) for _ in self.phases]
+        self._slot = 0
+        # Les marques posées avant le premier ``debut_frame`` sont ignorées
+        self._derniere_marque = horloge()
+
+    def debut_frame(self) -> None:
+        maintenant = self._horloge()
+        slot = self.frames % self.taille
+        self.frames += 1
+        self._slot = slot
+        self._debuts[slot] = maintenant
+        for durees in self._durees:
+            durees[slot] = 0
+        self._derniere_marque = maintenant
+
+    def marquer(self, phase: int) -> None:
+        """Attribue à ``phase`` (indice dans ``phases``) le temps écoulé depuis la marque précédente."""
+        maintenant = self._horloge()
+        self._durees[phase][self._slot] += maintenant - self._derniere_marque
+        self._derniere_marque = maintenant
+
+    @property
+    def nb_frames(self) -> int:
+        """Frames complètes disponibles (la frame en cours occupe un slot)."""
+        return min(max(self.frames - 1, 0), self.taille - 1)
+
+    def _ordre(self) -> np.ndarray:
+        # Slots des frames complètes, de la plus ancienne à la plus récente
+        nb = self.nb_frames
+        return (np.arange(self.frames - 1 - nb, self.frames - 1)) % self.taille
+
+    def durees_ns(self, phase: int) -> np.ndarray:
+        return np.frombuffer(self._durees[phase], dtype=np.int64)[self._ordre()]
+
+    def debuts_ns(self) -> np.ndarray:
+        return np.frombuffer(self._debuts, dtype=np.int64)[self._ordre()]
+
+    def totaux_ns(self) -> np.ndarray:
+        ordre = self._ordre()
+        total = np.zeros(len(ordre), dtype=np.int64)
+        for durees in self._durees:
+            total += np.frombuffer(durees, dtype=np.int64)[ordre]
+        return total
+
+    def resume(self) -> dict[str, dict[str, float]]:
+        """p50/p95/p99 et moyenne (ms) par phase et pour la frame entière."""
+        series = {phase: self.durees_ns(i) for i, phase in enumerate(self.phases)}
+        series["frame"] = self.totaux_ns()
+        resume = {}
+        for nom, valeurs in series.items():
+            if len(valeurs):
+                p50, p95, p99 = np.percentile(valeurs, (50, 95, 99)) / 1e6
+                moyenne = float(valeurs.mean()) / 1e6
+            else:
+                p50 = p95 = p99 = moyenne = 0.0
+            resume[nom] = {"p50": float(p50), "p95": float(p95), "p99": float(p99), "moyenne": moyenne}
+        return resume
+
+    def exporter(self, chemin: Path | str, format_export: str | None = None) -> Path:
+        """Écrit la session ; le format est déduit de l'extension si absent."""
+        chemin = Path(chemin)
+        if format_export is None:
+            format_export = "csv" if chemin.suffix == ".csv" else "json"
+        if format_export not in FORMATS_EXPORT:
+            raise ValueError(f"Format d'export inconnu : {format_export!r}")
+        chemin.parent.mkdir(parents=True, exist_ok=True)
+        if format_export == "csv":
+            self._exporter_csv(chemin)
+        elif format_export == "chrome":
+            chemin.write_text(json.dumps(self.trace_chrome()), encoding="utf-8")
+        else:
+            donnees = {
+                "phases": list(self.phases),
+                "debuts_ns": self.debuts_ns().tolist(),
+                "durees_ns": {phase: self.durees_ns(i).tolist() for i, phase in enumerate(self.phases)},
+                "resume_ms": self.resume(),
+            }
+            chemin.write_text(json.dumps(donnees), encoding="utf-8")
+        return chemin
+
+    def _exporter_csv(self, chemin: Path) -> None:
+        colonnes = [self.durees_ns(i) for i in range(len(self.phases))]
+        with chemin.open("w", newline="", encoding="utf-8") as fichier:
+            ecrivain = csv.writer(fichier)
+            ecrivain.writerow(["frame", "debut_ns", *(f"{phase}_ns" for phase in self.phases), "total_ns"])
+            premiere = self.frames - 1 - self.nb_frames
+            for rang, (debut, total) in enumerate(zip(self.debuts_ns().tolist(), self.totaux_ns().tolist())):
+                ecrivain.writerow([premiere + rang, debut, *(int(c[rang]) for c in colonnes), total])
+
+    def trace_chrome(self) -> dict:
+        """Événements complets (``"ph": "X"``) en microsecondes, phases bout à bout dans chaque frame."""
+        debuts = self.debuts_ns()
+        origine = int(debuts[0]) if len(debuts) else 0
+        colonnes = [self.durees_ns(i).tolist() for i in range(len(self.phases))]
+        evenements = []
+        for rang, debut in enumerate(debuts.tolist()):
+            instant = debut - origine
+            total = 0
+            for phase, durees in zip(self.phases, colonnes):
+                duree = durees[rang]
+                if duree:
+                    evenements.append(
+                        {"name": phase, "cat": "frame", "ph": "X", "ts": instant / 1000, "dur": duree / 1000, "pid": 1, "tid": 1}
+                    )
+                instant += duree
+                total += duree
+            evenements.append(
+                {"name": "frame", "cat": "frame", "ph": "X", "ts": (debut - origine) / 1000, "dur": total / 1000, "pid": 1, "tid": 0}
+            )
+        return {"traceEvents": evenements, "displayTimeUnit": "ms"}
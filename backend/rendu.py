@@ -0,0 +1,454 @@
+"""Outils de rendu pygame partagés par les écrans du jeu."""
+
+from collections import OrderedDict
+from collections.abc import Hashable
+
+import numpy as np
+import pygame
+
+CHIFFRES = "0123456789"
+ORD_ZERO = ord("0")
+
+
+class CacheSprites:
+    """Cache LRU borné de surfaces pré-rendues.
+
+    ``obtenir`` renvoie ``None`` en cas d'absence : l'appelant crée alors la
+    surface et la range avec ``ajouter``. Les compteurs de succès et la
+    mémoire occupée servent à régler ``capacite``.
+    """
+
+    def __init__(self, capacite: int = 2048):
+        if capacite <= 0:
+            raise ValueError("La capacité du cache doit être positive.")
+        self.capacite = capacite
+        self._surfaces: OrderedDict[Hashable, pygame.Surface] = OrderedDict()
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+        self.octets = 0
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def obtenir(self, cle: Hashable) -> pygame.Surface | None:
+        surface = self._surfaces.get(cle)
+        if surface is None:
+            self.echecs += 1
+            return None
+        self._surfaces.move_to_end(cle)
+        self.succes += 1
+        return surface
+
+    def ajouter(self, cle: Hashable, surface: pygame.Surface) -> pygame.Surface:
+        ancienne = self._surfaces.pop(cle, None)
+        if ancienne is not None:
+            self.octets -= _taille_surface(ancienne)
+        self._surfaces[cle] = surface
+        self.octets += _taille_surface(surface)
+        while len(self._surfaces) > self.capacite:
+            _, evincee = self._surfaces.popitem(last=False)
+            self.octets -= _taille_surface(evincee)
+            self.evictions += 1
+        return surface
+
+    def vider(self) -> None:
+        self._surfaces.clear()
+        self.octets = 0
+
+    @property
+    def taux_succes(self) -> float:
+        total = self.succes + self.echecs
+        return self.succes / total if total else 0.0
+
+    def statistiques(self) -> dict[str, float]:
+        return {
+            "entrees": len(self._surfaces),
+            "capacite": self.capacite,
+            "succes": self.succes,
+            "echecs": self.echecs,
+            "evictions": self.evictions,
+            "taux_succes": self.taux_succes,
+            "octets": self.octets,
+        }
+
+
+def _taille_surface(surface: pygame.Surface) -> int:
+    return surface.get_pitch() * surface.get_height()
+
+
+class RenduIncremental:
+    """Rendu par rectangles sales de l'écran de jeu.
+
+    Chaque frame, la signature des cellules (indice de couleur de chaque
+    segment, tête, nourriture, bonus), les lignes du HUD et la bordure sont
+    comparées à la frame précédente. Seules les régions modifiées sont
+    repeintes : fond, puis tout ce qui les recouvre, dans l'ordre du rendu
+    complet (bordure, serpent, nourriture, bonus, HUD). ``dessiner`` renvoie
+    les rectangles à passer à ``pygame.display.update``. Au-delà de
+    ``fraction_max`` du serpent modifié (skin animé sur tout le corps),
+    l'écran entier est repeint.
+    """
+
+    def __init__(
+        self,
+        taille_cellule: int,
+        colonnes: int,
+        lignes: int,
+        fond: tuple[int, int, int] = (0, 0, 0),
+        fraction_max: float = 0.25,
+    ):
+        self.taille_cellule = taille_cellule
+        self.colonnes = colonnes
+        self.lignes = lignes
+        self.fond = fond
+        self.fraction_max = fraction_max
+        nb_cellules = colonnes * lignes
+        # Signature par cellule : -1 vide, -2 tête, sinon indice de couleur du segment
+        self._signature = np.full(nb_cellules, -1, dtype=np.int64)
+        self._nouvelle = np.full(nb_cellules, -1, dtype=np.int64)
+        self._rangs = np.full(nb_cellules, -1, dtype=np.int64)
+        self._rangs_2d = self._rangs.reshape(lignes, colonnes)
+        self._ordre = np.arange(nb_cellules, dtype=np.int64)
+        self._ecran: pygame.Surface | None = None
+        self._partie = None
+        self._tete = None
+        self._fantome = None
+        self._nourriture = None
+        self._bonus = None
+        self._bordure = None
+        self._hud: list[tuple[pygame.Surface, pygame.Rect]] = []
+        # Contexte de la frame en cours, utilisé par ``_repeindre``
+        self._serpent = None
+        self._decalage_ombre = (0, 0)
+        self._cellules = None
+        self._indices = None
+        self._sprites: dict[int, tuple] = {}
+        self._temps = 0.0
+        self._alpha = 1.0
+        self._objet_nourriture = None
+        self._objet_bonus = None
+        self.frames_completes = 0
+        self.frames_partielles = 0
+        self.regions_repeintes = 0
+
+    def invalider(self) -> None:
+        """Force un rendu complet à la prochaine frame (changement d'écran, de mode...)."""
+        self._partie = None
+
+    def dessiner(
+        self,
+        ecran: pygame.Surface,
+        partie,
+        lignes_hud,
+        bordure=None,
+        temps: float | None = None,
+        alpha: float = 1.0,
+    ) -> list[pygame.Rect]:
+        """Met ``ecran`` à jour pour ``partie`` et renvoie les rectangles modifiés.
+
+        ``lignes_hud`` : liste de ``(surface, position)``,
+        ``bordure`` : ``(couleur, largeur)`` ou ``None``,
+        ``alpha`` : interpolation de la tête et de la queue entre deux ticks.
+        """
+        if temps is None:
+            temps = pygame.time.get_ticks() / 1000.0
+        serpent = partie.serpent
+        cellules = np.frombuffer(serpent.corps.cellules(), dtype=np.dtype("l"))
+        indices = serpent.indices_couleurs(temps)
+        nb_segments = len(cellules)
+
+        nouvelle = self._nouvelle
+        nouvelle.fill(-1)
+        nouvelle[cellules] = indices
+        nouvelle[cellules[0]] = -2
+        self._rangs.fill(-1)
+        self._rangs[cellules] = self._ordre[:nb_segments]
+
+        pixels_tete, fantome = serpent.pixels_interpoles(alpha)
+        tete = (int(cellules[0]), int(indices[0]), serpent.direction, pixels_tete)
+        nourriture = partie.nourriture.position
+        bonus = partie.bonus
+        etat_bonus = (bonus.position, bonus.visible, bonus.couleur) if bonus else None
+
+        self._serpent = serpent
+        self._decalage_ombre = serpent.plan.decalage_ombre if serpent.plan.ombre else (0, 0)
+        self._cellules = cellules
+        self._indices = indices
+        self._sprites = {}
+        self._temps = temps
+        self._alpha = alpha
+        self._objet_nourriture = partie.nourriture
+        self._objet_bonus = bonus
+        bordure_avant = self._bordure
+        self._bordure = bordure
+
+        # Lignes du HUD : les surfaces viennent d'un ``CacheTextes``, donc une
+        # ligne inchangée est le même objet d'une frame à l'autre
+        regions: list[pygame.Rect] = []
+        hud = []
+        for i, (surface, position) in enumerate(lignes_hud):
+            precedente = self._hud[i] if i < len(self._hud) else None
+            if precedente is not None and precedente[0] is surface and precedente[1].topleft == position:
+                hud.append(precedente)
+                continue
+            rect = surface.get_rect(topleft=position)
+            hud.append((surface, rect))
+            regions.append(rect)
+            if precedente is not None:
+                regions.append(precedente[1])
+        regions.extend(precedente[1] for precedente in self._hud[len(hud):])
+        self._hud = hud
+
+        complet = partie is not self._partie or ecran is not self._ecran
+        if not complet:
+            sales = np.flatnonzero(nouvelle != self._signature).tolist()
+            if tete != self._tete:
+                sales.append(tete[0])
+                sales.append(self._tete[0])
+                regions.append(self._rect_sprite(tete[3]))
+                regions.append(self._rect_sprite(self._tete[3]))
+            if fantome != self._fantome:
+                regions.extend(self._rect_sprite(f[1]) for f in (fantome, self._fantome) if f is not None)
+            if nourriture != self._nourriture:
+                sales.extend(self._cellule(p) for p in (nourriture, self._nourriture) if p is not None)
+            if etat_bonus != self._bonus:
+                sales.extend(self._cellule(e[0]) for e in (etat_bonus, self._bonus) if e is not None and e[0] is not None)
+            complet = len(sales) > self.fraction_max * nb_segments + 8
+            if not complet:
+                regions.extend(self._rect_cellule(cellule) for cellule in set(sales))
+                if bordure != bordure_avant:
+                    regions.extend(self._bandes_bordure(ecran, bordure or bordure_avant))
+
+        self._signature, self._nouvelle = nouvelle, self._signature
+        self._partie = partie
+        self._ecran = ecran
+        self._tete = tete
+        self._fantome = fantome
+        self._nourriture = nourriture
+        self._bonus = etat_bonus
+
+        if complet:
+            self.frames_completes += 1
+            self._repeindre_tout(ecran)
+            return [ecran.get_rect()]
+
+        self.frames_partielles += 1
+        self.regions_repeintes += len(regions)
+        for region in regions:
+            self._repeindre(ecran, region)
+        return regions
+
+    def _cellule(self, position: tuple[int, int]) -> int:
+        return position[1] * self.colonnes + position[0]
+
+    def _rect_cellule(self, cellule: int) -> pygame.Rect:
+        y, x = divmod(cellule, self.colonnes)
+        return self._rect_sprite((x * self.taille_cellule, y * self.taille_cellule))
+
+    def _rect_sprite(self, pixels: tuple[int, int]) -> pygame.Rect:
+        # Le sprite, son ombre portée et le débordement d'un pixel des cercles
+        taille = self.taille_cellule
+        ox, oy = self._decalage_ombre
+        return pygame.Rect(
+            pixels[0] - 1 + min(0, ox), pixels[1] - 1 + min(0, oy), taille + 2 + abs(ox), taille + 2 + abs(oy)
+        )
+
+    @staticmethod
+    def _bandes_bordure(ecran: pygame.Surface, bordure) -> list[pygame.Rect]:
+        largeur = bordure[1]
+        w, h = ecran.get_size()
+        return [
+            pygame.Rect(0, 0, w, largeur),
+            pygame.Rect(0, h - largeur, w, largeur),
+            pygame.Rect(0, 0, largeur, h),
+            pygame.Rect(w - largeur, 0, largeur, h),
+        ]
+
+    def _repeindre_tout(self, ecran: pygame.Surface) -> None:
+        ecran.fill(self.fond)
+        if self._bordure is not None:
+            couleur, largeur = self._bordure
+            pygame.draw.rect(ecran, couleur, ecran.get_rect(), largeur)
+        self._serpent.dessiner(ecran, self._temps, self._alpha)
+        if self._nourriture is not None:
+            self._objet_nourriture.dessiner(ecran)
+        if self._objet_bonus is not None:
+            self._objet_bonus.dessiner(ecran)
+        ecran.blits(self._hud, doreturn=False)
+
+    def _sprite_rang(self, rang: int) -> tuple:
+        serpent = self._serpent
+        if rang == len(self._cellules):
+            # Fantôme de la queue : sprite du dernier segment, position interpolée
+            ombre, corps = serpent.sprites_segment(rang - 1, int(self._indices[rang - 1]))
+            return ombre, corps, self._fantome[1]
+        ombre, corps = serpent.sprites_segment(rang, int(self._indices[rang]))
+        if rang == 0:
+            return ombre, corps, self._tete[3]
+        y, x = divmod(int(self._cellules[rang]), self.colonnes)
+        return ombre, corps, (x * self.taille_cellule, y * self.taille_cellule)
+
+    def _repeindre(self, ecran: pygame.Surface, region: pygame.Rect) -> None:
+        taille = self.taille_cellule
+        ecran.set_clip(region)
+        ecran.fill(self.fond, region)
+        if self._bordure is not None:
+            couleur, largeur = self._bordure
+            pygame.draw.rect(ecran, couleur, ecran.get_rect(), largeur)
+
+        # Segments dont le sprite ou l'ombre peut toucher la région ; la tête
+        # (interpolée) et le fantôme de la queue sont testés à part
+        x0 = max(0, region.left // taille - 1)
+        y0 = max(0, region.top // taille - 1)
+        x1 = (region.right - 1) // taille + 2
+        y1 = (region.bottom - 1) // taille + 2
+        voisins = self._rangs_2d[y0:y1, x0:x1]
+        rangs = np.sort(voisins[voisins > 0]).tolist()
+        if region.colliderect(self._rect_sprite(self._tete[3])):
+            rangs.insert(0, 0)
+        if self._fantome is not None and region.colliderect(self._rect_sprite(self._fantome[1])):
+            rangs.append(len(self._cellules))
+
+        sprites = self._sprites
+        decalage_x, decalage_y = self._decalage_ombre
+        lots = []
+        for rang in rangs:
+            sprite = sprites.get(rang)
+            if sprite is None:
+                sprite = sprites[rang] = self._sprite_rang(rang)
+            ombre, corps, position = sprite
+            if ombre is not None:
+                lots.append((ombre, (position[0] + decalage_x, position[1] + decalage_y)))
+            lots.append((corps, position))
+        ecran.blits(lots, doreturn=False)
+
+        if self._nourriture is not None and region.colliderect(self._rect_cellule(self._cellule(self._nourriture))):
+            self._objet_nourriture.dessiner(ecran)
+        if self._bonus is not None and self._bonus[0] is not None and region.colliderect(
+            self._rect_cellule(self._cellule(self._bonus[0]))
+        ):
+            self._objet_bonus.dessiner(ecran)
+        for surface, rect in self._hud:
+            if region.colliderect(rect):
+                ecran.blit(surface, rect)
+        ecran.set_clip(None)
+
+
+class CacheTextes:
+    """Textes rendus par les polices pygame, mis en cache.
+
+    ``rendre`` garde chaque surface sous la clé ``(police, texte, couleur)`` :
+    un texte inchangé ne repasse jamais par ``Font.render``. Les nombres
+    (score, niveau...) sont composés par ``rendre_nombre`` à partir d'un atlas
+    des dix chiffres pré-rendus par police et couleur, si bien qu'un score qui
+    change ne coûte que quelques blits.
+    """
+
+    def __init__(self, capacite: int = 512):
+        self._surfaces = CacheSprites(capacite)
+        self._atlas: dict[tuple, tuple[pygame.Surface, ...]] = {}
+        self.rasterisations = 0
+
+    def rendre(self, police: pygame.font.Font, texte: str, couleur) -> pygame.Surface:
+        cle = (police, texte, couleur)
+        surface = self._surfaces.obtenir(cle)
+        if surface is None:
+            self.rasterisations += 1
+            surface = self._surfaces.ajouter(cle, police.render(texte, True, couleur))
+        return surface
+
+    def rendre_nombre(self, police: pygame.font.Font, nombre: int, couleur, prefixe: str = "") -> pygame.Surface:
+        """``prefixe`` suivi de ``nombre``, chiffres tirés de l'atlas."""
+        cle = (police, prefixe, nombre, couleur)
+        surface = self._surfaces.obtenir(cle)
+        if surface is None:
+            chiffres = str(nombre)
+            if not chiffres.isdigit():
+                return self.rendre(police, prefixe + chiffres, couleur)
+            surface = self._surfaces.ajouter(cle, self._composer(police, prefixe, chiffres, couleur))
+        return surface
+
+    def _glyphes(self, police: pygame.font.Font, couleur) -> tuple[pygame.Surface, ...]:
+        glyphes = self._atlas.get((police, couleur))
+        if glyphes is None:
+            self.rasterisations += len(CHIFFRES)
+            glyphes = self._atlas[(police, couleur)] = tuple(police.render(c, True, couleur) for c in CHIFFRES)
+        return glyphes
+
+    def _composer(self, police: pygame.font.Font, prefixe: str, chiffres: str, couleur) -> pygame.Surface:
+        surface = pygame.Surface(police.size(prefixe + chiffres), pygame.SRCALPHA)
+        if prefixe:
+            surface.blit(self.rendre(police, prefixe, couleur), (0, 0))
+        glyphes = self._glyphes(police, couleur)
+        for rang, chiffre in enumerate(chiffres):
+            # Avance mesurée sur le texte complet : même crénage que Font.render
+            x = police.size(prefixe + chiffres[:rang])[0]
+            surface.blit(glyphes[ord(chiffre) - ORD_ZERO], (x, 0))
+        return surface
+
+    def vider(self) -> None:
+        self._surfaces.vider()
+        self._atlas.clear()
+
+    def statistiques(self) -> dict[str, float]:
+        return {**self._surfaces.statistiques(), "atlas": len(self._atlas), "rasterisations": self.rasterisations}
+
+
+class OverlayProfil:
+    """Panneau de profilage : p50/p95/p99 (ms) par phase et courbe des durées de frame.
+
+    Le panneau est opaque (il peut être reblitté sur une frame partielle du
+    rendu incrémental) et n'est recalculé que toutes les ``periode`` frames.
+    """
+
+    LARGEUR = 250
+    HAUTEUR_LIGNE = 14
+    HAUTEUR_COURBE = 36
+    NB_POINTS = 120
+    FOND = (12, 12, 16)
+    COULEUR_TEXTE = (220, 220, 220)
+    COULEUR_COURBE = (90, 220, 120)
+    COULEUR_REFERENCE = (90, 90, 90)
+    # Colonnes x : nom de phase, p50, p95, p99
+    COLONNES = (6, 110, 157, 204)
+
+    def __init__(self, profileur, police: pygame.font.Font, periode: int = 15, reference_ms: float = 1000 / 60):
+        self.profileur = profileur
+        self.police = police
+        self.periode = periode
+        self.reference_ms = reference_ms
+        nb_lignes = len(profileur.phases) + 2
+        self.surface = pygame.Surface((self.LARGEUR, nb_lignes * self.HAUTEUR_LIGNE + self.HAUTEUR_COURBE + 12))
+        self._derniere_mise_a_jour: int | None = None
+
+    def dessiner(self, ecran: pygame.Surface, position: tuple[int, int]) -> pygame.Rect:
+        frames = self.profileur.frames
+        if self._derniere_mise_a_jour is None or frames - self._derniere_mise_a_jour >= self.periode:
+            self._derniere_mise_a_jour = frames
+            self._mettre_a_jour()
+        return ecran.blit(self.surface, position)
+
+    def _mettre_a_jour(self) -> None:
+        surface = self.surface
+        surface.fill(self.FOND)
+        y = 4
+        for x, texte in zip(self.COLONNES, ("ms", "p50", "p95", "p99")):
+            surface.blit(self.police.render(texte, True, self.COULEUR_TEXTE), (x, y))
+        for nom, stats in self.profileur.resume().items():
+            y += self.HAUTEUR_LIGNE
+            valeurs = (nom, f"{stats['p50']:.2f}", f"{stats['p95']:.2f}", f"{stats['p99']:.2f}")
+            for x, texte in zip(self.COLONNES, valeurs):
+                surface.blit(self.police.render(texte, True, self.COULEUR_TEXTE), (x, y))
+
+        # Courbe des dernières durées de frame, avec la durée cible en référence
+        haut = y + self.HAUTEUR_LIGNE + 6
+        bas = haut + self.HAUTEUR_COURBE
+        totaux = self.profileur.totaux_ns()[-self.NB_POINTS:] / 1e6
+        echelle = max(2 * self.reference_ms, float(totaux.max()) if len(totaux) else 0.0)
+        y_reference = bas - round(self.reference_ms / echelle * self.HAUTEUR_COURBE)
+        pygame.draw.line(surface, self.COULEUR_REFERENCE, (6, y_reference), (self.LARGEUR - 6, y_reference))
+        if len(totaux) >= 2:
+            pas = (self.LARGEUR - 12) / (self.NB_POINTS - 1)
+            points = [(6 + i * pas, bas - v / echelle * self.HAUTEUR_COURBE) for i, v in enumerate(totaux.tolist())]
+            pygame.draw.lines(surface, self.COULEUR_COURBE, False, points)
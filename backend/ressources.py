@@ -0,0 +1,149 @@
+"""Ressources du jeu (sons, icône, sprites fixes), chargées une seule fois.
+
+Chaque ressource est déclarée avec sa fonction de chargement. ``demarrer``
+les charge et les décode sur un thread ; ``obtenir`` rend l'instance
+partagée, en la chargeant lui-même si le thread n'y est pas encore arrivé
+(avec ``attendre=False`` : ``None`` plutôt que de bloquer l'appelant). Une
+ressource n'est jamais rechargée ; les instances sont partagées entre les
+parties et ne doivent pas être modifiées.
+
+Les WAV PCM 16 bits sont lus par ``mmap`` : les échantillons sont pris
+directement dans le fichier projeté et mis au format du mixer.
+"""
+
+import mmap
+import struct
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+from demarrage import ProfilDemarrage
+
+# Ressource déclarée mais pas encore chargée (None : chargement impossible)
+_ABSENTE = object()
+
+
+class GestionnaireRessources:
+    """Ressources déclarées par nom, chargées par un thread ou à la demande."""
+
+    def __init__(self):
+        self._chargeurs: dict[str, Callable[[], object]] = {}
+        self._ressources: dict[str, object] = {}
+        # Durée de chargement de chaque ressource, en secondes
+        self.durees: dict[str, float] = {}
+        self._verrou = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def declarer(self, nom: str, chargeur: Callable[[], object]) -> None:
+        """``chargeur`` renvoie la ressource, ou lève ``pygame.error``/``OSError``/``ValueError``."""
+        self._chargeurs[nom] = chargeur
+
+    def _charger(self, nom: str) -> object:
+        with self._verrou:
+            ressource = self._ressources.get(nom, _ABSENTE)
+            if ressource is not _ABSENTE:
+                return ressource
+            debut = time.perf_counter()
+            try:
+                ressource = self._chargeurs[nom]()
+            except (pygame.error, OSError, ValueError):
+                ressource = None
+            self.durees[nom] = time.perf_counter() - debut
+            self._ressources[nom] = ressource
+            return ressource
+
+    def obtenir(self, nom: str, attendre: bool = True):
+        """La ressource ``nom`` (``None`` si elle n'a pas pu être chargée).
+
+        Avec ``attendre=False``, renvoie ``None`` tant qu'elle n'est pas prête.
+        """
+        ressource = self._ressources.get(nom, _ABSENTE)
+        if ressource is not _ABSENTE:
+            return ressource
+        if not attendre:
+            return None
+        return self._charger(nom)
+
+    def demarrer(self, profil: ProfilDemarrage | None = None) -> None:
+        """Lance le thread de chargement (une seule fois)."""
+        if self._thread is not None:
+            return
+
+        def charger_tout():
+            for nom in list(self._chargeurs):
+                self._charger(nom)
+                if profil is not None:
+                    profil.ajouter(f"ressource {nom}", self.durees[nom])
+
+        self._thread = threading.Thread(target=charger_tout, name="ressources", daemon=True)
+        self._thread.start()
+
+    @property
+    def pretes(self) -> bool:
+        return len(self._ressources) == len(self._chargeurs)
+
+    def attendre(self, delai: float | None = None) -> bool:
+        """Attend la fin du thread de chargement ; ``True`` si tout est chargé."""
+        if self._thread is not None:
+            self._thread.join(delai)
+        return self.pretes
+
+    def statistiques(self) -> dict[str, float]:
+        """Durée de chargement de chaque ressource chargée, en millisecondes."""
+        return {nom: duree * 1000 for nom, duree in self.durees.items()}
+
+
+def _format_wav(contenu) -> tuple[int, int, int, int, int, int]:
+    """``(code, canaux, fréquence, bits, début, taille)`` des données d'un WAV."""
+    if contenu[:4] != b"RIFF" or contenu[8:12] != b"WAVE":
+        raise ValueError("Ce n'est pas un fichier WAV.")
+    format_wav = None
+    position = 12
+    while position + 8 <= len(contenu):
+        bloc = contenu[position:position + 4]
+        (taille,) = struct.unpack_from("<I", contenu, position + 4)
+        debut = position + 8
+        if bloc == b"fmt ":
+            code, canaux, frequence = struct.unpack_from("<HHI", contenu, debut)
+            (bits,) = struct.unpack_from("<H", contenu, debut + 14)
+            format_wav = (code, canaux, frequence, bits)
+        elif bloc == b"data":
+            if format_wav is None:
+                raise ValueError("WAV sans bloc fmt avant les données.")
+            return (*format_wav, debut, min(taille, len(contenu) - debut))
+        # Les blocs sont alignés sur deux octets
+        position = debut + taille + (taille & 1)
+    raise ValueError("WAV sans données.")
+
+
+def _son_pcm16(contenu, canaux: int, debut: int, taille: int, canaux_mixer: int) -> pygame.mixer.Sound:
+    # Vue sur le fichier projeté ; Sound copie les échantillons dans son propre tampon
+    echantillons = np.frombuffer(contenu, dtype="<i2", count=taille // 2, offset=debut)
+    echantillons = echantillons[: len(echantillons) // canaux * canaux].reshape(-1, canaux)
+    if canaux == 1 and canaux_mixer > 1:
+        echantillons = np.repeat(echantillons, canaux_mixer, axis=1)
+    return pygame.mixer.Sound(buffer=np.ascontiguousarray(echantillons, dtype=np.int16))
+
+
+def charger_son(chemin: Path) -> pygame.mixer.Sound:
+    """Son prêt à jouer ; le mixer doit être initialisé.
+
+    Un WAV PCM 16 bits à la fréquence du mixer est lu par ``mmap`` ; les
+    autres formats passent par le décodeur de SDL.
+    """
+    frequence_mixer, taille_mixer, canaux_mixer = pygame.mixer.get_init()
+    with open(chemin, "rb") as fichier, mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ) as contenu:
+        code, canaux, frequence, bits, debut, taille = _format_wav(contenu)
+        if (
+            code == 1
+            and bits == 16
+            and taille_mixer == -16
+            and frequence == frequence_mixer
+            and canaux in (1, canaux_mixer)
+        ):
+            return _son_pcm16(contenu, canaux, debut, taille, canaux_mixer)
+    return pygame.mixer.Sound(str(chemin))
@@ -0,0 +1,590 @@
+"""Serveur de parties multi-salles : règles de ``moteur`` sur asyncio, TCP local.
+
+Chaque salle joue une partie de Snake (``moteur.avancer``, comme
+``Jeu.mettre_a_jour``) à la cadence de son niveau ; tous les clients de la
+salle pilotent le même serpent et reçoivent, à chaque tick, un delta de
+quelques octets (tête ajoutée, queue retirée, nourriture déplacée, score,
+bonus) au lieu de l'état complet. L'état complet (``ETAT``) n'est envoyé
+qu'en rejoignant une salle, sur demande, et au début de chaque partie
+(la salle relance une partie dès que le serpent meurt).
+
+Une seule tâche cadence toutes les salles : un tas d'échéances, chaque
+salle due avance puis son message part vers ses clients sans attendre
+(``transport.write``) ; un client dont le tampon d'envoi dépasse
+``TAMPON_ENVOI_MAX`` est déconnecté plutôt que de ralentir les autres.
+
+Trames : longueur (u32, petit-boutiste) puis message, dont le premier octet
+est le type ::
+
+    client  REJOINDRE u32 salle | DIRECTION u8 code | DEMANDER_ETAT | DEMANDER_STATISTIQUES
+    serveur ETAT (voir encoder_etat) | DELTA (voir encoder_delta) | STATISTIQUES json
+
+``MiroirPartie`` applique ces messages à un ``EtatPartie`` local (client
+léger de ``Jeu``, essaim de ``benchmarks/essaim_salles.py``) et
+``ClientSalle`` en est le transport côté jeu.
+
+Exemple ::
+
+    python backend/salles.py --port 8770
+"""
+
+import argparse
+import asyncio
+import heapq
+import itertools
+import json
+import random
+import signal
+import socket
+import struct
+import threading
+import time
+from array import array
+from collections import deque
+from collections.abc import Callable
+
+import moteur
+from boucle import percentile
+from enregistrement import CODES_DIRECTIONS, DIRECTIONS
+from grille import BONUS, NOURRITURE
+from moteur import COLONNES, LIGNES, TYPES_BONUS, Bonus, EtatPartie, Nourriture, Serpent
+
+HOTE = "127.0.0.1"
+PORT = 8770
+
+# Types de message
+REJOINDRE = 1
+DIRECTION = 2
+DEMANDER_ETAT = 3
+DEMANDER_STATISTIQUES = 4
+ETAT = 10
+DELTA = 11
+STATISTIQUES = 12
+
+# Drapeaux d'un delta
+DEPLACEMENT = 1
+QUEUE_RETIREE = 2
+NOURRITURE_DEPLACEE = 4
+SCORE_CHANGE = 8
+BONUS_CHANGE = 16
+FIN = 32
+INVINCIBLE = 64
+
+LONGUEUR = struct.Struct("<I")
+ENTETE_ETAT = struct.Struct("<BHHIIHBBBBiiBHI")
+ENTETE_DELTA = struct.Struct("<BIB")
+CELLULE = struct.Struct("<I")
+CELLULE_OU_RIEN = struct.Struct("<i")
+SCORE = struct.Struct("<IHBB")
+BONUS_DELTA = struct.Struct("<iBH")
+AUCUN_BONUS = 255
+
+TAILLE_FILE_DIRECTIONS = 3
+TAILLE_MESSAGE_CLIENT_MAX = 64
+# Octets en attente d'envoi au-delà desquels un client trop lent est déconnecté
+TAMPON_ENVOI_MAX = 256 * 1024
+# Retard au-delà duquel une salle repart de maintenant au lieu de rattraper
+RETARD_MAX = 0.25
+# Attente maximale de la tâche de cadence (nouvelles salles)
+PAUSE_MAX = 0.01
+TAILLE_HISTORIQUE = 10_000
+
+
+def tramer(message: bytes) -> bytes:
+    return LONGUEUR.pack(len(message)) + message
+
+
+def _bonus(etat: EtatPartie) -> tuple[int, int, int]:
+    """Cellule, type (indice) et durée de vie restante du bonus, ou ``(-1, AUCUN_BONUS, 0)``."""
+    bonus = etat.bonus
+    if bonus is None or bonus.position is None:
+        return (-1, AUCUN_BONUS, 0)
+    return (etat.grille.cellule(*bonus.position), TYPES_BONUS.index(bonus.type), bonus.duree_vie)
+
+
+def _nourriture(etat: EtatPartie) -> int:
+    position = etat.nourriture.position
+    return -1 if position is None else etat.grille.cellule(*position)
+
+
+def _score(etat: EtatPartie) -> tuple[int, int, int, int]:
+    return (etat.score, etat.niveau, etat.vitesse_actuelle, etat.multiplicateur_score)
+
+
+def encoder_etat(etat: EtatPartie) -> bytes:
+    """État complet : en-tête ``ENTETE_ETAT`` puis les cellules du corps (u32), tête en premier."""
+    cellules = etat.serpent.corps.cellules()
+    entete = ENTETE_ETAT.pack(
+        ETAT,
+        etat.colonnes,
+        etat.lignes,
+        etat.frame_count,
+        *_score(etat),
+        etat.invincible,
+        CODES_DIRECTIONS[etat.serpent.direction],
+        _nourriture(etat),
+        *_bonus(etat),
+        len(cellules),
+    )
+    return entete + array("I", cellules).tobytes()
+
+
+def encoder_delta(
+    tick: int,
+    drapeaux: int,
+    tete: int = 0,
+    nourriture: int = -1,
+    score: tuple[int, int, int, int] = (0, 0, 0, 0),
+    bonus: tuple[int, int, int] = (-1, AUCUN_BONUS, 0),
+) -> bytes:
+    """Delta d'un tick : ``ENTETE_DELTA`` puis, selon ``drapeaux``, tête (u32),
+    nourriture (i32), score/niveau/vitesse/multiplicateur et bonus (cellule, type, durée)."""
+    morceaux = [ENTETE_DELTA.pack(DELTA, tick, drapeaux)]
+    if drapeaux & DEPLACEMENT:
+        morceaux.append(CELLULE.pack(tete))
+    if drapeaux & NOURRITURE_DEPLACEE:
+        morceaux.append(CELLULE_OU_RIEN.pack(nourriture))
+    if drapeaux & SCORE_CHANGE:
+        morceaux.append(SCORE.pack(*score))
+    if drapeaux & BONUS_CHANGE:
+        morceaux.append(BONUS_DELTA.pack(*bonus))
+    return b"".join(morceaux)
+
+
+class Salle:
+    """Une partie et ses clients ; ``avancer`` joue un tick et renvoie les trames à diffuser."""
+
+    def __init__(self, identifiant: int, graine: int, colonnes: int = COLONNES, lignes: int = LIGNES):
+        self.identifiant = identifiant
+        self.colonnes = colonnes
+        self.lignes = lignes
+        self.rng = random.Random(graine)
+        self.clients: set[asyncio.StreamWriter] = set()
+        self.parties = 0
+        self._directions: deque[tuple[int, int]] = deque(maxlen=TAILLE_FILE_DIRECTIONS)
+        self.nouvelle_partie()
+
+    def nouvelle_partie(self) -> None:
+        self.etat = moteur.nouvelle_partie(self.colonnes, self.lignes, graine=self.rng.getrandbits(32))
+        self._directions.clear()
+        self.parties += 1
+
+    def memoriser_direction(self, direction: tuple[int, int]) -> None:
+        # Même file que Jeu._memoriser_direction : un virage par tick, pas de demi-tour
+        derniere = self._directions[-1] if self._directions else self.etat.serpent.direction
+        if direction not in (derniere, (-derniere[0], -derniere[1])) and len(self._directions) < TAILLE_FILE_DIRECTIONS:
+            self._directions.append(direction)
+
+    def avancer(self) -> bytes:
+        etat = self.etat
+        corps = etat.serpent.corps
+        longueur = corps.longueur
+        tete = corps.cellule_segment(0)
+        nourriture = etat.nourriture.position
+        score = _score(etat)
+        bonus = _bonus(etat)[:2]
+        action = self._directions.popleft() if self._directions else None
+        evenements = moteur.avancer(etat, action)
+
+        if evenements & moteur.PARTIE_TERMINEE and not evenements & moteur.PLATEAU_REMPLI:
+            # Collision : le serpent n'a pas bougé, la salle relance une partie
+            self.nouvelle_partie()
+            return tramer(encoder_delta(etat.frame_count, FIN)) + tramer(encoder_etat(self.etat))
+
+        drapeaux = 0
+        # Serpent invincible arrêté par un bord ou son corps : pas de déplacement
+        if corps.cellule_segment(0) != tete:
+            drapeaux = DEPLACEMENT
+            if corps.longueur == longueur:
+                drapeaux |= QUEUE_RETIREE
+        if etat.nourriture.position != nourriture:
+            drapeaux |= NOURRITURE_DEPLACEE
+        nouveau_score = _score(etat)
+        if nouveau_score != score:
+            drapeaux |= SCORE_CHANGE
+        nouveau_bonus = _bonus(etat)
+        if nouveau_bonus[:2] != bonus:
+            drapeaux |= BONUS_CHANGE
+        if etat.invincible:
+            drapeaux |= INVINCIBLE
+        message = tramer(encoder_delta(
+            etat.frame_count, drapeaux, corps.cellule_segment(0), _nourriture(etat), nouveau_score, nouveau_bonus
+        ))
+        if evenements & moteur.PARTIE_TERMINEE:
+            # Plateau rempli : dernier déplacement, puis fin
+            self.nouvelle_partie()
+            message += tramer(encoder_delta(etat.frame_count, FIN)) + tramer(encoder_etat(self.etat))
+        return message
+
+
+def _direction_entre(depart: int, arrivee: int, colonnes: int, lignes: int) -> tuple[int, int]:
+    """Direction d'une case à sa voisine, bords traversés compris."""
+    y0, x0 = divmod(depart, colonnes)
+    y1, x1 = divmod(arrivee, colonnes)
+    dx = x1 - x0
+    dy = y1 - y0
+    if abs(dx) > 1:
+        dx = -1 if dx > 0 else 1
+    if abs(dy) > 1:
+        dy = -1 if dy > 0 else 1
+    return (dx, dy)
+
+
+class MiroirPartie:
+    """``EtatPartie`` local reconstruit à partir des messages du serveur.
+
+    ``fabrique_serpent(colonnes, lignes, depart)``, ``classe_nourriture`` et
+    ``classe_bonus`` permettent d'y mettre les classes graphiques de ``snake``.
+    ``etat`` vaut ``None`` jusqu'au premier ``ETAT``, puis change d'objet à
+    chaque nouvelle partie.
+    """
+
+    def __init__(
+        self,
+        fabrique_serpent: Callable[[int, int, tuple[int, int]], Serpent] = Serpent,
+        classe_nourriture: type[Nourriture] = Nourriture,
+        classe_bonus: type[Bonus] = Bonus,
+    ):
+        self.fabrique_serpent = fabrique_serpent
+        self.classe_nourriture = classe_nourriture
+        self.classe_bonus = classe_bonus
+        self.etat: EtatPartie | None = None
+        self.statistiques: dict | None = None
+
+    def appliquer(self, message: bytes) -> int:
+        """Applique un message ; renvoie les événements ``moteur`` correspondants."""
+        type_message = message[0]
+        if type_message == ETAT:
+            self._appliquer_etat(message)
+            return moteur.AUCUN_EVENEMENT
+        if type_message == DELTA:
+            return self._appliquer_delta(message)
+        if type_message == STATISTIQUES:
+            self.statistiques = json.loads(message[1:])
+            return moteur.AUCUN_EVENEMENT
+        raise ValueError(f"Message inconnu : {type_message}")
+
+    def _appliquer_etat(self, message: bytes) -> None:
+        (
+            _, colonnes, lignes, tick, score, niveau, vitesse, multiplicateur, invincible,
+            code_direction, nourriture, cellule_bonus, type_bonus, duree_bonus, nb_cellules,
+        ) = ENTETE_ETAT.unpack_from(message)
+        cellules = array("I")
+        cellules.frombytes(message[ENTETE_ETAT.size:ENTETE_ETAT.size + 4 * nb_cellules])
+        # Corps reposé de la queue à la tête pour retrouver l'anneau
+        y, x = divmod(cellules[-1], colonnes)
+        serpent = self.fabrique_serpent(colonnes, lignes, (x, y))
+        for precedente, cellule in zip(reversed(cellules), reversed(cellules[:-1])):
+            serpent.corps.bouger(_direction_entre(precedente, cellule, colonnes, lignes), True, True)
+        serpent.direction = DIRECTIONS[code_direction]
+        etat = EtatPartie(
+            serpent=serpent,
+            nourriture=self.classe_nourriture(),
+            rng=random.Random(),
+            colonnes=colonnes,
+            lignes=lignes,
+            classe_bonus=self.classe_bonus,
+            score=score,
+            niveau=niveau,
+            multiplicateur_score=multiplicateur,
+            vitesse_actuelle=vitesse,
+            invincible=bool(invincible),
+            frame_count=tick,
+        )
+        self.etat = etat
+        self._poser_nourriture(nourriture)
+        self._poser_bonus(cellule_bonus, type_bonus, duree_bonus)
+
+    def _poser_nourriture(self, cellule: int) -> None:
+        etat = self.etat
+        grille = etat.grille
+        if etat.nourriture.position is not None:
+            grille.effacer(grille.cellule(*etat.nourriture.position), NOURRITURE)
+        if cellule < 0:
+            etat.nourriture.position = None
+            return
+        grille.marquer(cellule, NOURRITURE)
+        etat.nourriture.position = grille.coordonnees(cellule)
+
+    def _poser_bonus(self, cellule: int, type_bonus: int, duree: int) -> None:
+        etat = self.etat
+        if etat.bonus is not None:
+            etat.bonus.retirer(etat.grille)
+            etat.bonus = None
+        if cellule < 0:
+            return
+        bonus = etat.bonus = self.classe_bonus(TYPES_BONUS[type_bonus])
+        bonus.duree_vie = duree
+        bonus.position = etat.grille.coordonnees(cellule)
+        etat.grille.marquer(cellule, BONUS)
+
+    def _appliquer_delta(self, message: bytes) -> int:
+        etat = self.etat
+        if etat is None:
+            return moteur.AUCUN_EVENEMENT
+        _, tick, drapeaux = ENTETE_DELTA.unpack_from(message)
+        if drapeaux & FIN:
+            etat.terminee = True
+            return moteur.PARTIE_TERMINEE
+        evenements = moteur.AUCUN_EVENEMENT
+        position = ENTETE_DELTA.size
+        etat.frame_count = tick
+        if drapeaux & DEPLACEMENT:
+            (tete,) = CELLULE.unpack_from(message, position)
+            position += CELLULE.size
+            corps = etat.serpent.corps
+            direction = _direction_entre(corps.cellule_segment(0), tete, etat.colonnes, etat.lignes)
+            etat.serpent.direction = direction
+            corps.bouger(direction, not drapeaux & QUEUE_RETIREE, True)
+        if drapeaux & NOURRITURE_DEPLACEE:
+            (nourriture,) = CELLULE_OU_RIEN.unpack_from(message, position)
+            position += CELLULE_OU_RIEN.size
+            self._poser_nourriture(nourriture)
+            evenements |= moteur.NOURRITURE_MANGEE
+        if drapeaux & SCORE_CHANGE:
+            etat.score, etat.niveau, etat.vitesse_actuelle, etat.multiplicateur_score = SCORE.unpack_from(
+                message, position
+            )
+            position += SCORE.size
+        if drapeaux & BONUS_CHANGE:
+            cellule, type_bonus, duree = BONUS_DELTA.unpack_from(message, position)
+            if etat.bonus is not None and cellule < 0 and etat.serpent.corps.tete == etat.bonus.position:
+                evenements |= moteur.BONUS_RAMASSE
+            self._poser_bonus(cellule, type_bonus, duree)
+        elif etat.bonus is not None:
+            etat.bonus.mise_a_jour()
+        etat.invincible = bool(drapeaux & INVINCIBLE)
+        # Pas de minuterie côté client : le clignotement suit le tick
+        etat.temps_invincible = tick if etat.invincible else 0
+        return evenements
+
+
+class ServeurSalles:
+    """Salles créées à la demande, cadencées par une seule tâche."""
+
+    def __init__(self, colonnes: int = COLONNES, lignes: int = LIGNES, graine: int = 0):
+        self.colonnes = colonnes
+        self.lignes = lignes
+        self.graine = graine
+        self.salles: dict[int, Salle] = {}
+        self._echeances: list[tuple[float, int, Salle]] = []
+        self._compteur = itertools.count()
+        self.ticks = 0
+        self.octets_envoyes = 0
+        self.clients_lents = 0
+        self.retards: deque[float] = deque(maxlen=TAILLE_HISTORIQUE)
+        self.durees_ticks: deque[float] = deque(maxlen=TAILLE_HISTORIQUE)
+
+    def rejoindre(self, identifiant: int, client: asyncio.StreamWriter) -> Salle:
+        salle = self.salles.get(identifiant)
+        if salle is None:
+            salle = self.salles[identifiant] = Salle(
+                identifiant, hash((self.graine, identifiant)), self.colonnes, self.lignes
+            )
+            echeance = time.perf_counter() + 1 / salle.etat.vitesse_actuelle
+            heapq.heappush(self._echeances, (echeance, next(self._compteur), salle))
+        salle.clients.add(client)
+        return salle
+
+    def quitter(self, salle: Salle, client: asyncio.StreamWriter) -> None:
+        salle.clients.discard(client)
+        if not salle.clients and self.salles.get(salle.identifiant) is salle:
+            # Son échéance sera ignorée par la tâche de cadence
+            del self.salles[salle.identifiant]
+
+    def envoyer(self, client: asyncio.StreamWriter, octets: bytes) -> None:
+        transport = client.transport
+        if transport.is_closing():
+            return
+        if transport.get_write_buffer_size() > TAMPON_ENVOI_MAX:
+            self.clients_lents += 1
+            transport.abort()
+            return
+        transport.write(octets)
+        self.octets_envoyes += len(octets)
+
+    def avancer_salles_dues(self, maintenant: float) -> None:
+        echeances = self._echeances
+        horloge = time.perf_counter
+        while echeances and echeances[0][0] <= maintenant:
+            echeance, _, salle = heapq.heappop(echeances)
+            if self.salles.get(salle.identifiant) is not salle:
+                continue
+            debut = horloge()
+            self.retards.append(debut - echeance)
+            message = salle.avancer()
+            for client in salle.clients:
+                self.envoyer(client, message)
+            self.ticks += 1
+            self.durees_ticks.append(horloge() - debut)
+            prochaine = echeance + 1 / salle.etat.vitesse_actuelle
+            if prochaine < debut - RETARD_MAX:
+                prochaine = debut
+            heapq.heappush(echeances, (prochaine, next(self._compteur), salle))
+
+    async def cadencer(self) -> None:
+        horloge = time.perf_counter
+        while True:
+            self.avancer_salles_dues(horloge())
+            attente = self._echeances[0][0] - horloge() if self._echeances else PAUSE_MAX
+            await asyncio.sleep(min(max(attente, 0), PAUSE_MAX))
+
+    def statistiques(self) -> dict[str, float]:
+        retards = [retard * 1000 for retard in self.retards]
+        durees = [duree * 1e6 for duree in self.durees_ticks]
+        return {
+            "salles": len(self.salles),
+            "clients": sum(len(salle.clients) for salle in self.salles.values()),
+            "ticks": self.ticks,
+            "octets_envoyes": self.octets_envoyes,
+            "clients_lents": self.clients_lents,
+            "retard_ms_p50": percentile(retards, 50),
+            "retard_ms_p99": percentile(retards, 99),
+            "retard_ms_max": max(retards, default=0.0),
+            "tick_us_p50": percentile(durees, 50),
+            "tick_us_p99": percentile(durees, 99),
+        }
+
+    async def traiter_connexion(self, lecteur: asyncio.StreamReader, ecrivain: asyncio.StreamWriter) -> None:
+        salle: Salle | None = None
+        try:
+            while True:
+                (longueur,) = LONGUEUR.unpack(await lecteur.readexactly(LONGUEUR.size))
+                if not 0 < longueur <= TAILLE_MESSAGE_CLIENT_MAX:
+                    return
+                message = await lecteur.readexactly(longueur)
+                type_message = message[0]
+                if type_message == REJOINDRE and longueur == 5:
+                    if salle is not None:
+                        self.quitter(salle, ecrivain)
+                    salle = self.rejoindre(CELLULE.unpack_from(message, 1)[0], ecrivain)
+                    self.envoyer(ecrivain, tramer(encoder_etat(salle.etat)))
+                elif type_message == DIRECTION and longueur == 2 and message[1] < len(DIRECTIONS):
+                    if salle is not None:
+                        salle.memoriser_direction(DIRECTIONS[message[1]])
+                elif type_message == DEMANDER_ETAT and salle is not None:
+                    self.envoyer(ecrivain, tramer(encoder_etat(salle.etat)))
+                elif type_message == DEMANDER_STATISTIQUES:
+                    corps = json.dumps(self.statistiques()).encode("utf-8")
+                    self.envoyer(ecrivain, tramer(bytes([STATISTIQUES]) + corps))
+                else:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+        finally:
+            if salle is not None:
+                self.quitter(salle, ecrivain)
+            ecrivain.close()
+
+
+def message_rejoindre(salle: int) -> bytes:
+    return tramer(bytes([REJOINDRE]) + CELLULE.pack(salle))
+
+
+def message_direction(direction: tuple[int, int]) -> bytes:
+    return tramer(bytes([DIRECTION, CODES_DIRECTIONS[direction]]))
+
+
+class ClientSalle:
+    """Connexion bloquante à une salle ; un thread empile les messages reçus."""
+
+    def __init__(self, hote: str = HOTE, port: int = PORT, salle: int = 0, delai: float = 2.0):
+        self._prise = socket.create_connection((hote, port), timeout=delai)
+        self._prise.settimeout(None)
+        self._prise.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._recus: deque[bytes] = deque()
+        self._premier = threading.Event()
+        self.connecte = True
+        # Plateau de la salle, connu au premier ETAT
+        self.dimensions: tuple[int, int] | None = None
+        self._prise.sendall(message_rejoindre(salle))
+        self._thread = threading.Thread(target=self._lire_en_boucle, name="client-salle", daemon=True)
+        self._thread.start()
+
+    def _lire_exactement(self, taille: int) -> bytes:
+        morceaux = bytearray()
+        while len(morceaux) < taille:
+            morceau = self._prise.recv(taille - len(morceaux))
+            if not morceau:
+                raise ConnectionError("connexion fermée par le serveur")
+            morceaux += morceau
+        return bytes(morceaux)
+
+    def _lire_en_boucle(self) -> None:
+        try:
+            while True:
+                (longueur,) = LONGUEUR.unpack(self._lire_exactement(LONGUEUR.size))
+                message = self._lire_exactement(longueur)
+                if self.dimensions is None and message[0] == ETAT:
+                    self.dimensions = ENTETE_ETAT.unpack_from(message)[1:3]
+                self._recus.append(message)
+                self._premier.set()
+        except OSError:
+            self.connecte = False
+            self._premier.set()
+
+    def attendre_etat(self, delai: float = 2.0) -> bool:
+        """Attend l'état de la salle ; ``False`` si rien n'est venu."""
+        self._premier.wait(delai)
+        return self.dimensions is not None
+
+    def recus(self) -> list[bytes]:
+        """Messages reçus depuis l'appel précédent, dans l'ordre."""
+        messages = []
+        recus = self._recus
+        while recus:
+            messages.append(recus.popleft())
+        return messages
+
+    def envoyer_direction(self, direction: tuple[int, int]) -> None:
+        try:
+            self._prise.sendall(message_direction(direction))
+        except OSError:
+            self.connecte = False
+
+    def fermer(self) -> None:
+        try:
+            self._prise.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._prise.close()
+        self._thread.join(timeout=1.0)
+
+
+async def servir(hote: str, port: int, colonnes: int, lignes: int, graine: int = 0) -> None:
+    """Sert jusqu'à SIGINT/SIGTERM."""
+    serveur_salles = ServeurSalles(colonnes, lignes, graine)
+    serveur = await asyncio.start_server(serveur_salles.traiter_connexion, hote, port)
+    for prise in serveur.sockets:
+        prise.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    adresse = serveur.sockets[0].getsockname()
+    print(f"Serveur de salles sur {adresse[0]}:{adresse[1]} ({colonnes}x{lignes})", flush=True)
+
+    arret = asyncio.Event()
+    boucle = asyncio.get_running_loop()
+    for signal_arret in (signal.SIGINT, signal.SIGTERM):
+        try:
+            boucle.add_signal_handler(signal_arret, arret.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+    cadence = asyncio.create_task(serveur_salles.cadencer())
+    try:
+        async with serveur:
+            await arret.wait()
+    finally:
+        cadence.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur de parties multi-salles du Snake")
+    parser.add_argument("--hote", default=HOTE)
+    parser.add_argument("--port", type=int, default=PORT, help="0 : port libre choisi par le système")
+    parser.add_argument("--colonnes", type=int, default=COLONNES)
+    parser.add_argument("--lignes", type=int, default=LIGNES)
+    parser.add_argument("--graine", type=int, default=0, help="graine des salles (parties reproductibles)")
+    arguments = parser.parse_args()
+    asyncio.run(servir(arguments.hote, arguments.port, arguments.colonnes, arguments.lignes, arguments.graine))
+
+
+if __name__ == "__main__":
+    main()
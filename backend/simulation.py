@@ -0,0 +1,248 @@
+"""Simulation de parties sans affichage, réparties sur plusieurs processus.
+
+Chaque partie utilise les règles de ``moteur`` (score, niveau tous les 50
+points, bonus) avec une graine et une politique de pilotage. Les parties
+sont distribuées par lots à un ``ProcessPoolExecutor`` : chaque tâche joue
+un lot de graines et renvoie des tuples compacts, ce qui limite le coût de
+sérialisation entre processus.
+
+Exemple ::
+
+    python backend/simulation.py --parties 100000 --politique glouton
+"""
+
+import argparse
+import importlib
+import os
+import random
+import sys
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import moteur
+from moteur import BAS, COLONNES, DROITE, GAUCHE, HAUT, LIGNES, TYPES_BONUS, EtatPartie
+from pilote import PiloteAutomatique
+
+DIRECTIONS = (HAUT, BAS, GAUCHE, DROITE)
+MAX_TICKS_DEFAUT = 20_000
+
+# Une politique reçoit l'état courant et renvoie une direction (ou None)
+Politique = Callable[[EtatPartie], tuple[int, int] | None]
+
+
+class ResultatPartie(NamedTuple):
+    graine: int
+    score: int
+    niveau: int
+    longueur: int
+    ticks: int
+    bonus_vitesse: int
+    bonus_points: int
+    bonus_invincible: int
+
+
+class PolitiqueAleatoire:
+    """Tourne au hasard avec une probabilité ``chance_virage`` par tick."""
+
+    def __init__(self, graine: int | None = None, chance_virage: float = 0.25):
+        self.rng = random.Random(graine)
+        self.chance_virage = chance_virage
+
+    def __call__(self, etat: EtatPartie) -> tuple[int, int] | None:
+        if self.rng.random() < self.chance_virage:
+            return self.rng.choice(DIRECTIONS)
+        return None
+
+
+class PolitiqueGloutonne:
+    """Se rapproche de la nourriture en évitant les collisions immédiates."""
+
+    def __init__(self, graine: int | None = None):
+        self.rng = random.Random(graine)
+
+    def __call__(self, etat: EtatPartie) -> tuple[int, int] | None:
+        corps = etat.serpent.corps
+        grille = corps.grille
+        x, y = corps.tete
+        cible = etat.nourriture.position
+        direction = etat.serpent.direction
+        candidats = []
+        for dx, dy in DIRECTIONS:
+            if (dx, dy) == (-direction[0], -direction[1]):
+                continue
+            nx, ny = x + dx, y + dy
+            # Même invincible, un bord ou le corps arrête le serpent
+            if not grille.dans_les_bords(nx, ny) or grille.est_occupee(nx, ny):
+                continue
+            distance = abs(cible[0] - nx) + abs(cible[1] - ny) if cible else 0
+            candidats.append((distance, self.rng.random(), (dx, dy)))
+        if not candidats:
+            return None
+        return min(candidats)[2]
+
+
+POLITIQUES: dict[str, Callable[[int | None], Politique]] = {
+    "aleatoire": PolitiqueAleatoire,
+    "glouton": PolitiqueGloutonne,
+    "pilote": PiloteAutomatique,
+}
+
+
+def creer_politique(nom: str, graine: int | None = None) -> Politique:
+    """Instancie une politique enregistrée ou désignée par ``module:fabrique``."""
+    if nom in POLITIQUES:
+        return POLITIQUES[nom](graine)
+    if ":" not in nom:
+        raise ValueError(f"Politique inconnue : {nom!r} (disponibles : {', '.join(POLITIQUES)})")
+    nom_module, nom_fabrique = nom.split(":", 1)
+    fabrique = getattr(importlib.import_module(nom_module), nom_fabrique)
+    return fabrique(graine)
+
+
+def jouer_partie(
+    graine: int,
+    politique: Politique,
+    colonnes: int = COLONNES,
+    lignes: int = LIGNES,
+    max_ticks: int = MAX_TICKS_DEFAUT,
+) -> ResultatPartie:
+    """Joue une partie complète (ou ``max_ticks`` ticks) et renvoie son bilan."""
+    etat = moteur.nouvelle_partie(colonnes, lignes, graine=graine)
+    avancer = moteur.avancer
+    while etat.frame_count < max_ticks:
+        if avancer(etat, politique(etat)) & moteur.PARTIE_TERMINEE:
+            break
+    collectes = etat.bonus_collectes
+    return ResultatPartie(
+        graine,
+        etat.score,
+        etat.niveau,
+        len(etat.serpent.positions),
+        etat.frame_count,
+        collectes["vitesse"],
+        collectes["points"],
+        collectes["invincible"],
+    )
+
+
+def _jouer_lot(
+    graines: range,
+    nom_politique: str,
+    colonnes: int,
+    lignes: int,
+    max_ticks: int,
+) -> list[tuple[int, ...]]:
+    # Tuples bruts : plus compacts à sérialiser que des ResultatPartie
+    return [
+        tuple(jouer_partie(graine, creer_politique(nom_politique, graine), colonnes, lignes, max_ticks))
+        for graine in graines
+    ]
+
+
+def _lots(debut: int, nb_parties: int, taille_lot: int) -> Iterator[range]:
+    fin = debut + nb_parties
+    for depart in range(debut, fin, taille_lot):
+        yield range(depart, min(depart + taille_lot, fin))
+
+
+def simuler(
+    nb_parties: int,
+    politique: str = "glouton",
+    processus: int | None = None,
+    graine: int = 0,
+    taille_lot: int | None = None,
+    colonnes: int = COLONNES,
+    lignes: int = LIGNES,
+    max_ticks: int = MAX_TICKS_DEFAUT,
+) -> list[ResultatPartie]:
+    """Joue ``nb_parties`` parties de graines ``graine .. graine + nb_parties - 1``.
+
+    ``politique`` est un nom de ``POLITIQUES`` ou ``module:fabrique`` (la
+    fabrique reçoit la graine de la partie). Avec ``processus=1`` tout est
+    joué dans le processus courant.
+    """
+    if nb_parties <= 0:
+        return []
+    processus = processus or os.cpu_count() or 1
+    if taille_lot is None:
+        # Assez de lots pour équilibrer la charge, assez gros pour amortir l'IPC
+        taille_lot = max(1, min(1000, nb_parties // (processus * 8) or 1))
+    creer_politique(politique)  # valide le nom avant de lancer les processus
+
+    lots = _lots(graine, nb_parties, taille_lot)
+    if processus == 1:
+        return [
+            ResultatPartie._make(r)
+            for lot in lots
+            for r in _jouer_lot(lot, politique, colonnes, lignes, max_ticks)
+        ]
+
+    resultats: list[ResultatPartie] = []
+    with ProcessPoolExecutor(max_workers=processus) as executeur:
+        futurs = [
+            executeur.submit(_jouer_lot, lot, politique, colonnes, lignes, max_ticks)
+            for lot in lots
+        ]
+        for futur in futurs:
+            resultats.extend(ResultatPartie._make(r) for r in futur.result())
+    return resultats
+
+
+def en_dataframe(resultats: list[ResultatPartie]):
+    """Convertit les résultats en ``pandas.DataFrame`` (une ligne par partie)."""
+    import pandas as pd
+
+    return pd.DataFrame.from_records(resultats, columns=ResultatPartie._fields)
+
+
+def resumer(resultats):
+    """Statistiques agrégées (moyenne, écart-type, quantiles) par colonne."""
+    df = resultats if hasattr(resultats, "describe") else en_dataframe(resultats)
+    colonnes = [c for c in df.columns if c != "graine"]
+    return df[colonnes].describe(percentiles=[0.5, 0.9, 0.99]).transpose()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Simule des parties de Snake sans affichage.")
+    parser.add_argument("--parties", type=int, default=10_000, help="nombre de parties à jouer")
+    parser.add_argument("--politique", default="glouton",
+                        help=f"{', '.join(POLITIQUES)} ou module:fabrique")
+    parser.add_argument("--processus", type=int, default=None, help="nombre de processus (défaut : tous les cœurs)")
+    parser.add_argument("--graine", type=int, default=0, help="graine de la première partie")
+    parser.add_argument("--taille-lot", type=int, default=None, help="parties par tâche envoyée aux processus")
+    parser.add_argument("--colonnes", type=int, default=COLONNES)
+    parser.add_argument("--lignes", type=int, default=LIGNES)
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS_DEFAUT)
+    parser.add_argument("--csv", help="fichier CSV où écrire les résultats par partie")
+    args = parser.parse_args(argv)
+
+    debut = time.perf_counter()
+    resultats = simuler(
+        args.parties,
+        politique=args.politique,
+        processus=args.processus,
+        graine=args.graine,
+        taille_lot=args.taille_lot,
+        colonnes=args.colonnes,
+        lignes=args.lignes,
+        max_ticks=args.max_ticks,
+    )
+    duree = time.perf_counter() - debut
+
+    df = en_dataframe(resultats)
+    if args.csv:
+        df.to_csv(args.csv, index=False)
+    ticks = int(df["ticks"].sum())
+    print(resumer(df).to_string(float_format=lambda v: f"{v:.2f}"))
+    print(f"\n{len(df)} parties, {ticks} ticks en {duree:.2f} s "
+          f"({len(df) / duree:.0f} parties/s, {ticks / duree:.0f} ticks/s)")
+    print("Bonus ramassés : " + ", ".join(
+        f"{type_bonus}={int(df[f'bonus_{type_bonus}'].sum())}" for type_bonus in TYPES_BONUS
+    ))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
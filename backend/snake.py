@@ -1,15 +1,53 @@
-import json
-import pygame
-import random
 import sys
-import colorsys
-import math
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import Any
-
-# Initialisation de Pygame
-pygame.init()
+from typing import TYPE_CHECKING, Any
+
+from demarrage import PROFIL_DEMARRAGE, ProfilDemarrage, importer_pygame, initialiser_son, ouvrir_fenetre, police
+
+# Pas de pygame.init() : les sous-systèmes sont initialisés à la demande
+pygame = importer_pygame()
+PROFIL_DEMARRAGE.marquer("import pygame")
+
+import numpy as np  # noqa: E402
+
+import moteur  # noqa: E402
+from boucle import Cadenceur, PasFixe, StatistiquesBoucle  # noqa: E402
+from camera import Camera, MiniCarte, cellules_marquees, segments_visibles  # noqa: E402
+from client_classement import URL_DEFAUT, ClientClassement  # noqa: E402
+from enregistrement import EXTENSION, Enregistrement, nouvelle_graine  # noqa: E402
+from grille import CORPS, NOURRITURE, Grille  # noqa: E402
+from profilage import (  # noqa: E402
+    FORMATS_EXPORT,
+    PHASE_AFFICHAGE,
+    PHASE_ATTENTE,
+    PHASE_DECOR,
+    PHASE_EVENEMENTS,
+    PHASE_HUD,
+    PHASE_OVERLAY,
+    PHASE_SERPENT,
+    PHASE_SIMULATION,
+    Profileur,
+)
+from moteur import BAS, DROITE, FPS, GAUCHE, HAUT, EtatPartie  # noqa: E402
+from plan_rendu import PlanRendu, compiler_plan  # noqa: E402
+from rendu import CacheSprites, CacheTextes, OverlayProfil, RenduIncremental  # noqa: E402
+from ressources import GestionnaireRessources, charger_son  # noqa: E402
+
+# Sous-systèmes optionnels importés à la demande : le client de salles
+# (asyncio), le stockage (sqlite3), les sauvegardes, l'arène et le pilote
+if TYPE_CHECKING:
+    from arene import Arene
+    from instantane import JournalSauvegarde
+    from pilote import PiloteAutomatique
+    from salles import ClientSalle, MiroirPartie
+    from stockage import Stockage
+
+PROFIL_DEMARRAGE.marquer("import des modules du jeu")
 
 # Constantes
 LARGEUR = 640
@@ -17,49 +55,38 @@ HAUTEUR = 480
 TAILLE_CELLULE = 20
 LIGNES = HAUTEUR // TAILLE_CELLULE
 COLONNES = LARGEUR // TAILLE_CELLULE
-FPS = 10
 
 # Fichiers de données
 DOSSIER_DONNEES = Path(__file__).resolve().parent / "data"
 FICHIER_SCORES = DOSSIER_DONNEES / "scores.json"
 FICHIER_SERPENTS = DOSSIER_DONNEES / "skins.json"
+FICHIER_BASE = DOSSIER_DONNEES / "snake.db"
+# Parties pas encore reçues par le service de classement (main.py)
+FICHIER_ATTENTE_CLASSEMENT = DOSSIER_DONNEES / "classement_en_attente.json"
+DOSSIER_PARTIES = DOSSIER_DONNEES / "parties"
+# Sauvegarde rapide (F5, reprise avec F9) et sauvegarde automatique (--reprendre)
+DOSSIER_SAUVEGARDES = DOSSIER_DONNEES / "sauvegardes"
+# Extension instantane.EXTENSION, répétée pour ne pas importer le module
+NOM_SAUVEGARDE_RAPIDE = "rapide.snks"
+NOM_SAUVEGARDE_AUTO = "auto.snks"
+# Budget par décision de --pilote sans valeur, pilote.BUDGET_DECISION_US :
+# pilote.py n'est importé que si le pilote automatique sert
+BUDGET_PILOTE_US = 500
+# Ticks entre deux sauvegardes automatiques ; sous grille.RESERVE_ANNEAU, le
+# corps se relit dans son anneau et la plupart des sauvegardes sont des deltas
+TICKS_SAUVEGARDE_AUTO = 10
+TYPES_STOCKAGE = ("sqlite", "fichiers")
 NB_SCORES_AFFICHES = 5
+TAILLE_CACHE_SPRITES = 4096
+TAILLE_CACHE_TEXTES = 512
+MODES_RENDU = ("complet", "incremental")
+FPS_AFFICHAGE = 60
+# Virages mémorisés d'avance (appliqués un par tick)
+TAILLE_FILE_DIRECTIONS = 3
 DOSSIER_ASSETS = Path(__file__).resolve().parent.parent / "assets"
 FICHIER_SON_MANGER = DOSSIER_ASSETS / "manger.wav"
 FICHIER_SON_COLLISION = DOSSIER_ASSETS / "collision.wav"
-
-
-def charger_scores(fichier: Path = FICHIER_SCORES) -> list[int]:
-    """Charge les scores sauvegardés depuis ``fichier``."""
-    if not fichier.exists():
-        return []
-
-    try:
-        with fichier.open("r", encoding="utf-8") as flux:
-            donnees = json.load(flux)
-    except (OSError, json.JSONDecodeError):
-        return []
-
-    if not isinstance(donnees, list):
-        return []
-
-    scores = []
-    for valeur in donnees:
-        try:
-            scores.append(int(valeur))
-        except (TypeError, ValueError):
-            continue
-
-    scores.sort(reverse=True)
-    return scores
-
-
-def sauvegarder_scores(scores: list[int], fichier: Path = FICHIER_SCORES) -> None:
-    """Enregistre ``scores`` dans ``fichier`` (tri décroissant)."""
-    fichier.parent.mkdir(parents=True, exist_ok=True)
-    scores_triees = sorted((int(score) for score in scores), reverse=True)
-    with fichier.open("w", encoding="utf-8") as flux:
-        json.dump(scores_triees, flux, ensure_ascii=False, indent=2)
+FICHIER_ICONE = DOSSIER_ASSETS / "snake-icon.svg"
 
 
 @dataclass(frozen=True)
@@ -248,24 +275,14 @@ SNAKE_SKINS_PAR_ID: dict[str, SnakeSkin] = {skin.identifiant: skin for skin in S
 ID_SKIN_DEFAUT = SNAKE_SKINS[0].identifiant
 
 
-def charger_progression_serpents(
-    fichier: Path = FICHIER_SERPENTS,
-) -> dict[str, Any]:
-    """Charge les serpents débloqués et le serpent actif."""
+def _progression_valide(donnees: dict[str, Any] | None) -> dict[str, Any]:
+    """Ne garde que des skins connus ; le skin par défaut est toujours acheté."""
 
-    progression_defaut = {
-        "achetes": [ID_SKIN_DEFAUT],
-        "actif": ID_SKIN_DEFAUT,
-    }
-
-    if not fichier.exists():
-        return progression_defaut
-
-    try:
-        with fichier.open("r", encoding="utf-8") as flux:
-            donnees = json.load(flux)
-    except (OSError, json.JSONDecodeError):
-        return progression_defaut
+    if donnees is None:
+        return {
+            "achetes": [ID_SKIN_DEFAUT],
+            "actif": ID_SKIN_DEFAUT,
+        }
 
     achetes = donnees.get("achetes")
     if not isinstance(achetes, list):
@@ -289,13 +306,7 @@ def charger_progression_serpents(
     }
 
 
-def sauvegarder_progression_serpents(
-    achetes: list[str],
-    actif: str,
-    fichier: Path = FICHIER_SERPENTS,
-) -> None:
-    """Sauvegarde la progression des serpents débloqués."""
-
+def _progression_normalisee(achetes: list[str], actif: str) -> tuple[list[str], str]:
     if actif not in SNAKE_SKINS_PAR_ID:
         actif = ID_SKIN_DEFAUT
 
@@ -307,9 +318,44 @@ def sauvegarder_progression_serpents(
     if ID_SKIN_DEFAUT not in uniques:
         uniques.append(ID_SKIN_DEFAUT)
 
-    fichier.parent.mkdir(parents=True, exist_ok=True)
-    with fichier.open("w", encoding="utf-8") as flux:
-        json.dump({"achetes": uniques, "actif": actif}, flux, ensure_ascii=False, indent=2)
+    return uniques, actif
+
+
+def charger_progression_serpents(
+    fichier: Path = FICHIER_SERPENTS,
+) -> dict[str, Any]:
+    """Charge les serpents débloqués et le serpent actif."""
+    from stockage import charger_progression_json
+
+    return _progression_valide(charger_progression_json(fichier))
+
+
+def sauvegarder_progression_serpents(
+    achetes: list[str],
+    actif: str,
+    fichier: Path = FICHIER_SERPENTS,
+) -> None:
+    """Sauvegarde la progression des serpents débloqués."""
+    from stockage import sauvegarder_progression_json
+
+    sauvegarder_progression_json(*_progression_normalisee(achetes, actif), fichier)
+
+
+def creer_stockage(type_stockage: str = "sqlite") -> "Stockage":
+    """Stockage de ``DOSSIER_DONNEES``, écrit en arrière-plan.
+
+    La base SQLite importe les fichiers JSON à sa création.
+    """
+    from stockage import StockageDiffere, StockageFichiers, StockageSQLite
+
+    if type_stockage == "fichiers":
+        stockage = StockageFichiers(DOSSIER_DONNEES, FICHIER_SCORES, FICHIER_SERPENTS)
+    elif type_stockage == "sqlite":
+        stockage = StockageSQLite(FICHIER_BASE, fichier_scores=FICHIER_SCORES, fichier_progression=FICHIER_SERPENTS)
+    else:
+        raise ValueError(f"Stockage inconnu : {type_stockage!r}")
+    return StockageDiffere(stockage)
+
 
 # Couleurs
 NOIR = (0, 0, 0)
@@ -325,14 +371,23 @@ GRIS = (60, 60, 60)
 ROSE = (255, 105, 180)
 VERT_FEUILLE = (46, 139, 87)
 
-# Directions
-HAUT = (0, -1)
-BAS = (0, 1)
-GAUCHE = (-1, 0)
-DROITE = (1, 0)
+# Sprites de segments partagés par tous les serpents (toutes parties confondues)
+CACHE_SPRITES = CacheSprites(TAILLE_CACHE_SPRITES)
+PROFIL_DEMARRAGE.marquer("catalogue des skins")
+
+
+def _cellules_voisines(a: tuple[int, int], b: tuple[int, int]) -> bool:
+    return abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
 
 
-class Snake:
+def _pixels_entre(depart: tuple[int, int], arrivee: tuple[int, int], alpha: float) -> tuple[int, int]:
+    return (
+        round((depart[0] + (arrivee[0] - depart[0]) * alpha) * TAILLE_CELLULE),
+        round((depart[1] + (arrivee[1] - depart[1]) * alpha) * TAILLE_CELLULE),
+    )
+
+
+class Snake(moteur.Serpent):
     # Constantes d'animation (éviter les magic numbers)
     VITESSE_ANIMATION = 0.25  # cycles par seconde
     DELTA_COULEUR = 0.10      # espacement de teinte entre segments
@@ -363,70 +418,29 @@ class Snake:
     ECART_YEUX = 4                 # espacement latéral entre les yeux
     DISTANCE_DIRECTION_YEUX = 4    # décalage des yeux vers l'avant
     DECALAGE_PUPILLE = 2           # déplacement des pupilles vers la direction
-    def __init__(self, skin: SnakeSkin | None = None):
-        self.skin = skin or SNAKE_SKINS_PAR_ID[ID_SKIN_DEFAUT]
-        self.positions = [(COLONNES // 2, LIGNES // 2)]
-        self.direction = DROITE
-        self.grandir = False
-        self._palette_couleurs = tuple(self.skin.couleurs)
-        self._options_skin = dict(self.skin.options_snake)
-
-        for attribut, valeur in self._options_skin.items():
-            setattr(self, attribut, valeur)
-        
-    def _couleur_arc_en_ciel(self, index_segment: int, current_time: float | None = None) -> tuple:
-        """Retourne une couleur arc‑en‑ciel (RGB) pour un segment.
-        L'effet est animé dans le temps et décalé par segment.
-        """
-        # Décalage temporel pour l'animation (secondes)
-        if current_time is None:
-            current_time = pygame.time.get_ticks() / 1000.0
-        # Vitesse de rotation des couleurs (cycles par seconde)
-        vitesse = self.VITESSE_ANIMATION
-        # Espacement de teinte entre segments
-        delta = self.DELTA_COULEUR  # 0.0–1.0
-        hue = (index_segment * delta + current_time * vitesse) % 1.0
-        r, g, b = colorsys.hsv_to_rgb(hue, 1.0, 1.0)
-        return (int(r * 255), int(g * 255), int(b * 255))
-
-    def _couleur_palette(self, index_segment: int, current_time: float | None = None) -> tuple[int, int, int]:
-        if not self._palette_couleurs:
-            return self._couleur_arc_en_ciel(index_segment, current_time)
-
-        palette = self._palette_couleurs
-        if current_time is None:
-            current_time = pygame.time.get_ticks() / 1000.0
 
-        defilement = float(self._options_skin.get("PALETTE_DEFILEMENT", 0.0))
-        decalage = 0
-        if defilement:
-            decalage = int(current_time * defilement) % len(palette)
+    # Les constantes ci-dessus sont les valeurs par défaut des options de skin
+    def __init__(
+        self,
+        skin: SnakeSkin | None = None,
+        colonnes: int = COLONNES,
+        lignes: int = LIGNES,
+        depart: tuple[int, int] | None = None,
+        grille: Grille | None = None,
+    ):
+        super().__init__(colonnes, lignes, depart, grille)
+        self.skin = skin or SNAKE_SKINS_PAR_ID[ID_SKIN_DEFAUT]
+        # Options du skin validées et résolues une fois pour toutes, voir plan_rendu.py
+        self.plan = plan_pour_skin(self.skin)
 
-        return palette[(index_segment + decalage) % len(palette)]
+        # Tête et queue avant le dernier tick, pour interpoler l'affichage
+        self._tete_precedente: tuple[int, int] | None = None
+        self._queue_precedente: tuple[int, int] | None = None
 
-    def _couleur_pulse(self, index_segment: int, current_time: float | None = None) -> tuple[int, int, int]:
-        base = self._palette_couleurs[0] if self._palette_couleurs else (100, 100, 100)
+    def _couleur_segment(self, index_segment: int, current_time: float | None = None) -> tuple[int, int, int]:
         if current_time is None:
             current_time = pygame.time.get_ticks() / 1000.0
-
-        vitesse = float(self._options_skin.get("PULSE_VITESSE", 1.5))
-        amplitude = float(self._options_skin.get("PULSE_AMPLITUDE", 0.4))
-        decalage = float(self._options_skin.get("PULSE_DECALE", 0.25))
-        phase = current_time * vitesse + index_segment * decalage
-        intensite = (math.sin(phase) + 1) / 2
-
-        return tuple(
-            max(0, min(255, int(c + (255 - c) * amplitude * intensite)))
-            for c in base
-        )
-
-    def _couleur_segment(self, index_segment: int, current_time: float | None = None) -> tuple[int, int, int]:
-        mode = getattr(self.skin, "couleur_mode", "rainbow")
-        if mode == "palette":
-            return self._couleur_palette(index_segment, current_time)
-        if mode == "pulse":
-            return self._couleur_pulse(index_segment, current_time)
-        return self._couleur_arc_en_ciel(index_segment, current_time)
+        return self.plan.couleur(index_segment, current_time)
 
     def _accentuer_couleur(self, couleur: tuple[int, int, int], boost: float) -> tuple[int, int, int]:
         """Éclaircit légèrement une couleur RGB."""
@@ -435,133 +449,258 @@ class Snake:
             for c in couleur
         )
         
-    def bouger(self):
-        tete = self.positions[0]
-        nouvelle_tete = (tete[0] + self.direction[0], tete[1] + self.direction[1])
-        
-        # Vérifier les bordures
-        if (nouvelle_tete[0] < 0 or nouvelle_tete[0] >= COLONNES or
-            nouvelle_tete[1] < 0 or nouvelle_tete[1] >= LIGNES):
+    def bouger(self, traverser_bords: bool = False) -> bool:
+        tete = self.corps.tete
+        queue = None if self.grandir else self.corps.queue
+        if not super().bouger(traverser_bords):
+            # Arrêté sur place (mode invincible) : rien à interpoler
+            self._tete_precedente = self._queue_precedente = None
             return False
-            
-        # Vérifier collision avec soi-même
-        if nouvelle_tete in self.positions:
-            return False
-            
-        self.positions.insert(0, nouvelle_tete)
-        
-        if not self.grandir:
-            self.positions.pop()
-        else:
-            self.grandir = False
-            
+        self._tete_precedente = tete
+        self._queue_precedente = queue
         return True
-    
-    def changer_direction(self, nouvelle_direction):
-        # Empêcher de faire demi-tour
-        if (self.direction[0] * -1, self.direction[1] * -1) != nouvelle_direction:
-            self.direction = nouvelle_direction
-    
-    def manger(self):
-        self.grandir = True
-        
-    def dessiner(self, ecran):
+
+    def pixels_interpoles(self, alpha: float) -> tuple[tuple[int, int], tuple[int, tuple[int, int]] | None]:
+        """Pixels de la tête et segment fantôme de la queue à ``alpha`` entre le tick
+        précédent (0) et le tick courant (1).
+
+        Le fantôme, ``(cellule quittée, pixels)`` ou ``None``, glisse de l'ancienne
+        queue vers la nouvelle. Pas d'interpolation à travers les bords.
+        """
+        arrivee = self.corps.tete
+        tete = (arrivee[0] * TAILLE_CELLULE, arrivee[1] * TAILLE_CELLULE)
+        fantome = None
+        if alpha >= 1.0:
+            return tete, fantome
+        depart = self._tete_precedente
+        if depart is not None and _cellules_voisines(depart, arrivee):
+            tete = _pixels_entre(depart, arrivee, alpha)
+        depart = self._queue_precedente
+        if depart is not None and self.corps.longueur > 1:
+            arrivee = self.corps.queue
+            if _cellules_voisines(depart, arrivee):
+                fantome = (self.corps.grille.cellule(*depart), _pixels_entre(depart, arrivee, alpha))
+        return tete, fantome
+
+    def indices_couleurs(self, current_time: float):
+        """Indices (dans la table du skin) des couleurs de tous les segments."""
+        return self.plan.indices_frame(self.corps.longueur, current_time)
+
+    def sprites_segment(self, rang: int, indice_couleur: int) -> tuple[pygame.Surface | None, pygame.Surface]:
+        """Ombre (ou ``None``) et sprite du segment ``rang`` pour une couleur de la table."""
+        plan = self.plan
+        couleur = plan.couleurs[indice_couleur]
+        if rang == 0:
+            couleur = self._accentuer_couleur(couleur, plan.eclat_tete)
+            ombre = self._sprite_ombre(plan.rayon_tete) if plan.ombre else None
+            return ombre, self._sprite_tete(couleur, self.direction)
+        ombre = self._sprite_ombre(plan.rayon_corps) if plan.ombre else None
+        return ombre, self._sprite_segment(couleur)
+
+    def dessiner(self, ecran, current_time: float | None = None, alpha: float = 1.0, camera: Camera | None = None):
         # Cache la valeur temporelle pour cette frame
-        current_time = pygame.time.get_ticks() / 1000.0
-        for i, position in enumerate(self.positions):
+        if current_time is None:
+            current_time = pygame.time.get_ticks() / 1000.0
+        if camera is not None:
+            self._dessiner_visible(ecran, current_time, alpha, camera)
+            return
+        plan = self.plan
+        pixels_tete, fantome = self.pixels_interpoles(alpha)
+        decalage_ombre_x, decalage_ombre_y = plan.decalage_ombre
+        sprite_ombre_corps = self._sprite_ombre(plan.rayon_corps) if plan.ombre else None
+        sprite_segment = self._sprite_segment
+        positions = self.positions
+        # Couleurs de tous les segments en une opération vectorisée
+        couleurs = plan.couleurs_frame(len(positions), current_time)
+        lots = []
+        for i, position in enumerate(positions):
             x = position[0] * TAILLE_CELLULE
             y = position[1] * TAILLE_CELLULE
-            couleur = self._couleur_segment(i, current_time)
-
-            est_tete = (i == 0)
-            rayon = self.RAYON_ANGLE_TETE if est_tete else self.RAYON_ANGLE_CORPS
-            if est_tete:
-                couleur = self._accentuer_couleur(couleur, self.ECLAT_TETE)
-
-            # Ombre portée pour du relief
-            if self.AFFICHER_OMBRE:
-                ombre_surface = pygame.Surface((TAILLE_CELLULE, TAILLE_CELLULE), pygame.SRCALPHA)
-                pygame.draw.rect(
-                    ombre_surface,
-                    self.COULEUR_OMBRE,
-                    ombre_surface.get_rect(),
-                    border_radius=rayon,
-                )
-                ecran.blit(ombre_surface, (x + self.DECALAGE_OMBRE[0], y + self.DECALAGE_OMBRE[1]))
-
-            segment_surface = pygame.Surface((TAILLE_CELLULE, TAILLE_CELLULE), pygame.SRCALPHA)
-            rect = segment_surface.get_rect()
-            pygame.draw.rect(segment_surface, couleur, rect, border_radius=rayon)
-
-            if self.AFFICHER_REFLET:
-                reflet_rect = pygame.Rect(0, 0, int(TAILLE_CELLULE * 0.65), int(TAILLE_CELLULE * 0.5))
-                reflet_rect.x += 3
-                reflet_rect.y += 2
-                pygame.draw.ellipse(segment_surface, self.COULEUR_REFLET, reflet_rect)
-
-            if self.AFFICHER_CONTOUR:
-                pygame.draw.rect(
-                    segment_surface,
-                    self.COULEUR_CONTOUR,
-                    rect,
-                    width=self.LARGEUR_CONTOUR,
-                    border_radius=rayon,
-                )
+            couleur = couleurs[i]
 
-            ecran.blit(segment_surface, (x, y))
-
-            if est_tete:
-                self._dessiner_tete(ecran, x, y, couleur)
-
-    def _dessiner_tete(self, ecran, x: int, y: int, couleur: tuple[int, int, int]):
+            if i == 0:
+                x, y = pixels_tete
+                couleur = self._accentuer_couleur(couleur, plan.eclat_tete)
+                sprite = self._sprite_tete(couleur, self.direction)
+                ombre = self._sprite_ombre(plan.rayon_tete) if plan.ombre else None
+            else:
+                sprite = sprite_segment(couleur)
+                ombre = sprite_ombre_corps
+
+            # Ombre portée pour du relief, puis le segment (même ordre de superposition)
+            if ombre is not None:
+                lots.append((ombre, (x + decalage_ombre_x, y + decalage_ombre_y)))
+            lots.append((sprite, (x, y)))
+
+        if fantome is not None:
+            x, y = fantome[1]
+            if sprite_ombre_corps is not None:
+                lots.append((sprite_ombre_corps, (x + decalage_ombre_x, y + decalage_ombre_y)))
+            lots.append((sprite_segment(couleurs[-1]), (x, y)))
+
+        ecran.blits(lots, doreturn=False)
+
+    def _dessiner_visible(self, ecran, current_time: float, alpha: float, camera: Camera) -> None:
+        """Comme ``dessiner``, décalé par ``camera`` et limité aux segments sous la fenêtre."""
+        plan = self.plan
+        pixels_tete, fantome = self.pixels_interpoles(alpha)
+        decalage_ombre_x, decalage_ombre_y = plan.decalage_ombre
+        sprite_ombre_corps = self._sprite_ombre(plan.rayon_corps) if plan.ombre else None
+        sprite_segment = self._sprite_segment
+        couleurs = plan.couleurs
+        colonnes = self.corps.grille.colonnes
+        camera_x, camera_y = camera.x, camera.y
+        lots = []
+
+        if camera.visible(pixels_tete):
+            x, y = pixels_tete[0] - camera_x, pixels_tete[1] - camera_y
+            couleur = self._accentuer_couleur(plan.couleur(0, current_time), plan.eclat_tete)
+            if plan.ombre:
+                lots.append((self._sprite_ombre(plan.rayon_tete), (x + decalage_ombre_x, y + decalage_ombre_y)))
+            lots.append((self._sprite_tete(couleur, self.direction), (x, y)))
+
+        # Rangs croissants : même ordre de superposition que le rendu complet
+        rangs, cellules = segments_visibles(self.corps, *camera.cellules_visibles())
+        indices = plan.indices_rangs(rangs, current_time).tolist()
+        for rang, cellule, indice in zip(rangs.tolist(), cellules.tolist(), indices):
+            if rang == 0:
+                continue
+            y, x = divmod(cellule, colonnes)
+            x = x * TAILLE_CELLULE - camera_x
+            y = y * TAILLE_CELLULE - camera_y
+            if sprite_ombre_corps is not None:
+                lots.append((sprite_ombre_corps, (x + decalage_ombre_x, y + decalage_ombre_y)))
+            lots.append((sprite_segment(couleurs[indice]), (x, y)))
+
+        if fantome is not None and camera.visible(fantome[1]):
+            x, y = fantome[1][0] - camera_x, fantome[1][1] - camera_y
+            if sprite_ombre_corps is not None:
+                lots.append((sprite_ombre_corps, (x + decalage_ombre_x, y + decalage_ombre_y)))
+            lots.append((sprite_segment(plan.couleur(self.corps.longueur - 1, current_time)), (x, y)))
+
+        ecran.blits(lots, doreturn=False)
+
+    def _sprite_ombre(self, rayon: int) -> pygame.Surface:
+        couleur_ombre = self.plan.couleur_ombre
+        cle = ("ombre", couleur_ombre, rayon)
+        sprite = CACHE_SPRITES.obtenir(cle)
+        if sprite is None:
+            sprite = pygame.Surface((TAILLE_CELLULE, TAILLE_CELLULE), pygame.SRCALPHA)
+            pygame.draw.rect(sprite, couleur_ombre, sprite.get_rect(), border_radius=rayon)
+            CACHE_SPRITES.ajouter(cle, sprite)
+        return sprite
+
+    def _sprite_segment(self, couleur: tuple[int, int, int]) -> pygame.Surface:
+        cle = (self.plan.cle_rendu, "corps", couleur)
+        sprite = CACHE_SPRITES.obtenir(cle)
+        if sprite is None:
+            sprite = CACHE_SPRITES.ajouter(cle, self._creer_sprite_segment(couleur, self.plan.rayon_corps))
+        return sprite
+
+    def _sprite_tete(self, couleur: tuple[int, int, int], direction: tuple[int, int]) -> pygame.Surface:
+        cle_rendu = self.plan.cle_rendu
+        sprite = CACHE_SPRITES.obtenir((cle_rendu, "tete", couleur, direction))
+        if sprite is None:
+            # Les quatre orientations (museau et yeux) sont pré-rendues ensemble
+            for orientation in (HAUT, BAS, GAUCHE, DROITE):
+                variante = self._creer_sprite_segment(couleur, self.plan.rayon_tete)
+                self._dessiner_tete(variante, 0, 0, couleur, orientation)
+                CACHE_SPRITES.ajouter((cle_rendu, "tete", couleur, orientation), variante)
+                if orientation == direction:
+                    sprite = variante
+        return sprite
+
+    def _creer_sprite_segment(self, couleur: tuple[int, int, int], rayon: int) -> pygame.Surface:
+        plan = self.plan
+        segment_surface = pygame.Surface((TAILLE_CELLULE, TAILLE_CELLULE), pygame.SRCALPHA)
+        rect = segment_surface.get_rect()
+        pygame.draw.rect(segment_surface, couleur, rect, border_radius=rayon)
+
+        if plan.reflet:
+            reflet_rect = pygame.Rect(0, 0, int(TAILLE_CELLULE * 0.65), int(TAILLE_CELLULE * 0.5))
+            reflet_rect.x += 3
+            reflet_rect.y += 2
+            pygame.draw.ellipse(segment_surface, plan.couleur_reflet, reflet_rect)
+
+        if plan.contour:
+            pygame.draw.rect(
+                segment_surface,
+                plan.couleur_contour,
+                rect,
+                width=plan.largeur_contour,
+                border_radius=rayon,
+            )
+        return segment_surface
+
+    def _dessiner_tete(
+        self,
+        ecran,
+        x: int,
+        y: int,
+        couleur: tuple[int, int, int],
+        direction: tuple[int, int] | None = None,
+    ):
         """Ajoute museau et yeux orientés sur la tête du serpent."""
+        plan = self.plan
         centre_x = x + TAILLE_CELLULE // 2
         centre_y = y + TAILLE_CELLULE // 2
-        dir_x, dir_y = self.direction
+        dir_x, dir_y = direction or self.direction
 
         # Museau légèrement plus clair dans la direction de déplacement
-        museau_couleur = self._accentuer_couleur(couleur, self.ECLAT_MUSEAU)
+        museau_couleur = self._accentuer_couleur(couleur, plan.eclat_museau)
         museau_centre = (
-            centre_x + dir_x * self.DECALAGE_MUSEAU,
-            centre_y + dir_y * self.DECALAGE_MUSEAU,
+            centre_x + dir_x * plan.decalage_museau,
+            centre_y + dir_y * plan.decalage_museau,
         )
         pygame.draw.circle(
             ecran,
             museau_couleur,
             (int(museau_centre[0]), int(museau_centre[1])),
-            self.RAYON_MUSEAU,
+            plan.rayon_museau,
         )
 
         # Calcul des yeux en fonction de la direction
         if dir_x != 0:
-            avance = dir_x * self.DISTANCE_DIRECTION_YEUX
-            lateral = self.ECART_YEUX
+            avance = dir_x * plan.distance_yeux
+            lateral = plan.ecart_yeux
             yeux = [
                 (centre_x + avance, centre_y - lateral),
                 (centre_x + avance, centre_y + lateral),
             ]
-            pupille_offset = (dir_x * self.DECALAGE_PUPILLE, 0)
+            pupille_offset = (dir_x * plan.decalage_pupille, 0)
         else:
-            avance = dir_y * self.DISTANCE_DIRECTION_YEUX
-            lateral = self.ECART_YEUX
+            avance = dir_y * plan.distance_yeux
+            lateral = plan.ecart_yeux
             yeux = [
                 (centre_x - lateral, centre_y + avance),
                 (centre_x + lateral, centre_y + avance),
             ]
-            pupille_offset = (0, dir_y * self.DECALAGE_PUPILLE)
+            pupille_offset = (0, dir_y * plan.decalage_pupille)
 
         for oeil in yeux:
-            pygame.draw.circle(ecran, self.COULEUR_YEUX, (int(oeil[0]), int(oeil[1])), self.RAYON_YEUX)
+            pygame.draw.circle(ecran, plan.couleur_yeux, (int(oeil[0]), int(oeil[1])), plan.rayon_yeux)
             pupille_centre = (oeil[0] + pupille_offset[0], oeil[1] + pupille_offset[1])
             pygame.draw.circle(
                 ecran,
-                self.COULEUR_PUPILLE,
+                plan.couleur_pupille,
                 (int(pupille_centre[0]), int(pupille_centre[1])),
-                self.RAYON_PUPILLE,
+                plan.rayon_pupille,
             )
 
 
-class Nourriture:
+# Un plan par skin du catalogue, validé et compilé au chargement du module
+PLANS_RENDU: dict[str, PlanRendu] = {skin.identifiant: compiler_plan(skin, Snake) for skin in SNAKE_SKINS}
+
+
+def plan_pour_skin(skin: SnakeSkin) -> PlanRendu:
+    """Plan compilé de ``skin`` (compilé et gardé à la première demande s'il n'est pas au catalogue)."""
+    plan = PLANS_RENDU.get(skin.identifiant)
+    if plan is None or plan.skin is not skin:
+        plan = PLANS_RENDU[skin.identifiant] = compiler_plan(skin, Snake)
+    return plan
+
+
+class Nourriture(moteur.Nourriture):
     # Paramètres visuels pour la pomme
     RAYON_POMME = TAILLE_CELLULE // 2 - 3
     LARGEUR_REFLET = int(TAILLE_CELLULE * 0.35)
@@ -572,122 +711,248 @@ class Nourriture:
     HAUTEUR_FEUILLE = 4
 
     def __init__(self):
-        self.position = None
-        # Sprite de la pomme pré‑rendu pour éviter une recréation à chaque frame
-        self.sprite_nourriture = self._creer_sprite_pomme()
-        self.generer()
+        super().__init__()
+        # Sprite de la pomme pré‑rendu une fois, partagé par toutes les parties
+        self.sprite_nourriture = RESSOURCES.obtenir("pomme")
 
-    def generer(self):
-        self.position = (random.randint(0, COLONNES - 1),
-                        random.randint(0, LIGNES - 1))
-
-    def _creer_sprite_pomme(self):
+    @classmethod
+    def creer_sprite_pomme(cls) -> pygame.Surface:
         surf = pygame.Surface((TAILLE_CELLULE, TAILLE_CELLULE), pygame.SRCALPHA).convert_alpha()
 
         centre = (TAILLE_CELLULE // 2, TAILLE_CELLULE // 2 + 2)
 
         # Corps principal de la pomme
-        pygame.draw.circle(surf, ROSE, centre, self.RAYON_POMME)
+        pygame.draw.circle(surf, ROSE, centre, cls.RAYON_POMME)
 
         # Légère variation pour simuler le volume
-        reflet_rect = pygame.Rect(0, 0, self.LARGEUR_REFLET, self.HAUTEUR_REFLET)
-        reflet_rect.center = (centre[0] - self.RAYON_POMME // 2, centre[1] - self.RAYON_POMME // 2)
+        reflet_rect = pygame.Rect(0, 0, cls.LARGEUR_REFLET, cls.HAUTEUR_REFLET)
+        reflet_rect.center = (centre[0] - cls.RAYON_POMME // 2, centre[1] - cls.RAYON_POMME // 2)
         reflet_couleur = (min(255, ROSE[0] + 20), min(255, ROSE[1] + 20), min(255, ROSE[2] + 20), 160)
         pygame.draw.ellipse(surf, reflet_couleur, reflet_rect)
 
         # Tige
-        tige_rect = pygame.Rect(0, 0, self.LARGEUR_TIGE, self.HAUTEUR_TIGE)
-        tige_rect.center = (centre[0], centre[1] - self.RAYON_POMME - self.HAUTEUR_TIGE // 2 + 2)
+        tige_rect = pygame.Rect(0, 0, cls.LARGEUR_TIGE, cls.HAUTEUR_TIGE)
+        tige_rect.center = (centre[0], centre[1] - cls.RAYON_POMME - cls.HAUTEUR_TIGE // 2 + 2)
         pygame.draw.rect(surf, MARRON, tige_rect)
 
         # Feuille verte à côté de la tige
-        feuille_rect = pygame.Rect(0, 0, self.LARGEUR_FEUILLE, self.HAUTEUR_FEUILLE)
+        feuille_rect = pygame.Rect(0, 0, cls.LARGEUR_FEUILLE, cls.HAUTEUR_FEUILLE)
         feuille_rect.midleft = (tige_rect.right, tige_rect.top)
         pygame.draw.ellipse(surf, VERT_FEUILLE, feuille_rect)
 
         return surf
 
-    def dessiner(self, ecran):
+    def dessiner(self, ecran, camera: Camera | None = None):
         # Afficher la pomme pré‑rendue
         x = self.position[0] * TAILLE_CELLULE
         y = self.position[1] * TAILLE_CELLULE
+        if camera is not None:
+            x -= camera.x
+            y -= camera.y
         ecran.blit(self.sprite_nourriture, (x, y))
 
 
-class Bonus:
+def _charger_son(chemin: Path) -> pygame.mixer.Sound | None:
+    # Sans sortie audio, le jeu reste muet
+    if not initialiser_son():
+        return None
+    return charger_son(chemin)
+
+
+# Chargées par un thread après la première frame, puis jamais rechargées
+RESSOURCES = GestionnaireRessources()
+RESSOURCES.declarer("pomme", Nourriture.creer_sprite_pomme)
+RESSOURCES.declarer("son_manger", lambda: _charger_son(FICHIER_SON_MANGER))
+RESSOURCES.declarer("son_collision", lambda: _charger_son(FICHIER_SON_COLLISION))
+RESSOURCES.declarer("icone", lambda: pygame.image.load(str(FICHIER_ICONE)))
+
+
+class Bonus(moteur.Bonus):
     def __init__(self, type_bonus):
-        self.type = type_bonus  # 'vitesse', 'points', 'invincible'
-        self.position = None
-        self.duree_vie = 150  # Disparaît après 150 frames
+        super().__init__(type_bonus)
         self.couleur = {
             'vitesse': JAUNE,
             'points': VIOLET,
             'invincible': ORANGE
         }[type_bonus]
-        
-    def generer(self, positions_interdites):
-        valide = False
-        while not valide:
-            self.position = (random.randint(0, COLONNES - 1), 
-                            random.randint(0, LIGNES - 1))
-            if self.position not in positions_interdites:
-                valide = True
     
-    def mise_a_jour(self):
-        self.duree_vie -= 1
-        return self.duree_vie > 0
-    
-    def dessiner(self, ecran):
+    @property
+    def visible(self) -> bool:
+        # Effet de clignotement quand il va disparaître
+        return self.duree_vie > 30 or self.duree_vie % 6 < 3
+
+    def dessiner(self, ecran, camera: Camera | None = None):
         if self.position:
             x = self.position[0] * TAILLE_CELLULE
             y = self.position[1] * TAILLE_CELLULE
-            # Effet de clignotement quand il va disparaître
-            if self.duree_vie > 30 or self.duree_vie % 6 < 3:
+            if camera is not None:
+                x -= camera.x
+                y -= camera.y
+            if self.visible:
                 pygame.draw.circle(ecran, self.couleur, 
                                  (x + TAILLE_CELLULE // 2, y + TAILLE_CELLULE // 2), 
                                  TAILLE_CELLULE // 2)
 
 
 class Jeu:
-    def __init__(self):
-        self.ecran = pygame.display.set_mode((LARGEUR, HAUTEUR))
-        pygame.display.set_caption("Snake")
-        self.horloge = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 36)
-        self.font_moyen = pygame.font.Font(None, 30)
-        self.font_petit = pygame.font.Font(None, 24)
+    def __init__(
+        self,
+        mode_rendu: str = "complet",
+        fps_affichage: int = FPS_AFFICHAGE,
+        profileur: Profileur | None = None,
+        stockage: "Stockage | None" = None,
+        client_classement: ClientClassement | None = None,
+        dossier_enregistrements: Path | None = None,
+        profil_demarrage: ProfilDemarrage | None = None,
+        colonnes: int = COLONNES,
+        lignes: int = LIGNES,
+        robots: int = 0,
+        pilote: "PiloteAutomatique | None" = None,
+        client_salle: "ClientSalle | None" = None,
+        dossier_sauvegardes: Path | None = None,
+    ):
+        if mode_rendu not in MODES_RENDU:
+            raise ValueError(f"Mode de rendu inconnu : {mode_rendu!r}")
+        # Client léger : la partie tourne dans une salle du serveur (salles.py),
+        # le jeu n'affiche que le miroir tenu à jour par ses deltas
+        self.client_salle = client_salle
+        self.miroir: MiroirPartie | None = None
+        if client_salle is not None:
+            if robots:
+                raise ValueError("Pas d'arène en client léger.")
+            if not client_salle.attendre_etat():
+                raise ConnectionError("Le serveur de salles n'a pas envoyé l'état de la salle.")
+            colonnes, lignes = client_salle.dimensions
+            import salles
+
+            self.miroir = salles.MiroirPartie(self._fabriquer_serpent_seul, Nourriture, Bonus)
+        if colonnes <= 0 or lignes <= 0:
+            raise ValueError("Le plateau doit contenir au moins une cellule.")
+        # Plateau plus grand que la fenêtre : caméra qui suit la tête et
+        # mini-carte. Arène (robots > 0) : caméra dans tous les cas, les
+        # serpents sont dessinés d'après la grille. Le rendu incrémental
+        # (plateau entier à l'écran, un seul serpent) est exclu dans les deux cas.
+        self.colonnes = colonnes
+        self.lignes = lignes
+        self.robots = robots
+        self.camera: Camera | None = None
+        self.mini_carte: MiniCarte | None = None
+        grand_plateau = colonnes > COLONNES or lignes > LIGNES
+        if grand_plateau or robots:
+            if mode_rendu == "incremental":
+                raise ValueError(
+                    "Le rendu incrémental demande un seul serpent et un plateau qui tient dans la fenêtre."
+                )
+            self.camera = Camera(colonnes, lignes, TAILLE_CELLULE, LARGEUR, HAUTEUR)
+        if grand_plateau:
+            self.mini_carte = MiniCarte(colonnes, lignes)
+        # Phases jusqu'à la première frame (None : pas de rapport)
+        self.profil_demarrage = profil_demarrage
+        self.ecran = ouvrir_fenetre((LARGEUR, HAUTEUR), "Snake")
+        self._marquer_demarrage("fenêtre")
+        # Textes et nombres rendus une seule fois, voir rendu.CacheTextes
+        self.textes = CacheTextes(TAILLE_CACHE_TEXTES)
         self.score_bouton_rect = pygame.Rect(LARGEUR - 70, 12, 50, 26)
-        self.scores = charger_scores()
-        self.meilleur_score = self.scores[0] if self.scores else 0
-
-        progression = charger_progression_serpents()
+        # Scores et progression des skins, voir stockage.py
+        self.stockage = stockage if stockage is not None else creer_stockage()
+        self.meilleur_score = self.stockage.meilleur_score()
+        # Envoi des scores au service de classement (None : hors ligne)
+        self.client_classement = client_classement
+        self._debut_partie = time.monotonic()
+
+        progression = _progression_valide(self.stockage.charger_progression())
         self.skins_debloques = set(progression["achetes"])
         skin_active = progression.get("actif", ID_SKIN_DEFAUT)
         self.skin_selectionnee = SNAKE_SKINS_PAR_ID.get(skin_active, SNAKE_SKINS_PAR_ID[ID_SKIN_DEFAUT])
         if self.skin_selectionnee.identifiant not in self.skins_debloques:
             self.skin_selectionnee = SNAKE_SKINS_PAR_ID[ID_SKIN_DEFAUT]
             self.skins_debloques.add(self.skin_selectionnee.identifiant)
+        self._marquer_demarrage("scores et progression")
 
         self.index_menu_selection = self._trouver_index_skin(self.skin_selectionnee.identifiant)
         self.message_menu = ""
         self.message_menu_couleur = BLANC
 
-        self.snake: Snake | None = None
-        self.nourriture: Nourriture | None = None
-        self.bonus: Bonus | None = None
-        self.score = 0
-        self.niveau = 1
-        self.multiplicateur_score = 1
-        self.vitesse_actuelle = FPS
-        self.invincible = False
-        self.temps_invincible = 0
-        self.temps_multiplicateur = 0
-        self.frame_count = 0
+        # Règles et état de la partie (sans pygame), voir moteur.py. Chaque
+        # partie a sa graine ; avec les virages, elle suffit à la rejouer
+        # (enregistrement.py), et le fichier est écrit en fin de partie si
+        # dossier_enregistrements est donné.
+        self.dossier_enregistrements = dossier_enregistrements
+        self.enregistrement: Enregistrement | None = None
+        self.partie: EtatPartie = self._creer_partie()
         self.score_enregistre = False
+        # Sauvegardes de la partie en cours, voir instantane.py (None : aucune).
+        # Une partie reprise après un arrêt brutal n'a pas d'enregistrement mais
+        # reste classée ; une partie rechargée (F9) ne l'est plus.
+        self.dossier_sauvegardes = dossier_sauvegardes
+        self.journal_sauvegarde: JournalSauvegarde | None = None
+        if dossier_sauvegardes is not None and client_salle is None and not robots:
+            import instantane
+
+            self.journal_sauvegarde = instantane.JournalSauvegarde(dossier_sauvegardes / NOM_SAUVEGARDE_AUTO)
+        self.partie_classee = False
         self.etat = "menu"
-        self.son_manger: pygame.mixer.Sound | None = None
-        self.son_collision: pygame.mixer.Sound | None = None
-        self._initialiser_audio()
+        # Boucle à pas fixe : simulation à la cadence du niveau, affichage à fps_affichage
+        self.fps_affichage = fps_affichage
+        self.pas_fixe = PasFixe()
+        self.statistiques_boucle = StatistiquesBoucle()
+        self._directions: deque[tuple[int, int]] = deque(maxlen=TAILLE_FILE_DIRECTIONS)
+
+        # Rendu par rectangles sales, basculable en jeu avec F2
+        self.rendu_incremental: RenduIncremental | None = None
+        if mode_rendu == "incremental":
+            self.basculer_mode_rendu()
+
+        # Profilage par phase (None : désactivé, aucun coût), panneau avec F3
+        self.profileur = profileur
+        self.overlay_profil: OverlayProfil | None = None
+        # Pilote automatique à la place du clavier, basculable en jeu avec F4 ;
+        # pas dans l'arène, où il n'y a pas de nourriture unique à viser
+        self.pilote = pilote
+        self.pilote_actif = pilote is not None and not robots
+        self._marquer_demarrage("état du jeu")
+
+    # Polices chargées au premier texte qui s'en sert
+    @cached_property
+    def font(self) -> pygame.font.Font:
+        return police(36)
+
+    @cached_property
+    def font_moyen(self) -> pygame.font.Font:
+        return police(30)
+
+    @cached_property
+    def font_petit(self) -> pygame.font.Font:
+        return police(24)
+
+    @cached_property
+    def font_overlay(self) -> pygame.font.Font:
+        return police(18)
+
+    def _marquer_demarrage(self, phase: str) -> None:
+        if self.profil_demarrage is not None:
+            self.profil_demarrage.marquer(phase)
+
+    def _ressources_chargees(self) -> None:
+        RESSOURCES.attendre()
+        icone = RESSOURCES.obtenir("icone")
+        if icone is not None:
+            pygame.display.set_icon(icone)
+        if self.profil_demarrage is not None:
+            print(self.profil_demarrage.rapport(), flush=True)
+
+    def basculer_mode_rendu(self) -> None:
+        if self.camera is not None:
+            # Grand plateau ou arène : rendu complet uniquement
+            return
+        if self.rendu_incremental is None:
+            self.rendu_incremental = RenduIncremental(TAILLE_CELLULE, COLONNES, LIGNES, fond=NOIR)
+        else:
+            self.rendu_incremental = None
+
+    @property
+    def mode_rendu(self) -> str:
+        return "complet" if self.rendu_incremental is None else "incremental"
 
     def _trouver_index_skin(self, identifiant: str) -> int:
         for index, skin in enumerate(SNAKE_SKINS):
@@ -696,14 +961,15 @@ class Jeu:
         return 0
 
     def _mettre_a_jour_meilleur_score(self) -> None:
-        self.meilleur_score = max(self.scores) if self.scores else 0
+        self.meilleur_score = self.stockage.meilleur_score()
 
     def _sauvegarder_progression(self) -> None:
         ordre = sorted(
             self.skins_debloques,
             key=lambda ident: (SNAKE_SKINS_PAR_ID[ident].cout, ident),
         )
-        sauvegarder_progression_serpents(list(ordre), self.skin_selectionnee.identifiant)
+        achetes, actif = _progression_normalisee(list(ordre), self.skin_selectionnee.identifiant)
+        self.stockage.sauvegarder_progression(achetes, actif)
 
     def _peut_acheter_skin(self, skin: SnakeSkin) -> bool:
         if skin.identifiant in self.skins_debloques:
@@ -729,19 +995,48 @@ class Jeu:
             self.message_menu = "Score insuffisant pour débloquer ce serpent."
             self.message_menu_couleur = ROUGE
 
-    def _initialiser_nouvelle_partie(self) -> None:
-        self.snake = Snake(self.skin_selectionnee)
-        self.nourriture = Nourriture()
-        self.bonus = None
-        self.score = 0
-        self.niveau = 1
-        self.multiplicateur_score = 1
-        self.vitesse_actuelle = FPS
-        self.invincible = False
-        self.temps_invincible = 0
-        self.temps_multiplicateur = 0
-        self.frame_count = 0
+    def _creer_partie(self, graine: int | None = None) -> "EtatPartie | Arene":
+        if self.client_salle is not None:
+            # La partie de la salle continue pendant le menu : on rattrape son état
+            self.enregistrement = None
+            self._appliquer_messages_salle()
+            return self.miroir.etat
+        if self.robots:
+            # Les parties d'arène ne sont ni enregistrées ni classées
+            self.enregistrement = None
+            from arene import Arene
+
+            return Arene(self.colonnes, self.lignes, self.robots, graine, fabrique=self._fabriquer_serpent)
+        self.enregistrement = Enregistrement(
+            nouvelle_graine() if graine is None else graine, self.colonnes, self.lignes
+        )
+        return self.enregistrement.nouvelle_partie(
+            serpent=Snake(self.skin_selectionnee, self.colonnes, self.lignes),
+            nourriture=Nourriture(),
+            classe_bonus=Bonus,
+        )
+
+    def _fabriquer_serpent_seul(self, colonnes: int, lignes: int, depart: tuple[int, int]) -> Snake:
+        # Partie reconstruite ailleurs (salle du serveur, sauvegarde) avec le skin du joueur
+        return Snake(self.skin_selectionnee, colonnes, lignes, depart)
+
+    def _fabriquer_serpent(self, identifiant: int, grille: Grille, depart: tuple[int, int]) -> Snake:
+        # Le joueur avec son skin, les robots avec ceux du catalogue à tour de rôle
+        skin = self.skin_selectionnee if identifiant == 0 else SNAKE_SKINS[identifiant % len(SNAKE_SKINS)]
+        return Snake(skin, grille.colonnes, grille.lignes, depart, grille)
+
+    def _initialiser_nouvelle_partie(self, graine: int | None = None) -> None:
+        self._commencer_partie(self._creer_partie(graine))
+        self.partie_classee = self.enregistrement is not None
+
+    def _commencer_partie(self, partie: "EtatPartie | Arene") -> None:
+        self.partie = partie
+        self._directions.clear()
+        if self.pilote is not None:
+            self.pilote.reinitialiser()
+        self.pas_fixe.reinitialiser()
         self.score_enregistre = False
+        self._debut_partie = time.monotonic()
         self.etat = "jeu"
         self.message_menu = ""
 
@@ -750,30 +1045,10 @@ class Jeu:
         self.index_menu_selection = self._trouver_index_skin(self.skin_selectionnee.identifiant)
         self.message_menu = ""
         self.message_menu_couleur = BLANC
-        self.vitesse_actuelle = FPS
-        self.snake = None
-        self.nourriture = None
-        self.bonus = None
-
-    def _initialiser_audio(self) -> None:
-        try:
-            if not pygame.mixer.get_init():
-                pygame.mixer.init()
-        except pygame.error:
-            return
 
-        self.son_manger = self._charger_son(FICHIER_SON_MANGER)
-        self.son_collision = self._charger_son(FICHIER_SON_COLLISION)
-
-    def _charger_son(self, chemin: Path) -> pygame.mixer.Sound | None:
-        if not chemin.exists():
-            return None
-        try:
-            return pygame.mixer.Sound(str(chemin))
-        except (pygame.error, OSError):
-            return None
-
-    def _jouer_son(self, son: pygame.mixer.Sound | None) -> None:
+    def _jouer_son(self, nom: str) -> None:
+        # Tant que le thread des ressources ne l'a pas chargé, le son est muet
+        son = RESSOURCES.obtenir(nom, attendre=False)
         if not son:
             return
         try:
@@ -783,34 +1058,40 @@ class Jeu:
 
     def _declencher_game_over(self) -> None:
         self.etat = "game_over"
-        self._enregistrer_score_si_necessaire()
-        self._jouer_son(self.son_collision)
+        if self.partie_classee:
+            self._enregistrer_score_si_necessaire()
+        if self.enregistrement is not None:
+            self._sauvegarder_enregistrement()
+        if self.journal_sauvegarde is not None:
+            self.journal_sauvegarde.effacer()
+        self._jouer_son("son_collision")
 
     def _dessiner_menu(self) -> None:
         self.ecran.fill((15, 15, 18))
 
-        score_label = self.font_petit.render("Score", True, BLANC)
+        textes = self.textes
+        score_label = textes.rendre(self.font_petit, "Score", BLANC)
         self.ecran.blit(score_label, (40, 12))
 
-        score_valeur = self.font_petit.render(str(self.score), True, BLANC)
+        score_valeur = textes.rendre_nombre(self.font_petit, self.partie.score, BLANC)
         self.ecran.blit(score_valeur, (40, 34))
 
         pygame.draw.rect(self.ecran, GRIS, self.score_bouton_rect, border_radius=6)
-        bouton_score = self.font_petit.render("+1", True, BLANC)
+        bouton_score = textes.rendre(self.font_petit, "+1", BLANC)
         rect_score = bouton_score.get_rect(center=self.score_bouton_rect.center)
         self.ecran.blit(bouton_score, rect_score)
 
-        titre = self.font_moyen.render("Sélection des serpents", True, BLANC)
+        titre = textes.rendre(self.font_moyen, "Sélection des serpents", BLANC)
         self.ecran.blit(titre, titre.get_rect(center=(LARGEUR // 2, 30)))
 
-        instructions = self.font_petit.render(
+        instructions = textes.rendre(
+            self.font_petit,
             "↑↓ : naviguer  •  ENTRÉE : sélectionner  •  ESPACE : jouer",
-            True,
             GRIS,
         )
         self.ecran.blit(instructions, instructions.get_rect(center=(LARGEUR // 2, 55)))
 
-        meilleur = self.font_petit.render(f"Meilleur score : {self.meilleur_score}", True, BLANC)
+        meilleur = textes.rendre_nombre(self.font_petit, self.meilleur_score, BLANC, "Meilleur score : ")
         self.ecran.blit(meilleur, (40, 75))
 
         base_y = 100
@@ -831,7 +1112,7 @@ class Jeu:
             else:
                 couleur_nom = BLANC
 
-            nom_surface = self.font_petit.render(f"{skin.nom} - {skin.cout} pts", True, couleur_nom)
+            nom_surface = textes.rendre(self.font_petit, f"{skin.nom} - {skin.cout} pts", couleur_nom)
             self.ecran.blit(nom_surface, (rect.x + 12, rect.y + 4))
 
             if actif and debloque:
@@ -843,38 +1124,106 @@ class Jeu:
             else:
                 statut = ("Verrouillé", ROUGE)
 
-            statut_surface = self.font_petit.render(statut[0], True, statut[1])
+            statut_surface = textes.rendre(self.font_petit, statut[0], statut[1])
             self.ecran.blit(statut_surface, (rect.x + 12, rect.y + 20))
 
         if self.message_menu:
-            message_surface = self.font_petit.render(self.message_menu, True, self.message_menu_couleur)
+            message_surface = textes.rendre(self.font_petit, self.message_menu, self.message_menu_couleur)
             message_rect = message_surface.get_rect(center=(LARGEUR // 2, HAUTEUR - 15))
             self.ecran.blit(message_surface, message_rect)
 
     def _enregistrer_score_si_necessaire(self):
         if not self.score_enregistre:
-            self.scores.append(self.score)
-            self.scores.sort(reverse=True)
-            sauvegarder_scores(self.scores)
+            self.stockage.ajouter_score(self.partie.score)
+            if self.client_classement is not None:
+                self.client_classement.soumettre(
+                    {
+                        "score": self.partie.score,
+                        "skin": self.skin_selectionnee.identifiant,
+                        "niveau": self.partie.niveau,
+                        "duree": round(time.monotonic() - self._debut_partie, 3),
+                    }
+                )
             self.score_enregistre = True
             self._mettre_a_jour_meilleur_score()
 
+    def _sauvegarder_enregistrement(self) -> None:
+        self.enregistrement.terminer(self.partie)
+        if self.dossier_enregistrements is None:
+            return
+        nom = f"{time.strftime('%Y%m%d-%H%M%S')}-{self.partie.score}{EXTENSION}"
+        # Quelques centaines d'octets, écrits hors de la boucle d'affichage
+        threading.Thread(
+            target=self.enregistrement.sauvegarder,
+            args=(self.dossier_enregistrements / nom,),
+            name="enregistrement-partie",
+        ).start()
+
+    def sauvegarder_partie(self) -> Path | None:
+        """Sauvegarde rapide de la partie en cours (F5), écrite hors de la boucle d'affichage."""
+        if self.etat != "jeu" or self.journal_sauvegarde is None:
+            return None
+        import instantane
+
+        chemin = self.dossier_sauvegardes / NOM_SAUVEGARDE_RAPIDE
+        # Capturée ici, encodée et écrite pendant que la partie continue : un journal d'un seul instantané
+        capture = instantane.capturer(self.partie)
+        threading.Thread(
+            target=instantane.ecrire_sauvegarde, args=(chemin, capture), name="sauvegarde-rapide"
+        ).start()
+        return chemin
+
+    def reprendre_partie(self, automatique: bool = False) -> bool:
+        """Reprend la sauvegarde rapide (F9) ou, avec ``automatique``, la
+        sauvegarde automatique ; ``False`` s'il n'y a rien à reprendre.
+
+        Seule la reprise automatique (la partie interrompue, dont le journal
+        est effacé dès la fin de partie) reste classée : rechargée, une
+        sauvegarde rapide se rejouerait à volonté jusqu'au meilleur score. Une
+        partie rechargée n'est pas non plus sauvegardée automatiquement.
+        """
+        if self.journal_sauvegarde is None:
+            return False
+        self.journal_sauvegarde.valider()
+        import instantane
+
+        nom = NOM_SAUVEGARDE_AUTO if automatique else NOM_SAUVEGARDE_RAPIDE
+        try:
+            partie = instantane.charger(
+                self.dossier_sauvegardes / nom,
+                fabrique_serpent=self._fabriquer_serpent_seul,
+                classe_nourriture=Nourriture,
+                classe_bonus=Bonus,
+            )
+        except (OSError, ValueError):
+            # Sauvegarde illisible (autre version, fichier abîmé) : on reste où on est
+            return False
+        if partie is None or partie.terminee or (partie.colonnes, partie.lignes) != (self.colonnes, self.lignes):
+            return False
+        if not automatique:
+            # La partie quittée ne sera pas reprise à sa place
+            self.journal_sauvegarde.effacer()
+        self.enregistrement = None
+        self._commencer_partie(partie)
+        self.partie_classee = automatique
+        return True
+
     def _scores_a_afficher(self) -> list[tuple[str, int, bool]]:
         scores_affiches: list[tuple[str, int, bool]] = []
         score_courant_marque = False
 
-        for indice, score in enumerate(self.scores[:NB_SCORES_AFFICHES], start=1):
+        for indice, score in enumerate(self.stockage.meilleurs_scores(NB_SCORES_AFFICHES), start=1):
             est_courant = False
-            if not score_courant_marque and score == self.score:
+            if not score_courant_marque and score == self.partie.score:
                 est_courant = True
                 score_courant_marque = True
             scores_affiches.append((f"{indice}.", score, est_courant))
 
         if not score_courant_marque:
-            scores_affiches.append(("Vous", self.score, True))
+            scores_affiches.append(("Vous", self.partie.score, True))
 
         if not scores_affiches:
-            scores_affiches.append(("Vous", self.score, True))
+            scores_affiches.append(("Vous", self.partie.score, True))
 
         return scores_affiches
         
@@ -885,9 +1234,19 @@ class Jeu:
             elif evenement.type == pygame.MOUSEBUTTONDOWN:
                 if evenement.button == 1 and self.etat == "menu":
                     if self.score_bouton_rect.collidepoint(evenement.pos):
-                        self.score += 1
+                        self.partie.score += 1
             elif evenement.type == pygame.KEYDOWN:
-                if self.etat == "menu":
+                if evenement.key == pygame.K_F2:
+                    self.basculer_mode_rendu()
+                elif evenement.key == pygame.K_F3:
+                    self.basculer_overlay_profil()
+                elif evenement.key == pygame.K_F4:
+                    self.basculer_pilote()
+                elif evenement.key == pygame.K_F5:
+                    self.sauvegarder_partie()
+                elif evenement.key == pygame.K_F9:
+                    self.reprendre_partie()
+                elif self.etat == "menu":
                     if evenement.key in (pygame.K_UP, pygame.K_w):
                         self.index_menu_selection = (self.index_menu_selection - 1) % len(SNAKE_SKINS)
                         self.message_menu = ""
@@ -909,16 +1268,14 @@ class Jeu:
                                 self._sauvegarder_progression()
                             self._initialiser_nouvelle_partie()
                 elif self.etat == "jeu":
-                    if not self.snake:
-                        continue
                     if evenement.key == pygame.K_UP:
-                        self.snake.changer_direction(HAUT)
+                        self._memoriser_direction(HAUT)
                     elif evenement.key == pygame.K_DOWN:
-                        self.snake.changer_direction(BAS)
+                        self._memoriser_direction(BAS)
                     elif evenement.key == pygame.K_LEFT:
-                        self.snake.changer_direction(GAUCHE)
+                        self._memoriser_direction(GAUCHE)
                     elif evenement.key == pygame.K_RIGHT:
-                        self.snake.changer_direction(DROITE)
+                        self._memoriser_direction(DROITE)
                     elif evenement.key == pygame.K_ESCAPE:
                         self._retour_menu_depuis_game_over()
                 elif self.etat == "game_over":
@@ -926,144 +1283,184 @@ class Jeu:
                         self._retour_menu_depuis_game_over()
         return True
     
+    def _memoriser_direction(self, direction: tuple[int, int]) -> None:
+        # Les touches sont lues à chaque frame d'affichage, plusieurs fois par
+        # tick : chaque virage est joué à son propre tick pour qu'un double
+        # virage rapide ne soit ni perdu ni pris pour un demi-tour.
+        derniere = self._directions[-1] if self._directions else self.partie.serpent.direction
+        demi_tour = (-derniere[0], -derniere[1])
+        if direction not in (derniere, demi_tour) and len(self._directions) < TAILLE_FILE_DIRECTIONS:
+            self._directions.append(direction)
+
+    def _appliquer_messages_salle(self) -> int:
+        evenements = moteur.AUCUN_EVENEMENT
+        for message in self.client_salle.recus():
+            evenements |= self.miroir.appliquer(message)
+        return evenements
+
+    def _mettre_a_jour_client(self) -> None:
+        # Virages envoyés au serveur (qui les joue un par tick), deltas reçus appliqués
+        client = self.client_salle
+        if self.pilote_actif:
+            self._directions.clear()
+            action = self.pilote(self.partie)
+            if action is not None:
+                client.envoyer_direction(action)
+        while self._directions:
+            client.envoyer_direction(self._directions.popleft())
+        evenements = self._appliquer_messages_salle()
+        self.partie = self.miroir.etat
+        if evenements & moteur.NOURRITURE_MANGEE:
+            self._jouer_son("son_manger")
+        if evenements & moteur.PARTIE_TERMINEE:
+            # La salle relance aussitôt une partie, l'état suit dans les messages
+            self._jouer_son("son_collision")
+        if not client.connecte:
+            self._declencher_game_over()
+
     def mettre_a_jour(self):
-        if self.etat != "jeu" or not self.snake or not self.nourriture:
+        if self.etat != "jeu":
+            return
+        if self.client_salle is not None:
+            self._mettre_a_jour_client()
             return
 
-        self.frame_count += 1
-
-        # Gérer les effets temporaires
-        if self.temps_invincible > 0:
-            self.temps_invincible -= 1
-            if self.temps_invincible == 0:
-                self.invincible = False
-
-        if self.temps_multiplicateur > 0:
-            self.temps_multiplicateur -= 1
-            if self.temps_multiplicateur == 0:
-                self.multiplicateur_score = 1
-
-        # Mouvement du serpent
-        if not self.snake.bouger():
-            if not self.invincible:
-                self._declencher_game_over()
-                return
-            # En mode invincible, téléporter de l'autre côté
-            tete = self.snake.positions[0]
-            if tete in self.snake.positions[1:]:
-                self._declencher_game_over()
-                return
-            nouvelle_tete = list(tete)
-            if tete[0] < 0:
-                nouvelle_tete[0] = COLONNES - 1
-            elif tete[0] >= COLONNES:
-                nouvelle_tete[0] = 0
-            if tete[1] < 0:
-                nouvelle_tete[1] = LIGNES - 1
-            elif tete[1] >= LIGNES:
-                nouvelle_tete[1] = 0
-            self.snake.positions[0] = tuple(nouvelle_tete)
-
-        # Vérifier si le serpent mange la nourriture
-        if self.snake.positions[0] == self.nourriture.position:
-            self.snake.manger()
-            self._jouer_son(self.son_manger)
-            self.score += 10 * self.multiplicateur_score
-
-            # Augmenter le niveau tous les 50 points
-            if self.score % 50 == 0:
-                self.niveau += 1
-                self.vitesse_actuelle = min(FPS + self.niveau * 2, 30)
-
-            # Générer nouvelle nourriture
-            positions_interdites = self.snake.positions[:]
-            if self.bonus:
-                positions_interdites.append(self.bonus.position)
-            while self.nourriture.position in positions_interdites:
-                self.nourriture.generer()
-
-            # Chance de générer un bonus (20%)
-            if random.random() < 0.2 and not self.bonus:
-                type_bonus = random.choice(['vitesse', 'points', 'invincible'])
-                self.bonus = Bonus(type_bonus)
-                self.bonus.generer(self.snake.positions + [self.nourriture.position])
-
-        # Gérer les bonus
-        if self.bonus:
-            if not self.bonus.mise_a_jour():
-                self.bonus = None
-            elif self.snake.positions[0] == self.bonus.position:
-                # Appliquer l'effet du bonus
-                if self.bonus.type == 'vitesse':
-                    self.vitesse_actuelle = max(5, self.vitesse_actuelle - 3)
-                elif self.bonus.type == 'points':
-                    self.multiplicateur_score = 3
-                    self.temps_multiplicateur = 100
-                elif self.bonus.type == 'invincible':
-                    self.invincible = True
-                    self.temps_invincible = 150
-
-                self.score += 5 * self.multiplicateur_score
-                self.bonus = None
+        if self.pilote_actif:
+            self._directions.clear()
+            action = self.pilote(self.partie)
+        else:
+            action = self._directions.popleft() if self._directions else None
+        if self.robots:
+            evenements = self.partie.avancer(action)
+        else:
+            if action is not None and self.enregistrement is not None:
+                self.enregistrement.noter(self.partie.frame_count, action)
+            evenements = moteur.avancer(self.partie, action)
+        if evenements & moteur.NOURRITURE_MANGEE:
+            self._jouer_son("son_manger")
+        if evenements & moteur.PARTIE_TERMINEE:
+            self._declencher_game_over()
+        elif (
+            self.journal_sauvegarde is not None
+            and self.partie_classee
+            and self.partie.frame_count % TICKS_SAUVEGARDE_AUTO == 0
+        ):
+            self.journal_sauvegarde.sauvegarder(self.partie)
     
-    def dessiner(self):
-        if self.etat == "menu":
-            self._dessiner_menu()
-            pygame.display.flip()
+    def _lignes_hud(self) -> list[tuple[pygame.Surface, tuple[int, int]]]:
+        """Lignes du HUD de la partie : ``(surface, position)``, tirées du cache de textes."""
+        partie = self.partie
+        textes = self.textes
+        lignes = [
+            (textes.rendre_nombre(self.font, partie.score, BLANC, "Score: "), (10, 10)),
+            (textes.rendre_nombre(self.font_petit, partie.niveau, BLANC, "Niveau: "), (10, 50)),
+        ]
+        y_effet = 80
+        if partie.multiplicateur_score > 1:
+            multiplicateur = textes.rendre_nombre(self.font_petit, partie.multiplicateur_score, VIOLET, "Points x")
+            lignes.append((multiplicateur, (10, y_effet)))
+            y_effet += 25
+
+        if partie.invincible:
+            lignes.append((textes.rendre(self.font_petit, "INVINCIBLE!", ORANGE), (10, y_effet)))
+            y_effet += 25
+
+        if partie.vitesse_actuelle < FPS:
+            lignes.append((textes.rendre(self.font_petit, "Vitesse boost!", JAUNE), (10, y_effet)))
+            y_effet += 25
+
+        if self.pilote_actif:
+            lignes.append((textes.rendre(self.font_petit, "Pilote automatique", BLANC), (10, y_effet)))
+        return lignes
+
+    def _bordure_invincible(self) -> tuple[tuple[int, int, int], int] | None:
+        # Effet visuel pour l'invincibilité
+        if self.partie.invincible and self.partie.temps_invincible % 10 < 5:
+            return (ORANGE, 3)
+        return None
+
+    def dessiner(self, alpha: float = 1.0):
+        """Dessine l'écran courant ; ``alpha`` interpole le serpent entre deux ticks."""
+        marquer = self.profileur.marquer if self.profileur is not None else None
+        if self.etat == "jeu" and self.rendu_incremental is not None:
+            lignes_hud = self._lignes_hud()
+            if marquer:
+                marquer(PHASE_HUD)
+            # En rendu incrémental, la phase « serpent » couvre tout le plateau
+            rects = self.rendu_incremental.dessiner(
+                self.ecran, self.partie, lignes_hud, self._bordure_invincible(), alpha=alpha
+            )
+            if marquer:
+                marquer(PHASE_SERPENT)
+            if self.overlay_profil is not None:
+                rects.append(self._dessiner_overlay())
+                if marquer:
+                    marquer(PHASE_OVERLAY)
+            if rects:
+                pygame.display.update(rects)
+            if marquer:
+                marquer(PHASE_AFFICHAGE)
             return
+        if self.rendu_incremental is not None:
+            self.rendu_incremental.invalider()
 
-        self.ecran.fill(NOIR)
-
-        if self.etat == "jeu" and self.snake and self.nourriture:
-            # Effet visuel pour l'invincibilité
-            if self.invincible and self.temps_invincible % 10 < 5:
-                pygame.draw.rect(self.ecran, ORANGE, (0, 0, LARGEUR, HAUTEUR), 3)
-
-            self.snake.dessiner(self.ecran)
-            self.nourriture.dessiner(self.ecran)
-
-            if self.bonus:
-                self.bonus.dessiner(self.ecran)
-
-            texte_score = self.font.render(f"Score: {self.score}", True, BLANC)
-            self.ecran.blit(texte_score, (10, 10))
-
-            texte_niveau = self.font_petit.render(f"Niveau: {self.niveau}", True, BLANC)
-            self.ecran.blit(texte_niveau, (10, 50))
-
-            y_effet = 80
-            if self.multiplicateur_score > 1:
-                texte_multi = self.font_petit.render(f"Points x{self.multiplicateur_score}", True, VIOLET)
-                self.ecran.blit(texte_multi, (10, y_effet))
-                y_effet += 25
+        if self.etat == "menu":
+            self._dessiner_menu()
+        else:
+            self.ecran.fill(NOIR)
+
+        if self.etat == "jeu":
+            partie = self.partie
+            bordure = self._bordure_invincible()
+            if bordure is not None:
+                pygame.draw.rect(self.ecran, bordure[0], (0, 0, LARGEUR, HAUTEUR), bordure[1])
+            if marquer:
+                marquer(PHASE_DECOR)
+
+            camera = self.camera
+            if camera is not None:
+                camera.suivre(partie.serpent.pixels_interpoles(alpha)[0])
+            if self.robots:
+                self._dessiner_arene(alpha)
+            else:
+                partie.serpent.dessiner(self.ecran, alpha=alpha, camera=camera)
+            if marquer:
+                marquer(PHASE_SERPENT)
+            if self.robots:
+                self._dessiner_nourriture_arene()
+            else:
+                partie.nourriture.dessiner(self.ecran, camera)
 
-            if self.invincible:
-                texte_invincible = self.font_petit.render("INVINCIBLE!", True, ORANGE)
-                self.ecran.blit(texte_invincible, (10, y_effet))
-                y_effet += 25
+            if partie.bonus:
+                partie.bonus.dessiner(self.ecran, camera)
+            if self.mini_carte is not None:
+                self._dessiner_mini_carte()
+            if marquer:
+                marquer(PHASE_DECOR)
 
-            if self.vitesse_actuelle < FPS:
-                texte_vitesse = self.font_petit.render("Vitesse boost!", True, JAUNE)
-                self.ecran.blit(texte_vitesse, (10, y_effet))
+            self.ecran.blits(self._lignes_hud(), doreturn=False)
+            if marquer:
+                marquer(PHASE_HUD)
 
         elif self.etat == "game_over":
-            texte_game_over = self.font.render("GAME OVER", True, ROUGE)
+            textes = self.textes
+            texte_game_over = textes.rendre(self.font, "GAME OVER", ROUGE)
             rect_go = texte_game_over.get_rect(center=(LARGEUR // 2, HAUTEUR // 2 - 60))
             self.ecran.blit(texte_game_over, rect_go)
 
-            texte_score_final = self.font.render(f"Score final: {self.score}", True, BLANC)
+            texte_score_final = textes.rendre_nombre(self.font, self.partie.score, BLANC, "Score final: ")
             rect_sf = texte_score_final.get_rect(center=(LARGEUR // 2, HAUTEUR // 2 - 10))
             self.ecran.blit(texte_score_final, rect_sf)
 
-            skin_actif = self.font_petit.render(f"Serpent: {self.skin_selectionnee.nom}", True, BLANC)
+            skin_actif = textes.rendre(self.font_petit, f"Serpent: {self.skin_selectionnee.nom}", BLANC)
             rect_skin = skin_actif.get_rect(center=(LARGEUR // 2, HAUTEUR // 2 + 20))
             self.ecran.blit(skin_actif, rect_skin)
 
-            texte_rejouer = self.font.render("ESPACE pour retourner au menu", True, BLANC)
+            texte_rejouer = textes.rendre(self.font, "ESPACE pour retourner au menu", BLANC)
             rect_r = texte_rejouer.get_rect(center=(LARGEUR // 2, HAUTEUR // 2 + 70))
             self.ecran.blit(texte_rejouer, rect_r)
 
-            titre_scores = self.font.render("Top scores", True, BLANC)
+            titre_scores = textes.rendre(self.font, "Top scores", BLANC)
             rect_titre = titre_scores.get_rect()
             rect_titre.midtop = (LARGEUR // 2, rect_r.bottom + 30)
             self.ecran.blit(titre_scores, rect_titre)
@@ -1071,29 +1468,298 @@ class Jeu:
             y_ligne = rect_titre.bottom + 10
             for etiquette, score, est_courant in self._scores_a_afficher():
                 separateur = ":" if not etiquette.endswith(".") else ""
-                texte = f"{etiquette}{separateur} {score}"
                 couleur = VERT if est_courant else BLANC
-                rendu = self.font_petit.render(texte, True, couleur)
+                rendu = textes.rendre_nombre(self.font_petit, score, couleur, f"{etiquette}{separateur} ")
                 rect_ligne = rendu.get_rect()
                 rect_ligne.midtop = (LARGEUR // 2, y_ligne)
                 self.ecran.blit(rendu, rect_ligne)
                 y_ligne += 24
 
+        if marquer and self.etat != "jeu":
+            marquer(PHASE_DECOR)
+        if self.overlay_profil is not None:
+            self._dessiner_overlay()
+            if marquer:
+                marquer(PHASE_OVERLAY)
         pygame.display.flip()
+        if marquer:
+            marquer(PHASE_AFFICHAGE)
+
+    def _dessiner_arene(self, alpha: float) -> None:
+        """Serpents de l'arène qui ont une case sous la caméra, le joueur par-dessus."""
+        arene = self.partie
+        camera = self.camera
+        # Deux cases de marge : une tête interpolée peut entrer dans la fenêtre
+        cellules = cellules_marquees(arene.grille, CORPS, *camera.cellules_visibles(marge=2))
+        proprietaires = np.frombuffer(arene.proprietaires, dtype=np.dtype("l"))[cellules]
+        temps = pygame.time.get_ticks() / 1000.0
+        for identifiant in np.unique(proprietaires).tolist():
+            if identifiant != 0:
+                arene.serpents[identifiant].dessiner(self.ecran, temps, alpha, camera)
+        arene.serpent.dessiner(self.ecran, temps, alpha, camera)
+
+    def _dessiner_nourriture_arene(self) -> None:
+        pomme = RESSOURCES.obtenir("pomme")
+        camera = self.camera
+        colonnes = self.partie.grille.colonnes
+        lots = []
+        for cellule in cellules_marquees(self.partie.grille, NOURRITURE, *camera.cellules_visibles()).tolist():
+            y, x = divmod(cellule, colonnes)
+            lots.append((pomme, (x * TAILLE_CELLULE - camera.x, y * TAILLE_CELLULE - camera.y)))
+        self.ecran.blits(lots, doreturn=False)
+
+    def _dessiner_mini_carte(self) -> pygame.Rect:
+        partie = self.partie
+        mini_carte = self.mini_carte
+        if self.robots:
+            mini_carte.mettre_a_jour(*(serpent.corps for serpent in partie.serpents))
+            points = []
+        else:
+            mini_carte.mettre_a_jour(partie.serpent.corps)
+            points = [(partie.nourriture.position, ROUGE)] if partie.nourriture.position is not None else []
+        if partie.bonus and partie.bonus.position and partie.bonus.visible:
+            points.append((partie.bonus.position, partie.bonus.couleur))
+        position = (8, HAUTEUR - mini_carte.hauteur - 8)
+        return mini_carte.dessiner(self.ecran, position, self.camera, points)
+
+    def _dessiner_overlay(self) -> pygame.Rect:
+        largeur, hauteur = self.overlay_profil.surface.get_size()
+        return self.overlay_profil.dessiner(self.ecran, (LARGEUR - largeur - 8, HAUTEUR - hauteur - 8))
+
+    def basculer_pilote(self) -> None:
+        """Confie le serpent au pilote automatique, ou le rend au clavier (hors arène)."""
+        if self.robots:
+            return
+        if self.pilote is None:
+            from pilote import PiloteAutomatique
+
+            self.pilote = PiloteAutomatique()
+        self.pilote.reinitialiser()
+        self.pilote_actif = not self.pilote_actif
+
+    def basculer_overlay_profil(self) -> None:
+        """Affiche ou masque le panneau de profilage (et active le profileur au besoin)."""
+        if self.overlay_profil is not None:
+            self.overlay_profil = None
+            if self.rendu_incremental is not None:
+                self.rendu_incremental.invalider()
+            return
+        if self.profileur is None:
+            self.profileur = Profileur()
+        self.overlay_profil = OverlayProfil(self.profileur, self.font_overlay, reference_ms=1000 / self.fps_affichage)
     
-    def executer(self):
+    def executer(
+        self,
+        afficher_statistiques: bool = False,
+        export_profil: Path | None = None,
+        format_profil: str | None = None,
+    ):
         en_cours = True
+        cadenceur = Cadenceur(self.fps_affichage)
+        statistiques = self.statistiques_boucle
+        pas_fixe = self.pas_fixe
+        premiere_frame = True
+        ressources_en_attente = True
         while en_cours:
+            profileur = self.profileur
+            if profileur is not None:
+                profileur.debut_frame()
+            maintenant = time.perf_counter()
+            statistiques.frame(maintenant)
+            pas_fixe.demarrer_frame(maintenant)
             en_cours = self.gerer_evenements()
-            self.mettre_a_jour()
-            self.dessiner()
-            cadence = self.vitesse_actuelle if self.etat == "jeu" else FPS
-            self.horloge.tick(cadence)
-        
+            if profileur is not None:
+                profileur.marquer(PHASE_EVENEMENTS)
+
+            # Autant de ticks que le temps écoulé en contient, à la cadence du niveau
+            while self.etat == "jeu" and pas_fixe.tick_du(self.partie.vitesse_actuelle):
+                self.mettre_a_jour()
+                statistiques.tick(time.perf_counter(), self.partie.vitesse_actuelle)
+            if self.etat != "jeu":
+                pas_fixe.reinitialiser()
+                statistiques.interrompre_ticks()
+            if profileur is not None:
+                profileur.marquer(PHASE_SIMULATION)
+
+            self.dessiner(pas_fixe.alpha(self.partie.vitesse_actuelle) if self.etat == "jeu" else 1.0)
+            if premiere_frame:
+                # Menu affiché : sons, icône et sprites se chargent derrière
+                premiere_frame = False
+                self._marquer_demarrage("première frame")
+                RESSOURCES.demarrer(self.profil_demarrage)
+            elif ressources_en_attente and RESSOURCES.pretes:
+                ressources_en_attente = False
+                self._ressources_chargees()
+            cadenceur.attendre()
+            if profileur is not None:
+                profileur.marquer(PHASE_ATTENTE)
+
+        # Fenêtre fermée (pygame.QUIT) : on vide la file d'écriture avant de sortir
+        self.stockage.fermer()
+        if self.client_classement is not None:
+            self.client_classement.fermer()
+        if self.client_salle is not None:
+            self.client_salle.fermer()
+        if self.journal_sauvegarde is not None:
+            self.journal_sauvegarde.fermer()
+        if afficher_statistiques:
+            for cle, valeur in statistiques.resume().items():
+                print(f"{cle}: {valeur:.2f}")
+            for cle, valeur in self.stockage.statistiques().items():
+                print(f"stockage_{cle}: {valeur:.2f}")
+            if self.client_classement is not None:
+                for cle, valeur in self.client_classement.statistiques().items():
+                    print(f"classement_{cle}: {valeur:.2f}")
+            for nom, duree in RESSOURCES.statistiques().items():
+                print(f"ressource_{nom}_ms: {duree:.2f}")
+            if self.pilote is not None:
+                for cle, valeur in self.pilote.statistiques().items():
+                    print(f"pilote_{cle}: {valeur:.2f}")
+            if self.journal_sauvegarde is not None:
+                for cle, valeur in self.journal_sauvegarde.statistiques().items():
+                    print(f"sauvegarde_{cle}: {valeur:.2f}")
+        if export_profil is not None and self.profileur is not None:
+            print(f"Profil exporté : {self.profileur.exporter(export_profil, format_profil)}")
+        RESSOURCES.attendre()
         pygame.quit()
         sys.exit()
 
 
+def _adresse(texte: str) -> tuple[str, int]:
+    hote, _, port = texte.rpartition(":")
+    return (hote or "127.0.0.1", int(port))
+
+
 if __name__ == "__main__":
-    jeu = Jeu()
-    jeu.executer()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Snake")
+    parser.add_argument(
+        "--rendu",
+        choices=MODES_RENDU,
+        default="complet",
+        help="rendu complet ou par rectangles sales (basculable en jeu avec F2)",
+    )
+    parser.add_argument(
+        "--stockage",
+        choices=TYPES_STOCKAGE,
+        default="sqlite",
+        help="scores et progression dans data/snake.db (défaut) ou dans les fichiers JSON",
+    )
+    parser.add_argument(
+        "--classement",
+        default=URL_DEFAUT,
+        metavar="URL",
+        help="service de classement qui reçoit les scores (lancé par start.sh)",
+    )
+    parser.add_argument("--hors-ligne", action="store_true", help="n'envoie pas les scores au service de classement")
+    parser.add_argument(
+        "--enregistrer",
+        type=Path,
+        nargs="?",
+        const=DOSSIER_PARTIES,
+        metavar="DOSSIER",
+        help="enregistre chaque partie (graine + virages) pour la rejouer avec enregistrement.py",
+    )
+    parser.add_argument("--fps", type=int, default=FPS_AFFICHAGE, help="fréquence d'affichage")
+    parser.add_argument(
+        "--colonnes",
+        type=int,
+        default=COLONNES,
+        help="largeur du plateau en cellules ; au-delà de la fenêtre, une caméra suit la tête",
+    )
+    parser.add_argument("--lignes", type=int, default=LIGNES, help="hauteur du plateau en cellules")
+    parser.add_argument(
+        "--arene",
+        type=int,
+        default=0,
+        metavar="ROBOTS",
+        help="arène : le joueur et ROBOTS serpents robots sur le même plateau",
+    )
+    parser.add_argument(
+        "--pilote",
+        type=int,
+        nargs="?",
+        const=BUDGET_PILOTE_US,
+        metavar="BUDGET_US",
+        help="le pilote automatique joue (F4 pour reprendre la main), BUDGET_US µs par décision",
+    )
+    parser.add_argument(
+        "--serveur",
+        type=_adresse,
+        metavar="HOTE:PORT",
+        help="client léger : joue dans une salle du serveur de salles (backend/salles.py)",
+    )
+    parser.add_argument("--salle", type=int, default=0, help="salle à rejoindre avec --serveur")
+    parser.add_argument(
+        "--sauvegardes",
+        type=Path,
+        default=DOSSIER_SAUVEGARDES,
+        metavar="DOSSIER",
+        help="sauvegarde rapide (F5, reprise avec F9) et sauvegarde automatique de la partie en cours",
+    )
+    parser.add_argument(
+        "--reprendre",
+        action="store_true",
+        help="reprend la partie de la sauvegarde automatique (après un arrêt brutal)",
+    )
+    parser.add_argument(
+        "--stats-boucle",
+        action="store_true",
+        help="affiche durée des frames, gigue des ticks et latence des écritures en quittant",
+    )
+    parser.add_argument(
+        "--profil",
+        type=Path,
+        metavar="FICHIER",
+        help="profile chaque frame par phase et exporte la session en quittant (panneau : F3)",
+    )
+    parser.add_argument(
+        "--format-profil",
+        choices=FORMATS_EXPORT,
+        help="format d'export du profil (défaut : d'après l'extension, sinon json)",
+    )
+    parser.add_argument(
+        "--profil-demarrage",
+        action="store_true",
+        help="affiche la durée des imports et initialisations jusqu'à la première frame du menu",
+    )
+    arguments = parser.parse_args()
+    PROFIL_DEMARRAGE.marquer("arguments")
+    stockage = creer_stockage(arguments.stockage)
+    client_classement = (
+        None if arguments.hors_ligne else ClientClassement(arguments.classement, FICHIER_ATTENTE_CLASSEMENT)
+    )
+    PROFIL_DEMARRAGE.marquer("stockage et classement")
+    pilote_automatique = None
+    if arguments.pilote is not None:
+        import pilote
+
+        pilote_automatique = pilote.PiloteAutomatique(budget_us=arguments.pilote)
+    client_salle = None
+    if arguments.serveur is not None:
+        import salles
+
+        client_salle = salles.ClientSalle(*arguments.serveur, arguments.salle)
+    jeu = Jeu(
+        mode_rendu=arguments.rendu,
+        fps_affichage=arguments.fps,
+        profileur=Profileur() if arguments.profil else None,
+        stockage=stockage,
+        client_classement=client_classement,
+        dossier_enregistrements=arguments.enregistrer,
+        profil_demarrage=PROFIL_DEMARRAGE if arguments.profil_demarrage else None,
+        colonnes=arguments.colonnes,
+        lignes=arguments.lignes,
+        robots=arguments.arene,
+        pilote=pilote_automatique,
+        client_salle=client_salle,
+        dossier_sauvegardes=arguments.sauvegardes,
+    )
+    if arguments.reprendre and not jeu.reprendre_partie(automatique=True):
+        print("Aucune partie à reprendre.")
+    jeu.executer(
+        afficher_statistiques=arguments.stats_boucle,
+        export_profil=arguments.profil,
+        format_profil=arguments.format_profil,
+    )
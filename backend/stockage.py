@@ -0,0 +1,449 @@
+"""Stockage des scores et de la progression des skins, sans pygame.
+
+``Stockage`` décrit ce dont le jeu a besoin ; deux implémentations :
+
+- ``StockageFichiers`` : journal des scores (voir ``classement``) et
+  ``skins.json``, comme avant. Un seul processus à la fois.
+- ``StockageSQLite`` : une base SQLite en mode WAL, sûre avec plusieurs
+  processus (le jeu et le backend lancés par ``start.sh``). Les scores sont
+  validés par lots, les meilleurs scores viennent d'un index
+  (``ORDER BY score DESC LIMIT n``) et restent en cache tant qu'aucune
+  connexion n'a écrit. À la création, la base importe les fichiers JSON.
+
+``StockageDiffere`` enveloppe l'un ou l'autre : les écritures partent dans
+un thread dédié et le jeu ne touche plus au disque pendant une frame.
+
+La progression est rendue brute (``{"achetes": [...], "actif": ...}`` ou
+``None``) : la validation des identifiants de skins reste dans ``snake``.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from boucle import TAILLE_HISTORIQUE, percentile
+from classement import NOM_INDEX, JournalScores, charger_scores, ecrire_atomique
+
+TAILLE_LOT = 16
+DELAI_LOT = 2.0
+ATTENTE_VERROU = 5.0
+VERSION_SCHEMA = 2
+# Meilleurs scores gardés en mémoire par StockageDiffere
+TAILLE_TOP_DIFFERE = 100
+
+# Instructions séparées : executescript validerait la transaction en cours
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS scores (id INTEGER PRIMARY KEY, score INTEGER NOT NULL, date REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS scores_par_valeur ON scores (score DESC)",
+    "CREATE TABLE IF NOT EXISTS progression ("
+    "identifiant TEXT PRIMARY KEY, ordre INTEGER NOT NULL, actif INTEGER NOT NULL DEFAULT 0)",
+)
+# Version 2 : détails de la partie, fournis par le service de classement
+_SCHEMA_V2 = (
+    "ALTER TABLE scores ADD COLUMN skin TEXT",
+    "ALTER TABLE scores ADD COLUMN niveau INTEGER",
+    "ALTER TABLE scores ADD COLUMN duree REAL",
+)
+_INSERER_SCORE = "INSERT INTO scores (score, date, skin, niveau, duree) VALUES (?, ?, ?, ?, ?)"
+_MEILLEURS_SCORES = "SELECT score FROM scores ORDER BY score DESC LIMIT ?"
+_MEILLEURES_PARTIES = "SELECT score, skin, niveau, duree, date FROM scores ORDER BY score DESC LIMIT ?"
+_PROGRESSION = "SELECT identifiant, actif FROM progression ORDER BY ordre"
+_INSERER_PROGRESSION = "INSERT INTO progression (identifiant, ordre, actif) VALUES (?, ?, ?)"
+
+
+def charger_progression_json(fichier: Path) -> dict[str, Any] | None:
+    """Contenu brut de ``skins.json``, ou ``None`` s'il est absent ou illisible."""
+    if not fichier.exists():
+        return None
+    try:
+        with fichier.open("r", encoding="utf-8") as flux:
+            donnees = json.load(flux)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return donnees if isinstance(donnees, dict) else None
+
+
+def sauvegarder_progression_json(achetes: list[str], actif: str, fichier: Path) -> None:
+    ecrire_atomique(fichier, json.dumps({"achetes": achetes, "actif": actif}, ensure_ascii=False, indent=2))
+
+
+class Stockage(ABC):
+    """Interface commune des stockages de scores et de progression.
+
+    Un stockage qui n'implémente pas les quatre méthodes abstraites ne peut
+    pas être créé.
+    """
+
+    @abstractmethod
+    def ajouter_score(self, score: int) -> None:
+        """Enregistre le score d'une partie terminée."""
+
+    @abstractmethod
+    def meilleurs_scores(self, nombre: int) -> list[int]:
+        """Les ``nombre`` meilleurs scores, du plus grand au plus petit."""
+
+    def meilleur_score(self) -> int:
+        meilleurs = self.meilleurs_scores(1)
+        return meilleurs[0] if meilleurs else 0
+
+    @abstractmethod
+    def charger_progression(self) -> dict[str, Any] | None:
+        """Serpents débloqués et serpent actif, ``None`` s'il n'y a rien d'enregistré."""
+
+    @abstractmethod
+    def sauvegarder_progression(self, achetes: list[str], actif: str) -> None:
+        """Remplace la progression enregistrée."""
+
+    def valider(self) -> None:
+        """Rend durables les écritures en attente."""
+
+    def statistiques(self) -> dict[str, float]:
+        return {}
+
+    def fermer(self) -> None:
+        """Écrit ce qui reste en attente et libère les ressources."""
+
+
+class StockageFichiers(Stockage):
+    """Journal des scores en ajout seul et ``skins.json``."""
+
+    def __init__(self, dossier: Path, fichier_scores: Path, fichier_progression: Path):
+        self.journal = JournalScores(dossier, fichier_historique=fichier_scores)
+        self.fichier_progression = fichier_progression
+
+    def ajouter_score(self, score: int) -> None:
+        self.journal.ajouter(score)
+
+    def meilleurs_scores(self, nombre: int) -> list[int]:
+        return self.journal.meilleurs(nombre)
+
+    def meilleur_score(self) -> int:
+        return self.journal.meilleur
+
+    def charger_progression(self) -> dict[str, Any] | None:
+        return charger_progression_json(self.fichier_progression)
+
+    def sauvegarder_progression(self, achetes: list[str], actif: str) -> None:
+        sauvegarder_progression_json(achetes, actif, self.fichier_progression)
+
+    def fermer(self) -> None:
+        self.journal.fermer()
+
+
+def scores_fichiers(dossier: Path, fichier_scores: Path) -> list[int]:
+    """Scores à importer depuis le stockage par fichiers.
+
+    Si le journal a déjà servi, seuls ses meilleurs scores sont connus ;
+    sinon ``scores.json`` est importé en entier.
+    """
+    if (dossier / NOM_INDEX).exists() or any(dossier.glob("scores.*.log")):
+        return JournalScores(dossier).meilleurs()
+    return charger_scores(fichier_scores)
+
+
+class StockageSQLite(Stockage):
+    """Scores et progression dans une base SQLite (WAL).
+
+    Les scores ajoutés attendent en mémoire et sont insérés en une seule
+    transaction dès qu'il y en a ``taille_lot`` ou que le plus ancien a plus
+    de ``delai_lot`` secondes (vérifié à chaque appel), ainsi qu'à la
+    fermeture. Les lectures de ce processus les voient immédiatement.
+    """
+
+    def __init__(
+        self,
+        chemin: Path | str,
+        fichier_scores: Path | None = None,
+        fichier_progression: Path | None = None,
+        taille_lot: int = TAILLE_LOT,
+        delai_lot: float = DELAI_LOT,
+        horloge=time.monotonic,
+    ):
+        if str(chemin) != ":memory:":
+            Path(chemin).parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None : transactions explicites ; les requêtes
+        # paramétrées restent préparées dans le cache de la connexion.
+        # check_same_thread=False : StockageDiffere écrit depuis son thread,
+        # jamais en même temps que le thread qui a ouvert la base
+        self._connexion = sqlite3.connect(
+            str(chemin), timeout=ATTENTE_VERROU, isolation_level=None, check_same_thread=False
+        )
+        self._connexion.execute("PRAGMA journal_mode=WAL")
+        self._connexion.execute("PRAGMA synchronous=NORMAL")
+        self.taille_lot = taille_lot
+        self.delai_lot = delai_lot
+        self._horloge = horloge
+        self._en_attente: list[tuple[int, float, str | None, int | None, float | None]] = []
+        self._debut_lot = 0.0
+        self._cache_top: list[int] = []
+        self._nombre_cache = 0
+        self._version_cache: int | None = None
+        self._initialiser(fichier_scores, fichier_progression)
+
+    @contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE prend le verrou d'écriture tout de suite (attente
+        # bornée par ATTENTE_VERROU) au lieu d'échouer au premier INSERT
+        connexion = self._connexion
+        connexion.execute("BEGIN IMMEDIATE")
+        try:
+            yield connexion
+        except BaseException:
+            connexion.execute("ROLLBACK")
+            raise
+        connexion.execute("COMMIT")
+
+    def _initialiser(self, fichier_scores: Path | None, fichier_progression: Path | None) -> None:
+        # Un seul processus crée le schéma et importe les fichiers JSON
+        with self._transaction() as connexion:
+            version = connexion.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                for instruction in _SCHEMA:
+                    connexion.execute(instruction)
+                self._importer(fichier_scores, fichier_progression)
+            if version < 2:
+                for instruction in _SCHEMA_V2:
+                    connexion.execute(instruction)
+            if version < VERSION_SCHEMA:
+                connexion.execute(f"PRAGMA user_version = {VERSION_SCHEMA}")
+
+    def _importer(self, fichier_scores: Path | None, fichier_progression: Path | None) -> None:
+        maintenant = time.time()
+        if fichier_scores is not None:
+            scores = scores_fichiers(fichier_scores.parent, fichier_scores)
+            self._connexion.executemany(
+                "INSERT INTO scores (score, date) VALUES (?, ?)", ((score, maintenant) for score in scores)
+            )
+        if fichier_progression is not None:
+            progression = charger_progression_json(fichier_progression)
+            if progression is not None:
+                self._ecrire_progression(progression.get("achetes") or [], progression.get("actif"))
+
+    @property
+    def en_attente(self) -> int:
+        """Scores pas encore validés dans la base."""
+        return len(self._en_attente)
+
+    def ajouter_score(self, score: int) -> None:
+        self.ajouter_partie(score)
+
+    def ajouter_partie(
+        self,
+        score: int,
+        skin: str | None = None,
+        niveau: int | None = None,
+        duree: float | None = None,
+        date: float | None = None,
+    ) -> None:
+        """Comme ``ajouter_score``, avec les détails de la partie."""
+        if not self._en_attente:
+            self._debut_lot = self._horloge()
+        self._en_attente.append((int(score), time.time() if date is None else date, skin, niveau, duree))
+        try:
+            self._valider_si_necessaire()
+        except sqlite3.Error:
+            # Lot refusé : cette partie n'est pas enregistrée, les précédentes restent en attente
+            self._en_attente.pop()
+            raise
+
+    def _valider_si_necessaire(self) -> None:
+        if self._en_attente and (
+            len(self._en_attente) >= self.taille_lot or self._horloge() - self._debut_lot >= self.delai_lot
+        ):
+            self.valider()
+
+    def valider(self) -> None:
+        """Insère les scores en attente en une transaction."""
+        if not self._en_attente:
+            return
+        with self._transaction() as connexion:
+            connexion.executemany(_INSERER_SCORE, self._en_attente)
+        self._en_attente.clear()
+        self._version_cache = None
+
+    def meilleurs_scores(self, nombre: int) -> list[int]:
+        self._valider_si_necessaire()
+        # data_version change quand une autre connexion valide une écriture
+        version = self._connexion.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._version_cache or self._nombre_cache < nombre:
+            self._cache_top = [ligne[0] for ligne in self._connexion.execute(_MEILLEURS_SCORES, (nombre,))]
+            self._version_cache = version
+            self._nombre_cache = nombre
+        if not self._en_attente:
+            return self._cache_top[:nombre]
+        attente = [partie[0] for partie in self._en_attente]
+        return sorted(self._cache_top[:nombre] + attente, reverse=True)[:nombre]
+
+    def meilleures_parties(self, nombre: int) -> list[dict[str, Any]]:
+        """Les ``nombre`` meilleures parties validées, avec leurs détails."""
+        return [
+            {"score": score, "skin": skin, "niveau": niveau, "duree": duree, "date": date}
+            for score, skin, niveau, duree, date in self._connexion.execute(_MEILLEURES_PARTIES, (nombre,))
+        ]
+
+    def tous_les_scores(self) -> list[int]:
+        """Tous les scores validés, dans l'ordre de la table."""
+        return [ligne[0] for ligne in self._connexion.execute("SELECT score FROM scores")]
+
+    def charger_progression(self) -> dict[str, Any] | None:
+        lignes = self._connexion.execute(_PROGRESSION).fetchall()
+        if not lignes:
+            return None
+        actif = next((identifiant for identifiant, est_actif in lignes if est_actif), None)
+        return {"achetes": [identifiant for identifiant, _ in lignes], "actif": actif}
+
+    def sauvegarder_progression(self, achetes: list[str], actif: str) -> None:
+        with self._transaction():
+            self._ecrire_progression(achetes, actif)
+
+    def _ecrire_progression(self, achetes: list[str], actif: str | None) -> None:
+        self._connexion.execute("DELETE FROM progression")
+        self._connexion.executemany(
+            _INSERER_PROGRESSION,
+            ((identifiant, ordre, identifiant == actif) for ordre, identifiant in enumerate(dict.fromkeys(achetes))),
+        )
+
+    def fermer(self) -> None:
+        self.valider()
+        self._connexion.close()
+
+
+class MetriquesEcriture:
+    """Latence des écritures différées et profondeur de la file à chaque lot."""
+
+    def __init__(self, taille: int = TAILLE_HISTORIQUE):
+        self.latences: deque[float] = deque(maxlen=taille)
+        self.profondeurs: deque[int] = deque(maxlen=taille)
+        self.ecritures = 0
+        self.erreurs = 0
+        self.derniere_erreur: Exception | None = None
+
+    def ecriture(self, latence: float, profondeur: int) -> None:
+        self.latences.append(latence)
+        self.profondeurs.append(profondeur)
+        self.ecritures += 1
+
+    def resume(self) -> dict[str, float]:
+        profondeurs = self.profondeurs
+        return {
+            "ecritures": self.ecritures,
+            "erreurs": self.erreurs,
+            "latence_ms_p50": percentile(self.latences, 50) * 1000,
+            "latence_ms_p95": percentile(self.latences, 95) * 1000,
+            "latence_ms_max": max(self.latences, default=0.0) * 1000,
+            "file_moyenne": sum(profondeurs) / len(profondeurs) if profondeurs else 0.0,
+            "file_max": max(profondeurs, default=0),
+        }
+
+
+class StockageDiffere(Stockage):
+    """Écritures en arrière-plan (write-behind) pour un autre stockage.
+
+    La file fusionne les demandes : tous les scores en attente partent dans
+    le même lot, et seule la dernière progression demandée est écrite. Les
+    lectures sont servies depuis la mémoire (meilleurs scores relus après
+    chaque lot, plus les scores encore en file) : après l'ouverture, seul le
+    thread d'écriture utilise ``stockage``.
+    """
+
+    def __init__(self, stockage: Stockage, taille_top: int = TAILLE_TOP_DIFFERE):
+        self.stockage = stockage
+        self.taille_top = taille_top
+        self.metriques = MetriquesEcriture()
+        self._condition = threading.Condition()
+        self._scores: list[int] = []
+        self._progression: tuple[list[str], str] | None = None
+        # Scores du lot en cours d'écriture, pas encore dans _top
+        self._en_ecriture: list[int] = []
+        self._occupe = False
+        self._arret = False
+        self._top = stockage.meilleurs_scores(taille_top)
+        self._progression_courante = stockage.charger_progression()
+        self._thread = threading.Thread(target=self._ecrire_en_boucle, name="ecriture-stockage", daemon=True)
+        self._thread.start()
+
+    @property
+    def profondeur(self) -> int:
+        """Demandes en attente d'écriture."""
+        return len(self._scores) + (self._progression is not None)
+
+    def ajouter_score(self, score: int) -> None:
+        with self._condition:
+            self._scores.append(int(score))
+            self._condition.notify_all()
+
+    def meilleurs_scores(self, nombre: int) -> list[int]:
+        with self._condition:
+            attente = self._scores + self._en_ecriture
+            if not attente:
+                return self._top[:nombre]
+            return sorted(self._top[:nombre] + attente, reverse=True)[:nombre]
+
+    def charger_progression(self) -> dict[str, Any] | None:
+        return self._progression_courante
+
+    def sauvegarder_progression(self, achetes: list[str], actif: str) -> None:
+        achetes = list(achetes)
+        self._progression_courante = {"achetes": achetes, "actif": actif}
+        with self._condition:
+            self._progression = (achetes, actif)
+            self._condition.notify_all()
+
+    def _ecrire_en_boucle(self) -> None:
+        condition = self._condition
+        while True:
+            with condition:
+                while not self.profondeur and not self._arret:
+                    condition.wait()
+                if not self.profondeur:
+                    return
+                profondeur = self.profondeur
+                scores, self._scores = self._scores, []
+                progression, self._progression = self._progression, None
+                self._en_ecriture = scores
+                self._occupe = True
+
+            debut = time.perf_counter()
+            top = None
+            try:
+                for score in scores:
+                    self.stockage.ajouter_score(score)
+                if progression is not None:
+                    self.stockage.sauvegarder_progression(*progression)
+                self.stockage.valider()
+                top = self.stockage.meilleurs_scores(self.taille_top)
+            except Exception as erreur:
+                # Le jeu continue : l'erreur est comptée dans les métriques
+                self.metriques.erreurs += 1
+                self.metriques.derniere_erreur = erreur
+            latence = time.perf_counter() - debut
+
+            with condition:
+                # En cas d'échec, les scores restent visibles jusqu'à la fin de la partie
+                self._top = top if top is not None else sorted(self._top + scores, reverse=True)[:self.taille_top]
+                self._en_ecriture = []
+                self._occupe = False
+                self.metriques.ecriture(latence, profondeur)
+                condition.notify_all()
+
+    def valider(self) -> None:
+        """Attend que la file soit vide et le dernier lot écrit."""
+        with self._condition:
+            while (self.profondeur or self._occupe) and self._thread.is_alive():
+                self._condition.wait()
+
+    def statistiques(self) -> dict[str, float]:
+        return {**self.metriques.resume(), "file": self.profondeur}
+
+    def fermer(self) -> None:
+        with self._condition:
+            self._arret = True
+            self._condition.notify_all()
+        self._thread.join()
+        self.stockage.fermer()
@@ -0,0 +1,500 @@
+"""Bancs d'essai sans affichage : moteur, rendu et persistance.
+
+Tout tourne avec les pilotes SDL factices (``SDL_VIDEODRIVER=dummy``,
+``SDL_AUDIODRIVER=dummy``). Chaque banc prépare un état neuf à chaque
+répétition puis chronomètre ``nombre`` appels ; le résultat retenu est la
+médiane des répétitions, en microsecondes par opération. Les résultats
+s'enregistrent en JSON et ``comparer`` signale les écarts au-delà d'un seuil.
+
+Exemples ::
+
+    python benchmarks/bancs.py executer --sortie benchmarks/baselines/reference.json
+    python benchmarks/bancs.py executer --rapide --sortie /tmp/courant.json
+    python benchmarks/bancs.py comparer /tmp/courant.json --seuil 0.15
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import NamedTuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import numpy as np  # noqa: E402
+import pygame  # noqa: E402
+
+import classement  # noqa: E402
+import instantane  # noqa: E402
+import moteur  # noqa: E402
+import snake  # noqa: E402
+import stockage  # noqa: E402
+from arene import Arene  # noqa: E402
+from camera import Camera, MiniCarte  # noqa: E402
+from grille import CORPS, CorpsSerpent, Grille  # noqa: E402
+from pilote import PiloteAutomatique  # noqa: E402
+
+REPETITIONS = 5
+DOSSIER_BACKEND = Path(__file__).resolve().parent.parent / "backend"
+# Nouveau processus : import de snake.py, Jeu, première frame du menu
+SCRIPT_DEMARRAGE = """
+import os
+import snake
+from stockage import StockageSQLite
+snake.Jeu(stockage=StockageSQLite(":memory:")).dessiner()
+os._exit(0)
+"""
+SEUIL_DEFAUT = 0.10
+BASELINE_REFERENCE = Path(__file__).resolve().parent / "baselines" / "reference.json"
+
+
+class Banc(NamedTuple):
+    nom: str
+    # Construit un état neuf et renvoie l'opération à chronométrer
+    preparer: Callable[[], Callable[[], object]]
+    nombre: int
+
+
+def chronometrer(banc: Banc, repetitions: int = REPETITIONS) -> dict[str, float]:
+    """Médiane et minimum (µs par opération) sur ``repetitions`` séries."""
+    mesures = []
+    for _ in range(repetitions):
+        operation = banc.preparer()
+        gc_actif = gc.isenabled()
+        gc.disable()
+        try:
+            debut = time.perf_counter_ns()
+            for _ in range(banc.nombre):
+                operation()
+            duree = time.perf_counter_ns() - debut
+        finally:
+            if gc_actif:
+                gc.enable()
+        mesures.append(duree / banc.nombre / 1000)
+    return {
+        "us": statistics.median(mesures),
+        "min_us": min(mesures),
+        "nombre": banc.nombre,
+        "repetitions": repetitions,
+    }
+
+
+def _serpentin(corps: CorpsSerpent, longueur: int) -> None:
+    """Fait grandir ``corps`` (parti de (0, 0)) en aller-retour ligne par ligne."""
+    colonnes = corps.grille.colonnes
+    sens = 1
+    while corps.longueur < longueur:
+        x = corps.tete[0]
+        if 0 <= x + sens < colonnes:
+            corps.bouger((sens, 0), grandir=True)
+        else:
+            corps.bouger((0, 1), grandir=True)
+            sens = -sens
+
+
+def _banc_bouger(longueur: int, nombre: int) -> Banc:
+    def preparer():
+        # Une seule ligne : le serpent avance tout droit sans jamais buter
+        serpent = snake.Snake(colonnes=longueur + nombre + 1, lignes=1)
+        serpent.corps = CorpsSerpent(longueur + nombre + 1, 1, (0, 0))
+        _serpentin(serpent.corps, longueur)
+        serpent.direction = moteur.DROITE
+        return serpent.bouger
+
+    return Banc(f"serpent_bouger[{longueur}]", preparer, nombre)
+
+
+def _banc_dessiner(skin: snake.SnakeSkin, longueur: int, nombre: int) -> Banc:
+    def preparer():
+        ecran = pygame.Surface((snake.LARGEUR, snake.HAUTEUR))
+        serpent = snake.Snake(skin)
+        serpent.corps = CorpsSerpent(snake.COLONNES, snake.LIGNES, (0, 0))
+        _serpentin(serpent.corps, longueur)
+        horloge = iter(range(10**9))
+
+        def dessiner():
+            serpent.dessiner(ecran, next(horloge) / 60)
+
+        return dessiner
+
+    return Banc(f"serpent_dessiner[{skin.identifiant}]", preparer, nombre)
+
+
+def _banc_dessiner_camera(longueur: int, nombre: int) -> Banc:
+    """Dessin limité à la caméra sur un plateau de 1000 x 1000 cellules."""
+
+    def preparer():
+        ecran = pygame.Surface((snake.LARGEUR, snake.HAUTEUR))
+        serpent = snake.Snake(colonnes=1000, lignes=1000)
+        serpent.corps = CorpsSerpent(1000, 1000, (0, 0))
+        _serpentin(serpent.corps, longueur)
+        camera = Camera(1000, 1000, snake.TAILLE_CELLULE, snake.LARGEUR, snake.HAUTEUR)
+        camera.suivre(serpent.pixels_interpoles(1.0)[0])
+        horloge = iter(range(10**9))
+
+        def dessiner():
+            serpent.dessiner(ecran, next(horloge) / 60, camera=camera)
+
+        return dessiner
+
+    return Banc(f"serpent_dessiner_camera[1000x1000,longueur={longueur}]", preparer, nombre)
+
+
+def _banc_mini_carte(longueur: int, nombre: int) -> Banc:
+    """Mise à jour de la mini-carte après un déplacement."""
+
+    def preparer():
+        corps = CorpsSerpent(1000, 1000, (0, 0))
+        _serpentin(corps, longueur)
+        mini_carte = MiniCarte(1000, 1000)
+        mini_carte.mettre_a_jour(corps)
+
+        def mettre_a_jour():
+            # Même aller-retour que ``_serpentin``, sans grandir
+            x, y = corps.tete
+            sens = 1 if y % 2 == 0 else -1
+            corps.bouger((sens, 0) if 0 <= x + sens < 1000 else (0, 1))
+            mini_carte.mettre_a_jour(corps)
+
+        return mettre_a_jour
+
+    return Banc(f"mini_carte_mettre_a_jour[1000x1000,longueur={longueur}]", preparer, nombre)
+
+
+def _banc_arene(nb_serpents: int, nombre: int) -> Banc:
+    """Un tick d'arène de robots sur un plateau de 1000 x 1000."""
+
+    def preparer():
+        arene = Arene(1000, 1000, nb_robots=nb_serpents, graine=0, joueur=False)
+        return arene.avancer
+
+    return Banc(f"arene_tick[1000x1000,serpents={nb_serpents}]", preparer, nombre)
+
+
+def _banc_pilote(colonnes: int, lignes: int, nombre: int) -> Banc:
+    """Une décision du pilote automatique puis le tick, parties enchaînées."""
+
+    def preparer():
+        pilote = PiloteAutomatique()
+        graines = iter(range(1_000_000))
+        etat = moteur.nouvelle_partie(colonnes, lignes, graine=next(graines))
+
+        def decider():
+            nonlocal etat
+            if moteur.avancer(etat, pilote(etat)) & moteur.PARTIE_TERMINEE:
+                etat = moteur.nouvelle_partie(colonnes, lignes, graine=next(graines))
+                pilote.reinitialiser()
+
+        return decider
+
+    return Banc(f"pilote_decision[{colonnes}x{lignes}]", preparer, nombre)
+
+
+def _banc_nourriture(colonnes: int, lignes: int, libres: int, nombre: int) -> Banc:
+    def preparer():
+        grille = Grille(colonnes, lignes)
+        for cellule in range(grille.nb_cellules - libres):
+            grille.marquer(cellule, CORPS)
+        nourriture = moteur.Nourriture()
+        rng = random.Random(0)
+        return lambda: nourriture.generer(grille, rng)
+
+    return Banc(f"nourriture_generer[{colonnes}x{lignes},libres={libres}]", preparer, nombre)
+
+
+def _banc_instantane(operation: str, colonnes: int, lignes: int, longueur: int, nombre: int) -> Banc:
+    """Instantané complet (capture seule, encodage, décodage) ou delta de 10 ticks d'un serpent serpentin."""
+
+    def preparer():
+        etat = moteur.nouvelle_partie(colonnes, lignes, graine=0)
+        _serpentin(etat.serpent.corps, longueur)
+        if operation == "capturer":
+            return lambda: instantane.capturer(etat)
+        if operation == "encoder":
+            return lambda: instantane.encoder(etat)
+        if operation == "decoder":
+            donnees = instantane.encoder(etat)
+            return lambda: instantane.decoder(donnees)
+        depuis = instantane.repere(etat)
+        for _ in range(10):
+            moteur.avancer(etat, None)
+        return lambda: instantane.encoder_delta(etat, depuis)
+
+    return Banc(f"instantane_{operation}[{colonnes}x{lignes},longueur={longueur}]", preparer, nombre)
+
+
+def _banc_frame(mode_rendu: str, nombre: int) -> Banc:
+    def preparer():
+        jeu = snake.Jeu(mode_rendu=mode_rendu, stockage=stockage.StockageSQLite(":memory:"))
+        jeu.ecran = pygame.Surface((snake.LARGEUR, snake.HAUTEUR))
+
+        def nouvelle_partie():
+            jeu._initialiser_nouvelle_partie()
+            # Pas d'écriture de score pendant les mesures
+            jeu.score_enregistre = True
+            jeu.partie.rng.seed(0)
+
+        nouvelle_partie()
+
+        def frame():
+            if jeu.etat != "jeu":
+                nouvelle_partie()
+            jeu.mettre_a_jour()
+            jeu.dessiner()
+
+        return frame
+
+    return Banc(f"jeu_frame[{mode_rendu}]", preparer, nombre)
+
+
+def _banc_scores(operation: str, taille: int, dossier: Path) -> Banc:
+    fichier = dossier / f"scores_{taille}.json"
+    scores = sorted(np.random.default_rng(0).integers(0, 100_000, taille).tolist(), reverse=True)
+    # Une écriture coûte surtout l'ouverture du fichier : peu d'itérations
+    nombre = max(1, (20_000 if operation == "charger" else 200) // taille)
+
+    def preparer():
+        classement.sauvegarder_scores(scores, fichier)
+        if operation == "charger":
+            return lambda: classement.charger_scores(fichier)
+        return lambda: classement.sauvegarder_scores(scores, fichier)
+
+    return Banc(f"{operation}_scores[{taille}]", preparer, nombre)
+
+
+def _banc_journal(operation: str, taille: int, dossier: Path) -> Banc:
+    """Journal en ajout seul : une fin de partie, ou l'ouverture après ``taille`` parties."""
+    scores = np.random.default_rng(0).integers(0, 100_000, taille).tolist()
+    compteur = iter(range(10**9))
+
+    def preparer():
+        sous_dossier = dossier / f"journal_{operation}_{taille}_{next(compteur)}"
+        journal = classement.JournalScores(sous_dossier)
+        for score in scores:
+            journal.ajouter(score)
+        journal.fermer()
+        if operation == "ouvrir":
+            return lambda: classement.JournalScores(sous_dossier)
+        journal = classement.JournalScores(sous_dossier, seuil_compaction=10**9)
+        return lambda: journal.ajouter(next(compteur))
+
+    return Banc(f"journal_{operation}[{taille}]", preparer, 200 if operation == "ouvrir" else 2_000)
+
+
+def _banc_sqlite(operation: str, taille: int, dossier: Path) -> Banc:
+    """Base SQLite de ``taille`` scores : ajout (validé par lots), top 5 en cache ou relu."""
+    chemin = dossier / f"scores_{taille}.db"
+    base = stockage.StockageSQLite(chemin)
+    if not base.meilleurs_scores(1):
+        scores = np.random.default_rng(0).integers(0, 100_000, taille).tolist()
+        with base._transaction() as connexion:
+            connexion.executemany("INSERT INTO scores (score, date) VALUES (?, 0)", ((s,) for s in scores))
+    base.fermer()
+
+    def preparer():
+        courant = stockage.StockageSQLite(chemin)
+        if operation == "ajouter":
+            return lambda: courant.ajouter_score(50_000)
+        if operation == "top":
+            return lambda: courant.meilleurs_scores(5)
+
+        def top_sans_cache():
+            # Comme après l'écriture d'une autre connexion : requête sur l'index
+            courant._version_cache = None
+            return courant.meilleurs_scores(5)
+
+        return top_sans_cache
+
+    return Banc(f"sqlite_{operation}[{taille}]", preparer, 2_000)
+
+
+def _banc_ecriture(operation: str, differe: bool, dossier: Path) -> Banc:
+    """Coût côté frame d'une fin de partie ou d'un choix de skin, direct ou en arrière-plan."""
+    compteur = iter(range(10**9))
+
+    def preparer():
+        base = stockage.StockageSQLite(dossier / f"ecriture_{next(compteur)}.db", taille_lot=1)
+        courant = stockage.StockageDiffere(base) if differe else base
+        if operation == "score":
+            return lambda: courant.ajouter_score(next(compteur))
+        return lambda: courant.sauvegarder_progression(["orange", "magma"], "magma")
+
+    mode = "differe" if differe else "direct"
+    return Banc(f"stockage_{operation}[{mode}]", preparer, 500)
+
+
+def _banc_demarrage() -> Banc:
+    """Temps de lancement d'un processus jusqu'à la première frame du menu."""
+
+    def preparer():
+        return lambda: subprocess.run(
+            [sys.executable, "-c", SCRIPT_DEMARRAGE],
+            cwd=DOSSIER_BACKEND,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    return Banc("demarrage[premiere_frame]", preparer, 3)
+
+
+def bancs(dossier: Path, rapide: bool = False) -> list[Banc]:
+    """Liste des bancs ; ``rapide`` retire les plus grandes tailles."""
+    longueurs = (10, 100, 1_000) if rapide else (10, 100, 1_000, 10_000)
+    tailles_scores = (10, 1_000, 100_000) if rapide else (10, 1_000, 100_000, 1_000_000)
+    tailles_sqlite = (1_000,) if rapide else (1_000, 1_000_000)
+    plateaux = ((32, 24),) if rapide else ((32, 24), (256, 256))
+    serpents_arene = (10, 100) if rapide else (10, 100, 500, 1_000)
+    instantanes = ((32, 24, 100, 500),)
+    if not rapide:
+        instantanes += ((128, 160, 10_000, 100), (1_000, 1_000, 10_000, 10))
+
+    liste = [_banc_bouger(longueur, 20_000) for longueur in longueurs]
+    liste += [_banc_dessiner(skin, 100, 300) for skin in snake.SNAKE_SKINS]
+    liste += [_banc_dessiner_camera(longueur, 300) for longueur in longueurs]
+    liste += [_banc_mini_carte(longueur, 2_000) for longueur in longueurs]
+    liste += [_banc_arene(nb_serpents, 200) for nb_serpents in serpents_arene]
+    liste += [_banc_pilote(colonnes, lignes, 2_000) for colonnes, lignes in plateaux]
+    liste += [
+        _banc_nourriture(colonnes, lignes, libres, 20_000)
+        for colonnes, lignes in plateaux
+        for libres in (1, 16)
+    ]
+    liste += [
+        _banc_instantane(operation, colonnes, lignes, longueur, nombre)
+        for colonnes, lignes, longueur, nombre in instantanes
+        for operation in ("capturer", "encoder", "decoder", "delta")
+    ]
+    liste += [_banc_frame(mode, 300) for mode in snake.MODES_RENDU]
+    liste.append(_banc_demarrage())
+    liste += [
+        _banc_scores(operation, taille, dossier)
+        for taille in tailles_scores
+        for operation in ("charger", "sauvegarder")
+    ]
+    liste += [_banc_journal(operation, 1_000, dossier) for operation in ("ajouter", "ouvrir")]
+    liste += [
+        _banc_sqlite(operation, taille, dossier)
+        for taille in tailles_sqlite
+        for operation in ("ajouter", "top", "top_sans_cache")
+    ]
+    liste += [
+        _banc_ecriture(operation, differe, dossier)
+        for operation in ("score", "progression")
+        for differe in (False, True)
+    ]
+    return liste
+
+
+def executer(rapide: bool = False, filtre: str | None = None, repetitions: int = REPETITIONS) -> dict:
+    resultats = {}
+    with tempfile.TemporaryDirectory() as dossier:
+        for banc in bancs(Path(dossier), rapide):
+            if filtre and filtre not in banc.nom:
+                continue
+            resultats[banc.nom] = mesure = chronometrer(banc, repetitions)
+            print(f"{banc.nom:<45} {mesure['us']:>12.2f} µs  (min {mesure['min_us']:.2f})", flush=True)
+    return {
+        "meta": {
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "systeme": platform.system(),
+            "rapide": rapide,
+        },
+        "resultats": resultats,
+    }
+
+
+def comparer(
+    base: dict,
+    courant: dict,
+    seuil: float = SEUIL_DEFAUT,
+    metrique: str = "us",
+) -> list[tuple[str, float | None, float | None, str]]:
+    """Compare deux sessions : ``(nom, base, courant, statut)`` par banc.
+
+    ``statut`` vaut ``regression`` (plus lent de plus de ``seuil``),
+    ``amelioration``, ``stable``, ``nouveau`` ou ``absent``.
+    """
+    lignes = []
+    resultats_base = base["resultats"]
+    resultats_courants = courant["resultats"]
+    for nom in sorted(resultats_base.keys() | resultats_courants.keys()):
+        avant = resultats_base.get(nom, {}).get(metrique)
+        apres = resultats_courants.get(nom, {}).get(metrique)
+        if avant is None:
+            statut = "nouveau"
+        elif apres is None:
+            statut = "absent"
+        elif apres > avant * (1 + seuil):
+            statut = "regression"
+        elif apres < avant / (1 + seuil):
+            statut = "amelioration"
+        else:
+            statut = "stable"
+        lignes.append((nom, avant, apres, statut))
+    return lignes
+
+
+def _charger(chemin: Path) -> dict:
+    with chemin.open("r", encoding="utf-8") as flux:
+        return json.load(flux)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Bancs d'essai du Snake (sans affichage).")
+    commandes = parser.add_subparsers(dest="commande", required=True)
+
+    execution = commandes.add_parser("executer", help="lance les bancs et enregistre les résultats")
+    execution.add_argument("--sortie", type=Path, help="fichier JSON de résultats")
+    execution.add_argument("--rapide", action="store_true", help="sans les plus grandes tailles")
+    execution.add_argument("--filtre", help="ne lance que les bancs dont le nom contient ce texte")
+    execution.add_argument("--repetitions", type=int, default=REPETITIONS)
+
+    comparaison = commandes.add_parser("comparer", help="compare deux fichiers de résultats")
+    comparaison.add_argument("courant", type=Path)
+    comparaison.add_argument("--base", type=Path, default=BASELINE_REFERENCE,
+                             help="résultats de référence (défaut : baselines/reference.json)")
+    comparaison.add_argument("--seuil", type=float, default=SEUIL_DEFAUT,
+                             help="écart relatif toléré (0.10 = 10 %%)")
+    comparaison.add_argument("--metrique", choices=("us", "min_us"), default="us")
+    args = parser.parse_args(argv)
+
+    if args.commande == "executer":
+        session = executer(args.rapide, args.filtre, args.repetitions)
+        if args.sortie:
+            args.sortie.parent.mkdir(parents=True, exist_ok=True)
+            args.sortie.write_text(json.dumps(session, indent=2) + "\n", encoding="utf-8")
+            print(f"\nRésultats enregistrés dans {args.sortie}")
+        return 0
+
+    lignes = comparer(_charger(args.base), _charger(args.courant), args.seuil, args.metrique)
+    regressions = 0
+    for nom, avant, apres, statut in lignes:
+        if avant is not None and apres is not None:
+            detail = f"{avant:>12.2f} -> {apres:>12.2f} µs  ({apres / avant - 1:+.1%})"
+        else:
+            detail = f"{avant if avant is not None else '-':>12} -> {apres if apres is not None else '-':>12}"
+        marque = "!!" if statut == "regression" else "  "
+        print(f"{marque} {nom:<45} {detail}  {statut}")
+        regressions += statut == "regression"
+    print(f"\n{regressions} régression(s) au-delà de {args.seuil:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""Générateur de charge pour le service de classement (``backend/main.py``).
+
+Lance le service sur un port libre avec une base temporaire (ou vise
+``--url``), ouvre ``--connexions`` connexions persistantes et envoie au
+total ``--soumissions`` parties, puis affiche le débit, les latences et
+vérifie que le service a bien tout compté.
+
+Exemple ::
+
+    python benchmarks/charge_classement.py --soumissions 20000 --connexions 32
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+DOSSIER_BACKEND = Path(__file__).resolve().parent.parent / "backend"
+SKINS = ("orange", "arc_en_ciel", "nocturne", "magma", "galaxie")
+
+
+async def _requete(lecteur, ecrivain, methode: str, chemin: str, corps: bytes = b"") -> tuple[int, bytes]:
+    ecrivain.write(
+        f"{methode} {chemin} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(corps)}\r\n\r\n".encode("latin-1") + corps
+    )
+    entete = await lecteur.readuntil(b"\r\n\r\n")
+    ligne, *champs = entete.decode("latin-1").split("\r\n")
+    longueur = 0
+    for champ in champs:
+        nom, _, valeur = champ.partition(":")
+        if nom.lower() == "content-length":
+            longueur = int(valeur)
+    return int(ligne.split(" ", 2)[1]), await lecteur.readexactly(longueur)
+
+
+async def _connexion(hote: str, port: int, nombre: int, graine: int, latences: list[float]) -> int:
+    rng = random.Random(graine)
+    lecteur, ecrivain = await asyncio.open_connection(hote, port)
+    refusees = 0
+    try:
+        for _ in range(nombre):
+            partie = {
+                "score": int(rng.expovariate(1 / 200)),
+                "skin": rng.choice(SKINS),
+                "niveau": rng.randint(1, 20),
+                "duree": round(rng.uniform(5, 600), 3),
+            }
+            debut = time.perf_counter()
+            statut, _ = await _requete(lecteur, ecrivain, "POST", "/scores", json.dumps(partie).encode())
+            latences.append(time.perf_counter() - debut)
+            refusees += statut != 201
+    finally:
+        ecrivain.close()
+    return refusees
+
+
+async def charger(hote: str, port: int, soumissions: int, connexions: int) -> dict:
+    latences: list[float] = []
+    parts = [soumissions // connexions + (i < soumissions % connexions) for i in range(connexions)]
+    debut = time.perf_counter()
+    refusees = await asyncio.gather(*(_connexion(hote, port, n, i, latences) for i, n in enumerate(parts)))
+    duree = time.perf_counter() - debut
+
+    lecteur, ecrivain = await asyncio.open_connection(hote, port)
+    _, sante = await _requete(lecteur, ecrivain, "GET", "/sante")
+    _, top = await _requete(lecteur, ecrivain, "GET", "/scores/top?n=3")
+    _, rang = await _requete(lecteur, ecrivain, "GET", "/scores/rang?score=500")
+    ecrivain.close()
+
+    latences.sort()
+    return {
+        "soumissions": soumissions,
+        "connexions": connexions,
+        "refusees": sum(refusees),
+        "duree_s": duree,
+        "par_seconde": soumissions / duree,
+        "latence_ms_p50": statistics.median(latences) * 1000,
+        "latence_ms_p99": latences[int(0.99 * (len(latences) - 1))] * 1000,
+        "sante": json.loads(sante),
+        "top3": [partie["score"] for partie in json.loads(top)["parties"]],
+        "rang_500": json.loads(rang),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Charge le service de classement.")
+    parser.add_argument("--soumissions", type=int, default=20_000)
+    parser.add_argument("--connexions", type=int, default=32)
+    parser.add_argument("--url", help="service déjà lancé (sinon : un service temporaire est démarré)")
+    args = parser.parse_args(argv)
+
+    service = None
+    with tempfile.TemporaryDirectory() as dossier:
+        if args.url:
+            adresse = urlsplit(args.url)
+            hote, port = adresse.hostname, adresse.port
+        else:
+            service = subprocess.Popen(
+                [sys.executable, str(DOSSIER_BACKEND / "main.py"), "--port", "0", "--base", str(Path(dossier) / "charge.db")],
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            # « Service de classement sur http://127.0.0.1:PORT (...) »
+            adresse = urlsplit(service.stdout.readline().split()[4])
+            hote, port = adresse.hostname, adresse.port
+        try:
+            resultat = asyncio.run(charger(hote, port, args.soumissions, args.connexions))
+        finally:
+            if service is not None:
+                service.terminate()
+                service.wait(timeout=10)
+
+    for cle, valeur in resultat.items():
+        print(f"{cle}: {valeur:.2f}" if isinstance(valeur, float) else f"{cle}: {valeur}")
+    return 1 if resultat["refusees"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""Essaim de clients synthétiques pour le serveur de salles (``backend/salles.py``).
+
+Lance le serveur sur un port libre (ou vise ``--serveur``), ouvre
+``--clients-par-salle`` connexions dans chacune des ``--salles`` salles
+pendant ``--duree`` secondes. Le premier client de chaque salle tourne au
+hasard ; tous tiennent un ``MiroirPartie`` à jour avec les deltas et
+mesurent l'écart entre deux deltas successifs et le pas théorique
+``1 / vitesse``. Pour finir, chaque client redemande l'état complet et le
+compare à son miroir, puis le serveur donne ses propres mesures (retard des
+ticks, durée d'un tick de salle).
+
+Exemple ::
+
+    python benchmarks/essaim_salles.py --salles 300 --duree 10
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+DOSSIER_BACKEND = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(DOSSIER_BACKEND))
+
+import salles  # noqa: E402
+from boucle import percentile  # noqa: E402
+from enregistrement import DIRECTIONS  # noqa: E402
+from salles import DELTA, ETAT, LONGUEUR, MiroirPartie  # noqa: E402
+
+# Probabilité qu'un client pilote tourne à chaque delta reçu
+CHANCE_VIRAGE = 0.15
+
+
+class ClientEssaim:
+    def __init__(self, salle: int, pilote: bool, graine: int):
+        self.salle = salle
+        self.pilote = pilote
+        self.rng = random.Random(graine)
+        self.miroir = MiroirPartie()
+        self.ecarts: list[float] = []
+        self.deltas = 0
+        self.octets = 0
+        self.divergences = 0
+        self.verifie = False
+        self._dernier: float | None = None
+        self._verification_demandee = False
+
+    def _verifier(self, message: bytes) -> None:
+        # L'état est encodé entre deux ticks : le miroir doit être identique
+        reference = MiroirPartie()
+        reference.appliquer(message)
+        attendu, obtenu = reference.etat, self.miroir.etat
+        if (
+            list(attendu.serpent.corps.cellules()) != list(obtenu.serpent.corps.cellules())
+            or attendu.nourriture.position != obtenu.nourriture.position
+            or attendu.score != obtenu.score
+            or bytes(attendu.grille.occupation) != bytes(obtenu.grille.occupation)
+        ):
+            self.divergences += 1
+        self.verifie = True
+
+    async def jouer(self, hote: str, port: int, fin: float) -> None:
+        lecteur, ecrivain = await asyncio.open_connection(hote, port)
+        ecrivain.write(salles.message_rejoindre(self.salle))
+        try:
+            while not self.verifie:
+                if not self._verification_demandee and time.perf_counter() >= fin:
+                    self._verification_demandee = True
+                    ecrivain.write(salles.tramer(bytes([salles.DEMANDER_ETAT])))
+                (longueur,) = LONGUEUR.unpack(await lecteur.readexactly(LONGUEUR.size))
+                message = await lecteur.readexactly(longueur)
+                self.octets += LONGUEUR.size + longueur
+                etat = self.miroir.etat
+                # Après une fin de partie, l'ETAT suivant est la nouvelle partie
+                if message[0] == ETAT and self._verification_demandee and etat is not None and not etat.terminee:
+                    self._verifier(message)
+                    continue
+                self.miroir.appliquer(message)
+                if message[0] != DELTA:
+                    self._dernier = None
+                    continue
+                maintenant = time.perf_counter()
+                etat = self.miroir.etat
+                if self._dernier is not None and not etat.terminee:
+                    self.ecarts.append(abs(maintenant - self._dernier - 1 / etat.vitesse_actuelle))
+                self._dernier = maintenant
+                self.deltas += 1
+                if self.pilote and self.rng.random() < CHANCE_VIRAGE:
+                    ecrivain.write(salles.message_direction(self.rng.choice(DIRECTIONS)))
+        finally:
+            ecrivain.close()
+
+
+async def _statistiques_serveur(hote: str, port: int) -> dict:
+    lecteur, ecrivain = await asyncio.open_connection(hote, port)
+    ecrivain.write(salles.tramer(bytes([salles.DEMANDER_STATISTIQUES])))
+    (longueur,) = LONGUEUR.unpack(await lecteur.readexactly(LONGUEUR.size))
+    message = await lecteur.readexactly(longueur)
+    ecrivain.close()
+    return json.loads(message[1:])
+
+
+async def essaimer(hote: str, port: int, nb_salles: int, clients_par_salle: int, duree: float) -> dict:
+    clients = [
+        ClientEssaim(salle, rang == 0, salle * clients_par_salle + rang)
+        for salle in range(nb_salles)
+        for rang in range(clients_par_salle)
+    ]
+    fin = time.perf_counter() + duree
+    await asyncio.gather(*(client.jouer(hote, port, fin) for client in clients))
+    serveur = await _statistiques_serveur(hote, port)
+
+    ecarts = [ecart * 1000 for client in clients for ecart in client.ecarts]
+    deltas = sum(client.deltas for client in clients)
+    octets = sum(client.octets for client in clients)
+    return {
+        "salles": nb_salles,
+        "clients": len(clients),
+        "deltas_par_seconde": deltas / duree,
+        "octets_par_delta": octets / max(1, deltas),
+        "ecart_ms_p50": percentile(ecarts, 50),
+        "ecart_ms_p99": percentile(ecarts, 99),
+        "divergences": sum(client.divergences for client in clients),
+        **{f"serveur_{cle}": valeur for cle, valeur in serveur.items()},
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Essaim de clients pour le serveur de salles.")
+    parser.add_argument("--salles", type=int, default=200)
+    parser.add_argument("--clients-par-salle", type=int, default=1)
+    parser.add_argument("--duree", type=float, default=10.0, help="secondes de jeu")
+    parser.add_argument("--serveur", help="HOTE:PORT d'un serveur déjà lancé (sinon : un serveur temporaire)")
+    args = parser.parse_args(argv)
+
+    serveur = None
+    if args.serveur:
+        hote, _, port = args.serveur.rpartition(":")
+    else:
+        serveur = subprocess.Popen(
+            [sys.executable, str(DOSSIER_BACKEND / "salles.py"), "--port", "0"],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        # « Serveur de salles sur 127.0.0.1:PORT (...) »
+        hote, _, port = serveur.stdout.readline().split()[4].rpartition(":")
+    try:
+        resultat = asyncio.run(essaimer(hote, int(port), args.salles, args.clients_par_salle, args.duree))
+    finally:
+        if serveur is not None:
+            serveur.terminate()
+            serveur.wait(timeout=10)
+
+    for cle, valeur in resultat.items():
+        print(f"{cle}: {valeur:.2f}" if isinstance(valeur, float) else f"{cle}: {valeur}")
+    return 1 if resultat["divergences"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import pygame  # noqa: E402
+
+import moteur  # noqa: E402
+import snake  # noqa: E402
+from arene import Arene  # noqa: E402
+from camera import MiniCarte  # noqa: E402
+from grille import CORPS, NOURRITURE  # noqa: E402
+from stockage import StockageSQLite  # noqa: E402
+
+
+class TestArene(unittest.TestCase):
+    def _arene(self, nb_robots: int = 1) -> Arene:
+        # Robots sans virage gratuit : tout droit tant que c'est libre
+        return Arene(10, 5, nb_robots=nb_robots, graine=0, nb_nourritures=0, chance_virage=0.0)
+
+    def test_face_a_face(self):
+        arene = self._arene()
+        arene.placer(0, (2, 2), moteur.DROITE)
+        arene.placer(1, (4, 2), moteur.GAUCHE)
+        robot = arene.serpents[1]
+        evenements = arene.avancer()
+        self.assertTrue(evenements & moteur.PARTIE_TERMINEE)
+        self.assertTrue(arene.terminee)
+        self.assertEqual(arene.morts["face_a_face"], 2)
+        # Le robot mort a réapparu ailleurs, la case disputée est restée libre
+        self.assertIsNot(arene.serpents[1], robot)
+        self.assertFalse(arene.grille.occupation[arene.grille.cellule(3, 2)] & CORPS)
+        self.assertEqual(arene.avancer(), moteur.PARTIE_TERMINEE)
+
+    def test_collision_avec_le_corps_d_un_autre(self):
+        arene = self._arene()
+        arene.placer(0, (4, 1), moteur.DROITE)
+        arene.placer(1, (5, 1), moteur.BAS)
+        arene.avancer()
+        # La tête du robot occupait encore (5, 1) au début du tick
+        self.assertTrue(arene.terminee)
+        self.assertEqual(arene.morts, {"bord": 0, "corps": 1, "face_a_face": 0})
+        self.assertEqual(arene.serpents[1].corps.tete, (5, 2))
+
+    def test_nourriture_mangee_par_le_joueur(self):
+        arene = self._arene(nb_robots=0)
+        arene.placer(0, (2, 2), moteur.DROITE)
+        arene.grille.marquer(arene.grille.cellule(3, 2), NOURRITURE)
+        arene.nourritures_en_jeu += 1
+        self.assertTrue(arene.avancer() & moteur.NOURRITURE_MANGEE)
+        self.assertEqual(arene.score, 10)
+        arene.avancer()
+        self.assertEqual(arene.serpent.corps.longueur, 2)
+
+    def test_grille_et_proprietaires_coherents(self):
+        arene = Arene(100, 100, nb_robots=300, graine=7, joueur=False, nb_nourritures=2000)
+        carte = MiniCarte(100, 100, taille_max=50)
+        for _ in range(300):
+            arene.avancer()
+            carte.mettre_a_jour(*(serpent.corps for serpent in arene.serpents))
+        grille = arene.grille
+        self.assertFalse(arene.terminee)
+        self.assertGreater(sum(arene.morts.values()), 0)
+        longueurs = 0
+        for identifiant, serpent in enumerate(arene.serpents):
+            corps = serpent.corps
+            longueurs += corps.longueur
+            for rang, position in enumerate(corps.positions):
+                cellule = grille.cellule(*position)
+                self.assertTrue(grille.occupation[cellule] & CORPS)
+                self.assertEqual(arene.proprietaires[cellule], identifiant)
+                self.assertEqual(corps.rang(cellule), rang)
+        self.assertGreater(longueurs, 300)
+        self.assertEqual(sum(1 for octet in grille.occupation if octet & CORPS), longueurs)
+        self.assertEqual(sum(1 for octet in grille.occupation if octet & NOURRITURE), 2000)
+        self.assertEqual(len(grille.libres), grille.nb_cellules - longueurs - 2000)
+
+        # Serpents morts et réapparus : la mini-carte incrémentale reste exacte
+        reference = MiniCarte(100, 100, taille_max=50)
+        reference.reconstruire(*(serpent.corps for serpent in arene.serpents))
+        self.assertEqual(carte._comptes.tolist(), reference._comptes.tolist())
+        # Seuls les anneaux agrandis forcent une reconstruction
+        self.assertLess(carte.reconstructions, 10)
+
+
+class TestJeuArene(unittest.TestCase):
+    def test_frames_d_arene(self):
+        jeu = snake.Jeu(stockage=StockageSQLite(":memory:"), colonnes=200, lignes=200, robots=100)
+        jeu.ecran = pygame.Surface((snake.LARGEUR, snake.HAUTEUR))
+        jeu._initialiser_nouvelle_partie(graine=3)
+        self.assertIsInstance(jeu.partie, Arene)
+        self.assertIsNone(jeu.enregistrement)
+        for _ in range(50):
+            if jeu.etat != "jeu":
+                jeu._initialiser_nouvelle_partie()
+            jeu.mettre_a_jour()
+            jeu.dessiner(0.5)
+        self.assertEqual(jeu.mode_rendu, "complet")
+        self.assertEqual(jeu.stockage.meilleur_score(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
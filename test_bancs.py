@@ -0,0 +1,29 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "benchmarks"))
+
+from bancs import Banc, chronometrer, comparer  # noqa: E402
+
+
+class TestBancs(unittest.TestCase):
+    def test_chronometrer(self):
+        appels = []
+        banc = Banc("liste", lambda: (lambda: appels.append(1)), 100)
+        mesure = chronometrer(banc, repetitions=3)
+        self.assertEqual(len(appels), 300)
+        self.assertLessEqual(mesure["min_us"], mesure["us"])
+
+    def test_comparer_signale_les_regressions(self):
+        base = {"resultats": {"a": {"us": 10.0}, "b": {"us": 10.0}, "c": {"us": 10.0}, "d": {"us": 1.0}}}
+        courant = {"resultats": {"a": {"us": 10.5}, "b": {"us": 12.0}, "c": {"us": 8.0}, "e": {"us": 1.0}}}
+        statuts = {nom: statut for nom, _, _, statut in comparer(base, courant, seuil=0.10)}
+        self.assertEqual(
+            statuts,
+            {"a": "stable", "b": "regression", "c": "amelioration", "d": "absent", "e": "nouveau"},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from boucle import Cadenceur, PasFixe, StatistiquesBoucle, percentile  # noqa: E402
+
+
+class TestPasFixe(unittest.TestCase):
+    def test_ticks_independants_de_l_affichage(self):
+        pas_fixe = PasFixe()
+        ticks = 0
+        # 64 frames d'affichage en une seconde, simulation à 8 ticks/s
+        for frame in range(65):
+            pas_fixe.demarrer_frame(frame / 64)
+            while pas_fixe.tick_du(8):
+                ticks += 1
+            self.assertAlmostEqual(pas_fixe.alpha(8), (frame % 8) / 8)
+        self.assertEqual(ticks, 8)
+
+    def test_retard_plafonne(self):
+        pas_fixe = PasFixe(retard_max=0.25)
+        pas_fixe.demarrer_frame(0.0)
+        pas_fixe.demarrer_frame(5.0)
+        ticks = 0
+        while pas_fixe.tick_du(10):
+            ticks += 1
+        self.assertEqual(ticks, 2)
+        self.assertAlmostEqual(pas_fixe.alpha(10), 0.5)
+
+
+class TestCadenceur(unittest.TestCase):
+    def test_echeances_absolues_sans_derive(self):
+        horloge = [0.0]
+        sommeils = []
+
+        def dormir(duree):
+            sommeils.append(duree)
+            horloge[0] += duree
+
+        def lire():
+            horloge[0] += 0.0001
+            return horloge[0]
+
+        cadenceur = Cadenceur(50, marge=0.002, horloge=lire, dormir=dormir)
+        reveils = [cadenceur.attendre() for _ in range(100)]
+        self.assertAlmostEqual(reveils[-1], 100 * 0.02, delta=0.001)
+        self.assertTrue(all(duree < 0.02 for duree in sommeils))
+
+
+class TestStatistiquesBoucle(unittest.TestCase):
+    def test_gigue_et_percentiles(self):
+        statistiques = StatistiquesBoucle()
+        for i, instant in enumerate((0.0, 0.1, 0.21, 0.3)):
+            statistiques.frame(instant)
+            statistiques.tick(instant, 10)
+        resume = statistiques.resume()
+        self.assertEqual((resume["frames"], resume["ticks"]), (4, 4))
+        self.assertAlmostEqual(resume["gigue_tick_ms_max"], 10.0, places=6)
+        self.assertEqual(percentile([3, 1, 2], 50), 2)
+        self.assertEqual(percentile([], 99), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import random
+import sys
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import pygame  # noqa: E402
+
+import snake  # noqa: E402
+from camera import Camera, MiniCarte, segments_visibles  # noqa: E402
+from grille import CorpsSerpent  # noqa: E402
+from stockage import StockageSQLite  # noqa: E402
+
+
+def _serpentin(corps: CorpsSerpent, longueur: int) -> None:
+    """Aller-retour ligne par ligne depuis (0, 0)."""
+    sens = 1
+    while corps.longueur < longueur:
+        x = corps.tete[0]
+        if 0 <= x + sens < corps.grille.colonnes:
+            corps.bouger((sens, 0), grandir=True)
+        else:
+            corps.bouger((0, 1), grandir=True)
+            sens = -sens
+
+
+class TestCamera(unittest.TestCase):
+    def test_suit_la_tete_sans_sortir_du_plateau(self):
+        camera = Camera(100, 50, 20, 640, 480)
+        camera.suivre((0, 0))
+        self.assertEqual((camera.x, camera.y), (0, 0))
+        camera.suivre((50 * 20, 25 * 20))
+        self.assertEqual((camera.x, camera.y), (50 * 20 + 10 - 320, 25 * 20 + 10 - 240))
+        camera.suivre((99 * 20, 49 * 20))
+        self.assertEqual((camera.x, camera.y), (2000 - 640, 1000 - 480))
+        self.assertEqual(camera.cellules_visibles(marge=0), (68, 26, 100, 50))
+        self.assertEqual(camera.cellules_visibles(), (67, 25, 100, 50))
+
+        # Plateau plus petit que la fenêtre : pas de défilement
+        petite = Camera(10, 10, 20, 640, 480)
+        petite.suivre((180, 180))
+        self.assertEqual((petite.x, petite.y), (0, 0))
+
+    def test_rendu_limite_identique_au_rendu_complet(self):
+        colonnes, lignes = 80, 60
+        for skin in snake.SNAKE_SKINS:
+            with self.subTest(skin=skin.identifiant):
+                serpent = snake.Snake(skin, colonnes, lignes)
+                serpent.corps = CorpsSerpent(colonnes, lignes, (0, 0))
+                _serpentin(serpent.corps, 2000)
+                serpent.bouger()
+                camera = Camera(colonnes, lignes, snake.TAILLE_CELLULE, snake.LARGEUR, snake.HAUTEUR)
+                camera.suivre(serpent.pixels_interpoles(0.5)[0])
+                self.assertNotEqual((camera.x, camera.y), (0, 0))
+
+                plateau = pygame.Surface((colonnes * snake.TAILLE_CELLULE, lignes * snake.TAILLE_CELLULE))
+                serpent.dessiner(plateau, 1.5, alpha=0.5)
+                ecran = pygame.Surface((snake.LARGEUR, snake.HAUTEUR))
+                serpent.dessiner(ecran, 1.5, alpha=0.5, camera=camera)
+                attendu = plateau.subsurface(camera.rect)
+                self.assertEqual(
+                    pygame.image.tobytes(ecran, "RGB"), pygame.image.tobytes(attendu, "RGB")
+                )
+
+    def test_seuls_les_segments_sous_la_camera_sont_lus(self):
+        corps = CorpsSerpent(200, 200, (0, 0))
+        _serpentin(corps, 20_000)
+        camera = Camera(200, 200, 20, 640, 480)
+        camera.suivre((150 * 20, 60 * 20))
+        x0, y0, x1, y1 = camera.cellules_visibles()
+        rangs, cellules = segments_visibles(corps, x0, y0, x1, y1)
+        self.assertLessEqual(len(rangs), (x1 - x0) * (y1 - y0))
+        self.assertEqual(rangs.tolist(), sorted(rangs.tolist()))
+        attendus = [
+            (rang, corps.grille.cellule(*position))
+            for rang, position in enumerate(corps.positions)
+            if x0 <= position[0] < x1 and y0 <= position[1] < y1
+        ]
+        self.assertEqual(list(zip(rangs.tolist(), cellules.tolist())), attendus)
+
+
+class TestMiniCarte(unittest.TestCase):
+    def test_mise_a_jour_incrementale_identique_a_la_reconstruction(self):
+        rng = random.Random(5)
+        corps = CorpsSerpent(300, 200, (150, 100))
+        carte = MiniCarte(300, 200, taille_max=64)
+        self.assertEqual((carte.echelle, carte.largeur, carte.hauteur), (5, 60, 40))
+        carte.mettre_a_jour(corps)
+        direction = (1, 0)
+        for frame in range(400):
+            for _ in range(rng.randrange(4)):
+                if rng.random() < 0.2:
+                    direction = rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1)])
+                if not corps.bouger(direction, grandir=rng.random() < 0.5, traverser_bords=True):
+                    direction = (-direction[1], direction[0])
+            carte.mettre_a_jour(corps)
+        # Reconstruit seulement quand l'anneau double
+        self.assertLessEqual(carte.reconstructions, 6)
+
+        reference = MiniCarte(300, 200, taille_max=64)
+        reference.reconstruire(corps)
+        self.assertEqual(carte._comptes.tolist(), reference._comptes.tolist())
+        self.assertEqual(pygame.image.tobytes(carte.surface, "RGB"), pygame.image.tobytes(reference.surface, "RGB"))
+
+        # Nouveau serpent : l'ancien est décompté, le nouveau compté
+        nouveau = CorpsSerpent(300, 200, (0, 0))
+        carte.mettre_a_jour(nouveau)
+        reference.reconstruire(nouveau)
+        self.assertEqual(carte._comptes.tolist(), reference._comptes.tolist())
+        self.assertEqual(pygame.image.tobytes(carte.surface, "RGB"), pygame.image.tobytes(reference.surface, "RGB"))
+
+
+class TestGrandPlateau(unittest.TestCase):
+    def test_partie_sur_un_plateau_de_mille_cellules_de_cote(self):
+        jeu = snake.Jeu(stockage=StockageSQLite(":memory:"), colonnes=1000, lignes=1000)
+        jeu.ecran = pygame.Surface((snake.LARGEUR, snake.HAUTEUR))
+        jeu._initialiser_nouvelle_partie(graine=2)
+        jeu.score_enregistre = True
+        self.assertEqual(jeu.partie.grille.nb_cellules, 1_000_000)
+        for _ in range(30):
+            jeu.mettre_a_jour()
+            jeu.dessiner(0.5)
+        tete = jeu.partie.serpent.corps.tete
+        self.assertTrue(jeu.camera.rect.collidepoint(tete[0] * snake.TAILLE_CELLULE, tete[1] * snake.TAILLE_CELLULE))
+        self.assertEqual(jeu.mini_carte.reconstructions, 0)
+        # Pas de rendu incrémental : le plateau ne tient pas dans la fenêtre
+        jeu.basculer_mode_rendu()
+        self.assertEqual(jeu.mode_rendu, "complet")
+        with self.assertRaises(ValueError):
+            snake.Jeu(mode_rendu="incremental", stockage=StockageSQLite(":memory:"), colonnes=1000, lignes=1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
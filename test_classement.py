@@ -0,0 +1,106 @@
+import bisect
+import json
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from classement import NOM_INDEX, IndexRangs, JournalScores, sauvegarder_scores  # noqa: E402
+
+
+class TestJournalScores(unittest.TestCase):
+    def setUp(self):
+        self._temporaire = tempfile.TemporaryDirectory()
+        self.dossier = Path(self._temporaire.name)
+
+    def tearDown(self):
+        self._temporaire.cleanup()
+
+    def test_meilleurs_scores_bornes(self):
+        journal = JournalScores(self.dossier, taille_top=3)
+        for score in (5, 1, 9, 7, 3, 9):
+            journal.ajouter(score)
+        self.assertEqual(journal.meilleurs(), [9, 9, 7])
+        self.assertEqual(journal.meilleurs(2), [9, 9])
+        self.assertEqual(journal.meilleur, 9)
+        self.assertEqual(journal.parties, 6)
+        journal.fermer()
+
+    def test_rechargement_sans_fermeture(self):
+        journal = JournalScores(self.dossier, taille_top=3)
+        for score in (4, 8, 2):
+            journal.ajouter(score)
+        # Pas de fermer() : le journal seul doit suffire
+        recharge = JournalScores(self.dossier, taille_top=3)
+        self.assertEqual(recharge.meilleurs(), [8, 4, 2])
+        self.assertEqual(recharge.parties, 3)
+        journal.fermer()
+
+    def test_compaction_replie_le_journal(self):
+        journal = JournalScores(self.dossier, taille_top=2, seuil_compaction=4)
+        for score in range(10):
+            journal.ajouter(score)
+        journal.fermer()
+        self.assertEqual(list(self.dossier.glob("scores.*.log")), [])
+        index = json.loads((self.dossier / NOM_INDEX).read_text(encoding="utf-8"))
+        self.assertEqual(index["top"], [9, 8])
+        self.assertEqual(index["parties"], 10)
+
+        recharge = JournalScores(self.dossier, taille_top=2)
+        recharge.ajouter(20)
+        self.assertEqual(recharge.meilleurs(), [20, 9])
+        self.assertEqual(recharge.parties, 11)
+        recharge.fermer()
+
+    def test_ligne_tronquee_ignoree(self):
+        (self.dossier / "scores.0.log").write_bytes(b"12\n30\n4")
+        journal = JournalScores(self.dossier)
+        self.assertEqual(journal.meilleurs(), [30, 12])
+        journal.ajouter(7)
+        journal.fermer()
+        self.assertEqual(JournalScores(self.dossier).meilleurs(), [30, 12, 7])
+
+    def test_migration_depuis_scores_json(self):
+        historique = self.dossier / "scores.json"
+        sauvegarder_scores([3, 50, 12, 8], historique)
+        journal = JournalScores(self.dossier, taille_top=3, fichier_historique=historique)
+        self.assertEqual(journal.meilleurs(), [50, 12, 8])
+        self.assertEqual(journal.parties, 4)
+        journal.ajouter(20)
+        journal.fermer()
+
+        # Migration faite une seule fois, l'ancien fichier reste intact
+        recharge = JournalScores(self.dossier, taille_top=3, fichier_historique=historique)
+        self.assertEqual(recharge.meilleurs(), [50, 20, 12])
+        self.assertEqual(recharge.parties, 5)
+        self.assertTrue(historique.exists())
+
+
+class TestIndexRangs(unittest.TestCase):
+    def test_rangs_identiques_a_une_liste_triee(self):
+        rng = random.Random(4)
+        index = IndexRangs(capacite=8)
+        tries = []
+        for _ in range(2000):
+            # Des scores bien au-delà de la capacité initiale forcent des agrandissements
+            score = rng.randrange(rng.choice((10, 1000, 50_000)))
+            index.ajouter(score)
+            bisect.insort(tries, score)
+        for score in [-1, 0, 9, 999, 49_999, 10**6] + rng.sample(range(50_000), 200):
+            self.assertEqual(index.rang(score), len(tries) - bisect.bisect_right(tries, score) + 1)
+        self.assertEqual(len(index), 2000)
+
+    def test_ex_aequo(self):
+        index = IndexRangs()
+        for score in (10, 30, 30, 20):
+            index.ajouter(score)
+        self.assertEqual([index.rang(score) for score in (30, 20, 10, 40)], [1, 3, 4, 1])
+        with self.assertRaises(ValueError):
+            index.ajouter(-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import colorsys
+import math
+import os
+import sys
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import numpy as np  # noqa: E402
+import pygame  # noqa: E402
+
+import snake  # noqa: E402
+
+TOLERANCE = 2  # écart maximal par canal dû à la quantification des tables
+
+
+def couleur_exacte(serpent, index_segment, temps):
+    """Formules d'origine, évaluées sans table."""
+    options = serpent.skin.options_snake
+    palette = serpent.skin.couleurs
+    mode = serpent.skin.couleur_mode
+    if mode == "palette" and palette:
+        defilement = float(options.get("PALETTE_DEFILEMENT", 0.0))
+        decalage = int(temps * defilement) % len(palette) if defilement else 0
+        return palette[(index_segment + decalage) % len(palette)]
+    if mode == "pulse":
+        base = palette[0] if palette else (100, 100, 100)
+        phase = (temps * float(options.get("PULSE_VITESSE", 1.5))
+                 + index_segment * float(options.get("PULSE_DECALE", 0.25)))
+        intensite = (math.sin(phase) + 1) / 2
+        amplitude = float(options.get("PULSE_AMPLITUDE", 0.4))
+        return tuple(max(0, min(255, int(c + (255 - c) * amplitude * intensite))) for c in base)
+    teinte = (index_segment * serpent.plan.delta_couleur + temps * serpent.plan.vitesse_animation) % 1.0
+    r, g, b = colorsys.hsv_to_rgb(teinte, 1.0, 1.0)
+    return (int(r * 255), int(g * 255), int(b * 255))
+
+
+def rendre(serpent, couleurs):
+    surface = pygame.Surface((snake.LARGEUR, snake.HAUTEUR))
+    for i, position in enumerate(serpent.positions):
+        sprite = serpent._sprite_segment(couleurs[i]) if i else serpent._sprite_tete(
+            serpent._accentuer_couleur(couleurs[0], serpent.plan.eclat_tete), serpent.direction)
+        surface.blit(sprite, (position[0] * snake.TAILLE_CELLULE, position[1] * snake.TAILLE_CELLULE))
+    return pygame.surfarray.array3d(surface).astype(np.int16)
+
+
+class TestTablesCouleurs(unittest.TestCase):
+    def test_rendu_identique_a_la_quantification_pres(self):
+        for skin in snake.SNAKE_SKINS:
+            serpent = snake.Snake(skin)
+            for direction in [snake.HAUT] * 8 + [snake.GAUCHE] * 12 + [snake.BAS] * 10:
+                serpent.direction = direction
+                serpent.manger()
+                serpent.bouger()
+            n = len(serpent.positions)
+            for temps in (0.0, 1.37, 12.5, 333.3):
+                with self.subTest(skin=skin.identifiant, temps=temps):
+                    table = serpent.plan.couleurs_frame(n, temps)
+                    exact = [couleur_exacte(serpent, i, temps) for i in range(n)]
+                    ecart = np.abs(rendre(serpent, table) - rendre(serpent, exact)).max()
+                    self.assertLessEqual(ecart, TOLERANCE)
+                    self.assertEqual(serpent._couleur_segment(5, temps), table[5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+DOSSIER_BACKEND = Path(__file__).parent / "backend"
+sys.path.insert(0, str(DOSSIER_BACKEND))
+
+from demarrage import ProfilDemarrage  # noqa: E402
+
+
+class TestDemarrage(unittest.TestCase):
+    def test_profil(self):
+        profil = ProfilDemarrage(debut=0.0)
+        profil.marquer("import")
+        profil.marquer("fenêtre")
+        profil.ajouter("audio", 0.5)
+        self.assertEqual([nom for nom, _ in profil.phases], ["import", "fenêtre"])
+        self.assertAlmostEqual(profil.total, sum(duree for _, duree in profil.phases))
+        rapport = profil.rapport()
+        self.assertIn("total", rapport)
+        self.assertIn("audio (à part)", rapport)
+
+    def test_premiere_frame_sans_initialisation_superflue(self):
+        # Nouveau processus : l'état des modules et de SDL ne dépend pas des autres tests
+        script = """
+import sys, time
+import snake
+pygame = snake.pygame
+from stockage import StockageSQLite
+jeu = snake.Jeu(stockage=StockageSQLite(":memory:"))
+avant = pygame.font.get_init()
+jeu.dessiner()
+time.sleep(0.02)
+print(avant, pygame.font.get_init(), pygame.mixer.get_init() is not None, pygame.joystick.get_init(),
+      "pkg_resources" in sys.modules, "http.client" in sys.modules, pygame.time.get_ticks() > 0)
+"""
+        sortie = subprocess.run(
+            [sys.executable, "-c", script], cwd=DOSSIER_BACKEND, capture_output=True, text=True, check=True
+        ).stdout.split("\n")[-2]
+        self.assertEqual(sortie.split(), ["False", "True", "False", "False", "False", "False", "True"])
+
+    def test_sous_systemes_optionnels_importes_a_la_demande(self):
+        script = """
+import sys
+import snake
+print(*sorted(m for m in ("asyncio", "sqlite3", "salles", "stockage", "instantane", "arene", "pilote")
+              if m in sys.modules))
+import instantane, pilote
+print(snake.NOM_SAUVEGARDE_RAPIDE.endswith(instantane.EXTENSION), snake.NOM_SAUVEGARDE_AUTO.endswith(instantane.EXTENSION),
+      snake.BUDGET_PILOTE_US == pilote.BUDGET_DECISION_US)
+"""
+        lignes = subprocess.run(
+            [sys.executable, "-c", script], cwd=DOSSIER_BACKEND, capture_output=True, text=True, check=True
+        ).stdout.split("\n")
+        self.assertEqual(lignes[-3], "")
+        self.assertEqual(lignes[-2], "True True True")
+
+
+if __name__ == "__main__":
+    unittest.main()
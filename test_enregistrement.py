@@ -0,0 +1,75 @@
+import os
+import random
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import pygame  # noqa: E402
+
+import moteur  # noqa: E402
+import snake  # noqa: E402
+from enregistrement import DivergenceRejeu, Enregistrement, enregistrer_partie, rejouer  # noqa: E402
+from simulation import PolitiqueAleatoire, PolitiqueGloutonne  # noqa: E402
+from stockage import StockageSQLite  # noqa: E402
+
+
+class TestEnregistrement(unittest.TestCase):
+    def test_format_compact_et_relu_a_l_identique(self):
+        enregistrement = enregistrer_partie(2**63 + 5, PolitiqueGloutonne(1))
+        self.assertGreater(enregistrement.score, 0)
+        donnees = enregistrement.en_octets()
+        relu = Enregistrement.depuis_octets(donnees)
+        self.assertEqual(relu.graine, 2**63 + 5)
+        self.assertEqual((relu.ticks, relu.score), (enregistrement.ticks, enregistrement.score))
+        self.assertEqual(list(relu.ticks_virages), list(enregistrement.ticks_virages))
+        self.assertEqual(relu.codes_virages, enregistrement.codes_virages)
+        # En-tête fixe (une vingtaine d'octets) puis un à deux octets par virage
+        self.assertLess(len(donnees), 24 + 2 * len(enregistrement))
+
+    def test_rejeu_des_politiques(self):
+        for graine in range(20):
+            for politique in (PolitiqueAleatoire(graine), PolitiqueGloutonne(graine)):
+                enregistrement = enregistrer_partie(graine, politique)
+                etat = rejouer(enregistrement)
+                self.assertEqual(etat.score, enregistrement.score)
+
+    def test_divergence_detectee(self):
+        enregistrement = enregistrer_partie(3, PolitiqueGloutonne(3))
+        enregistrement.graine += 1
+        with self.assertRaises(DivergenceRejeu):
+            rejouer(enregistrement)
+        with self.assertRaises(ValueError):
+            Enregistrement.depuis_octets(b"PNG?")
+        with self.assertRaises(ValueError):
+            Enregistrement.depuis_octets(enregistrement.en_octets()[:-1])
+
+    def test_partie_jouee_dans_le_jeu(self):
+        with tempfile.TemporaryDirectory() as dossier:
+            jeu = snake.Jeu(stockage=StockageSQLite(":memory:"), dossier_enregistrements=Path(dossier))
+            jeu.ecran = pygame.Surface((snake.LARGEUR, snake.HAUTEUR))
+            jeu._initialiser_nouvelle_partie(graine=11)
+            rng = random.Random(5)
+            while jeu.etat == "jeu":
+                # Plusieurs touches par tick, comme au clavier
+                for _ in range(rng.randrange(3)):
+                    jeu._memoriser_direction(rng.choice((moteur.HAUT, moteur.BAS, moteur.GAUCHE, moteur.DROITE)))
+                jeu.mettre_a_jour()
+            for thread in threading.enumerate():
+                if thread.name == "enregistrement-partie":
+                    thread.join()
+
+            (fichier,) = Path(dossier).iterdir()
+            enregistrement = Enregistrement.charger(fichier)
+            self.assertEqual(enregistrement.graine, 11)
+            self.assertEqual(enregistrement.score, jeu.partie.score)
+            self.assertEqual(rejouer(enregistrement).frame_count, jeu.partie.frame_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import numpy as np  # noqa: E402
+
+import moteur  # noqa: E402
+from environnement_lot import (  # noqa: E402
+    ACTION_BAS,
+    ACTION_DROITE,
+    ACTION_GAUCHE,
+    ACTION_HAUT,
+    CASE_NOURRITURE,
+    CASE_TETE,
+    EnvironnementLot,
+)
+
+
+def jouer(env, nb_ticks, graine_actions=0):
+    rng = np.random.default_rng(graine_actions)
+    scores = []
+    for _ in range(nb_ticks):
+        actions = rng.integers(-1, 4, env.nb_envs)
+        _, _, _, infos = env.step(actions)
+        if infos:
+            scores.extend(zip(infos["envs"].tolist(), infos["score"].tolist()))
+    return scores
+
+
+DIRECTIONS = {ACTION_HAUT: moteur.HAUT, ACTION_BAS: moteur.BAS, ACTION_GAUCHE: moteur.GAUCHE,
+              ACTION_DROITE: moteur.DROITE}
+
+
+def corps_lot(env):
+    """Cellules du corps de l'environnement 0, tête en premier."""
+    k = env.nb_cellules
+    return [int(env.anneau[0, (env.slot_tete[0] - i) % k]) for i in range(env.longueur[0])]
+
+
+def corps_moteur(etat):
+    return [y * etat.grille.colonnes + x for x, y in etat.serpent.positions]
+
+
+class TestEnvironnementLot(unittest.TestCase):
+    def test_reset_observations(self):
+        env = EnvironnementLot(3, colonnes=8, lignes=6)
+        obs = env.reset(graines=[1, 2, 3])
+        self.assertEqual(obs.shape, (3, 6, 8))
+        self.assertTrue(((obs == CASE_TETE).sum(axis=(1, 2)) == 1).all())
+        self.assertTrue(((obs == CASE_NOURRITURE).sum(axis=(1, 2)) == 1).all())
+
+    def test_demi_tour_ignore_et_mur_fatal(self):
+        env = EnvironnementLot(1, colonnes=4, lignes=4)
+        _, _, terminees, _ = env.step([ACTION_GAUCHE])
+        self.assertEqual(env.direction[0], ACTION_DROITE)
+        self.assertFalse(terminees[0])
+        _, _, terminees, infos = env.step([ACTION_DROITE])
+        self.assertTrue(terminees[0])
+        self.assertEqual(infos["ticks"][0], 2)
+        self.assertEqual(env.longueur[0], 1)
+
+    def test_manger_grandit(self):
+        env = EnvironnementLot(1, colonnes=8, lignes=8)
+        env.nourriture[0] = env.anneau[0, 0] + 8
+        _, recompenses, _, _ = env.step([ACTION_BAS])
+        self.assertEqual(recompenses[0], 10)
+        env.step([-1])
+        self.assertEqual(env.longueur[0], 2)
+        self.assertEqual(int(env.grille[0].sum()), 2)
+
+    def test_grille_coherente_avec_le_corps(self):
+        env = EnvironnementLot(64, colonnes=10, lignes=10, graine=5)
+        jouer(env, 300)
+        self.assertTrue((env.grille.sum(axis=1) == env.longueur).all())
+
+    def comparer_au_moteur(self, colonnes, lignes, coups):
+        """Joue ``coups`` (action, croissance, invincible) dans le lot et dans
+        moteur.avancer, en comparant le corps et la fin de partie à chaque tick."""
+        env = EnvironnementLot(1, colonnes=colonnes, lignes=lignes)
+        etat = moteur.nouvelle_partie(colonnes=colonnes, lignes=lignes, graine=0)
+        env.nourriture[0] = 0
+        etat.nourriture.position = (0, 0)
+        self.assertEqual(corps_lot(env), corps_moteur(etat))
+        for action, croissance, invincible in coups:
+            if croissance:
+                env.grandir[0] = etat.serpent.grandir = True
+            env.temps_invincible[0] = etat.temps_invincible = 10 if invincible else 0
+            etat.invincible = invincible
+            _, _, terminees, _ = env.step([action])
+            evenements = moteur.avancer(etat, None if action < 0 else DIRECTIONS[action])
+            self.assertEqual(bool(terminees[0]), bool(evenements & moteur.PARTIE_TERMINEE))
+            if terminees[0]:
+                return
+            self.assertEqual(corps_lot(env), corps_moteur(etat))
+            self.assertEqual(int(env.grille[0].sum()), env.longueur[0])
+        self.fail("La partie devait se terminer.")
+
+    def test_invincible_arrete_au_bord_comme_le_moteur(self):
+        # Tête en (2, 2) : un pas vers le bord droit, puis deux pas refusés
+        coups = [(-1, False, True)] * 3 + [(ACTION_BAS, False, True), (ACTION_DROITE, False, True)]
+        self.comparer_au_moteur(4, 4, coups + [(ACTION_DROITE, False, False)])
+
+    def test_invincible_arrete_par_son_corps_comme_le_moteur(self):
+        coups = [(-1, True, False), (ACTION_BAS, True, False), (ACTION_GAUCHE, True, False)]
+        # Le segment d'au-dessus est le corps : refusé, la croissance attend le pas suivant
+        coups += [(ACTION_HAUT, True, True), (ACTION_HAUT, False, True), (ACTION_GAUCHE, False, True)]
+        self.comparer_au_moteur(8, 8, coups + [(ACTION_GAUCHE, False, False)] * 4)
+
+    def test_graine_independante_du_lot(self):
+        seul = EnvironnementLot(1, colonnes=10, lignes=10)
+        seul.reset(graines=[42])
+        lot = EnvironnementLot(4, colonnes=10, lignes=10)
+        lot.reset(graines=[7, 42, 8, 9])
+        for _ in range(50):
+            seul.step([-1])
+            lot.step([-1] * 4)
+            self.assertEqual(seul.nourriture[0], lot.nourriture[1])
+            self.assertEqual(seul.score[0], lot.score[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
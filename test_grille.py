@@ -0,0 +1,146 @@
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from grille import CAPACITE_INITIALE, CORPS, NOURRITURE, RESERVE_ANNEAU, CorpsSerpent, Grille, _identite  # noqa: E402
+
+
+class TestCorpsSerpent(unittest.TestCase):
+    def test_bouger_et_grandir(self):
+        corps = CorpsSerpent(10, 10, (5, 5))
+        self.assertTrue(corps.bouger((1, 0), grandir=True))
+        self.assertTrue(corps.bouger((1, 0)))
+        self.assertEqual(list(corps.positions), [(7, 5), (6, 5)])
+        self.assertNotIn((5, 5), corps.positions)
+        self.assertIn((6, 5), corps.positions)
+
+    def test_collisions_bord_et_corps(self):
+        corps = CorpsSerpent(3, 3, (2, 0))
+        self.assertFalse(corps.bouger((1, 0)))
+        self.assertEqual(corps.tete, (2, 0))
+        for direction in ((0, 1), (-1, 0), (0, -1)):
+            self.assertTrue(corps.bouger(direction, grandir=True))
+        # La tête (1, 0) revient sur le premier segment (2, 0).
+        self.assertFalse(corps.bouger((1, 0)))
+
+    def test_traverser_bords(self):
+        corps = CorpsSerpent(4, 3, (3, 0))
+        self.assertTrue(corps.bouger((1, 0), traverser_bords=True))
+        self.assertTrue(corps.bouger((0, -1), traverser_bords=True))
+        self.assertEqual(corps.tete, (0, 2))
+        self.assertEqual(len(corps.positions), 1)
+
+    def test_plateau_rempli(self):
+        corps = CorpsSerpent(4, 4, (0, 0))
+        chemin = [(1, 0)] * 3 + [(0, 1)] + [(-1, 0)] * 3 + [(0, 1)] + [(1, 0)] * 3 + [(0, 1)] + [(-1, 0)] * 3
+        for direction in chemin:
+            self.assertTrue(corps.bouger(direction, grandir=True))
+        self.assertEqual(len(corps.positions), 16)
+        self.assertEqual(corps.positions[-1], (0, 0))
+        self.assertFalse(corps.bouger((0, -1), grandir=True))
+        self.assertFalse(corps.bouger((-1, 0), traverser_bords=True))
+
+    def test_rangs_et_changements_depuis_des_reperes(self):
+        corps = CorpsSerpent(5, 4, (0, 0))
+        for direction in [(1, 0)] * 4 + [(0, 1)]:
+            corps.bouger(direction, grandir=True)
+        reperes = corps.reperes
+        for cellule, position in enumerate(corps.positions):
+            self.assertEqual(corps.rang(corps.grille.cellule(*position)), cellule)
+        corps.bouger((-1, 0))
+        corps.bouger((-1, 0), grandir=True)
+        entrees, sorties = corps.changements_depuis(reperes)
+        self.assertEqual(entrees, [corps.grille.cellule(3, 1), corps.grille.cellule(2, 1)])
+        self.assertEqual(sorties, [corps.grille.cellule(0, 0)])
+        # Tête revenue sur les slots des cellules sorties : il faut tout relire
+        corps = CorpsSerpent(5, 4, (0, 0))
+        corps.bouger((1, 0), grandir=True)
+        corps.bouger((1, 0), grandir=True)
+        reperes = corps.reperes
+        for _ in range(corps.capacite - 3):
+            self.assertTrue(corps.bouger((1, 0), traverser_bords=True))
+        self.assertEqual(len(corps.changements_depuis(reperes)[1]), corps.capacite - 3)
+        self.assertTrue(corps.bouger((1, 0), traverser_bords=True))
+        self.assertIsNone(corps.changements_depuis(reperes))
+
+    def test_anneau_agrandi_a_la_demande(self):
+        corps = CorpsSerpent(100, 100, (0, 0))
+        self.assertEqual(corps.capacite, CAPACITE_INITIALE)
+        reperes = corps.reperes
+        sens = 1
+        while corps.longueur < 500:
+            x = corps.tete[0]
+            if 0 <= x + sens < 100:
+                self.assertTrue(corps.bouger((sens, 0), grandir=True))
+            else:
+                self.assertTrue(corps.bouger((0, 1), grandir=True))
+                sens = -sens
+            self.assertGreaterEqual(corps.capacite, corps.longueur + RESERVE_ANNEAU)
+        self.assertLess(corps.capacite, 2 * (500 + RESERVE_ANNEAU))
+        self.assertIsNone(corps.changements_depuis(reperes))
+        positions = list(corps.positions)
+        self.assertEqual(positions[0], corps.tete)
+        self.assertEqual(positions[-1], (0, 0))
+        for rang, position in enumerate(positions):
+            self.assertEqual(corps.rang(corps.grille.cellule(*position)), rang)
+        self.assertEqual(len(corps.grille.libres), 100 * 100 - 500)
+
+    def test_grille_partagee(self):
+        grille = Grille(6, 6)
+        a = CorpsSerpent(6, 6, (0, 0), grille)
+        b = CorpsSerpent(6, 6, (0, 2), grille)
+        with self.assertRaises(ValueError):
+            CorpsSerpent(6, 6, (0, 2), grille)
+        self.assertTrue(a.bouger((0, 1), grandir=True))
+        # Le corps de l'autre serpent bloque comme le sien
+        self.assertFalse(a.bouger((0, 1)))
+        self.assertTrue(b.bouger((1, 0)))
+        self.assertTrue(a.bouger((0, 1)))
+        b.liberer()
+        self.assertEqual(len(grille.libres), 36 - 2)
+        self.assertEqual(list(b.positions), [(1, 2)])
+
+
+class TestCellulesLibres(unittest.TestCase):
+    def test_index_suit_les_drapeaux(self):
+        grille = Grille(3, 2)
+        grille.marquer(0, CORPS)
+        grille.marquer(0, NOURRITURE)
+        grille.marquer(4, NOURRITURE)
+        self.assertEqual(len(grille.libres), 4)
+        grille.effacer(0, CORPS)
+        self.assertNotIn(0, grille.libres)
+        grille.effacer(0, NOURRITURE)
+        grille.effacer(0, NOURRITURE)
+        self.assertIn(0, grille.libres)
+        self.assertEqual(len(grille.libres), 5)
+
+    def test_tirage_uniquement_libre(self):
+        corps = CorpsSerpent(4, 4, (0, 0))
+        for direction in [(1, 0)] * 3 + [(0, 1)] + [(-1, 0)] * 3:
+            corps.bouger(direction, grandir=True)
+        rng = random.Random(0)
+        tirages = {corps.grille.tirer_cellule_libre(rng) for _ in range(200)}
+        self.assertEqual(tirages, set(range(8, 16)))
+
+    def test_grille_pleine(self):
+        grille = Grille(1, 2)
+        grille.marquer(0, CORPS)
+        grille.marquer(1, NOURRITURE)
+        self.assertIsNone(grille.tirer_cellule_libre(random.Random(0)))
+
+    def test_identites_en_cache_bornees(self):
+        for colonnes in range(2, 12):
+            grille = Grille(colonnes, 3)
+            self.assertEqual(grille.libres.ordre().tolist(), list(range(colonnes * 3)))
+        # Les identités copiées restent distinctes d'une grille à l'autre
+        grille.libres.retirer(0)
+        self.assertEqual(len(Grille(11, 3).libres), 33)
+        self.assertEqual(_identite.cache_info().currsize, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
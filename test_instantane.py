@@ -0,0 +1,228 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import pygame  # noqa: E402
+
+import instantane  # noqa: E402
+import moteur  # noqa: E402
+import snake  # noqa: E402
+from instantane import JournalSauvegarde, appliquer_delta, decoder, encoder, encoder_delta, repere  # noqa: E402
+from moteur import BAS, DROITE, GAUCHE, HAUT  # noqa: E402
+from pilote import PiloteAutomatique  # noqa: E402
+from stockage import StockageSQLite  # noqa: E402
+
+
+def _signature(etat: moteur.EtatPartie) -> tuple:
+    bonus = etat.bonus
+    return (
+        list(etat.serpent.corps.cellules()),
+        bytes(etat.grille.occupation),
+        len(etat.grille.libres),
+        etat.serpent.direction,
+        etat.serpent.grandir,
+        etat.nourriture.position,
+        None if bonus is None else (bonus.type, bonus.position, bonus.duree_vie),
+        (etat.score, etat.niveau, etat.vitesse_actuelle, etat.multiplicateur_score),
+        (etat.invincible, etat.temps_invincible, etat.temps_multiplicateur),
+        (etat.frame_count, etat.terminee, etat.plateau_rempli),
+        etat.bonus_collectes,
+        etat.rng.getstate(),
+    )
+
+
+def _pilote_jusqu_a(etat: moteur.EtatPartie, pilote: PiloteAutomatique, tick: int, *copies) -> None:
+    """Avance ``etat`` (et ``copies`` avec les mêmes directions) jusqu'à ``tick``."""
+    while etat.frame_count < tick and not etat.terminee:
+        action = pilote(etat)
+        moteur.avancer(etat, action)
+        for copie in copies:
+            moteur.avancer(copie, action)
+
+
+class TestInstantane(unittest.TestCase):
+    def test_la_partie_reprise_continue_a_l_identique(self):
+        etat = moteur.nouvelle_partie(graine=1)
+        pilote = PiloteAutomatique(budget_us=5_000)
+        for tick in range(0, 3_000, 300):
+            _pilote_jusqu_a(etat, pilote, tick)
+            copie = decoder(encoder(etat))
+            self.assertEqual(_signature(copie), _signature(etat))
+            # Même générateur : mêmes nourritures et bonus par la suite
+            _pilote_jusqu_a(etat, pilote, tick + 150, copie)
+            self.assertEqual(_signature(copie), _signature(etat))
+        self.assertGreater(etat.score, 0)
+
+    def test_grand_plateau_en_codes_de_direction(self):
+        # 300 x 300 : au-delà des cellules u16, le corps part en codes de 2 bits
+        etat = moteur.nouvelle_partie(300, 300, graine=0)
+        corps = etat.serpent.corps
+        for direction, pas in ((DROITE, 250), (BAS, 3), (GAUCHE, 280), (HAUT, 290), (DROITE, 2)):
+            for _ in range(pas):
+                # Bords traversés comme en mode invincible
+                self.assertTrue(corps.bouger(direction, grandir=True, traverser_bords=True))
+        etat.invincible = True
+        donnees = encoder(etat)
+        # Cellules libres presque dans l'ordre initial : quelques Ko compressées
+        self.assertLess(len(donnees), 2_600 + corps.longueur // 4 + 8_000)
+        self.assertEqual(_signature(decoder(donnees)), _signature(etat))
+
+    def test_serpent_de_dix_mille_segments(self):
+        etat = moteur.nouvelle_partie(128, 160, graine=0)
+        corps = etat.serpent.corps
+        while corps.longueur < 10_000:
+            x, y = corps.tete
+            sens = DROITE if y % 2 == 0 else GAUCHE
+            bord = x + sens[0] in (-1, 128)
+            self.assertTrue(corps.bouger(BAS if bord else sens, grandir=True))
+        donnees = encoder(etat)
+        # Deux octets par cellule, corps et cellules libres, plus le générateur
+        self.assertLess(len(donnees), 2 * 128 * 160 + 2_600)
+        self.assertEqual(_signature(decoder(donnees)), _signature(etat))
+
+    def test_deltas_de_tick_en_tick(self):
+        etat = moteur.nouvelle_partie(graine=4)
+        pilote = PiloteAutomatique(budget_us=5_000)
+        copie = decoder(encoder(etat))
+        depuis = repere(etat)
+        tailles = []
+        while etat.frame_count < 2_000 and not etat.terminee:
+            _pilote_jusqu_a(etat, pilote, etat.frame_count + 10)
+            delta = encoder_delta(etat, depuis)
+            if delta is None:
+                # Anneau agrandi depuis le repère : instantané complet
+                copie = decoder(encoder(etat))
+            else:
+                appliquer_delta(copie, delta)
+                if not instantane.SCALAIRES.unpack_from(delta, instantane.ENTETE.size)[7] & instantane.GENERATEUR:
+                    tailles.append(len(delta))
+            self.assertEqual(_signature(copie), _signature(etat))
+            depuis = repere(etat)
+        # Sans le générateur, un delta de 10 ticks tient en moins de 200 octets
+        self.assertTrue(tailles)
+        self.assertLess(max(tailles), 200)
+
+        # Delta pris depuis un autre tick que celui de la partie à compléter
+        delta = encoder_delta(etat, repere(etat))
+        copie.frame_count += 1
+        with self.assertRaises(ValueError):
+            appliquer_delta(copie, delta)
+        with self.assertRaises(ValueError):
+            decoder(b"SNKR" + encoder(etat)[4:])
+
+
+class TestJournalSauvegarde(unittest.TestCase):
+    def setUp(self):
+        self.dossier = tempfile.TemporaryDirectory()
+        self.chemin = Path(self.dossier.name) / "auto.snks"
+        self.journal = JournalSauvegarde(self.chemin, deltas_par_complet=4)
+
+    def tearDown(self):
+        self.journal.fermer()
+        self.dossier.cleanup()
+
+    def test_reprise_au_dernier_enregistrement_complet(self):
+        etat = moteur.nouvelle_partie(graine=2)
+        pilote = PiloteAutomatique(budget_us=5_000)
+        signatures = []
+        for tick in range(10, 130, 10):
+            _pilote_jusqu_a(etat, pilote, tick)
+            self.journal.sauvegarder(etat)
+            signatures.append(_signature(etat))
+        self.journal.valider()
+        self.assertEqual(_signature(instantane.charger(self.chemin)), signatures[-1])
+        statistiques = self.journal.statistiques()
+        self.assertEqual(statistiques["complets"] + statistiques["deltas"], 12)
+        self.assertGreater(statistiques["deltas"], statistiques["complets"])
+        self.assertLessEqual(statistiques["capture_us_p50"], statistiques["capture_us_p99"])
+
+        # Arrêt brutal pendant l'ajout du dernier delta : on reprend au précédent
+        donnees = self.chemin.read_bytes()
+        self.chemin.write_bytes(donnees[:-3])
+        self.assertEqual(_signature(instantane.charger(self.chemin)), signatures[-2])
+        corrompu = bytearray(donnees)
+        corrompu[-1] ^= 0xFF
+        self.chemin.write_bytes(bytes(corrompu))
+        self.assertEqual(_signature(instantane.charger(self.chemin)), signatures[-2])
+
+        self.journal.effacer()
+        self.journal.valider()
+        self.assertFalse(self.chemin.exists())
+        self.assertIsNone(instantane.charger(self.chemin))
+
+
+class TestJeuSauvegardes(unittest.TestCase):
+    def setUp(self):
+        self.dossier = tempfile.TemporaryDirectory()
+        self.jeu = snake.Jeu(
+            stockage=StockageSQLite(":memory:"), pilote=PiloteAutomatique(), dossier_sauvegardes=Path(self.dossier.name)
+        )
+        self.jeu.ecran = pygame.Surface((snake.LARGEUR, snake.HAUTEUR))
+
+    def tearDown(self):
+        self.jeu.journal_sauvegarde.fermer()
+        self.dossier.cleanup()
+
+    def _avancer(self, ticks: int) -> None:
+        for _ in range(ticks):
+            self.jeu.mettre_a_jour()
+        self.jeu.journal_sauvegarde.valider()
+
+    def _perdre(self, score: int) -> None:
+        self.jeu.partie.score = score
+        self.jeu._declencher_game_over()
+        self.jeu.journal_sauvegarde.valider()
+
+    def test_sauvegarde_rapide_et_reprise(self):
+        jeu = self.jeu
+        jeu._initialiser_nouvelle_partie(graine=1)
+        self._avancer(25)
+        self.assertIsNotNone(jeu.sauvegarder_partie())
+        for ecriture in threading.enumerate():
+            if ecriture.name == "sauvegarde-rapide":
+                ecriture.join()
+        sauvegardee = _signature(jeu.partie)
+        self._avancer(20)
+
+        # Sauvegarde automatique tous les TICKS_SAUVEGARDE_AUTO ticks : la partie reste classée
+        self.assertTrue(jeu.reprendre_partie(automatique=True))
+        self.assertEqual(jeu.partie.frame_count, 40)
+        self.assertTrue(jeu.partie_classee)
+
+        self.assertTrue(jeu.reprendre_partie())
+        self.assertEqual(_signature(jeu.partie), sauvegardee)
+        self.assertIsInstance(jeu.partie.serpent, snake.Snake)
+        self.assertIsNone(jeu.enregistrement)
+        self.assertFalse(jeu.partie_classee)
+        self._avancer(10)
+        jeu.dessiner(0.5)
+        # Ni la partie quittée ni la partie rechargée ne sont reprises automatiquement
+        self.assertFalse(jeu.reprendre_partie(automatique=True))
+
+    def test_partie_rechargee_non_classee(self):
+        jeu = self.jeu
+        jeu._initialiser_nouvelle_partie(graine=1)
+        self._avancer(5)
+        jeu.sauvegarder_partie()
+        for ecriture in threading.enumerate():
+            if ecriture.name == "sauvegarde-rapide":
+                ecriture.join()
+        self._perdre(70)
+        self.assertEqual(jeu.stockage.meilleur_score(), 70)
+        self.assertFalse(jeu.reprendre_partie(automatique=True))
+
+        # Rechargée après la fin de partie puis perdue à nouveau : classée une seule fois
+        self.assertTrue(jeu.reprendre_partie())
+        self._perdre(90)
+        self.assertEqual(jeu.stockage.meilleurs_scores(5), [70])
+
+
+if __name__ == "__main__":
+    unittest.main()
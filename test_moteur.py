@@ -0,0 +1,91 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+DOSSIER_BACKEND = Path(__file__).parent / "backend"
+sys.path.insert(0, str(DOSSIER_BACKEND))
+
+import moteur  # noqa: E402
+
+
+class TestMoteur(unittest.TestCase):
+    def test_sans_pygame(self):
+        code = "import sys, moteur; sys.exit('pygame' in sys.modules)"
+        resultat = subprocess.run([sys.executable, "-c", code], cwd=DOSSIER_BACKEND)
+        self.assertEqual(resultat.returncode, 0)
+
+    def test_manger_nourriture(self):
+        etat = moteur.nouvelle_partie(graine=1)
+        tete = etat.serpent.corps.tete
+        etat.nourriture.position = (tete[0] + 1, tete[1])
+        evenements = moteur.avancer(etat)
+        self.assertTrue(evenements & moteur.NOURRITURE_MANGEE)
+        self.assertEqual(etat.score, 10)
+        self.assertNotIn(etat.nourriture.position, etat.serpent.positions)
+        moteur.avancer(etat)
+        self.assertEqual(len(etat.serpent.positions), 2)
+
+    def test_bord_fatal_sauf_invincible(self):
+        etat = moteur.nouvelle_partie(colonnes=4, lignes=4, graine=2)
+        etat.nourriture.position = (0, 0)
+        etat.invincible, etat.temps_invincible = True, 10
+        for _ in range(3):
+            self.assertEqual(moteur.avancer(etat), moteur.AUCUN_EVENEMENT)
+        # Arrêté contre le bord, sans le traverser
+        self.assertEqual(etat.serpent.corps.tete, (3, 2))
+        self.assertFalse(etat.terminee)
+        etat.invincible, etat.temps_invincible = False, 0
+        self.assertEqual(moteur.avancer(etat), moteur.PARTIE_TERMINEE)
+        self.assertTrue(etat.terminee)
+
+    def test_morsure_arretee_en_mode_invincible(self):
+        etat = moteur.nouvelle_partie(colonnes=8, lignes=8, graine=0)
+        etat.nourriture.position = (0, 0)
+        etat.serpent.grandir = True
+        moteur.avancer(etat)
+        etat.serpent.grandir = True
+        moteur.avancer(etat, moteur.BAS)
+        etat.serpent.grandir = True
+        moteur.avancer(etat, moteur.GAUCHE)
+        corps = list(etat.serpent.positions)
+        etat.invincible, etat.temps_invincible = True, 10
+        # Le segment d'au-dessus est le corps : le serpent ne bouge pas
+        self.assertEqual(moteur.avancer(etat, moteur.HAUT), moteur.AUCUN_EVENEMENT)
+        self.assertEqual(list(etat.serpent.positions), corps)
+        etat.invincible, etat.temps_invincible = False, 0
+        self.assertEqual(moteur.avancer(etat), moteur.PARTIE_TERMINEE)
+
+    def test_bonus_points(self):
+        etat = moteur.nouvelle_partie(graine=3)
+        tete = etat.serpent.corps.tete
+        etat.bonus = moteur.Bonus('points')
+        etat.bonus.position = (tete[0] + 1, tete[1])
+        self.assertTrue(moteur.avancer(etat) & moteur.BONUS_RAMASSE)
+        self.assertEqual((etat.score, etat.multiplicateur_score), (15, 3))
+        self.assertEqual(etat.bonus_collectes['points'], 1)
+
+    def test_plateau_rempli(self):
+        etat = moteur.nouvelle_partie(colonnes=2, lignes=1, graine=0)
+        self.assertEqual(etat.nourriture.position, (0, 0))
+        etat.serpent.direction = moteur.GAUCHE
+        self.assertEqual(moteur.avancer(etat), moteur.NOURRITURE_MANGEE)
+        self.assertEqual(etat.nourriture.position, (1, 0))
+        etat.serpent.direction = moteur.DROITE
+        evenements = moteur.avancer(etat)
+        self.assertTrue(evenements & moteur.PLATEAU_REMPLI)
+        self.assertTrue(etat.terminee and etat.plateau_rempli)
+
+    def test_graine_reproductible(self):
+        def jouer(graine):
+            etat = moteur.nouvelle_partie(graine=graine)
+            directions = (moteur.BAS, moteur.GAUCHE, moteur.HAUT, moteur.DROITE)
+            for tick in range(200):
+                moteur.avancer(etat, directions[(tick // 3) % 4])
+            return etat.nourriture.position, etat.score, list(etat.serpent.positions)
+
+        self.assertEqual(jouer(7), jouer(7))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import pygame  # noqa: E402
+
+import moteur  # noqa: E402
+import simulation  # noqa: E402
+import snake  # noqa: E402
+from enregistrement import enregistrer_partie, rejouer  # noqa: E402
+from grille import NOURRITURE, CorpsSerpent  # noqa: E402
+from moteur import DROITE, HAUT  # noqa: E402
+from pilote import DIRECTIONS, PiloteAutomatique  # noqa: E402
+from stockage import StockageSQLite  # noqa: E402
+
+
+def _jouer(pilote: PiloteAutomatique, graine: int, max_ticks: int = 5_000) -> moteur.EtatPartie:
+    etat = moteur.nouvelle_partie(graine=graine)
+    pilote.reinitialiser()
+    while etat.frame_count < max_ticks:
+        if moteur.avancer(etat, pilote(etat)) & moteur.PARTIE_TERMINEE:
+            break
+    return etat
+
+
+class TestPilote(unittest.TestCase):
+    def test_meilleur_que_le_glouton(self):
+        graines = range(4)
+        pilote = PiloteAutomatique(budget_us=5_000)
+        scores_pilote = [_jouer(pilote, graine).score for graine in graines]
+        scores_glouton = [r.score for r in simulation.simuler(len(graines), politique="glouton", processus=1)]
+        self.assertGreater(sum(scores_pilote), 2 * sum(scores_glouton))
+
+        statistiques = pilote.statistiques()
+        self.assertEqual(statistiques["decisions"], pilote.decisions)
+        self.assertGreater(statistiques["chemins_reutilises"], statistiques["replanifications"])
+        self.assertLessEqual(statistiques["decision_us_p50"], statistiques["decision_us_p99"])
+        self.assertLessEqual(statistiques["decision_us_p99"], statistiques["decision_us_max"])
+
+    def test_evite_le_cul_de_sac(self):
+        etat = moteur.nouvelle_partie(8, 8, graine=0)
+        grille = etat.grille
+        etat.serpent.corps.liberer()
+        grille.effacer(grille.cellule(*etat.nourriture.position), NOURRITURE)
+        # Corps (0, 2) -> (2, 2) -> (2, 1) -> (3, 1) -> tête (3, 0) : à gauche, une
+        # poche de 5 cases ((0..1, 0..1) et (2, 0)) pour 6 segments
+        corps = CorpsSerpent(8, 8, (0, 2), grille)
+        for direction in (DROITE, DROITE, HAUT, DROITE, HAUT):
+            corps.bouger(direction, grandir=True)
+        etat.serpent.corps = corps
+        etat.serpent.direction = HAUT
+        grille.marquer(grille.cellule(0, 0), NOURRITURE)
+        etat.nourriture.position = (0, 0)
+
+        pilote = PiloteAutomatique()
+        self.assertEqual(pilote(etat), DROITE)
+        self.assertEqual(pilote.replanifications, 1)
+
+    def test_nourriture_derriere_un_serpent_d_une_case(self):
+        # Graine 0 : tête (16, 12) vers la droite, nourriture en (10, 12), derrière
+        etat = moteur.nouvelle_partie(graine=0)
+        self.assertEqual((etat.serpent.direction, etat.nourriture.position), (DROITE, (10, 12)))
+        pilote = PiloteAutomatique()
+        self.assertNotEqual(pilote(etat), moteur.GAUCHE)
+        while etat.score == 0:
+            self.assertFalse(moteur.avancer(etat, pilote(etat)) & moteur.PARTIE_TERMINEE, etat.frame_count)
+        self.assertLess(etat.frame_count, 20)
+
+    def test_budget_nul_joue_quand_meme_un_coup_sur(self):
+        pilote = PiloteAutomatique(budget_us=0)
+        for graine in range(3):
+            etat = moteur.nouvelle_partie(graine=graine)
+            while etat.frame_count < 300:
+                serpent = etat.serpent
+                x, y = serpent.corps.tete
+                issue = any(
+                    (dx, dy) != (-serpent.direction[0], -serpent.direction[1])
+                    and etat.grille.dans_les_bords(x + dx, y + dy)
+                    and not etat.grille.est_occupee(x + dx, y + dy)
+                    for dx, dy in DIRECTIONS
+                )
+                if moteur.avancer(etat, pilote(etat)) & moteur.PARTIE_TERMINEE:
+                    self.assertFalse(issue)
+                    break
+        self.assertGreater(pilote.depassements, 0)
+
+    def test_politique_de_simulation_et_enregistrement(self):
+        resultats = simulation.simuler(2, politique="pilote", processus=1, max_ticks=2_000)
+        self.assertEqual(len(resultats), 2)
+        enregistrement = enregistrer_partie(7, PiloteAutomatique(), max_ticks=2_000)
+        # Seuls les virages sont notés
+        self.assertLess(len(enregistrement), enregistrement.ticks)
+        etat = rejouer(enregistrement)
+        self.assertEqual(etat.score, enregistrement.score)
+
+
+class TestJeuPilote(unittest.TestCase):
+    def test_le_pilote_joue_a_la_place_du_clavier(self):
+        jeu = snake.Jeu(stockage=StockageSQLite(":memory:"), pilote=PiloteAutomatique())
+        jeu.ecran = pygame.Surface((snake.LARGEUR, snake.HAUTEUR))
+        jeu._initialiser_nouvelle_partie(graine=1)
+        jeu.score_enregistre = True
+        for _ in range(200):
+            jeu.mettre_a_jour()
+        jeu.dessiner(1.0)
+        self.assertGreater(jeu.partie.score, 0)
+        self.assertEqual(jeu.pilote.decisions, 200)
+
+        jeu.basculer_pilote()
+        self.assertFalse(jeu.pilote_actif)
+        direction = jeu.partie.serpent.direction
+        jeu.mettre_a_jour()
+        self.assertEqual(jeu.partie.serpent.direction, direction)
+        self.assertEqual(jeu.pilote.decisions, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import dataclasses
+import os
+import sys
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import snake  # noqa: E402
+from plan_rendu import compiler_plan  # noqa: E402
+
+
+class TestPlanRendu(unittest.TestCase):
+    def test_catalogue_compile(self):
+        self.assertEqual(set(snake.PLANS_RENDU), set(snake.SNAKE_SKINS_PAR_ID))
+        galaxie = snake.PLANS_RENDU["galaxie"]
+        self.assertEqual(galaxie.vitesse_animation, 0.15)
+        self.assertEqual(galaxie.largeur_contour, 3)
+        self.assertEqual(galaxie.delta_couleur, snake.Snake.DELTA_COULEUR)
+        self.assertFalse(snake.PLANS_RENDU["nocturne"].ombre)
+        self.assertEqual(snake.PLANS_RENDU["magma"].couleur_ombre, (255, 69, 0, 80))
+
+    def test_plan_immuable_et_partage(self):
+        premier = snake.Snake(snake.SNAKE_SKINS_PAR_ID["magma"])
+        second = snake.Snake(snake.SNAKE_SKINS_PAR_ID["magma"])
+        self.assertIs(premier.plan, second.plan)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            premier.plan.ombre = False
+        self.assertFalse(hasattr(premier.plan, "__dict__"))
+        # Plus d'options recopiées sur chaque instance
+        self.assertNotIn("AFFICHER_REFLET", vars(premier))
+
+    def test_skin_invalide(self):
+        skin = snake.SNAKE_SKINS_PAR_ID["orange"]
+        for modification in (
+            {"options_snake": {"AFFICHER_OMBER": False}},
+            {"options_snake": {"AFFICHER_OMBRE": 1}},
+            {"options_snake": {"COULEUR_CONTOUR": (300, 0, 0)}},
+            {"options_snake": {"PULSE_VITESSE": "vite"}},
+            {"couleurs": ((1, 2),)},
+            {"couleur_mode": "degrade"},
+        ):
+            with self.subTest(**modification), self.assertRaises(ValueError):
+                compiler_plan(dataclasses.replace(skin, **modification), snake.Snake)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import csv
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from profilage import Profileur  # noqa: E402
+
+
+class HorlogeFactice:
+    def __init__(self):
+        self.instant = 0
+
+    def __call__(self):
+        return self.instant
+
+
+class TestProfileur(unittest.TestCase):
+    def _profileur(self, nb_frames, taille=4):
+        horloge = HorlogeFactice()
+        profileur = Profileur(("a", "b"), taille=taille, horloge=horloge)
+        for frame in range(nb_frames):
+            profileur.debut_frame()
+            horloge.instant += 1000 * (frame + 1)
+            profileur.marquer(0)
+            horloge.instant += 500
+            profileur.marquer(1)
+            horloge.instant += 250
+            profileur.marquer(1)
+        profileur.debut_frame()
+        return profileur
+
+    def test_tampon_circulaire(self):
+        profileur = self._profileur(6)
+        self.assertEqual(profileur.nb_frames, 3)
+        self.assertEqual(profileur.durees_ns(0).tolist(), [4000, 5000, 6000])
+        self.assertEqual(profileur.durees_ns(1).tolist(), [750] * 3)
+        self.assertEqual(profileur.totaux_ns().tolist(), [4750, 5750, 6750])
+        resume = profileur.resume()
+        self.assertAlmostEqual(resume["b"]["p99"], 0.00075)
+        self.assertAlmostEqual(resume["frame"]["moyenne"], 0.00575)
+
+    def test_exports(self):
+        profileur = self._profileur(3)
+        with tempfile.TemporaryDirectory() as dossier:
+            session = json.loads(profileur.exporter(Path(dossier) / "profil.json").read_text())
+            self.assertEqual(session["durees_ns"]["a"], [1000, 2000, 3000])
+
+            with profileur.exporter(Path(dossier) / "profil.csv").open(newline="") as fichier:
+                lignes = list(csv.reader(fichier))
+            self.assertEqual(lignes[0], ["frame", "debut_ns", "a_ns", "b_ns", "total_ns"])
+            self.assertEqual(lignes[-1][2:], ["3000", "750", "3750"])
+
+            trace = json.loads(profileur.exporter(Path(dossier) / "trace.json", "chrome").read_text())
+            phases = [e for e in trace["traceEvents"] if e["name"] == "b"]
+            self.assertEqual(len(phases), 3)
+            self.assertAlmostEqual(phases[0]["ts"], 1.0)
+            self.assertAlmostEqual(phases[0]["dur"], 0.75)
+
+
+if __name__ == "__main__":
+    unittest.main()
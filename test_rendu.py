@@ -0,0 +1,96 @@
+import os
+import random
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import pygame  # noqa: E402
+
+import demarrage  # noqa: E402
+from rendu import CacheSprites, CacheTextes  # noqa: E402
+import moteur  # noqa: E402
+import snake  # noqa: E402
+from stockage import StockageSQLite  # noqa: E402
+
+
+class TestCacheSprites(unittest.TestCase):
+    def test_lru_et_statistiques(self):
+        cache = CacheSprites(capacite=2)
+        for cle in ("a", "b"):
+            self.assertIsNone(cache.obtenir(cle))
+            cache.ajouter(cle, pygame.Surface((4, 4), pygame.SRCALPHA))
+        self.assertIsNotNone(cache.obtenir("a"))
+        cache.ajouter("c", pygame.Surface((4, 4), pygame.SRCALPHA))
+        self.assertIsNone(cache.obtenir("b"))
+        self.assertIsNotNone(cache.obtenir("a"))
+        stats = cache.statistiques()
+        self.assertEqual((stats["entrees"], stats["evictions"]), (2, 1))
+        self.assertEqual(stats["octets"], 2 * 4 * 4 * 4)
+        self.assertAlmostEqual(cache.taux_succes, 2 / 5)
+
+
+class TestCacheTextes(unittest.TestCase):
+    def test_nombres_composes_depuis_l_atlas(self):
+        police = demarrage.police(36)
+        textes = CacheTextes()
+        for score in range(0, 200, 10):
+            surface = textes.rendre_nombre(police, score, (255, 255, 255), "Score: ")
+            self.assertEqual(surface.get_size(), police.size(f"Score: {score}"))
+        # Un préfixe et dix chiffres rasterisés, puis plus rien en régime établi
+        self.assertEqual(textes.rasterisations, 11)
+        self.assertIs(textes.rendre_nombre(police, 190, (255, 255, 255), "Score: "), surface)
+        self.assertIs(textes.rendre(police, "Score: ", (255, 255, 255)), textes.rendre(police, "Score: ", (255, 255, 255)))
+        self.assertEqual(textes.rasterisations, 11)
+
+
+class TestRenduIncremental(unittest.TestCase):
+    def _jeu(self, mode, skin):
+        jeu = snake.Jeu(mode_rendu=mode, stockage=StockageSQLite(":memory:"))
+        jeu.ecran = pygame.Surface((snake.LARGEUR, snake.HAUTEUR))
+        jeu.skin_selectionnee = snake.SNAKE_SKINS_PAR_ID[skin]
+        jeu._initialiser_nouvelle_partie()
+        jeu.partie.rng.seed(3)
+        jeu.partie.nourriture.generer(jeu.partie.grille, jeu.partie.rng)
+        jeu.partie.invincible = True
+        jeu.partie.temps_invincible = 60
+        return jeu
+
+    def test_identique_au_rendu_complet(self):
+        temps = [0]
+        with mock.patch.object(pygame.time, "get_ticks", lambda: temps[0]):
+            for skin in ("orange", "galaxie"):
+                complet, incremental = self._jeu("complet", skin), self._jeu("incremental", skin)
+                rng = random.Random(1)
+                for frame in range(90):
+                    temps[0] += rng.choice((16, 100))
+                    if frame % 3 == 0:
+                        direction = rng.choice((moteur.HAUT, moteur.DROITE, None))
+                        for jeu in (complet, incremental):
+                            if direction:
+                                jeu.partie.serpent.changer_direction(direction)
+                            if frame % 9 == 0:
+                                jeu.partie.serpent.manger()
+                            if frame == 30:
+                                bonus = snake.Bonus("points")
+                                bonus.generer(jeu.partie.grille, random.Random(0))
+                                jeu.partie.bonus = bonus
+                            jeu.mettre_a_jour()
+                    # Affichage interpolé entre deux ticks, comme dans Jeu.executer
+                    alpha = (frame % 3 + 1) / 3
+                    complet.dessiner(alpha)
+                    incremental.dessiner(alpha)
+                    self.assertEqual(
+                        pygame.image.tobytes(complet.ecran, "RGB"),
+                        pygame.image.tobytes(incremental.ecran, "RGB"),
+                        f"{skin}, frame {frame}",
+                    )
+                self.assertGreater(incremental.rendu_incremental.frames_partielles, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
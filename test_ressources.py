@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+import unittest
+import wave
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import numpy as np  # noqa: E402
+import pygame  # noqa: E402
+
+import snake  # noqa: E402
+from ressources import GestionnaireRessources, charger_son  # noqa: E402
+from stockage import StockageSQLite  # noqa: E402
+
+
+class TestGestionnaireRessources(unittest.TestCase):
+    def test_chargement_unique(self):
+        appels = []
+        ressources = GestionnaireRessources()
+        ressources.declarer("a", lambda: appels.append("a") or "A")
+        ressources.declarer("b", lambda: open("/inexistant/b.wav", "rb"))
+        self.assertIsNone(ressources.obtenir("a", attendre=False))
+        self.assertEqual(ressources.obtenir("a"), "A")
+        ressources.demarrer()
+        self.assertTrue(ressources.attendre(5))
+        # Chargement impossible : None, sans exception
+        self.assertIsNone(ressources.obtenir("b"))
+        self.assertEqual(ressources.obtenir("a", attendre=False), "A")
+        self.assertEqual(appels, ["a"])
+        self.assertEqual(set(ressources.statistiques()), {"a", "b"})
+
+    def test_pomme_partagee_entre_les_parties(self):
+        jeu = snake.Jeu(stockage=StockageSQLite(":memory:"))
+        sprite = jeu.partie.nourriture.sprite_nourriture
+        jeu._initialiser_nouvelle_partie()
+        self.assertIs(jeu.partie.nourriture.sprite_nourriture, sprite)
+
+
+class TestChargerSon(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.mixer.init()
+
+    def test_wav_mono_lu_par_mmap(self):
+        with wave.open(str(snake.FICHIER_SON_COLLISION)) as fichier:
+            brut = np.frombuffer(fichier.readframes(fichier.getnframes()), dtype="<i2")
+        echantillons = pygame.sndarray.array(charger_son(snake.FICHIER_SON_COLLISION))
+        canaux = pygame.mixer.get_init()[2]
+        self.assertEqual(echantillons.shape, (len(brut), canaux) if canaux > 1 else (len(brut),))
+        self.assertTrue(np.array_equal(echantillons.reshape(len(brut), -1)[:, 0], brut))
+
+    def test_autre_format_decode_par_sdl(self):
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = Path(dossier) / "bip.wav"
+            with wave.open(str(chemin), "wb") as fichier:
+                fichier.setnchannels(1)
+                fichier.setsampwidth(1)
+                fichier.setframerate(22050)
+                fichier.writeframes(bytes(range(256)) * 10)
+            son = charger_son(chemin)
+            self.assertAlmostEqual(son.get_length(), 2560 / 22050, places=2)
+            with self.assertRaises(ValueError):
+                (Path(dossier) / "faux.wav").write_bytes(b"RIFF\0\0\0\0AVI ")
+                charger_son(Path(dossier) / "faux.wav")
+
+
+if __name__ == "__main__":
+    unittest.main()
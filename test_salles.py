@@ -0,0 +1,174 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import pygame  # noqa: E402
+
+import moteur  # noqa: E402
+import salles  # noqa: E402
+import snake  # noqa: E402
+from moteur import BAS, DROITE  # noqa: E402
+from pilote import PiloteAutomatique  # noqa: E402
+from salles import ClientSalle, MiroirPartie, Salle, ServeurSalles  # noqa: E402
+from stockage import StockageSQLite  # noqa: E402
+
+
+def _messages(trames: bytes) -> list[bytes]:
+    messages = []
+    position = 0
+    while position < len(trames):
+        (longueur,) = salles.LONGUEUR.unpack_from(trames, position)
+        position += salles.LONGUEUR.size
+        messages.append(trames[position:position + longueur])
+        position += longueur
+    return messages
+
+
+class ServeurEnFond:
+    """Serveur de salles et sa tâche de cadence, dans une boucle asyncio d'un thread."""
+
+    def __init__(self, serveur_salles: ServeurSalles):
+        self.boucle = asyncio.new_event_loop()
+        self.serveur = self.boucle.run_until_complete(
+            asyncio.start_server(serveur_salles.traiter_connexion, "127.0.0.1", 0)
+        )
+        self.cadence = self.boucle.create_task(serveur_salles.cadencer())
+        self.port = self.serveur.sockets[0].getsockname()[1]
+        self._thread = threading.Thread(target=self.boucle.run_forever, daemon=True)
+        self._thread.start()
+
+    def arreter(self):
+        self.boucle.call_soon_threadsafe(self.boucle.stop)
+        self._thread.join()
+        self.cadence.cancel()
+        self.serveur.close()
+        self.boucle.run_until_complete(self.serveur.wait_closed())
+        self.boucle.close()
+
+
+def _attendre(condition, delai: float = 3.0) -> bool:
+    limite = time.monotonic() + delai
+    while time.monotonic() < limite:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestSalle(unittest.TestCase):
+    def test_le_miroir_suit_la_salle_tick_par_tick(self):
+        salle = Salle(1, graine=42)
+        miroir = MiroirPartie()
+        miroir.appliquer(salles.encoder_etat(salle.etat))
+        pilote = PiloteAutomatique(budget_us=5_000)
+        tailles_deltas = []
+        fins = 0
+        for tick in range(6_000):
+            direction = pilote(salle.etat)
+            if direction is not None:
+                salle.memoriser_direction(direction)
+            for message in _messages(salle.avancer()):
+                if message[0] == salles.DELTA and not message[5] & salles.FIN:
+                    tailles_deltas.append(len(message))
+                if miroir.appliquer(message) & moteur.PARTIE_TERMINEE:
+                    fins += 1
+                    pilote.reinitialiser()
+            attendu, obtenu = salle.etat, miroir.etat
+            self.assertEqual(list(obtenu.serpent.corps.cellules()), list(attendu.serpent.corps.cellules()), tick)
+            self.assertEqual(bytes(obtenu.grille.occupation), bytes(attendu.grille.occupation), tick)
+            self.assertEqual(
+                (obtenu.score, obtenu.niveau, obtenu.vitesse_actuelle, obtenu.multiplicateur_score, obtenu.invincible),
+                (attendu.score, attendu.niveau, attendu.vitesse_actuelle, attendu.multiplicateur_score,
+                 attendu.invincible),
+            )
+            if attendu.bonus is None:
+                self.assertIsNone(obtenu.bonus)
+            else:
+                self.assertEqual(
+                    (obtenu.bonus.position, obtenu.bonus.type, obtenu.bonus.duree_vie),
+                    (attendu.bonus.position, attendu.bonus.type, attendu.bonus.duree_vie),
+                )
+        self.assertGreater(fins, 0)
+        # Tête ajoutée et queue retirée : 10 octets, loin de l'état complet
+        self.assertEqual(min(tailles_deltas), 10)
+        self.assertLess(sum(tailles_deltas) / len(tailles_deltas), 12)
+        self.assertGreater(len(salles.encoder_etat(salle.etat)), 40)
+
+    def test_file_de_directions(self):
+        salle = Salle(1, graine=0)
+        salle.memoriser_direction(BAS)
+        salle.memoriser_direction(BAS)
+        salle.memoriser_direction(DROITE)
+        salle.avancer()
+        self.assertEqual(salle.etat.serpent.direction, BAS)
+        salle.avancer()
+        self.assertEqual(salle.etat.serpent.direction, DROITE)
+
+
+class TestServeurSalles(unittest.TestCase):
+    def setUp(self):
+        self.serveur_salles = ServeurSalles(graine=3)
+        self.serveur = ServeurEnFond(self.serveur_salles)
+
+    def tearDown(self):
+        self.serveur.arreter()
+
+    def test_deux_clients_dans_la_meme_salle(self):
+        premier = ClientSalle(port=self.serveur.port, salle=7)
+        second = ClientSalle(port=self.serveur.port, salle=7)
+        autre = ClientSalle(port=self.serveur.port, salle=8)
+        try:
+            self.assertTrue(premier.attendre_etat() and second.attendre_etat() and autre.attendre_etat())
+            self.assertEqual(premier.dimensions, (moteur.COLONNES, moteur.LIGNES))
+            miroirs = [MiroirPartie(), MiroirPartie()]
+            premier.envoyer_direction(BAS)
+
+            def appliquer():
+                for client, miroir in zip((premier, second), miroirs):
+                    for message in client.recus():
+                        miroir.appliquer(message)
+                return all(miroir.etat is not None and miroir.etat.frame_count >= 5 for miroir in miroirs)
+
+            self.assertTrue(_attendre(appliquer))
+            self.assertEqual(miroirs[0].etat.serpent.direction, BAS)
+            self.assertEqual(len(self.serveur_salles.salles), 2)
+        finally:
+            for client in (premier, second, autre):
+                client.fermer()
+        self.assertTrue(_attendre(lambda: not self.serveur_salles.salles))
+        statistiques = self.serveur_salles.statistiques()
+        self.assertGreaterEqual(statistiques["ticks"], 10)
+        self.assertGreaterEqual(statistiques["retard_ms_p99"], statistiques["retard_ms_p50"])
+
+    def test_client_leger_de_jeu(self):
+        client = ClientSalle(port=self.serveur.port, salle=1)
+        jeu = snake.Jeu(stockage=StockageSQLite(":memory:"), client_salle=client)
+        jeu.ecran = pygame.Surface((snake.LARGEUR, snake.HAUTEUR))
+        jeu._initialiser_nouvelle_partie()
+        self.assertIsNone(jeu.enregistrement)
+        self.assertIsInstance(jeu.partie.serpent, snake.Snake)
+        debut = jeu.partie.frame_count
+        jeu._memoriser_direction(BAS)
+
+        def avance():
+            jeu.mettre_a_jour()
+            return jeu.partie.frame_count >= debut + 3
+
+        self.assertTrue(_attendre(avance))
+        self.assertEqual(jeu.partie.serpent.direction, BAS)
+        jeu.dessiner(0.5)
+        client.fermer()
+        self.assertTrue(_attendre(lambda: (jeu.mettre_a_jour(), jeu.etat == "game_over")[1]))
+        self.assertEqual(jeu.stockage.meilleur_score(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+import asyncio
+import http.client
+import json
+import socket
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from client_classement import ClientClassement  # noqa: E402
+from main import ServiceClassement  # noqa: E402
+from stockage import StockageSQLite  # noqa: E402
+
+
+def port_libre() -> int:
+    with socket.socket() as prise:
+        prise.bind(("127.0.0.1", 0))
+        return prise.getsockname()[1]
+
+
+class ServeurEnFond:
+    """Service de classement servi par une boucle asyncio dans un thread."""
+
+    def __init__(self, service: ServiceClassement, port: int = 0):
+        self.boucle = asyncio.new_event_loop()
+        self.serveur = self.boucle.run_until_complete(
+            asyncio.start_server(service.traiter_connexion, "127.0.0.1", port)
+        )
+        self.port = self.serveur.sockets[0].getsockname()[1]
+        self._thread = threading.Thread(target=self.boucle.run_forever, daemon=True)
+        self._thread.start()
+
+    def arreter(self):
+        self.boucle.call_soon_threadsafe(self.boucle.stop)
+        self._thread.join()
+        self.serveur.close()
+        self.boucle.run_until_complete(self.serveur.wait_closed())
+        self.boucle.close()
+
+
+class TestServiceClassement(unittest.TestCase):
+    def setUp(self):
+        self.service = ServiceClassement(StockageSQLite(":memory:"), taille_top=3)
+
+    def _soumettre(self, **partie):
+        return self.service.repondre("POST", "/scores", json.dumps(partie).encode())
+
+    def test_rangs_et_top(self):
+        for score in (40, 10, 70, 40, 5):
+            statut, _ = self._soumettre(score=score, skin="orange", niveau=2, duree=12.5)
+            self.assertEqual(statut, 201)
+        self.assertEqual(self._soumettre(score=50), (201, {"rang": 2, "total": 6}))
+
+        statut, top = self.service.repondre("GET", "/scores/top?n=10", b"")
+        self.assertEqual(statut, 200)
+        self.assertEqual([partie["score"] for partie in top["parties"]], [70, 50, 40])
+        self.assertEqual(top["parties"][2]["skin"], "orange")
+        self.assertEqual(self.service.repondre("GET", "/scores/rang?score=40", b""), (200, {"rang": 3, "total": 6}))
+
+    def test_requetes_invalides(self):
+        self.assertEqual(self._soumettre(score=-3)[0], 400)
+        self.assertEqual(self._soumettre(score="12")[0], 400)
+        self.assertEqual(self._soumettre(score=3, niveau="un")[0], 400)
+        self.assertEqual(self.service.repondre("POST", "/scores", b"{")[0], 400)
+        self.assertEqual(self.service.repondre("GET", "/scores", b"")[0], 405)
+        self.assertEqual(self.service.repondre("GET", "/scores/rang", b"")[0], 400)
+        self.assertEqual(self.service.repondre("GET", "/inconnu", b"")[0], 404)
+
+    def test_stockage_en_echec(self):
+        class StockageEnPanne(StockageSQLite):
+            def valider(self):
+                raise sqlite3.OperationalError("database is locked")
+
+        service = ServiceClassement(StockageEnPanne(":memory:", taille_lot=1))
+        statut, reponse = service.repondre("POST", "/scores", json.dumps({"score": 12}).encode())
+        self.assertEqual(statut, 503)
+        self.assertIn("database is locked", reponse["erreur"])
+        # Ni classée ni laissée en attente : le client la renverra
+        self.assertEqual((len(service.index), service.top(5)["parties"]), (0, []))
+        self.assertEqual(service.stockage.en_attente, 0)
+        self.assertEqual(service.repondre("GET", "/sante", b"")[1]["erreurs_stockage"], 1)
+
+    def test_rechargement_depuis_la_base(self):
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = Path(dossier) / "classement.db"
+            service = ServiceClassement(StockageSQLite(chemin))
+            for score in (3, 9, 6):
+                service.soumettre({"score": score, "skin": "magma"})
+            service.stockage.fermer()
+            recharge = ServiceClassement(StockageSQLite(chemin))
+            self.assertEqual(recharge.rang(6), {"rang": 2, "total": 3})
+            self.assertEqual(recharge.top(1)["parties"][0]["skin"], "magma")
+            recharge.stockage.fermer()
+
+    def test_http_connexion_persistante(self):
+        serveur = ServeurEnFond(self.service)
+        try:
+            connexion = http.client.HTTPConnection("127.0.0.1", serveur.port, timeout=5)
+            for score in (8, 3):
+                connexion.request("POST", "/scores", json.dumps({"score": score}))
+                reponse = connexion.getresponse()
+                self.assertEqual(reponse.status, 201)
+                reponse.read()
+            connexion.request("GET", "/scores/top?n=1")
+            reponse = connexion.getresponse()
+            self.assertEqual(json.loads(reponse.read())["parties"][0]["score"], 8)
+            connexion.close()
+        finally:
+            serveur.arreter()
+
+    def test_base_verrouillee_sans_bloquer_la_boucle(self):
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = Path(dossier) / "classement.db"
+            service = ServiceClassement(StockageSQLite(chemin, taille_lot=1))
+            serveur = ServeurEnFond(service)
+            autre = sqlite3.connect(chemin, isolation_level=None)
+            autre.execute("BEGIN IMMEDIATE")
+            try:
+                # La validation du lot attend le verrou tenu par l'autre connexion...
+                soumission = http.client.HTTPConnection("127.0.0.1", serveur.port, timeout=5)
+                soumission.request("POST", "/scores", json.dumps({"score": 8}))
+                time.sleep(0.1)
+                # ... pendant que la boucle sert les autres connexions
+                debut = time.monotonic()
+                connexion = http.client.HTTPConnection("127.0.0.1", serveur.port, timeout=5)
+                connexion.request("GET", "/scores/rang?score=8")
+                self.assertEqual(json.loads(connexion.getresponse().read()), {"rang": 1, "total": 0})
+                self.assertLess(time.monotonic() - debut, 0.5)
+                connexion.close()
+                autre.execute("COMMIT")
+                reponse = soumission.getresponse()
+                self.assertEqual((reponse.status, json.loads(reponse.read())), (201, {"rang": 1, "total": 1}))
+                soumission.close()
+            finally:
+                autre.close()
+                serveur.arreter()
+                service.fermer()
+
+
+class TestClientClassement(unittest.TestCase):
+    def test_reessai_quand_le_service_arrive(self):
+        port = port_libre()
+        client = ClientClassement(f"http://127.0.0.1:{port}", delai_min=0.02, delai_max=0.05)
+        client.soumettre({"score": 12})
+        client.soumettre({"score": 30})
+        limite = time.monotonic() + 5
+        while not client.echecs and time.monotonic() < limite:
+            time.sleep(0.01)
+        self.assertGreater(client.echecs, 0)
+        self.assertEqual(client.en_attente, 2)
+
+        service = ServiceClassement(StockageSQLite(":memory:"))
+        serveur = ServeurEnFond(service, port)
+        try:
+            self.assertTrue(client.vider(5))
+            self.assertEqual(client.envoyees, 2)
+            self.assertEqual(client.dernier_rang, 1)
+            self.assertEqual(len(service.index), 2)
+        finally:
+            client.fermer()
+            serveur.arreter()
+
+    def test_file_hors_ligne_sauvegardee(self):
+        with tempfile.TemporaryDirectory() as dossier:
+            fichier = Path(dossier) / "attente.json"
+            url = f"http://127.0.0.1:{port_libre()}"
+            client = ClientClassement(url, fichier, delai_min=0.02)
+            client.soumettre({"score": 7, "skin": "orange"})
+            client.fermer(delai=0.05)
+            self.assertEqual(json.loads(fichier.read_text(encoding="utf-8")), [{"score": 7, "skin": "orange"}])
+
+            # Rechargée au lancement suivant
+            client = ClientClassement(url, fichier, delai_min=0.02)
+            self.assertEqual(client.en_attente, 1)
+            client.fermer(delai=0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import moteur  # noqa: E402
+import simulation  # noqa: E402
+
+
+class TestSimulation(unittest.TestCase):
+    def test_resultats_reproductibles_et_independants_des_processus(self):
+        sequentiel = simulation.simuler(12, processus=1, graine=3, taille_lot=5)
+        parallele = simulation.simuler(12, processus=2, graine=3, taille_lot=5)
+        self.assertEqual(sequentiel, parallele)
+        self.assertEqual([r.graine for r in sequentiel], list(range(3, 15)))
+        for resultat in sequentiel:
+            self.assertEqual(resultat.score % 5, 0)
+            self.assertGreaterEqual(resultat.longueur, 1)
+
+    def test_dataframe(self):
+        resultats = simulation.simuler(4, politique="aleatoire", processus=1)
+        df = simulation.en_dataframe(resultats)
+        self.assertEqual(list(df.columns), list(simulation.ResultatPartie._fields))
+        self.assertEqual(len(df), 4)
+        self.assertIn("score", simulation.resumer(df).index)
+
+    def test_glouton_invincible_evite_le_bord(self):
+        etat = moteur.nouvelle_partie(colonnes=4, lignes=4, graine=0)
+        etat.invincible, etat.temps_invincible = True, 10
+        moteur.avancer(etat)
+        # Tête en (3, 2) contre le bord droit, nourriture juste de l'autre côté
+        etat.nourriture.position = (0, 2)
+        direction = simulation.PolitiqueGloutonne(0)(etat)
+        self.assertIn(direction, (moteur.HAUT, moteur.BAS))
+
+    def test_politique_inconnue(self):
+        with self.assertRaises(ValueError):
+            simulation.simuler(1, politique="inconnue", processus=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from classement import sauvegarder_scores  # noqa: E402
+from stockage import (  # noqa: E402
+    Stockage,
+    StockageDiffere,
+    StockageFichiers,
+    StockageSQLite,
+    sauvegarder_progression_json,
+)
+
+
+class HorlogeFactice:
+    def __init__(self):
+        self.instant = 0.0
+
+    def __call__(self):
+        return self.instant
+
+
+class StockageLent(Stockage):
+    """Enregistre les écritures ; chacune attend ``debloquer``."""
+
+    def __init__(self):
+        self.commence = threading.Event()
+        self.debloquer = threading.Event()
+        self.scores = []
+        self.progressions = []
+
+    def ajouter_score(self, score):
+        self.commence.set()
+        self.debloquer.wait()
+        self.scores.append(score)
+
+    def meilleurs_scores(self, nombre):
+        return sorted(self.scores, reverse=True)[:nombre]
+
+    def charger_progression(self):
+        return None
+
+    def sauvegarder_progression(self, achetes, actif):
+        self.debloquer.wait()
+        self.progressions.append((achetes, actif))
+
+
+class TestStockage(unittest.TestCase):
+    def test_stockage_incomplet_refuse_a_la_creation(self):
+        class SansProgression(Stockage):
+            def ajouter_score(self, score):
+                pass
+
+            def meilleurs_scores(self, nombre):
+                return []
+
+        with self.assertRaisesRegex(TypeError, "charger_progression"):
+            SansProgression()
+        self.assertEqual(StockageLent().meilleur_score(), 0)
+
+
+class TestStockageDiffere(unittest.TestCase):
+    def test_file_fusionnee_et_lectures_immediates(self):
+        lent = StockageLent()
+        differe = StockageDiffere(lent)
+        differe.ajouter_score(5)
+        # Le thread est bloqué sur le premier score : les suivants s'accumulent
+        self.assertTrue(lent.commence.wait(5))
+        for actif in ("orange", "magma", "nocturne"):
+            differe.sauvegarder_progression(["orange", actif], actif)
+        differe.ajouter_score(9)
+        self.assertEqual(differe.meilleurs_scores(3), [9, 5])
+        self.assertEqual(differe.charger_progression(), {"achetes": ["orange", "nocturne"], "actif": "nocturne"})
+
+        lent.debloquer.set()
+        differe.valider()
+        self.assertEqual(lent.scores, [5, 9])
+        # Seule la dernière progression demandée est écrite
+        self.assertEqual(lent.progressions, [(["orange", "nocturne"], "nocturne")])
+        statistiques = differe.statistiques()
+        self.assertEqual(statistiques["ecritures"], 2)
+        self.assertEqual(statistiques["file_max"], 2)
+        self.assertEqual(statistiques["file"], 0)
+        differe.fermer()
+
+    def test_fermer_vide_la_file(self):
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = Path(dossier) / "snake.db"
+            differe = StockageDiffere(StockageSQLite(chemin))
+            for score in range(20):
+                differe.ajouter_score(score)
+            differe.sauvegarder_progression(["orange"], "orange")
+            differe.fermer()
+            base = StockageSQLite(chemin)
+            self.assertEqual(base.meilleurs_scores(2), [19, 18])
+            self.assertEqual(base.charger_progression(), {"achetes": ["orange"], "actif": "orange"})
+            base.fermer()
+
+
+class TestStockageSQLite(unittest.TestCase):
+    def setUp(self):
+        self._temporaire = tempfile.TemporaryDirectory()
+        self.dossier = Path(self._temporaire.name)
+        self.chemin = self.dossier / "snake.db"
+
+    def tearDown(self):
+        self._temporaire.cleanup()
+
+    def test_meilleurs_scores_et_lots(self):
+        horloge = HorlogeFactice()
+        base = StockageSQLite(self.chemin, taille_lot=3, delai_lot=2.0, horloge=horloge)
+        autre = StockageSQLite(self.chemin)
+        base.ajouter_score(10)
+        base.ajouter_score(30)
+        # En attente : visibles ici, pas encore pour l'autre connexion
+        self.assertEqual(base.meilleurs_scores(5), [30, 10])
+        self.assertEqual(autre.meilleurs_scores(5), [])
+        base.ajouter_score(20)
+        self.assertEqual(autre.meilleurs_scores(2), [30, 20])
+
+        base.ajouter_score(40)
+        horloge.instant = 2.5
+        self.assertEqual(base.meilleur_score(), 40)
+        self.assertEqual(autre.meilleurs_scores(5), [40, 30, 20, 10])
+        base.fermer()
+        autre.fermer()
+
+    def test_ecritures_de_deux_connexions(self):
+        jeu = StockageSQLite(self.chemin, taille_lot=1)
+        serveur = StockageSQLite(self.chemin, taille_lot=1)
+        for score in range(50):
+            (jeu if score % 2 else serveur).ajouter_score(score)
+        self.assertEqual(jeu.meilleurs_scores(3), [49, 48, 47])
+        self.assertEqual(serveur.meilleurs_scores(3), [49, 48, 47])
+        jeu.fermer()
+        serveur.fermer()
+
+    def test_progression(self):
+        base = StockageSQLite(self.chemin)
+        self.assertIsNone(base.charger_progression())
+        base.sauvegarder_progression(["orange", "magma"], "magma")
+        base.fermer()
+        self.assertEqual(
+            StockageSQLite(self.chemin).charger_progression(),
+            {"achetes": ["orange", "magma"], "actif": "magma"},
+        )
+
+    def test_import_des_fichiers_json(self):
+        fichier_scores = self.dossier / "scores.json"
+        fichier_progression = self.dossier / "skins.json"
+        sauvegarder_scores([7, 3, 12], fichier_scores)
+        sauvegarder_progression_json(["orange", "nocturne"], "nocturne", fichier_progression)
+        base = StockageSQLite(self.chemin, fichier_scores=fichier_scores, fichier_progression=fichier_progression)
+        self.assertEqual(base.meilleurs_scores(5), [12, 7, 3])
+        self.assertEqual(base.charger_progression(), {"achetes": ["orange", "nocturne"], "actif": "nocturne"})
+        base.fermer()
+
+        # Import fait une seule fois, à la création de la base
+        sauvegarder_scores([100], fichier_scores)
+        base = StockageSQLite(self.chemin, fichier_scores=fichier_scores, fichier_progression=fichier_progression)
+        self.assertEqual(base.meilleurs_scores(5), [12, 7, 3])
+        base.fermer()
+
+    def test_import_depuis_le_journal(self):
+        fichiers = StockageFichiers(self.dossier, self.dossier / "scores.json", self.dossier / "skins.json")
+        for score in (5, 8):
+            fichiers.ajouter_score(score)
+        fichiers.fermer()
+        base = StockageSQLite(self.chemin, fichier_scores=self.dossier / "scores.json")
+        self.assertEqual(base.meilleurs_scores(5), [8, 5])
+        base.fermer()
+
+
+if __name__ == "__main__":
+    unittest.main()